@@ -44,10 +44,51 @@ class Debug(Frame):
         """
         super().__init__(gui_manager)
         self.size = (300, 500)
+        self.__telemetry_rows = 15  # Number of jobs showed in the table of the telemetry
         self.position = (
             self._GUI_manager.get_window_width() - self.size[0] - 200,
             self._GUI_manager.get_window_height() - self.size[1])
 
+    def __render_memory_usage(self, memory_data: dict) -> None:
+        """
+        Render the table with the memory used by every model, showing in red the models (and the total) that use more
+        memory than the thresholds defined in the settings.
+
+        Args:
+            memory_data: Data of the memory used, as returned by the method get_memory_usage_data of the GUIManager.
+
+        Returns: None
+        """
+        megabyte = 1024 ** 2
+        total_exceeded = memory_data['CPU'] + memory_data['GPU'] > memory_data['TOTAL_WARNING']
+
+        if imgui.tree_node('Memory used by the models'):
+            imgui.columns(3, 'Memory used')
+            for header in ['Model', 'CPU (MB)', 'GPU (MB)']:
+                imgui.text(header)
+                imgui.next_column()
+            imgui.separator()
+
+            rows = [(f"{model['NAME']} ({model['TYPE']})",
+                     model['CPU'],
+                     model['GPU'],
+                     model['CPU'] + model['GPU'] > memory_data['MODEL_WARNING']) for model in memory_data['MODELS']]
+            rows.append(('Total', memory_data['CPU'], memory_data['GPU'], total_exceeded))
+
+            for name, cpu_memory, gpu_memory, exceeded in rows:
+                for text in [name, f"{cpu_memory / megabyte:.1f}", f"{gpu_memory / megabyte:.1f}"]:
+                    if exceeded:
+                        imgui.text_colored(text, 1, 0.3, 0.3)
+                    else:
+                        imgui.text(text)
+                    imgui.next_column()
+            imgui.columns(1)
+            imgui.tree_pop()
+
+        elif total_exceeded:
+            imgui.same_line()
+            imgui.text_colored('(over the budget)', 1, 0.3, 0.3)
+
     def render(self) -> None:
         """
         Render the main sample text.
@@ -61,6 +102,10 @@ class Debug(Frame):
         active_model = self._GUI_manager.get_active_model_id()
         loading = self._GUI_manager.is_program_loading()
         memory_usage_mb = (psutil.Process(os.getpid()).memory_info().rss / 1024 ** 2)
+        scheduler_data = self._GUI_manager.get_main_thread_scheduler_data()
+        profiler_data = self._GUI_manager.get_frame_profiler_data()
+        telemetry_data = self._GUI_manager.get_task_telemetry_data()
+        memory_data = self._GUI_manager.get_memory_usage_data()
         # cpu_percent = psutil.cpu_percent()
 
         self._begin_frame('Debug')
@@ -75,9 +120,77 @@ class Debug(Frame):
         imgui.separator()
         imgui.text(f"Loading: {loading}")
         imgui.separator()
+        imgui.text(f"Main thread work: {scheduler_data['LAST_FRAME_TIME'] * 1000:.1f} / "
+                   f"{scheduler_data['TIME_BUDGET'] * 1000:.1f} ms")
+        imgui.text(f"Slices of work in the last frame: {scheduler_data['LAST_FRAME_SLICES']}")
+        imgui.text(f"Pending work: {scheduler_data['PENDING_WORK']}")
+        imgui.separator()
         imgui.text(f"RAM used: {memory_usage_mb} MB")
+        self.__render_memory_usage(memory_data)
         # imgui.text(f"CPU usage: {cpu_percent} %")  # This value change a lot in short time
 
+        if imgui.button('Reload shaders'):
+            self._GUI_manager.reload_shaders()
+
+        imgui.separator()
+        changed, enabled = imgui.checkbox('Frame profiler', profiler_data['ENABLED'])
+        if changed:
+            self._GUI_manager.set_frame_profiler_enabled(enabled)
+
+        if profiler_data['ENABLED']:
+            imgui.same_line()
+            if imgui.button('Export trace'):
+                self._GUI_manager.export_frame_trace()
+
+            imgui.text(f"Frames measured: {profiler_data['FRAMES']}")
+            imgui.columns(5, 'Frame profiler')
+            for header in ['Part (ms)', 'Last', 'P50', 'P95', 'P99']:
+                imgui.text(header)
+                imgui.next_column()
+            imgui.separator()
+            for name, statistics in sorted(profiler_data['STATISTICS'].items()):
+                imgui.text(name)
+                imgui.next_column()
+                for key in ['LAST', 'P50', 'P95', 'P99']:
+                    imgui.text(f"{statistics[key]:.2f}")
+                    imgui.next_column()
+            imgui.columns(1)
+
+        imgui.separator()
+        changed, enabled = imgui.checkbox('Task telemetry', telemetry_data['ENABLED'])
+        if changed:
+            self._GUI_manager.set_task_telemetry_enabled(enabled)
+
+        if telemetry_data['ENABLED']:
+            imgui.same_line()
+            if imgui.button('Export telemetry'):
+                self._GUI_manager.export_task_telemetry()
+
+            imgui.columns(6, 'Task telemetry')
+            for header in ['Job', 'Kind', 'Wait (ms)', 'Run (ms)', 'Then (ms)', 'Result (KB)']:
+                imgui.text(header)
+                imgui.next_column()
+            imgui.separator()
+            for record in reversed(telemetry_data['RECORDS'][-self.__telemetry_rows:]):
+                imgui.text(record['NAME'].replace('.<locals>', ''))
+                if imgui.is_item_hovered():
+                    imgui.set_tooltip(f"Status: {record['STATUS']}\n"
+                                      f"Memory used: {record['MEMORY_DELTA'] / 1024 ** 2:.1f} MB")
+                imgui.next_column()
+                imgui.text(record['KIND'])
+                imgui.next_column()
+                for start, end in [('SUBMIT_TIME', 'START_TIME'), ('START_TIME', 'END_TIME')]:
+                    if record[start] is not None and record[end] is not None:
+                        imgui.text(f"{(record[end] - record[start]) * 1000:.1f}")
+                    else:
+                        imgui.text('-')
+                    imgui.next_column()
+                imgui.text(f"{record['THEN_DURATION'] * 1000:.1f}")
+                imgui.next_column()
+                imgui.text(f"{record['RESULT_SIZE'] / 1024:.1f}")
+                imgui.next_column()
+            imgui.columns(1)
+
         imgui.separator()
         imgui.text_wrapped(f"List of polygons: {self._GUI_manager.get_polygon_id_list()}")
         imgui.text_wrapped(f"List of folders: {self._GUI_manager.get_polygon_folder_id_list()}")
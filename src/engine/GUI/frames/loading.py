@@ -43,7 +43,7 @@ class Loading(Frame):
         """
         super().__init__(gui_manager)
         self.__loading_message = "Please wait a moment..."
-        self.__windows_width, self.__windows_height = 300, 100
+        self.__windows_width, self.__windows_height = 300, 120
 
     def post_render(self) -> None:
         """
@@ -60,6 +60,14 @@ class Loading(Frame):
             imgui.set_window_size(self.__windows_width, self.__windows_height)
             imgui.text(self.__loading_message)
 
+            # Show the progress of the transformations and allow to cancel them
+            # -----------------------------------------------------------------
+            transformation_progress = self._GUI_manager.get_transformation_progress()
+            if transformation_progress is not None:
+                imgui.text(f'Progress: {transformation_progress * 100:.0f}%')
+                if imgui.button('Cancel', -1):
+                    self._GUI_manager.cancel_transformation()
+
             if not self._GUI_manager.is_program_loading():
                 imgui.close_current_popup()
                 self._GUI_manager.set_controller_keyboard_callback_state(True)
@@ -30,6 +30,7 @@ from src.engine.GUI.frames.modal.interpolate_nan_map_modal import InterpolateNan
 from src.engine.GUI.frames.modal.replace_values_with_nan_modal import ReplaceValuesWithNanModal
 from src.engine.GUI.frames.modal.subtract_map_modal import SubtractMapModal
 from src.engine.scene.map_transformation.fill_nan_map_transformation import FillNanMapTransformation
+from src.engine.scene.model.map2d_render_mode import Map2DRenderMode
 from src.program.view_mode import ViewMode
 from src.utils import get_logger
 
@@ -126,6 +127,20 @@ class MainMenuBar(Frame):
                 log.info("Rendering filled polygons")
                 self._GUI_manager.set_models_polygon_mode(GL.GL_FILL)
 
+            # Option to render the 2D maps as meshes or as rasters
+            imgui.separator()
+            if self._GUI_manager.get_map_2d_render_mode() == Map2DRenderMode.mesh:
+                imgui.menu_item('Render maps as rasters', enabled=model_loaded)
+                if imgui.is_item_clicked() and model_loaded:
+                    log.info("Rendering maps as rasters")
+                    self._GUI_manager.set_map_2d_render_mode(Map2DRenderMode.raster)
+
+            else:
+                imgui.menu_item('Render maps as meshes', enabled=model_loaded)
+                if imgui.is_item_clicked() and model_loaded:
+                    log.info("Rendering maps as meshes")
+                    self._GUI_manager.set_map_2d_render_mode(Map2DRenderMode.mesh)
+
             # Option to change to 2D/3D mode. Raise error if the program is in another mode other than 3D or 2D.
             imgui.separator()
             program_view_mode = self._GUI_manager.get_program_view_mode()
@@ -157,6 +172,11 @@ class MainMenuBar(Frame):
             imgui.menu_item('Undo', 'CTRL+Z', False, model_loaded)
             if imgui.is_item_clicked() and model_loaded:
                 self._GUI_manager.undo_action()
+
+            # Option to redo the last action undone
+            imgui.menu_item('Redo', 'CTRL+Y', False, model_loaded)
+            if imgui.is_item_clicked() and model_loaded:
+                self._GUI_manager.redo_action()
             imgui.end_menu()
 
     def __map_tools_menu(self, model_loaded: bool):
@@ -25,6 +25,8 @@ import imgui
 
 from src.engine.GUI.font import Font
 from src.engine.GUI.frames.modal.confirmation_modal import ConfirmationModal
+from src.engine.scene.transformation.fill_nan_batch_transformation import FillNanBatchTransformation
+from src.engine.scene.transformation.linear_batch_transformation import LinearBatchTransformation
 from src.program.tools import Tools
 from src.utils import get_logger
 
@@ -306,6 +308,35 @@ class PolygonTools:
                 self.__GUI_manager.export_polygons_inside_folder(folder_id)
                 imgui.close_current_popup()
 
+            imgui.separator()
+            batch_settings = self.__GUI_manager.get_batch_transformation_settings()
+            imgui.selectable('Change height using parameters')
+            if imgui.is_item_hovered():
+                imgui.set_tooltip(f'Change the height of the points inside every polygon of the folder using the '
+                                  f'values of the parameters '
+                                  f'{batch_settings["BATCH_TRANSFORMATION_MIN_HEIGHT_PARAMETER"]} and '
+                                  f'{batch_settings["BATCH_TRANSFORMATION_MAX_HEIGHT_PARAMETER"]} of the polygon.')
+            if imgui.is_item_clicked():
+                transformation = LinearBatchTransformation(
+                    self.__GUI_manager.get_active_model_id(),
+                    self.__GUI_manager.get_polygons_id_from_polygon_folder(folder_id),
+                    batch_settings['BATCH_TRANSFORMATION_MIN_HEIGHT_PARAMETER'],
+                    batch_settings['BATCH_TRANSFORMATION_MAX_HEIGHT_PARAMETER'],
+                    max_workers=batch_settings['BATCH_TRANSFORMATION_MAX_THREADS']
+                )
+                self.__GUI_manager.apply_transformation(transformation)
+                imgui.close_current_popup()
+
+            imgui.selectable('Fill polygons with nan')
+            if imgui.is_item_clicked():
+                transformation = FillNanBatchTransformation(
+                    self.__GUI_manager.get_active_model_id(),
+                    self.__GUI_manager.get_polygons_id_from_polygon_folder(folder_id),
+                    max_workers=batch_settings['BATCH_TRANSFORMATION_MAX_THREADS']
+                )
+                self.__GUI_manager.apply_transformation(transformation)
+                imgui.close_current_popup()
+
             imgui.separator()
             imgui.selectable('Move Up')
             if imgui.is_item_clicked():
@@ -51,6 +51,7 @@ from src.utils import get_logger
 
 if TYPE_CHECKING:
     from src.engine.engine import Engine
+    from src.engine.scene.model.map2d_render_mode import Map2DRenderMode
     from glfw import _GLFWwindow
     from src.program.tools import Tools
     from src.engine.scene.transformation.transformation import Transformation
@@ -339,6 +340,14 @@ class GUIManager:
         """
         return self.__engine.calculate_max_min_height(model_id, polygon_id, return_data)
 
+    def cancel_transformation(self) -> None:
+        """
+        Cancel the transformations that are being applied.
+
+        Returns: None
+        """
+        self.__engine.cancel_transformation()
+
     def change_color_file_with_dialog(self) -> None:
         """
         Ask the engine to open a dialog (file selector menu) and change the CPT file used to color the 2D and 3D models.
@@ -489,6 +498,14 @@ class GUIManager:
         # check for the mouse component
         self.__is_mouse_inside_frame = imgui.get_io().want_capture_mouse
 
+    def export_frame_trace(self) -> None:
+        """
+        Ask the engine to export the time used by the parts of the last frames as a trace file.
+
+        Returns: None
+        """
+        self.__engine.export_frame_trace()
+
     def export_model_as_netcdf(self, model_id: str) -> None:
         """
         Ask the engine to export the model with the specified ID as  a netcdf file.
@@ -523,6 +540,14 @@ class GUIManager:
         self.__engine.export_polygon_list_id(self.__polygon_folder_manager.get_polygon_id_list(polygon_folder_id),
                                              self.__polygon_folder_manager.get_name_of_folder(polygon_folder_id))
 
+    def export_task_telemetry(self) -> None:
+        """
+        Ask the engine to export the records of the last jobs executed in the background as a JSONL file.
+
+        Returns: None
+        """
+        self.__engine.export_task_telemetry()
+
     def fix_frames_position(self, value: bool) -> None:
         """
         Set if the windows will be fixed on the screen or if they will be floating.
@@ -576,6 +601,14 @@ class GUIManager:
         """
         return self.__engine.get_active_tool()
 
+    def get_batch_transformation_settings(self) -> dict:
+        """
+        Ask the engine for the settings related to the transformations applied over all the polygons of a folder.
+
+        Returns: Dictionary with the settings of the transformations.
+        """
+        return self.__engine.get_batch_transformation_settings()
+
     def get_camera_data(self) -> dict:
         """
         Ask the engine for the data related to the camera.
@@ -674,6 +707,24 @@ class GUIManager:
         """
         return self.__engine.get_gui_setting_data()['LEFT_FRAME_WIDTH']
 
+    def get_frame_profiler_data(self) -> dict:
+        """
+        Get the statistics of the time used by the parts of the frames, used for debugging.
+
+        Returns: Dictionary with the state of the profiler, the number of frames measured and the statistics (in
+                 milliseconds) of every part of the frames.
+        """
+        return self.__engine.get_frame_profiler_data()
+
+    def get_main_thread_scheduler_data(self) -> dict:
+        """
+        Get the data of the work executed in the main thread, used for debugging.
+
+        Returns: Dictionary with the time budget of the frames, the time used and the slices of work executed in the
+                 last frame and the number of works pending.
+        """
+        return self.__engine.get_main_thread_scheduler_data()
+
     def get_main_menu_bar_height(self) -> int:
         """
         Get the main menu bar height frm the settings.
@@ -716,6 +767,14 @@ class GUIManager:
         """
         return self.__engine.get_map_height_on_coordinates(x_coordinate, y_coordinate)
 
+    def get_map_2d_render_mode(self) -> 'Map2DRenderMode':
+        """
+        Get the mode used to render the maps in 2D.
+
+        Returns: Render mode used by the maps.
+        """
+        return self.__engine.get_map_2d_render_mode()
+
     def get_map_position(self) -> list:
         """
         The the position of the map in the program.
@@ -724,6 +783,15 @@ class GUIManager:
         """
         return self.__engine.get_map_position()
 
+    def get_memory_usage_data(self) -> dict:
+        """
+        Get the memory used by the models of the scene in the CPU and in the GPU, used for debugging.
+
+        Returns: Dictionary with the list of models (each one with the keys NAME, TYPE, CPU and GPU), the total of
+                 bytes used in the CPU and the GPU and the thresholds (in bytes) used to show warnings.
+        """
+        return self.__engine.get_memory_usage_data()
+
     def get_model_list(self) -> List[str]:
         """
         Get a list with the ID of all the 2D models loaded into the program.
@@ -829,6 +897,22 @@ class GUIManager:
         """
         return self.__engine.get_quality()
 
+    def get_task_telemetry_data(self) -> dict:
+        """
+        Get the records of the last jobs executed in the background, used for debugging.
+
+        Returns: Dictionary with the state of the telemetry and the list of records (from the oldest to the newest).
+        """
+        return self.__engine.get_task_telemetry_data()
+
+    def get_transformation_progress(self) -> Union[float, None]:
+        """
+        Get the progress of the transformations that are being applied.
+
+        Returns: Number between 0 and 1 with the progress. None if there is no transformations being applied.
+        """
+        return self.__engine.get_transformation_progress()
+
     def get_window_height(self) -> int:
         """
         Get the window height.
@@ -1064,6 +1148,14 @@ class GUIManager:
         """
         self.__implementation.process_inputs()
 
+    def redo_action(self) -> None:
+        """
+        Call the engine to redo the most recent modification of the heights undone on the program.
+
+        Returns: None
+        """
+        self.__engine.redo_action()
+
     def reload_models(self):
         """
         Ask the Engine to reload the models into a better definition.
@@ -1079,6 +1171,14 @@ class GUIManager:
         """
         self.__engine.reload_models()
 
+    def reload_shaders(self) -> None:
+        """
+        Ask the Engine to compile again the shaders whose files were modified.
+
+        Returns: None
+        """
+        self.__engine.reload_shaders()
+
     def remove_all_polygons_inside_folder(self, polygon_folder_id: str) -> None:
         """
         Remove all the polygons that are inside a folder from the system and from the folder.
@@ -1238,6 +1338,17 @@ class GUIManager:
         imgui.pop_font()
         imgui.push_font(self.__loaded_fonts[font])
 
+    def set_frame_profiler_enabled(self, enabled: bool) -> None:
+        """
+        Enable or disable the measure of the time used by the parts of the frames.
+
+        Args:
+            enabled: If measure the frames or not.
+
+        Returns: None
+        """
+        self.__engine.set_frame_profiler_enabled(enabled)
+
     def set_loading_message(self, new_msg: str) -> None:
         """
         Set a new loading message in the loading frame.
@@ -1255,6 +1366,17 @@ class GUIManager:
         raise AssertionError('There is not a frame from the Loading class on the list of frames '
                              'handled by the GUIManager.')
 
+    def set_map_2d_render_mode(self, render_mode: 'Map2DRenderMode') -> None:
+        """
+        Call the engine to change the mode used to render the maps in 2D.
+
+        Args:
+            render_mode: Render mode to use.
+
+        Returns: None
+        """
+        self.__engine.set_map_2d_render_mode(render_mode)
+
     def set_models_polygon_mode(self, polygon_mode: gl_constants.IntConstant) -> None:
         """
         Call the scene to change the polygon mode used by the models.
@@ -1319,6 +1441,17 @@ class GUIManager:
         """
         self.__engine.set_program_view_mode(mode)
 
+    def set_task_telemetry_enabled(self, enabled: bool) -> None:
+        """
+        Enable or disable the records of the times of the jobs executed in the background.
+
+        Args:
+            enabled: If record the jobs or not.
+
+        Returns: None
+        """
+        self.__engine.set_task_telemetry_enabled(enabled)
+
     def undo_action(self) -> None:
         """
         Call the engine to undo the most recent action made on the program.
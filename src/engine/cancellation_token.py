@@ -0,0 +1,52 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+File with the class CancellationToken, class used to cancel the tasks executed in other threads.
+"""
+from threading import Event
+
+
+class CancellationToken:
+    """
+    Class used to tell a task executed in another thread that its result is not needed anymore.
+
+    The ThreadManager does not start the tasks whose token was cancelled and does not call their then functions. Long
+    tasks can also check the token while running to stop as soon as possible.
+    """
+
+    def __init__(self):
+        """
+        Constructor of the class.
+        """
+        self.__event = Event()
+
+    def cancel(self) -> None:
+        """
+        Cancel the task associated to the token.
+
+        Returns: None
+        """
+        self.__event.set()
+
+    def is_cancelled(self) -> bool:
+        """
+        Check if the task associated to the token was cancelled.
+
+        Returns: Boolean indicating if the task was cancelled.
+        """
+        return self.__event.is_set()
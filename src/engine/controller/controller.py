@@ -387,6 +387,11 @@ class Controller:
                                 log.debug("Pressed ctrl+z")
                                 engine.undo_action()
 
+                        if key == glfw.KEY_Y:
+                            if self.__is_left_ctrl_pressed:
+                                log.debug("Pressed ctrl+y")
+                                engine.redo_action()
+
                         if key == glfw.KEY_R:
                             engine.reload_models()
 
@@ -19,20 +19,27 @@
 File that contains the Engine class. Class in charge of the management of all the logic of the application.
 """
 from pathlib import Path
-from typing import List, TYPE_CHECKING, Union
+from typing import Callable, Hashable, List, TYPE_CHECKING, Union
 
 import glfw
 from PIL import Image
 
 from src.engine.GUI.frames.modal.text_modal import TextModal
 from src.engine.GUI.guimanager import GUIManager
+from src.engine.cancellation_token import CancellationToken
 from src.engine.controller.controller import Controller
+from src.engine.frame_profiler import FrameProfiler
+from src.engine.main_thread_scheduler import MainThreadScheduler, complete_work
 from src.engine.process_manager import ProcessManager
 from src.engine.render.render import Render
+from src.engine.scene.model.shader_cache import ShaderCache
 from src.engine.scene.scene import Scene
+from src.engine.shared_array import SharedArray
 from src.engine.settings import Settings
 from src.engine.task_manager import TaskManager
+from src.engine.task_telemetry import TaskTelemetry
 from src.engine.thread_manager import ThreadManager
+from src.engine.thread_task_priority import ThreadTaskPriority
 from src.error.export_error import ExportError
 from src.error.filter_error import FilterError
 from src.error.interpolation_error import InterpolationError
@@ -41,6 +48,7 @@ from src.error.netcdf_import_error import NetCDFImportError
 from src.error.polygon_error import PolygonError
 from src.error.scene_error import SceneError
 from src.error.transformation_error import TransformationError
+from src.error.transformation_job_error import TransformationJobError
 from src.input.NetCDF import read_info
 from src.input.shapefile_importer import ShapefileImporter
 from src.output.netcdf_exporter import NetcdfExporter
@@ -56,6 +64,7 @@ if TYPE_CHECKING:
     from src.engine.scene.transformation.transformation import Transformation
     from src.engine.scene.interpolation.interpolation import Interpolation
     from src.engine.scene.map_transformation.map_transformation import MapTransformation
+    from src.engine.scene.model.map2d_render_mode import Map2DRenderMode
 
 log = get_logger(module='ENGINE')
 
@@ -92,12 +101,45 @@ class Engine:
 
         self.__use_threads = True
         self.__wait_loading_frame_render = True
-        self.__process_manager = ProcessManager()
-        self.__thread_manager = ThreadManager()
+        self.__process_manager = ProcessManager(Settings.PROCESS_POOL_WORKERS)
+        self.__main_thread_scheduler = MainThreadScheduler(Settings.MAIN_THREAD_TIME_BUDGET)
+        self.__thread_manager = ThreadManager(Settings.THREAD_POOL_WORKERS,
+                                              self.__main_thread_scheduler,
+                                              glfw.post_empty_event)
         self.__task_manager = TaskManager()
+        FrameProfiler.set_enabled(Settings.FRAME_PROFILER_ENABLED, Settings.FRAME_PROFILER_HISTORY)
+        TaskTelemetry.set_enabled(Settings.TASK_TELEMETRY_ENABLED, Settings.TASK_TELEMETRY_HISTORY)
+        TaskTelemetry.set_output_file(Settings.TASK_TELEMETRY_FILE)
+
+        # Frames to render even if nothing changes, used by the on demand rendering
+        self.__redraw_frames = 0
 
         self.__initialize_components()
 
+    def __end_transformation_job(self, error: Union[BaseException, None], show_error: Callable) -> None:
+        """
+        Close the loading frame after the end of the job that applies a transformation (or a map transformation, or an
+        interpolation), showing the error raised by the transformation if there was one.
+
+        Errors without a specific message are showed with a generic message, the heights of the map are restored by the
+        job when the transformation fails.
+
+        Args:
+            error: Error raised by the transformation. None if no error was raised.
+            show_error: Function that shows the message of the errors raised by the type of transformation applied.
+
+        Returns: None
+        """
+        self.program.set_loading(False)
+        if error is None:
+            return
+
+        try:
+            show_error(error)
+        except BaseException as e:
+            log.error(f'Error applying the transformation: {e}')
+            self.set_modal_text('Error', 'There was an error applying the transformation, the map was not modified.')
+
     def __initialize_components(self) -> None:
         """
         Initialize the components of the program.
@@ -111,11 +153,257 @@ class Engine:
         glfw.set_window_icon(self.window, 1, [program_icon])
 
         # CONTROLLER CODE
-        glfw.set_key_callback(self.window, self.controller.get_on_key_callback(self))
-        glfw.set_window_size_callback(self.window, self.controller.get_resize_callback(self))
-        glfw.set_mouse_button_callback(self.window, self.controller.get_mouse_button_callback(self))
-        glfw.set_cursor_pos_callback(self.window, self.controller.get_cursor_position_callback(self))
-        glfw.set_scroll_callback(self.window, self.controller.get_mouse_scroll_callback(self))
+        # The input received by the callbacks ask for the render of new frames
+        glfw.set_key_callback(self.window, self.__redraw_after(self.controller.get_on_key_callback(self)))
+        glfw.set_window_size_callback(self.window, self.__redraw_after(self.controller.get_resize_callback(self)))
+        glfw.set_mouse_button_callback(self.window,
+                                       self.__redraw_after(self.controller.get_mouse_button_callback(self)))
+        glfw.set_cursor_pos_callback(self.window,
+                                     self.__redraw_after(self.controller.get_cursor_position_callback(self)))
+        glfw.set_scroll_callback(self.window, self.__redraw_after(self.controller.get_mouse_scroll_callback(self)))
+        glfw.set_window_refresh_callback(self.window, lambda _: self.request_redraw())
+        glfw.set_window_focus_callback(self.window, lambda _, focused: self.request_redraw())
+
+    def __is_redraw_needed(self) -> bool:
+        """
+        Check if a new frame must be rendered when using the on demand rendering.
+
+        Frames are rendered when they were requested (after receiving inputs or finishing tasks), when the program is
+        loading or applying transformations (to show the progress), when there is work pending in the main thread and
+        when the maps are waiting to refresh their tiles.
+
+        Returns: Boolean indicating if a frame must be rendered.
+        """
+        return self.__redraw_frames > 0 or \
+            self.program.is_loading() or \
+            self.__task_manager.get_number_of_pending_tasks() > 0 or \
+            self.__main_thread_scheduler.get_number_of_pending_work() > 0 or \
+            self.scene.get_transformation_progress() is not None or \
+            self.scene.is_refresh_pending()
+
+    @staticmethod
+    def __profiled(task: Callable, name: str) -> Callable:
+        """
+        Get a function that measure the time used by the task with the frame profiler.
+
+        Args:
+            task: Function without parameters to measure.
+            name: Name used in the profiler.
+
+        Returns: Function that calls the task.
+        """
+
+        # noinspection PyMissingOrEmptyDocstring
+        def profiled_task():
+            with FrameProfiler.scope(name):
+                task()
+
+        return profiled_task
+
+    def __redraw_after(self, callback: Callable) -> Callable:
+        """
+        Get a function that ask for the render of new frames before calling the callback.
+
+        Args:
+            callback: Callback of GLFW to use.
+
+        Returns: Function that calls the callback.
+        """
+
+        # noinspection PyMissingOrEmptyDocstring
+        def callback_with_redraw(*args):
+            self.request_redraw()
+            callback(*args)
+
+        return callback_with_redraw
+
+    def __run_iteration(self, on_demand: bool) -> None:
+        """
+        Execute one iteration of the main loop of the program.
+
+        The tasks, threads and process are updated, and then the frame is rendered. If using on demand rendering and
+        there is nothing new to render, then the program waits for new events (or for the timeout defined in the
+        settings, so the tasks keep being updated) instead of rendering the frame.
+
+        Args:
+            on_demand: If render the frame only when something changed.
+
+        Returns: None
+        """
+        FrameProfiler.begin_frame()
+
+        # Render new frames if tasks were executed or finished
+        with FrameProfiler.scope('task_update'):
+            updated_tasks = self.__task_manager.get_number_of_pending_tasks()
+            self.__task_manager.update_tasks()
+        with FrameProfiler.scope('thread_update'):
+            updated_tasks += self.__thread_manager.update_threads()
+        with FrameProfiler.scope('main_thread_work'):
+            self.__main_thread_scheduler.update()
+        with FrameProfiler.scope('process_update'):
+            updated_tasks += self.__process_manager.update_process()
+
+        if updated_tasks > 0:
+            self.request_redraw()
+
+        if on_demand and not self.__is_redraw_needed():
+            # Iterations without render are not stored in the profiler, the next iteration discards their events
+            self.render.wait_events(Settings.ON_DEMAND_RENDERING_TIMEOUT)
+            return
+
+        self.__redraw_frames = max(self.__redraw_frames - 1, 0)
+        self.render.on_loop([self.__profiled(self.gui_manager.process_input, 'input'),
+                             self.__profiled(lambda: self.scene.draw(
+                                 self.program.get_active_model(),
+                                 self.program.get_active_polygon_id(),
+                                 self.program.get_view_mode()
+                             ), 'scene_draw'),
+                             self.__profiled(self.gui_manager.draw_frames, 'gui_build'),
+                             self.__profiled(self.gui_manager.render, 'gui_render')])
+        FrameProfiler.end_frame()
+
+    def __show_interpolation_error(self, error: Exception) -> None:
+        """
+        Show a modal with the message of an error raised when applying an interpolation, closing the loading frame.
+
+        Errors without a specific message are raised again.
+
+        Args:
+            error: Error raised.
+
+        Returns: None
+        """
+        self.program.set_loading(False)
+
+        if isinstance(error, InterpolationError):
+            if error.code == 1:
+                self.set_modal_text('Error', 'There is not enough points in the polygon to do'
+                                             ' the interpolation.')
+            elif error.code == 2:
+                self.set_modal_text('Error', 'Distance must be greater than 0 to do the '
+                                             'interpolation')
+            elif error.code == 3:
+                self.set_modal_text('Error', 'Model used for interpolation is not accepted by '
+                                             'the program.')
+            elif error.code == 4:
+                self.set_modal_text('Error', 'Model not selected.')
+            elif error.code == 5:
+                self.set_modal_text('Error', 'Polygon not selected.')
+            elif error.code == 6:
+                self.set_modal_text('Error', 'Polygon selected is not planar.')
+        elif isinstance(error, TransformationJobError):
+            if error.code == 1:
+                self.set_modal_text('Error', 'The model is already being modified by another transformation.')
+            else:
+                raise error
+        else:
+            raise error
+
+    def __show_map_transformation_error(self, error: Exception) -> None:
+        """
+        Show a modal with the message of an error raised when applying a map transformation, closing the loading frame.
+
+        Errors without a specific message are raised again.
+
+        Args:
+            error: Error raised.
+
+        Returns: None
+        """
+        self.program.set_loading(False)
+
+        if isinstance(error, MapTransformationError):
+            if error.code == 0:
+                self.set_modal_text('Error', 'Model specified can not be None.')
+            elif error.code == 1:
+                self.set_modal_text('Error', 'Model specified not found in the program.')
+            elif error.code == 2:
+                self.set_modal_text('Error', 'One polygon used for the transformation is not planar.')
+            else:
+                raise error
+        elif isinstance(error, TransformationJobError):
+            if error.code == 1:
+                self.set_modal_text('Error', 'The model is already being modified by another transformation.')
+            else:
+                raise error
+        else:
+            raise error
+
+    def __show_transformation_error(self, error: Exception) -> None:
+        """
+        Show a modal with the message of an error raised when applying a transformation, closing the loading frame.
+
+        Errors without a specific message are raised again.
+
+        Args:
+            error: Error raised.
+
+        Returns: None
+        """
+        self.program.set_loading(False)
+
+        if isinstance(error, FilterError):
+            if error.code == 0:
+                self.set_modal_text('Error',
+                                    'Polygon in filter can not be None.')
+            elif error.code == 1:
+                self.set_modal_text('Error',
+                                    'Polygons used in filters must have at least 3 vertices.')
+            elif error.code == 2:
+                self.set_modal_text('Error',
+                                    'One of the polygons used in a filter is not simple/planar.')
+            elif error.code == 3:
+                self.set_modal_text('Error',
+                                    'Polygon not selected or invalid in filter.')
+            else:
+                raise error
+        elif isinstance(error, TransformationError):
+            if error.code == 2:
+                self.set_modal_text('Error',
+                                    'The polygon must have at least 3 points to be able to '
+                                    'modify the heights.')
+            elif error.code == 3:
+                self.set_modal_text('Error',
+                                    'The polygon is not planar. Try using a planar polygon.')
+            elif error.code == 4:
+                self.set_modal_text('Error',
+                                    'The current model is not supported to use to update the '
+                                    'height of the vertices, try using another type of '
+                                    'model.')
+            elif error.code == 6:
+                self.set_modal_text('Error',
+                                    'Polygon not selected or invalid in filter.')
+            elif error.code == 7:
+                self.set_modal_text('Error',
+                                    'Polygons used in filters must have at least 3 vertices.')
+            elif error.code == 8:
+                self.set_modal_text('Error',
+                                    'One of the polygons used in a filter is not simple/planar.')
+            elif error.code == 9:
+                self.set_modal_text('Error', 'The new minimum value is higher or equal to'
+                                             ' the maximum value.')
+            elif error.code == 10:
+                self.set_modal_text('Error', 'Model not selected.')
+            elif error.code == 11:
+                self.set_modal_text('Error', 'Polygon not selected.')
+            elif error.code == 12:
+                self.set_modal_text('Error', 'Model selected not found in the program.')
+            elif error.code == 13:
+                self.set_modal_text('Error', 'Polygon selected not found in the program.')
+            elif error.code == 14:
+                self.set_modal_text('Error', 'There are no polygons in the folder.')
+            elif error.code == 15:
+                self.set_modal_text('Error', 'All the polygons of the folder must have a numeric value in the '
+                                             'parameters with the new heights.')
+            else:
+                raise error
+        elif isinstance(error, TransformationJobError):
+            if error.code == 1:
+                self.set_modal_text('Error', 'The model is already being modified by another transformation.')
+            else:
+                raise error
+        else:
+            raise error
 
     @property
     def use_threads(self) -> bool:
@@ -247,24 +535,11 @@ class Engine:
 
             interpolation.initialize(self.scene)
             self.scene.apply_interpolation(interpolation,
-                                           lambda: self.program.set_loading(False))
+                                           lambda applied, error: self.__end_transformation_job(
+                                               error, self.__show_interpolation_error))
 
-        except InterpolationError as e:
-            if e.code == 1:
-                self.set_modal_text('Error', 'There is not enough points in the polygon to do'
-                                             ' the interpolation.')
-            elif e.code == 2:
-                self.set_modal_text('Error', 'Distance must be greater than 0 to do the '
-                                             'interpolation')
-            elif e.code == 3:
-                self.set_modal_text('Error', 'Model used for interpolation is not accepted by '
-                                             'the program.')
-            elif e.code == 4:
-                self.set_modal_text('Error', 'Model not selected.')
-            elif e.code == 5:
-                self.set_modal_text('Error', 'Polygon not selected.')
-            elif e.code == 6:
-                self.set_modal_text('Error', 'Polygon selected is not planar.')
+        except (InterpolationError, TransformationJobError) as e:
+            self.__show_interpolation_error(e)
 
     def apply_map_transformation(self, map_transformation: 'MapTransformation') -> None:
         """
@@ -277,18 +552,17 @@ class Engine:
         """
         try:
             map_transformation.initialize(self.scene)
-            self.set_task_with_loading_frame(lambda: self.scene.apply_map_transformation(map_transformation),
-                                             'Applying map transformation.')
 
-        except MapTransformationError as e:
-            if e.code == 0:
-                self.set_modal_text('Error', 'Model specified can not be None.')
-            elif e.code == 1:
-                self.set_modal_text('Error', 'Model specified not found in the program.')
-            elif e.code == 2:
-                self.set_modal_text('Error', 'One polygon used for the transformation is not planar.')
-            else:
-                raise e
+            # Apply the transformation in a different thread, the loading frame allows to cancel it
+            # -------------------------------------------------------------------------------------
+            self.program.set_loading(True)
+            self.gui_manager.set_loading_message('Applying map transformation.')
+            self.scene.apply_map_transformation(map_transformation,
+                                                lambda applied, error: self.__end_transformation_job(
+                                                    error, self.__show_map_transformation_error))
+
+        except (MapTransformationError, TransformationJobError) as e:
+            self.__show_map_transformation_error(e)
 
     def apply_transformation(self, transformation: 'Transformation') -> None:
         """
@@ -305,62 +579,16 @@ class Engine:
             # ----------------------------------------------------------------
             transformation.initialize(self.scene)
 
-            # Run the transformation in a different thread
-            # --------------------------------------------
-            self.set_task_with_loading_frame(lambda: self.scene.apply_transformation(transformation),
-                                             'Applying transformation.')
+            # Run the transformation in a different thread, the loading frame allows to cancel it
+            # -----------------------------------------------------------------------------------
+            self.program.set_loading(True)
+            self.gui_manager.set_loading_message('Applying transformation.')
+            self.scene.apply_transformation(transformation,
+                                            lambda applied, error: self.__end_transformation_job(
+                                                error, self.__show_transformation_error))
 
-        except FilterError as e:
-            if e.code == 0:
-                self.set_modal_text('Error',
-                                    'Polygon in filter can not be None.')
-            elif e.code == 1:
-                self.set_modal_text('Error',
-                                    'Polygons used in filters must have at least 3 vertices.')
-            elif e.code == 2:
-                self.set_modal_text('Error',
-                                    'One of the polygons used in a filter is not simple/planar.')
-            elif e.code == 3:
-                self.set_modal_text('Error',
-                                    'Polygon not selected or invalid in filter.')
-            else:
-                raise e
-
-        except TransformationError as e:
-            if e.code == 2:
-                self.set_modal_text('Error',
-                                    'The polygon must have at least 3 points to be able to '
-                                    'modify the heights.')
-            elif e.code == 3:
-                self.set_modal_text('Error',
-                                    'The polygon is not planar. Try using a planar polygon.')
-            elif e.code == 4:
-                self.set_modal_text('Error',
-                                    'The current model is not supported to use to update the '
-                                    'height of the vertices, try using another type of '
-                                    'model.')
-            elif e.code == 6:
-                self.set_modal_text('Error',
-                                    'Polygon not selected or invalid in filter.')
-            elif e.code == 7:
-                self.set_modal_text('Error',
-                                    'Polygons used in filters must have at least 3 vertices.')
-            elif e.code == 8:
-                self.set_modal_text('Error',
-                                    'One of the polygons used in a filter is not simple/planar.')
-            elif e.code == 9:
-                self.set_modal_text('Error', 'The new minimum value is higher or equal to'
-                                             ' the maximum value.')
-            elif e.code == 10:
-                self.set_modal_text('Error', 'Model not selected.')
-            elif e.code == 11:
-                self.set_modal_text('Error', 'Polygon not selected.')
-            elif e.code == 12:
-                self.set_modal_text('Error', 'Model selected not found in the program.')
-            elif e.code == 13:
-                self.set_modal_text('Error', 'Polygon selected not found in the program.')
-            else:
-                raise e
+        except (FilterError, TransformationError, TransformationJobError) as e:
+            self.__show_transformation_error(e)
 
     def are_frames_fixed(self) -> bool:
         """
@@ -440,6 +668,17 @@ class Engine:
         self.set_task_with_loading_frame(lambda: asynchronous_task(return_data),
                                          'Calculating heights...')
 
+    def cancel_transformation(self) -> None:
+        """
+        Cancel the transformations that are being applied.
+
+        The models keep the heights that they had before applying the transformations.
+
+        Returns: None
+        """
+        log.debug('Cancelling transformations.')
+        self.scene.cancel_transformation_jobs()
+
     def change_3D_model_height_unit(self, model_id: str, measure_unit: str) -> None:
         """
         Ask the scene to change the measure unit of the specified model.
@@ -643,8 +882,10 @@ class Engine:
             self.program.set_loading(False)
 
             if self.program.get_view_mode() == ViewMode.mode_3d:
-                self.set_task_with_loading_frame(
-                    lambda: self.scene.create_3D_model_if_not_exists(self.program.get_active_model()))
+                self.program.set_loading(True)
+                self.gui_manager.set_loading_message('Generating 3D model...')
+                self.scene.create_3D_model_if_not_exists(self.program.get_active_model(),
+                                                         lambda: self.program.set_loading(False))
 
             # Create temporary file with the information of the model
             # -------------------------------------------------------
@@ -828,6 +1069,19 @@ class Engine:
         self.set_task_with_loading_frame(load_preview_logic,
                                          'Loading preview, this may take a while.')
 
+    def create_shared_array(self, array: 'np.ndarray') -> SharedArray:
+        """
+        Copy the array to a block of shared memory that can be given to the process tasks without copying it.
+
+        The array must be released with the method release_shared_array when it is not needed anymore.
+
+        Args:
+            array: Array to copy.
+
+        Returns: Shared array with the values of the array.
+        """
+        return self.__process_manager.create_shared_array(array)
+
     def exit(self):
         """
         Terminate the process in charge of rendering the windows and the scene, closing the windows and returning the
@@ -838,9 +1092,55 @@ class Engine:
 
         Returns: None
         """
+        # Stop the threads and processes used to execute the parallel tasks
+        self.__thread_manager.shutdown()
+        self.__process_manager.shutdown()
+
         # Terminate process external to the engine, returning the resources to the OS.
         glfw.terminate()
 
+        # The shader programs compiled are deleted with the context of OpenGL
+        ShaderCache.clear()
+
+        # Delete the temporary files used to store the modifications of the maps
+        self.scene.clear_height_history()
+
+    def export_frame_trace(self, directory_file: str = None) -> None:
+        """
+        Export the time used by the parts of the last frames measured by the frame profiler to a json file.
+
+        The file can be opened with chrome://tracing.
+
+        Args:
+            directory_file: Directory and filename to use to store the file. If not selected, then a popup is opened.
+
+        Returns: None
+        """
+        if FrameProfiler.get_number_of_frames() == 0:
+            self.set_modal_text('Error', 'There are no frames measured. Enable the profiler first.')
+            return
+
+        try:
+            if directory_file is None:
+                directory_file = self.program.open_file_save_box_dialog(
+                    'Select a directory and filename for the trace file.',
+                    'Relief Creator',
+                    'frame_trace')
+        except ValueError:
+            self.set_modal_text('Error', 'Trace not exported.')
+            return
+
+        if directory_file[-5:] != '.json':
+            directory_file += '.json'
+
+        try:
+            FrameProfiler.export_chrome_trace(directory_file)
+        except OSError:
+            self.set_modal_text('Error', 'Could not write the trace file.')
+            return
+
+        self.set_modal_text('Information', 'Trace exported successfully')
+
     def export_model_as_netcdf(self, model_id: str, directory_file: str = None) -> None:
         """
         Save the information of a model in a netcdf file.
@@ -986,6 +1286,40 @@ class Engine:
 
         self.set_modal_text('Information', 'Polygon exported successfully')
 
+    def export_task_telemetry(self, directory_file: str = None) -> None:
+        """
+        Export the records of the last jobs executed in the background to a file, one record per line in JSON format.
+
+        Args:
+            directory_file: Directory and filename to use to store the file. If not selected, then a popup is opened.
+
+        Returns: None
+        """
+        if len(TaskTelemetry.get_records()) == 0:
+            self.set_modal_text('Error', 'There are no jobs recorded. Enable the task telemetry first.')
+            return
+
+        try:
+            if directory_file is None:
+                directory_file = self.program.open_file_save_box_dialog(
+                    'Select a directory and filename for the telemetry file.',
+                    'Relief Creator',
+                    'task_telemetry')
+        except ValueError:
+            self.set_modal_text('Error', 'Telemetry not exported.')
+            return
+
+        if directory_file[-6:] != '.jsonl':
+            directory_file += '.jsonl'
+
+        try:
+            TaskTelemetry.export_jsonl(directory_file)
+        except OSError:
+            self.set_modal_text('Error', 'Could not write the telemetry file.')
+            return
+
+        self.set_modal_text('Information', 'Telemetry exported successfully')
+
     def fix_frames(self, fix: bool) -> None:
         """
         Fixes/unfix the frames in the application.
@@ -1028,6 +1362,18 @@ class Engine:
         """
         return self.program.get_active_tool()
 
+    def get_batch_transformation_settings(self) -> dict:
+        """
+        Get the settings related to the transformations applied over all the polygons of a folder.
+
+        Returns: Dictionary with the settings of the transformations.
+        """
+        return {
+            'BATCH_TRANSFORMATION_MIN_HEIGHT_PARAMETER': Settings.BATCH_TRANSFORMATION_MIN_HEIGHT_PARAMETER,
+            'BATCH_TRANSFORMATION_MAX_HEIGHT_PARAMETER': Settings.BATCH_TRANSFORMATION_MAX_HEIGHT_PARAMETER,
+            'BATCH_TRANSFORMATION_MAX_THREADS': Settings.BATCH_TRANSFORMATION_MAX_THREADS
+        }
+
     def get_camera_data(self) -> dict:
         """
         Ask the scene for the camera data.
@@ -1118,6 +1464,17 @@ class Engine:
             'MAIN_MENU_BAR_HEIGHT': Settings.MAIN_MENU_BAR_HEIGHT
         }
 
+    def get_height_history_settings(self) -> dict:
+        """
+        Get the settings related to the history of modifications of the heights of the maps.
+
+        Returns: Dictionary with the settings of the history.
+        """
+        return {
+            'HEIGHT_HISTORY_MEMORY_BUDGET': Settings.HEIGHT_HISTORY_MEMORY_BUDGET,
+            'HEIGHT_HISTORY_MAX_ENTRIES': Settings.HEIGHT_HISTORY_MAX_ENTRIES
+        }
+
     def get_height_normalization_factor_of_active_3D_model(self) -> float:
         """
         Ask the scene for the normalization factor being used by the active 3D model.
@@ -1142,6 +1499,34 @@ class Engine:
         """
         return self.scene.hidden_models
 
+    def get_main_thread_scheduler_data(self) -> dict:
+        """
+        Get the data of the work executed in the main thread, used for debugging.
+
+        Returns: Dictionary with the time budget of the frames, the time used and the slices of work executed in the
+                 last frame and the number of works pending.
+        """
+        return {
+            'TIME_BUDGET': self.__main_thread_scheduler.get_time_budget(),
+            'LAST_FRAME_TIME': self.__main_thread_scheduler.get_last_frame_time(),
+            'LAST_FRAME_SLICES': self.__main_thread_scheduler.get_last_frame_slices(),
+            'PENDING_WORK': self.__main_thread_scheduler.get_number_of_pending_work()
+        }
+
+    # noinspection PyMethodMayBeStatic
+    def get_frame_profiler_data(self) -> dict:
+        """
+        Get the statistics of the time used by the parts of the frames, used for debugging.
+
+        Returns: Dictionary with the state of the profiler, the number of frames measured and the statistics (in
+                 milliseconds) of every part of the frames.
+        """
+        return {
+            'ENABLED': FrameProfiler.is_enabled(),
+            'FRAMES': FrameProfiler.get_number_of_frames(),
+            'STATISTICS': FrameProfiler.get_statistics()
+        }
+
     def get_map_coordinates_from_window_coordinates(self, x_coordinate: int, y_coordinate: int) -> (float, float):
         """
         Get the position of a point in the map given in screen coordinates.
@@ -1190,6 +1575,41 @@ class Engine:
         """
         return self.program.get_map_position()
 
+    def get_map_2d_render_mode(self) -> 'Map2DRenderMode':
+        """
+        Get the mode used to render the maps in 2D.
+
+        Returns: Render mode used by the maps.
+        """
+        return self.scene.get_map_2d_render_mode()
+
+    def get_map_tiles_settings(self) -> dict:
+        """
+        Get the settings related to the tiles used to render the maps in 2D.
+
+        Returns: Dictionary with the settings of the tiles.
+        """
+        return {
+            'MAP_TILE_SIZE': Settings.MAP_TILE_SIZE,
+            'MAP_TILES_GPU_MEMORY_BUDGET': Settings.MAP_TILES_GPU_MEMORY_BUDGET,
+            'MAP_TILES_USE_TRIANGLE_STRIPS': Settings.MAP_TILES_USE_TRIANGLE_STRIPS,
+            'MAP_TILES_REFRESH_DELAY': Settings.MAP_TILES_REFRESH_DELAY,
+            'MAP_TILES_UPLOAD_CHUNK_SIZE': Settings.MAP_TILES_UPLOAD_CHUNK_SIZE
+        }
+
+    def get_memory_usage_data(self) -> dict:
+        """
+        Get the memory used by the models of the scene in the CPU and in the GPU, used for debugging.
+
+        Returns: Dictionary with the list of models (each one with the keys NAME, TYPE, CPU and GPU), the total of
+                 bytes used in the CPU and the GPU and the thresholds (in bytes) used to show warnings.
+        """
+        return {
+            **self.scene.get_memory_usage(),
+            'MODEL_WARNING': Settings.MEMORY_WARNING_MODEL,
+            'TOTAL_WARNING': Settings.MEMORY_WARNING_TOTAL
+        }
+
     def get_model_information(self, model_id: str) -> dict:
         """
         Get the information of a model in a dictionary.
@@ -1293,7 +1713,8 @@ class Engine:
             "QUALITY": Settings.QUALITY,
             "DOT_SIZE": Settings.DOT_SIZE,
             "POLYGON_DOT_SIZE": Settings.POLYGON_DOT_SIZE,
-            "ACTIVE_POLYGON_LINE_WIDTH": Settings.ACTIVE_POLYGON_LINE_WIDTH
+            "ACTIVE_POLYGON_LINE_WIDTH": Settings.ACTIVE_POLYGON_LINE_WIDTH,
+            "POLYGON_SIMPLIFICATION_TOLERANCE": Settings.POLYGON_SIMPLIFICATION_TOLERANCE
         }
 
     def get_scene_setting_data(self) -> dict:
@@ -1307,6 +1728,37 @@ class Engine:
             'SCENE_WIDTH_X': Settings.SCENE_WIDTH_X, 'SCENE_HEIGHT_Y': Settings.SCENE_HEIGHT_Y
         }
 
+    # noinspection PyMethodMayBeStatic
+    def get_task_telemetry_data(self) -> dict:
+        """
+        Get the records of the last jobs executed in the background, used for debugging.
+
+        Returns: Dictionary with the state of the telemetry and the list of records (from the oldest to the newest).
+        """
+        return {
+            'ENABLED': TaskTelemetry.is_enabled(),
+            'RECORDS': TaskTelemetry.get_records()
+        }
+
+    def get_terrain_lod_settings(self) -> dict:
+        """
+        Get the settings related to the chunks used to render the maps in 3D.
+
+        Returns: Dictionary with the settings of the chunks.
+        """
+        return {
+            'TERRAIN_CHUNK_SIZE': Settings.TERRAIN_CHUNK_SIZE,
+            'TERRAIN_MAX_SCREEN_ERROR': Settings.TERRAIN_MAX_SCREEN_ERROR
+        }
+
+    def get_transformation_progress(self) -> Union[float, None]:
+        """
+        Get the progress of the transformations that are being applied.
+
+        Returns: Number between 0 and 1 with the progress. None if there is no transformations being applied.
+        """
+        return self.scene.get_transformation_progress()
+
     def get_window_setting_data(self) -> dict:
         """
         Get the window setting data.
@@ -1453,8 +1905,9 @@ class Engine:
         """
         Call the scene to optimize the GPU memory.
 
-        Optimize the memory regenerating the indices for the current points of the map being showed on the application.
-        This method only works when the application is in 2D mode.
+        Optimize the memory deleting the tiles of the maps that were not used for the longest time until the memory
+        used by them is under the budget defined in the settings. This method only works when the application is in 2D
+        mode.
 
         Make an asynchronous call, setting the loading screen.
 
@@ -1462,7 +1915,7 @@ class Engine:
         """
         log.debug("Optimizing gpu memory")
         self.program.set_loading(True)
-        self.gui_manager.set_loading_message("Deleting triangles from the memory")
+        self.gui_manager.set_loading_message("Deleting tiles from the memory")
 
         # noinspection PyMissingOrEmptyDocstring
         def then_routine():
@@ -1485,16 +1938,42 @@ class Engine:
         """
         return read_info(filename)
 
+    def redo_action(self) -> None:
+        """
+        Redo the most recent modification of the heights of the maps that was undone.
+
+        Returns: None
+        """
+        log.debug('Redoing modification of the heights.')
+        try:
+            self.scene.redo_height_modification()
+        except TransformationJobError as e:
+            if e.code == 1:
+                self.set_modal_text('Error', 'The model is being modified by a transformation.')
+            else:
+                raise e
+
+    def release_shared_array(self, shared_array: SharedArray) -> None:
+        """
+        Release the block of shared memory used by a shared array created by the engine.
+
+        Args:
+            shared_array: Shared array to release.
+
+        Returns: None
+        """
+        self.__process_manager.release_shared_array(shared_array)
+
     def reload_models(self) -> None:
         """
         Ask the Scene to reload the models to better the definitions.
 
-        This method recalculate the indices array used on the maps in the 2D mode to generate the triangles on the
-        model that will be rendered. The new indices are generated so they only generate just the sufficient amount of
-        triangles to fill the scene on the current level of zoom.
+        This method load the tiles used on the maps in the 2D mode to fill the scene on the current level of zoom with
+        the quality defined in the settings. The maps already load the tiles needed when the scene is moved or
+        zoomed, so this method is only needed to force the reload after changing the quality.
 
-        After the process, the old indices that were in the same position than the new triangles will be deleted
-        using the method optimize_gpu_memory.
+        After the process, the tiles that exceed the memory budget will be deleted using the method
+        optimize_gpu_memory.
 
         NOTE:
             This method will create a loading frame on the application while the models are being reloaded.
@@ -1515,6 +1994,17 @@ class Engine:
 
         self.scene.reload_models_async(Settings.QUALITY, then_routine)
 
+    def reload_shaders(self) -> None:
+        """
+        Compile again the shader programs whose files were modified since they were compiled.
+
+        The models take their programs from the ShaderCache, so the new programs are used from the next frame.
+
+        Returns: None
+        """
+        programs_reloaded = ShaderCache.reload()
+        log.debug(f'Shader programs reloaded: {programs_reloaded}')
+
     def remove_interpolation_preview(self, polygon_id: str) -> None:
         """
         Ask the scene to remove the interpolation area of the specified polygon.
@@ -1566,6 +2056,21 @@ class Engine:
         """
         self.scene.remove_polygon_by_id(polygon_id)
 
+    def request_redraw(self, frames: int = None) -> None:
+        """
+        Ask for the render of new frames when using the on demand rendering.
+
+        More than one frame is rendered by default, since the GUI needs some frames to show the effects of the inputs.
+
+        Args:
+            frames: Number of frames to render. None to use the number defined in the settings.
+
+        Returns: None
+        """
+        if frames is None:
+            frames = Settings.ON_DEMAND_RENDERING_EXTRA_FRAMES
+        self.__redraw_frames = max(self.__redraw_frames, frames)
+
     def reset_camera_values(self) -> None:
         """
         Ask the scene to reset the values of the camera.
@@ -1613,31 +2118,11 @@ class Engine:
                 if glfw.window_should_close(self.window):
                     break
 
-                self.__task_manager.update_tasks()
-                self.__thread_manager.update_threads()
-                self.__process_manager.update_process()
-                self.render.on_loop([lambda: self.gui_manager.process_input(),
-                                     lambda: self.scene.draw(
-                                         self.program.get_active_model(),
-                                         self.program.get_active_polygon_id(),
-                                         self.program.get_view_mode()
-                                     ),
-                                     lambda: self.gui_manager.draw_frames(),
-                                     lambda: self.gui_manager.render()])
+                self.__run_iteration(on_demand=False)
 
         else:
             while not glfw.window_should_close(self.window):
-                self.__task_manager.update_tasks()
-                self.__thread_manager.update_threads()
-                self.__process_manager.update_process()
-                self.render.on_loop([lambda: self.gui_manager.process_input(),
-                                     lambda: self.scene.draw(
-                                         self.program.get_active_model(),
-                                         self.program.get_active_polygon_id(),
-                                         self.program.get_view_mode()
-                                     ),
-                                     lambda: self.gui_manager.draw_frames(),
-                                     lambda: self.gui_manager.render()])
+                self.__run_iteration(on_demand=Settings.ON_DEMAND_RENDERING)
 
         # Terminate the process if the app ended the process.
         if terminate_process:
@@ -1696,6 +2181,46 @@ class Engine:
         """
         self.controller.set_keyboard_callback(new_state)
 
+    # noinspection PyMethodMayBeStatic
+    def set_frame_profiler_enabled(self, enabled: bool) -> None:
+        """
+        Enable or disable the measure of the time used by the parts of the frames.
+
+        Args:
+            enabled: If measure the frames or not.
+
+        Returns: None
+        """
+        FrameProfiler.set_enabled(enabled)
+
+    def set_main_thread_work(self, work: Callable) -> None:
+        """
+        Add a work to execute in the main thread without exceeding the time budget of the frames.
+
+        If the work returns a generator, then the generator is executed in slices in the next frames. The work is
+        executed completely before returning if the engine does not use threads.
+
+        Args:
+            work: Function without arguments to execute.
+
+        Returns: None
+        """
+        if self.__use_threads:
+            self.__main_thread_scheduler.set_work(work)
+        else:
+            complete_work(work())
+
+    def set_map_2d_render_mode(self, render_mode: 'Map2DRenderMode') -> None:
+        """
+        Call the scene to change the mode used to render the maps in 2D.
+
+        Args:
+            render_mode: Render mode to use.
+
+        Returns: None
+        """
+        self.scene.set_map_2d_render_mode(render_mode)
+
     def set_modal_text(self, title_modal, msg) -> None:
         """
         Set a modal in the program.
@@ -1760,7 +2285,8 @@ class Engine:
         Args:
             parallel_task: Task to execute in another process.
             then_task: Task to execute after the process. (the return object from the parallel task will be passed as
-                       first parameter to this function)
+                       first parameter to this function, if the object is a shared array created by the engine, then
+                       the numpy array stored in the shared memory is passed instead of a copy)
             parallel_task_args: Arguments to give to the parallel task.
             then_task_args: Arguments to give to the then task.
 
@@ -1795,13 +2321,27 @@ class Engine:
             self.program.set_view_mode_3D()
             self.render.enable_depth_buffer(True)
 
-            self.set_task_with_loading_frame(
-                lambda: self.scene.create_3D_model_if_not_exists(self.program.get_active_model()),
-                'Generating 3D model...')
+            # The 3D model is generated in another thread, the loading frame is showed until the model is ready
+            self.program.set_loading(True)
+            self.gui_manager.set_loading_message('Generating 3D model...')
+            self.scene.create_3D_model_if_not_exists(self.program.get_active_model(),
+                                                     lambda: self.program.set_loading(False))
 
         else:
             raise ValueError(f'Can not change program view mode to {mode}.')
 
+    # noinspection PyMethodMayBeStatic
+    def set_task_telemetry_enabled(self, enabled: bool) -> None:
+        """
+        Enable or disable the records of the times of the jobs executed in the background.
+
+        Args:
+            enabled: If record the jobs or not.
+
+        Returns: None
+        """
+        TaskTelemetry.set_enabled(enabled)
+
     def set_task_with_loading_frame(self, task: callable, message: Union[str, None] = None) -> None:
         """
         Set a task to be executed at the end of the next frame. Also configures the loading setting of
@@ -1826,58 +2366,97 @@ class Engine:
                 task()
                 self.program.set_loading(False)
 
-            self.__task_manager.set_task(task_loading, 3)
+            self.__task_manager.set_task(task_loading, 3, 'loading', getattr(task, '__qualname__', None))
 
         else:
             task()
 
-    def set_thread_task(self, parallel_task, then, parallel_task_args=None, then_task_args=None) -> None:
+    def set_thread_task(self,
+                        parallel_task,
+                        then,
+                        parallel_task_args=None,
+                        then_task_args=None,
+                        priority: ThreadTaskPriority = ThreadTaskPriority.interactive,
+                        key: Hashable = None,
+                        token: CancellationToken = None) -> CancellationToken:
         """
-        Add and start a new thread with the current task. At the end of the thread, the then
+        Add a new task to execute in another thread. At the end of the task, the then
         function is called.
 
         If the parallel task return something other than None, then the object returned is given as the first
         parameter to the then task.
 
+        The tasks are executed by a fixed number of threads in order of priority. Adding a task with the same key of a
+        task that did not finish cancels the old task, and the then function of the cancelled tasks is never called.
+
         Args:
             then_task_args: List of argument to use in the then task
             parallel_task_args: List of argument to use in the parallel task
             parallel_task: Task to be executed in parallel
             then: Task to be executed in the main thread after the parallel task
+            priority: Priority of the task.
+            key: Key used to cancel the older tasks with the same key. None to not cancel tasks.
+            token: Token to use to cancel the task. A new token is created if not specified.
 
-        Returns: None
+        Returns: Token that can be used to cancel the task.
         """
         if self.__use_threads:
-            self.__thread_manager.set_thread_task(parallel_task, then, parallel_task_args, then_task_args)
+            return self.__thread_manager.set_thread_task(parallel_task,
+                                                         then,
+                                                         parallel_task_args,
+                                                         then_task_args,
+                                                         priority,
+                                                         key,
+                                                         token)
         else:
 
             if parallel_task_args is None:
                 parallel_task_args = []
             if then_task_args is None:
                 then_task_args = []
+            if token is None:
+                token = CancellationToken()
+
+            record = TaskTelemetry.create_record('thread', parallel_task)
+            ret_val = TaskTelemetry.run_task(record, parallel_task, parallel_task_args)
+            if token.is_cancelled():
+                TaskTelemetry.finish_record(record, 'cancelled')
+                return token
 
-            ret_val = parallel_task(*parallel_task_args)
             if ret_val is not None:
-                then(ret_val, *then_task_args)
+                complete_work(TaskTelemetry.run_then(record, then, [ret_val, *then_task_args]))
             else:
-                then(*then_task_args)
+                complete_work(TaskTelemetry.run_then(record, then, then_task_args))
+
+            return token
 
     def undo_action(self) -> None:
         """
         Undo the most recent action made in the program.
 
-        The logic executed depends on the active tool of the program.
+        The logic executed depends on the active tool of the program. When creating polygons, the last point added to
+        the active polygon is removed, otherwise, the last modification of the heights of the maps is undone.
 
         Returns: None
         """
         active_tool = self.get_active_tool()
 
-        if active_tool == Tools.create_polygon:
+        if active_tool == Tools.create_polygon and self.get_active_polygon_id() is not None:
             log.debug('Undoing actions for tool create_polygon.')
 
-            # Ask for the active polygon and call the scene to remove the last added point
-            if self.get_active_polygon_id() is not None:
-                self.scene.remove_last_point_from_active_polygon()
+            # Call the scene to remove the last added point of the active polygon
+            self.scene.remove_last_point_from_active_polygon()
+            return
+
+        # Undo the last modification of the heights of the maps
+        log.debug('Undoing modification of the heights.')
+        try:
+            self.scene.undo_height_modification()
+        except TransformationJobError as e:
+            if e.code == 1:
+                self.set_modal_text('Error', 'The model is being modified by a transformation.')
+            else:
+                raise e
 
     def update_current_3D_model(self) -> None:
         """
@@ -1885,10 +2464,14 @@ class Engine:
 
         A frame with the loading message is displayed while the process is executed.
 
+        IMPORTANT:
+            This method is asynchronous, the data of the model is generated in another thread.
+
         Returns: None
         """
-        self.set_task_with_loading_frame(lambda: self.scene.update_3D_model(self.program.get_active_model()),
-                                         'Getting data from the map 2D...')
+        self.program.set_loading(True)
+        self.gui_manager.set_loading_message('Getting data from the map 2D...')
+        self.scene.update_3D_model(self.program.get_active_model(), lambda: self.program.set_loading(False))
 
     def update_scene_models_colors(self):
         """
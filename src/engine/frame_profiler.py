@@ -0,0 +1,280 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+File with the class FrameProfiler, static class used to measure the time used by the different parts of the frames
+of the program.
+
+The parts of the frames are measured using scopes:
+
+    with FrameProfiler.scope('scene_draw'):
+        ...
+
+The profiler is disabled by default, and the scopes do nothing when disabled.
+"""
+import json
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Deque, Dict, List, Tuple, Union
+
+import numpy as np
+
+from src.utils import get_logger
+
+log = get_logger(module='FRAME_PROFILER')
+
+# Event measured by the profiler: (name, start in seconds, duration in seconds, thread identifier)
+ProfilerEvent = Tuple[str, float, float, int]
+
+# Scope returned when the profiler is disabled
+_DISABLED_SCOPE = nullcontext()
+
+
+class ProfilerScope:
+    """
+    Class used to measure the time used by a block of code, adding the time measured to the profiler when the block
+    ends.
+    """
+
+    __slots__ = ('__name', '__start')
+
+    def __init__(self, name: str):
+        """
+        Constructor of the class.
+
+        Args:
+            name: Name of the block of code.
+        """
+        self.__name = name
+        self.__start = 0.0
+
+    def __enter__(self) -> 'ProfilerScope':
+        """
+        Start measuring the time.
+
+        Returns: The scope.
+        """
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """
+        Stop measuring the time and add the time measured to the profiler.
+
+        Returns: None
+        """
+        FrameProfiler.add_event(self.__name, self.__start, time.perf_counter() - self.__start)
+
+
+class FrameProfiler:
+    """
+    Static class that store the time used by the named parts of the frames.
+
+    For every name, the total time used in each frame is stored in a ring buffer with the last frames, used to
+    calculate the percentiles of the time used. The events of the last frames are also stored so they can be exported
+    as a trace that can be opened with chrome://tracing.
+    """
+
+    __enabled: bool = False
+    __history_size: int = 240
+
+    __origin: float = time.perf_counter()  # time used as zero in the traces
+    __frame_start: Union[float, None] = None
+    __frame_events: List[ProfilerEvent] = []
+
+    __frames: Deque[List[ProfilerEvent]] = deque(maxlen=240)  # events of the last frames
+    __durations: Dict[str, Deque[float]] = {}  # time used in the last frames by every name
+
+    @staticmethod
+    def add_event(name: str, start: float, duration: float) -> None:
+        """
+        Add a measured event to the current frame.
+
+        Args:
+            name: Name of the event.
+            start: Time (of the performance counter) when the event started.
+            duration: Seconds that the event lasted.
+
+        Returns: None
+        """
+        if not FrameProfiler.__enabled:
+            return
+        FrameProfiler.__frame_events.append((name, start, duration, threading.get_ident()))
+
+    @staticmethod
+    def begin_frame() -> None:
+        """
+        Start measuring a new frame.
+
+        Returns: None
+        """
+        if not FrameProfiler.__enabled:
+            return
+        FrameProfiler.__frame_start = time.perf_counter()
+        FrameProfiler.__frame_events = []
+
+    @staticmethod
+    def clear() -> None:
+        """
+        Delete the frames measured.
+
+        Returns: None
+        """
+        FrameProfiler.__frame_start = None
+        FrameProfiler.__frame_events = []
+        FrameProfiler.__frames = deque(maxlen=FrameProfiler.__history_size)
+        FrameProfiler.__durations = {}
+
+    @staticmethod
+    def end_frame() -> None:
+        """
+        End the measure of the current frame, storing the time used by every name in the frame.
+
+        The whole frame is stored with the name 'frame'.
+
+        Returns: None
+        """
+        if not FrameProfiler.__enabled or FrameProfiler.__frame_start is None:
+            return
+
+        frame_events = FrameProfiler.__frame_events
+        frame_events.append(('frame',
+                             FrameProfiler.__frame_start,
+                             time.perf_counter() - FrameProfiler.__frame_start,
+                             threading.get_ident()))
+
+        frame_durations: Dict[str, float] = {}
+        for name, _, duration, _ in frame_events:
+            frame_durations[name] = frame_durations.get(name, 0.0) + duration
+
+        for name, duration in frame_durations.items():
+            if name not in FrameProfiler.__durations:
+                FrameProfiler.__durations[name] = deque(maxlen=FrameProfiler.__history_size)
+            FrameProfiler.__durations[name].append(duration)
+
+        FrameProfiler.__frames.append(frame_events)
+        FrameProfiler.__frame_start = None
+        FrameProfiler.__frame_events = []
+
+    @staticmethod
+    def export_chrome_trace(filename: str) -> int:
+        """
+        Export the events of the frames stored as a trace in the format used by chrome://tracing.
+
+        Args:
+            filename: Name of the file to create.
+
+        Returns: Number of events exported.
+        """
+        process_id = 1
+        trace_events = []
+        for frame_events in FrameProfiler.__frames:
+            for name, start, duration, thread_id in frame_events:
+                trace_events.append({
+                    'name': name,
+                    'cat': 'frame',
+                    'ph': 'X',
+                    'ts': (start - FrameProfiler.__origin) * 1e6,
+                    'dur': duration * 1e6,
+                    'pid': process_id,
+                    'tid': thread_id
+                })
+
+        with open(filename, 'w') as file:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, file)
+
+        log.debug(f'Exported {len(trace_events)} events to {filename}')
+        return len(trace_events)
+
+    @staticmethod
+    def get_number_of_frames() -> int:
+        """
+        Get the number of frames stored.
+
+        Returns: Number of frames.
+        """
+        return len(FrameProfiler.__frames)
+
+    @staticmethod
+    def get_statistics() -> Dict[str, Dict[str, float]]:
+        """
+        Get the statistics of the time used by every name in the frames stored.
+
+        The statistics are given in milliseconds, in a dictionary with the keys LAST, P50, P95 and P99.
+
+        Returns: Dictionary with the statistics of every name.
+        """
+        statistics = {}
+        for name, durations in FrameProfiler.__durations.items():
+            durations_ms = np.array(durations) * 1000
+            p50, p95, p99 = np.percentile(durations_ms, [50, 95, 99])
+            statistics[name] = {
+                'LAST': float(durations_ms[-1]),
+                'P50': float(p50),
+                'P95': float(p95),
+                'P99': float(p99)
+            }
+        return statistics
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """
+        Check if the profiler is measuring the frames.
+
+        Returns: Boolean indicating if the profiler is enabled.
+        """
+        return FrameProfiler.__enabled
+
+    @staticmethod
+    def scope(name: str, detail: Union[str, None] = None):
+        """
+        Get a context manager that measures the time used by the block of code inside it.
+
+        If the profiler is disabled, then a context manager that does nothing is returned.
+
+        Args:
+            name: Name of the block of code.
+            detail: Text added to the name, used to measure the same code with different objects (like the models
+                    drawn).
+
+        Returns: Context manager to use with the statement with.
+        """
+        if not FrameProfiler.__enabled:
+            return _DISABLED_SCOPE
+        return ProfilerScope(name if detail is None else f'{name} {detail}')
+
+    @staticmethod
+    def set_enabled(enabled: bool, history_size: Union[int, None] = None) -> None:
+        """
+        Enable or disable the profiler.
+
+        The frames stored are deleted when the profiler is enabled.
+
+        Args:
+            enabled: If measure the frames or not.
+            history_size: Number of frames to store. None to keep the actual number.
+
+        Returns: None
+        """
+        if history_size is not None:
+            FrameProfiler.__history_size = max(int(history_size), 1)
+
+        if enabled and not FrameProfiler.__enabled:
+            FrameProfiler.clear()
+        FrameProfiler.__enabled = enabled
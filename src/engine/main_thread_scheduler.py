@@ -0,0 +1,167 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+File with the class MainThreadScheduler, class in charge of executing the work that must be done in the main thread
+(like sending data to the GPU) without exceeding a time budget in every frame.
+
+The work is given as functions. If a function returns a generator, then the generator is executed in slices, one
+slice every time that the generator yields, so big works can be split between several frames.
+"""
+import time
+from collections import deque
+from types import GeneratorType
+
+from src.utils import get_logger
+
+log = get_logger(module='MAIN_THREAD_SCHEDULER')
+
+
+def complete_work(work_result) -> None:
+    """
+    Execute all the slices of the work if the work returned a generator.
+
+    Used to execute the works when there is no scheduler to split them between frames.
+
+    Args:
+        work_result: Value returned by the function of the work.
+
+    Returns: None
+    """
+    if isinstance(work_result, GeneratorType):
+        for _ in work_result:
+            pass
+
+
+class MainThreadScheduler:
+    """
+    Class in charge of executing the work of the main thread in slices, without exceeding the time budget of the
+    frames.
+
+    The works are executed in the order in which they were added. At least one slice of work is executed in every
+    frame, so the works always progress even if a slice takes more time than the budget.
+    """
+
+    def __init__(self, time_budget: float):
+        """
+        Constructor of the class.
+
+        Args:
+            time_budget: Seconds that can be used to execute the works in every frame.
+        """
+        self.__time_budget = time_budget
+        self.__pending_work = deque()
+
+        # Data of the last frame, used for debugging
+        # ------------------------------------------
+        self.__last_frame_time = 0.0
+        self.__last_frame_slices = 0
+
+    def __run_slice(self) -> None:
+        """
+        Execute the next slice of the first work of the queue.
+
+        Works that return a generator are kept in the queue until the generator is exhausted.
+
+        Returns: None
+        """
+        work = self.__pending_work[0]
+
+        if isinstance(work, GeneratorType):
+            try:
+                next(work)
+            except StopIteration:
+                self.__pending_work.popleft()
+            except Exception:
+                self.__pending_work.popleft()
+                raise
+            return
+
+        # Execute the first slice of the works that return a generator
+        self.__pending_work.popleft()
+        work_result = work()
+        if isinstance(work_result, GeneratorType):
+            self.__pending_work.appendleft(work_result)
+            self.__run_slice()
+
+    def get_last_frame_slices(self) -> int:
+        """
+        Get the number of slices of work executed in the last frame.
+
+        Returns: Number of slices.
+        """
+        return self.__last_frame_slices
+
+    def get_last_frame_time(self) -> float:
+        """
+        Get the seconds used to execute the works in the last frame.
+
+        Returns: Seconds used.
+        """
+        return self.__last_frame_time
+
+    def get_number_of_pending_work(self) -> int:
+        """
+        Get the number of works waiting to be executed (or to finish their execution).
+
+        Returns: Number of works.
+        """
+        return len(self.__pending_work)
+
+    def get_time_budget(self) -> float:
+        """
+        Get the seconds that can be used to execute the works in every frame.
+
+        Returns: Seconds of the budget.
+        """
+        return self.__time_budget
+
+    def set_work(self, work: callable) -> None:
+        """
+        Add a new work to execute in the next frames.
+
+        Args:
+            work: Function without arguments to execute. If the function returns a generator, then the generator is
+                  executed in slices.
+
+        Returns: None
+        """
+        self.__pending_work.append(work)
+
+    def update(self) -> None:
+        """
+        Method that must be called on each frame of the application.
+
+        Execute slices of the pending works until the time budget of the frame is used or there is no more work.
+
+        Returns: None
+        """
+        start_time = time.perf_counter()
+        slices = 0
+
+        while len(self.__pending_work) > 0:
+            self.__run_slice()
+            slices += 1
+
+            if time.perf_counter() - start_time >= self.__time_budget:
+                break
+
+        self.__last_frame_time = time.perf_counter() - start_time
+        self.__last_frame_slices = slices
+
+        if self.__last_frame_time > 2 * self.__time_budget:
+            log.debug(f'Work of the main thread used {self.__last_frame_time * 1000:.1f} ms in the last frame.')
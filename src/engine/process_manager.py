@@ -23,58 +23,75 @@ Parallel process are executed in another space of memory than the main process,
 variables and data from the main process to the new process. This can make process slower than threads or task, since
 the last two does not need to copy the variables and data to another space of memory.
 
+To avoid copying big arrays (like the heights of the maps), the arrays can be stored in blocks of shared memory using
+the class SharedArray. Only the name of the block is copied to the other process, and both processes use the same
+memory.
+
 All the methods called on the process must be parsed and copied to the new space of memory, and thus, all the functions
 used for the parallel process must be public (they can not be private, protected, local to a class or functions or
 lambda).
 """
-import queue
-from multiprocessing import Process, Queue
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Union
+
+import numpy as np
+
+from src.engine.shared_array import SharedArray
+from src.engine.task_telemetry import TaskTelemetry, measure_task
+from src.utils import get_logger
+
+log = get_logger(module='PROCESS_MANAGER')
 
 
 class ProcessManager:
     """
     Class in charge of the management of the process.
 
+    The tasks are executed in a pool of processes that is created the first time that a task is added and reused by
+    the next tasks, so a new process is not created for every task.
+
     All the methods called on the process must be parsed and copied to the new space of memory, and thus, all the
     functions used for the parallel process must be public (they can not be private, protected, local to a class or
     functions or lambda).
 
     WARNING: The use of this module can be slow since it has to copy all the variables to another memory to
-    execute the new process. (use threads if this step is too slow)
+    execute the new process. (use threads if this step is too slow, or share the big arrays using shared arrays)
     """
 
-    def __init__(self):
+    def __init__(self, max_workers: Union[int, None] = None):
         """
         Constructor of the class.
-        """
-        self.__process_list = []
 
-    def true_parallel_task(self, q, function, *args) -> None:
+        Args:
+            max_workers: Number of processes of the pool. None to use the number of processors of the machine.
         """
-        Function to really use as the parallel process.
+        self.__max_workers = max_workers
+        self.__executor: Union[ProcessPoolExecutor, None] = None
+        self.__process_list: List[dict] = []
 
-        This function should be private but due to a bug in the multiprocessing module it has to be public.
+        # Shared arrays created by the manager, indexed by the name of their block of memory
+        self.__shared_arrays: Dict[str, SharedArray] = {}
 
-        Args:
-            q: Queue to use for communicating.
-            function: Task to use.
-            *args: Args to use in the function.
+    def __get_executor(self) -> ProcessPoolExecutor:
+        """
+        Get the pool of processes used to execute the tasks, creating it if it does not exist.
 
-        Returns: Queue used with the return value included.
+        Returns: Pool of processes.
         """
-        ret = function(*args)
-        q.put(ret)
-        return q
+        if self.__executor is None:
+            self.__executor = ProcessPoolExecutor(max_workers=self.__max_workers)
+        return self.__executor
 
     def create_parallel_process(self, parallel_task: callable,
                                 parallel_task_args=None,
                                 then_function: callable = lambda: None,
                                 then_function_args=None) -> None:
         """
-        Create a new process and start it.
+        Execute the task in the pool of processes.
 
         If the return parameter of the parallel_task is not none, then the returned value will be used as first
-        argument of the then_function.
+        argument of the then_function. If the returned value is a shared array created by this manager, then the
+        then_function receives the numpy array stored in the block of shared memory (not a copy of it).
 
         Args:
             parallel_task: Function to execute in a new process.
@@ -90,42 +107,133 @@ class ProcessManager:
         if parallel_task_args is None:
             parallel_task_args = []
 
-        q = Queue()
-        p = Process(target=self.true_parallel_task, args=(q, parallel_task) + tuple(parallel_task_args))
-        p.start()
+        # Measure the task in the other process if the telemetry is enabled
+        record = TaskTelemetry.create_record('process', parallel_task)
+        if record is not None:
+            future = self.__get_executor().submit(measure_task, parallel_task, *parallel_task_args)
+        else:
+            future = self.__get_executor().submit(parallel_task, *parallel_task_args)
 
         self.__process_list.append({
-            'process': p,
-            'queue': q,
+            'future': future,
             'then_function': then_function,
-            'then_function_args': then_function_args
+            'then_function_args': then_function_args,
+            'telemetry': record
         })
 
-    def update_process(self) -> None:
+    def create_shared_array(self, array: np.ndarray) -> SharedArray:
         """
-        Update the process, calling the then_task if they already finished.
+        Copy the array to a new block of shared memory.
+
+        The shared array can be given as argument to the parallel tasks without copying the data of the array. The
+        block of memory must be released with the method release_shared_array when it is not needed anymore.
+
+        Args:
+            array: Array to copy.
+
+        Returns: Shared array with the values of the array.
+        """
+        shared_array = SharedArray.from_array(array)
+        self.__shared_arrays[shared_array.get_name()] = shared_array
+        return shared_array
+
+    def get_shared_memory_nbytes(self) -> int:
+        """
+        Get the number of bytes used by the shared arrays created by the manager.
+
+        Returns: Number of bytes.
+        """
+        return sum(shared_array.get_nbytes() for shared_array in self.__shared_arrays.values())
+
+    def release_shared_array(self, shared_array: SharedArray) -> None:
+        """
+        Release the block of shared memory used by the array.
+
+        The numpy arrays obtained from the shared array must not be used after releasing it.
+
+        Args:
+            shared_array: Shared array to release.
 
         Returns: None
         """
-        to_delete = []
-        for process in self.__process_list:
+        shared_array = self.__shared_arrays.pop(shared_array.get_name(), shared_array)
+        shared_array.release()
+
+    def shutdown(self) -> None:
+        """
+        Stop the pool of processes and release all the shared arrays created by the manager.
+
+        The tasks that did not start are cancelled.
+
+        Returns: None
+        """
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True, cancel_futures=True)
+            self.__executor = None
+        self.__process_list = []
+
+        for shared_array in list(self.__shared_arrays.values()):
+            self.release_shared_array(shared_array)
+
+    def true_parallel_task(self, q, function, *args) -> None:
+        """
+        Function to really use as the parallel process.
 
-            try:
-                ret = process['queue'].get(False)
-                process['process'].join()
+        Put the value returned by the function in the queue, used to execute functions in processes that only
+        communicate using queues.
 
-                # Execute the then function with the returned argument only if the return value of the
-                # parallel process is not None.
-                if ret is not None:
-                    process['then_function'](ret, *process['then_function_args'])
-                else:
-                    process['then_function'](*process['then_function_args'])
+        Args:
+            q: Queue to use for communicating.
+            function: Task to use.
+            *args: Args to use in the function.
 
-                # Add the process as one to delete.
-                to_delete.append(process)
+        Returns: Queue used with the return value included.
+        """
+        ret = function(*args)
+        q.put(ret)
+        return q
 
-            except queue.Empty:
-                pass
+    def update_process(self) -> int:
+        """
+        Update the process, calling the then_task if they already finished.
 
-        for process in to_delete:
+        If the parallel task raised an exception, then the exception is logged and the then_task is not called.
+
+        Returns: Number of process that finished.
+        """
+        finished_process = [process for process in self.__process_list if process['future'].done()]
+        for process in finished_process:
             self.__process_list.remove(process)
+
+            future: Future = process['future']
+            if future.cancelled():
+                TaskTelemetry.finish_record(process['telemetry'], 'cancelled')
+                continue
+
+            exception = future.exception()
+            if exception is not None:
+                log.error(f'Exception raised in a parallel process: {exception!r}')
+                TaskTelemetry.finish_record(process['telemetry'], 'error')
+                continue
+
+            ret = future.result()
+            if process['telemetry'] is not None:
+                ret = TaskTelemetry.set_process_measures(process['telemetry'], ret)
+
+            # Give the array stored in the shared memory instead of the copy received from the process
+            if isinstance(ret, SharedArray):
+                shared_array = self.__shared_arrays.get(ret.get_name())
+                if shared_array is not None:
+                    ret.release()
+                    ret = shared_array.get_array()
+
+            # Execute the then function with the returned argument only if the return value of the
+            # parallel process is not None.
+            if ret is not None:
+                TaskTelemetry.run_then(process['telemetry'],
+                                       process['then_function'],
+                                       [ret, *process['then_function_args']])
+            else:
+                TaskTelemetry.run_then(process['telemetry'], process['then_function'], process['then_function_args'])
+
+        return len(finished_process)
@@ -26,6 +26,8 @@ from typing import Dict, TYPE_CHECKING
 import OpenGL.GL as GL
 import glfw
 
+from src.engine.frame_profiler import FrameProfiler
+
 if TYPE_CHECKING:
     from glfw import _GLFWwindow
 
@@ -162,6 +164,19 @@ class Render:
         else:
             GL.glDisable(GL.GL_DEPTH_TEST)
 
+    def wait_events(self, timeout: float) -> None:
+        """
+        Wait until an event arrives to the window or until the timeout ends, without rendering a frame.
+
+        Used instead of on_loop when there is nothing new to render.
+
+        Args:
+            timeout: Maximum number of seconds to wait.
+
+        Returns: None
+        """
+        glfw.wait_events_timeout(timeout)
+
     def on_loop(self, on_frame_tasks: list = None) -> None:
         """
         Function to be called in every frame of he application.
@@ -194,5 +209,7 @@ class Render:
                 self.__previous_time = self.__current_time
 
         # Once the render is done, buffers are swapped, showing the complete scene.
-        glfw.swap_buffers(self.__window)
-        glfw.poll_events()
+        with FrameProfiler.scope('swap_buffers'):
+            glfw.swap_buffers(self.__window)
+        with FrameProfiler.scope('poll_events'):
+            glfw.poll_events()
@@ -48,6 +48,8 @@ class Camera:
         self.__look_at = np.array([0, 0, 0])
         self.__normal = np.array([0, 0, 1])
 
+        self.__view_matrix = None  # View matrix generated by the camera, None if the camera changed
+
     def __spherical_to_cartesian(self, radius, phi, theta) -> np.ndarray:
         """
         Transform spherical coordinates to cartesian coordinates.
@@ -111,11 +113,16 @@ class Camera:
         This matrix have to be passed to the shaders of the models and be applied between the model matrix and the
         projection matrix to give the illusion of viewing the model from the position of the camera.
 
+        The matrix is only generated again if the camera changed since the last call, otherwise, the same matrix
+        object is returned.
+
         Returns: Matrix generated by the camera. Numpy Array
         """
-        return lookAt(self.__camera_pos + self.__camera_position_offset,
-                      self.__look_at + self.__camera_position_offset,
-                      self.__normal)
+        if self.__view_matrix is None:
+            self.__view_matrix = lookAt(self.__camera_pos + self.__camera_position_offset,
+                                        self.__look_at + self.__camera_position_offset,
+                                        self.__normal)
+        return self.__view_matrix
 
     def modify_azimuthal_angle(self, angle) -> None:
         """
@@ -128,6 +135,7 @@ class Camera:
         """
         self.__phi += angle
         self.__camera_pos = self.__spherical_to_cartesian(self.__radius, self.__phi, self.__theta)
+        self.__view_matrix = None
 
     def modify_camera_offset(self, offset_value: tuple) -> None:
         """
@@ -143,6 +151,7 @@ class Camera:
         Returns: None
         """
         self.__camera_position_offset += offset_value
+        self.__view_matrix = None
 
     def modify_elevation(self, angle) -> None:
         """
@@ -161,6 +170,7 @@ class Camera:
         self.__camera_pos = self.__spherical_to_cartesian(self.__radius,
                                                           self.__phi,
                                                           self.__theta)
+        self.__view_matrix = None
 
     def modify_radius(self, change_value: float = 1) -> None:
         """
@@ -178,6 +188,7 @@ class Camera:
         self.__camera_pos = self.__spherical_to_cartesian(self.__radius,
                                                           self.__phi,
                                                           self.__theta)
+        self.__view_matrix = None
 
     def reset_values(self) -> None:
         """
@@ -196,3 +207,4 @@ class Camera:
         self.__camera_pos = self.__spherical_to_cartesian(self.__radius, self.__phi, self.__theta)
         self.__look_at = np.array([0, 0, 0])
         self.__normal = np.array([0, 0, 1])
+        self.__view_matrix = None
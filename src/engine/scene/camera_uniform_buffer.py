@@ -0,0 +1,183 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+File with the class CameraUniformBuffer, class in charge of the uniform buffer shared by all the shaders with the
+matrices and viewport used to render the scene.
+"""
+from typing import Dict, Tuple
+
+import OpenGL.GL as GL
+import numpy as np
+
+# Name and binding point of the uniform block in the shaders.
+CAMERA_UNIFORM_BLOCK_NAME = 'Camera'
+CAMERA_UNIFORM_BLOCK_BINDING = 0
+
+
+class CameraUniformBuffer:
+    """
+    Class that store the matrices and viewport used to render the scene in an uniform buffer shared by all the shader
+    programs.
+
+    The shaders must declare the block:
+
+        layout (std140) uniform Camera
+        {
+            mat4 projection_2d;
+            mat4 projection_3d;
+            mat4 view;
+            vec4 viewport;
+        };
+
+    The values are marked as outdated when they change, and only the outdated values are sent to the GPU when the
+    method update is called (once per frame).
+    """
+
+    # Offset (in bytes) of every member of the block using the std140 layout
+    __offsets = {
+        'projection_2d': 0,
+        'projection_3d': 64,
+        'view': 128,
+        'viewport': 192,
+    }
+    __size = 208
+
+    def __init__(self):
+        """
+        Constructor of the class.
+
+        The buffer is created in the GPU the first time that the method update is called.
+        """
+        self.__ubo = None
+
+        self.__values: Dict[str, object] = {
+            'projection_2d': None,
+            'projection_3d': None,
+            'view': None,
+            'viewport': None,
+        }
+        self.__outdated_values: Dict[str, bool] = {}
+
+    def __set_value(self, name: str, value: object) -> None:
+        """
+        Store the value of a member of the block and mark it as outdated if it changed.
+
+        The matrices are compared by identity, since the scene and the camera only generate new matrices when their
+        values change.
+
+        Args:
+            name: Name of the member of the block.
+            value: New value of the member.
+
+        Returns: None
+        """
+        if value is None or value is self.__values[name]:
+            return
+
+        self.__values[name] = value
+        self.__outdated_values[name] = True
+
+    def get_outdated_data(self) -> Dict[str, Tuple[int, bytes]]:
+        """
+        Get the data of the members of the block that changed since the last update.
+
+        The matrices are converted to the column-major order used by OpenGL.
+
+        Returns: Dictionary with the offset and the bytes of every outdated member.
+        """
+        outdated_data = {}
+        for name in self.__outdated_values:
+            value = np.asarray(self.__values[name], dtype=np.float32)
+            if value.ndim == 2:
+                value = value.T
+            outdated_data[name] = (self.__offsets[name], np.ascontiguousarray(value).tobytes())
+
+        return outdated_data
+
+    def set_projection_matrix_2D(self, projection_matrix: np.ndarray) -> None:
+        """
+        Set the projection matrix used to render the models in 2D.
+
+        Args:
+            projection_matrix: Projection matrix to use.
+
+        Returns: None
+        """
+        self.__set_value('projection_2d', projection_matrix)
+
+    def set_projection_matrix_3D(self, projection_matrix: np.ndarray) -> None:
+        """
+        Set the projection matrix used to render the models in 3D.
+
+        Args:
+            projection_matrix: Projection matrix to use.
+
+        Returns: None
+        """
+        self.__set_value('projection_3d', projection_matrix)
+
+    def set_view_matrix(self, view_matrix: np.ndarray) -> None:
+        """
+        Set the view matrix used to render the models in 3D.
+
+        Args:
+            view_matrix: View matrix generated by the camera.
+
+        Returns: None
+        """
+        self.__set_value('view', view_matrix)
+
+    def set_viewport(self, x: int, y: int, width: int, height: int) -> None:
+        """
+        Set the position and size (in pixels) of the viewport used to render the scene.
+
+        Args:
+            x: Position of the viewport in the x-axis.
+            y: Position of the viewport in the y-axis.
+            width: Width of the viewport.
+            height: Height of the viewport.
+
+        Returns: None
+        """
+        viewport = (x, y, width, height)
+        if viewport != self.__values['viewport']:
+            self.__set_value('viewport', viewport)
+
+    def update(self) -> None:
+        """
+        Send the outdated values to the uniform buffer in the GPU.
+
+        Do nothing if no value changed since the last update.
+
+        Returns: None
+        """
+        if len(self.__outdated_values) == 0:
+            return
+
+        if self.__ubo is None:
+            self.__ubo = GL.glGenBuffers(1)
+            GL.glBindBuffer(GL.GL_UNIFORM_BUFFER, self.__ubo)
+            GL.glBufferData(GL.GL_UNIFORM_BUFFER, self.__size, None, GL.GL_DYNAMIC_DRAW)
+            GL.glBindBufferBase(GL.GL_UNIFORM_BUFFER, CAMERA_UNIFORM_BLOCK_BINDING, self.__ubo)
+
+        GL.glBindBuffer(GL.GL_UNIFORM_BUFFER, self.__ubo)
+        for offset, data in self.get_outdated_data().values():
+            GL.glBufferSubData(GL.GL_UNIFORM_BUFFER, offset, len(data), data)
+        GL.glBindBuffer(GL.GL_UNIFORM_BUFFER, 0)
+
+        self.__outdated_values.clear()
@@ -18,7 +18,8 @@
 """
 Utility module that defines different geometrical operations.
 """
-from typing import List
+import heapq
+from typing import Callable, List, Tuple, Union
 
 import numpy as np
 from scipy import interpolate
@@ -75,16 +76,93 @@ def get_bounding_box_indexes(points_array: np.ndarray, polygon: LinearRing) -> l
     return [min_x_index, max_x_index, min_y_index, max_y_index]
 
 
-def generate_mask(points_array: np.ndarray, polygon_points) -> np.ndarray:
+def get_points_bounding_box(points: list) -> Union[Tuple[float, float, float, float], None]:
+    """
+    Get the bounding box of a list of points.
+
+    Args:
+        points: List of points. The list must have the format [x1, y1, z1, x2, y2, z2, ...]
+
+    Returns: Tuple with the minimum x, minimum y, maximum x and maximum y of the points. None if the list is empty.
+    """
+    points = np.array(points, dtype=np.float64).reshape((-1, 3))
+    if len(points) == 0:
+        return None
+
+    return float(np.min(points[:, 0])), float(np.min(points[:, 1])), \
+        float(np.max(points[:, 0])), float(np.max(points[:, 1]))
+
+
+def get_region_indexes(points_array: np.ndarray,
+                       area: Union[Tuple[float, float, float, float], None]) -> Tuple[int, int, int, int]:
+    """
+    Get the rows and columns of the matrix that contain all the points inside the area.
+
+    The region returned includes one row and column more on every side of the area, so the points over the limits of
+    the area are always inside the region. If the area is completely outside the matrix, the region returned is empty
+    (the max values are equal to the min values).
+
+    Args:
+        points_array: Array 2D with shape (x,y,3) with the values of the points.
+        area: Tuple with the minimum x, minimum y, maximum x and maximum y of the area. None to use the whole matrix.
+
+    Returns: (min_row, max_row, min_col, max_col), the max values are not inclusive.
+    """
+    rows, cols = points_array.shape[:2]
+    if area is None:
+        return 0, rows, 0, cols
+
+    min_x, min_y, max_x, max_y = area
+    first_col = int(np.searchsorted(points_array[0, :, 0], min_x, side='left'))
+    last_col = int(np.searchsorted(points_array[0, :, 0], max_x, side='right'))
+    first_row = int(np.searchsorted(points_array[:, 0, 1], min_y, side='left'))
+    last_row = int(np.searchsorted(points_array[:, 0, 1], max_y, side='right'))
+
+    min_col = min(max(first_col - 1, 0), cols)
+    min_row = min(max(first_row - 1, 0), rows)
+
+    # The area does not have any point of the matrix between its limits
+    if first_col == cols or last_col == 0 or first_row == rows or last_row == 0:
+        return min_row, min_row, min_col, min_col
+
+    max_col = min(last_col + 1, cols)
+    max_row = min(last_row + 1, rows)
+
+    return min_row, max(max_row, min_row), min_col, max(max_col, min_col)
+
+
+def get_row_blocks(rows: int, cols: int, points_per_block: int = 250000) -> List[Tuple[int, int]]:
+    """
+    Divide the rows of a matrix in blocks of rows with approximately the given number of points.
+
+    Used by the operations that process big matrices in blocks to report their progress after every block.
+
+    Args:
+        rows: Number of rows of the matrix.
+        cols: Number of columns of the matrix.
+        points_per_block: Number of points to use in every block.
+
+    Returns: List with the first row and the row after the last row of every block.
+    """
+    rows_per_block = max(points_per_block // max(cols, 1), 1)
+    return [(start, min(start + rows_per_block, rows)) for start in range(0, rows, rows_per_block)]
+
+
+def generate_mask(points_array: np.ndarray,
+                  polygon_points,
+                  progress: Callable[[float], None] = None) -> np.ndarray:
     """
     Generate a mask of the points that are inside the specified polygon. This method does not considerate the
     points that are on the polygon, returning false in case they exists.
 
     Mask is a numpy array with booleans representing if the point is inside the polygon or not.
 
+    The mask is generated in blocks of rows, calling the progress function after every block.
+
     Args:
         points_array: Numpy array with the points (shape must be (x, y, 3))
         polygon_points: List with the points of the polygon. [x1, y1, z1, x2, y2, z2, ...]
+        progress: Function that receives the fraction of the rows processed. None to not report the progress.
 
     Returns: Numpy array with booleans indicating if the points are inside the polygon or not.
     """
@@ -94,8 +172,15 @@ def generate_mask(points_array: np.ndarray, polygon_points) -> np.ndarray:
     for point_ind in range(len(polygon_points)):
         if point_ind % 3 == 0:
             points_xy.append((polygon_points[point_ind], polygon_points[point_ind + 1]))
+    polygon = Polygon(points_xy)
+
+    flags = np.zeros(points_array.shape[:2], dtype=bool)
+    blocks = get_row_blocks(*points_array.shape[:2])
+    for block_number, (start, end) in enumerate(blocks):
+        flags[start:end] = contains(polygon, points_array[start:end, :, 0], points_array[start:end, :, 1])
+        if progress is not None:
+            progress((block_number + 1) / len(blocks))
 
-    flags = contains(Polygon(points_xy), points_array[:, :, 0], points_array[:, :, 1])
     return flags
 
 
@@ -158,6 +243,64 @@ def get_max_min_inside_polygon(points_array: np.ndarray,
     return maximum, minimum
 
 
+def get_effective_areas(points: np.ndarray) -> np.ndarray:
+    """
+    Calculate the effective area of every point of a line using the Visvalingam-Whyatt algorithm.
+
+    The effective area of a point is the area of the triangle formed by the point and its neighbours at the moment
+    that the point is removed from the line, removing always the point with the smallest area first. The areas are
+    forced to be non-decreasing in the order of removal, so all the points with an area greater or equal than a
+    threshold form the line simplified with that threshold.
+
+    The first and the last points of the line are never removed, so their effective area is infinite.
+
+    Args:
+        points: Points of the line. Array of shape (number_of_points, 2) or (number_of_points, 3), only the first two
+                coordinates are used.
+
+    Returns: Array with the effective area of every point.
+    """
+    number_of_points = len(points)
+    areas = np.full(number_of_points, np.inf)
+    if number_of_points < 3:
+        return areas
+
+    x = [float(value) for value in points[:, 0]]
+    y = [float(value) for value in points[:, 1]]
+    previous_points = list(range(-1, number_of_points - 1))
+    next_points = list(range(1, number_of_points + 1))
+
+    def get_triangle_area(index: int) -> float:
+        previous_index, next_index = previous_points[index], next_points[index]
+        return abs((x[index] - x[previous_index]) * (y[next_index] - y[previous_index]) -
+                   (x[next_index] - x[previous_index]) * (y[index] - y[previous_index])) / 2
+
+    # Heap with the area of the points, the old entries of the points are skipped using the version of the points
+    versions = [0] * number_of_points
+    heap = [(get_triangle_area(index), index, 0) for index in range(1, number_of_points - 1)]
+    heapq.heapify(heap)
+
+    max_area = 0
+    while len(heap) > 0:
+        area, index, version = heapq.heappop(heap)
+        if version != versions[index]:
+            continue
+
+        max_area = max(max_area, area)
+        areas[index] = max_area
+
+        # Remove the point from the line and update the area of its neighbours
+        previous_index, next_index = previous_points[index], next_points[index]
+        next_points[previous_index] = next_index
+        previous_points[next_index] = previous_index
+        for neighbour in (previous_index, next_index):
+            if 0 < neighbour < number_of_points - 1:
+                versions[neighbour] += 1
+                heapq.heappush(heap, (get_triangle_area(neighbour), neighbour, versions[neighbour]))
+
+    return areas
+
+
 def get_external_polygon_points(polygon_points: List[float],
                                 distance: float,
                                 default_z_value: float = 0.5) -> List[float]:
@@ -195,14 +338,21 @@ def get_external_polygon_points(polygon_points: List[float],
 
 def interpolate_nan(array_2d: np.ndarray,
                     nan_mask: np.ndarray,
-                    interpolation_type: str = 'linear') -> np.ndarray:
+                    interpolation_type: str = 'linear',
+                    progress: Callable[[float], None] = None,
+                    points_per_block: int = 250000) -> np.ndarray:
     """
     Interpolate the missing values from the array2d using scipy interpolation method.
 
+    The interpolator is generated once, and the values are interpolated in blocks of points, calling the progress
+    function after every block.
+
     Args:
         array_2d: Array 2D with missing values to interpolate.
         nan_mask: Array 2D with a mask specifying where are located the nan values.
         interpolation_type: Type of the interpolation. (nearest, linear, cubic)
+        progress: Function that receives the fraction of the points interpolated. None to not report the progress.
+        points_per_block: Number of points to interpolate in every block.
 
     Returns: Array interpolated.
     """
@@ -242,8 +392,23 @@ def interpolate_nan(array_2d: np.ndarray,
 
     # Interpolate values
     # ------------------
+    # Same interpolators used by scipy.interpolate.griddata for data in two dimensions
+    if interpolation_type == 'nearest':
+        interpolator = interpolate.NearestNDInterpolator(points, values)
+    elif interpolation_type == 'linear':
+        interpolator = interpolate.LinearNDInterpolator(points, values)
+    elif interpolation_type == 'cubic':
+        interpolator = interpolate.CloughTocher2DInterpolator(points, values)
+    else:
+        raise ValueError(f'Unknown interpolation method {interpolation_type}.')
+
     # noinspection PyShadowingNames
-    y = interpolate.griddata(points, values, points_to_interpolate, method=interpolation_type)
+    y = np.empty(len(points_to_interpolate))
+    for start in range(0, len(points_to_interpolate), points_per_block):
+        end = min(start + points_per_block, len(points_to_interpolate))
+        y[start:end] = interpolator(points_to_interpolate[start:end])
+        if progress is not None:
+            progress(end / len(points_to_interpolate))
 
     # Modify the values of the data
     # -----------------------------
@@ -254,3 +419,42 @@ def interpolate_nan(array_2d: np.ndarray,
     data = data.reshape(array_2d.shape)
 
     return data
+
+
+def filter_in_row_blocks(array_2d: np.ndarray,
+                         filter_function: Callable[[np.ndarray], np.ndarray],
+                         halo: int,
+                         progress: Callable[[float], None] = None) -> np.ndarray:
+    """
+    Apply a filter that uses the neighbours of every cell (like a convolution) to the array in blocks of rows, calling
+    the progress function after every block.
+
+    Every block is filtered with the halo rows that surround it, so the result is the same as the one obtained
+    filtering the whole array if the halo is at least the radius of the kernel of the filter.
+
+    Args:
+        array_2d: Array to filter.
+        filter_function: Function that receives an array and returns the filtered array with the same shape.
+        halo: Number of rows to add on every side of the blocks.
+        progress: Function that receives the fraction of the rows filtered. None to not report the progress.
+
+    Returns: Filtered array.
+    """
+    rows, cols = array_2d.shape
+    blocks = get_row_blocks(rows, cols)
+    if len(blocks) == 0:
+        return filter_function(array_2d)
+
+    result = None
+    for block_number, (start, end) in enumerate(blocks):
+        halo_start, halo_end = max(start - halo, 0), min(end + halo, rows)
+        filtered_block = filter_function(array_2d[halo_start:halo_end])
+
+        if result is None:
+            result = np.empty(array_2d.shape, dtype=filtered_block.dtype)
+        result[start:end] = filtered_block[start - halo_start:end - halo_start]
+
+        if progress is not None:
+            progress((block_number + 1) / len(blocks))
+
+    return result
@@ -0,0 +1,405 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+File with the classes HeightDelta and HeightHistory, classes used by the scene to undo and redo the modifications made
+to the heights of the maps.
+"""
+import os
+import shutil
+import tempfile
+import zlib
+from typing import Callable, List, Tuple, Union
+
+import numpy as np
+
+from src.utils import get_logger
+
+log = get_logger(module='HEIGHT_HISTORY')
+
+# Region of a map: (min_row, max_row, min_col, max_col), the max values are not inclusive
+Region = Tuple[int, int, int, int]
+
+
+def compress_heights(heights: np.ndarray) -> bytes:
+    """
+    Compress the array of heights.
+
+    The bytes of the values are shuffled before compressing them (the first byte of every value, then the second byte
+    of every value and so on), since the bytes with the sign and exponent of neighbouring heights are usually equal
+    and compress a lot better when they are stored together.
+
+    Args:
+        heights: Array with the heights.
+
+    Returns: Compressed bytes.
+    """
+    heights = np.ascontiguousarray(heights)
+    shuffled = heights.view(np.uint8).reshape((-1, heights.itemsize)).T
+    return zlib.compress(shuffled.tobytes(), 1)
+
+
+def decompress_heights(data: bytes, shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+    """
+    Decompress an array of heights compressed with compress_heights.
+
+    Args:
+        data: Compressed bytes.
+        shape: Shape of the array.
+        dtype: Type of the values of the array.
+
+    Returns: Array with the heights.
+    """
+    dtype = np.dtype(dtype)
+    shuffled = np.frombuffer(zlib.decompress(data), dtype=np.uint8).reshape((dtype.itemsize, -1))
+    return np.ascontiguousarray(shuffled.T).view(dtype).reshape(shape)
+
+
+class HeightDelta:
+    """
+    Class that store the heights that a region of a map had before being modified.
+
+    The heights are stored compressed in memory, and can be moved to a file to free the memory (spilled). The heights
+    are read again from the file when they are needed.
+    """
+
+    def __init__(self, model_id: str, model_shape: Tuple[int, int], region: Region, heights: np.ndarray):
+        """
+        Constructor of the class.
+
+        Args:
+            model_id: ID of the model modified.
+            model_shape: Shape of the heights of the model (rows, cols).
+            region: Region of the model that was modified.
+            heights: Heights that the region had before the modification.
+        """
+        self.__model_id = model_id
+        self.__model_shape = tuple(model_shape)
+        self.__region = region
+
+        self.__shape = heights.shape
+        self.__dtype = heights.dtype
+        self.__data: Union[bytes, None] = compress_heights(heights)
+        self.__file: Union[str, None] = None
+
+    def apply(self, heights: np.ndarray) -> 'HeightDelta':
+        """
+        Restore the heights stored in the region of the map.
+
+        Args:
+            heights: Heights of the map to modify. Array with shape (rows, cols).
+
+        Returns: Delta with the heights that the region had before restoring them (used to undo this operation).
+        """
+        min_row, max_row, min_col, max_col = self.__region
+
+        current_delta = HeightDelta(self.__model_id,
+                                    self.__model_shape,
+                                    self.__region,
+                                    heights[min_row:max_row, min_col:max_col])
+        heights[min_row:max_row, min_col:max_col] = self.get_heights()
+
+        return current_delta
+
+    def delete_file(self) -> None:
+        """
+        Delete the file used to store the heights if the delta was spilled.
+
+        Returns: None
+        """
+        if self.__file is not None and os.path.exists(self.__file):
+            os.remove(self.__file)
+        self.__file = None
+
+    def get_heights(self) -> np.ndarray:
+        """
+        Get the heights stored.
+
+        Returns: Array with the heights of the region.
+        """
+        data = self.__data
+        if data is None:
+            with open(self.__file, 'rb') as file:
+                data = file.read()
+        return decompress_heights(data, self.__shape, self.__dtype)
+
+    def get_memory_size(self) -> int:
+        """
+        Get the number of bytes used in memory to store the heights.
+
+        Returns: Number of bytes. 0 if the delta was spilled.
+        """
+        return 0 if self.__data is None else len(self.__data)
+
+    def get_model_id(self) -> str:
+        """
+        Get the ID of the model modified.
+
+        Returns: ID of the model.
+        """
+        return self.__model_id
+
+    def get_model_shape(self) -> Tuple[int, int]:
+        """
+        Get the shape of the heights of the model when the delta was created.
+
+        Returns: Tuple with the number of rows and columns.
+        """
+        return self.__model_shape
+
+    def get_region(self) -> Region:
+        """
+        Get the region of the model modified.
+
+        Returns: Tuple with the min row, max row, min column and max column (max values are not inclusive).
+        """
+        return self.__region
+
+    def is_spilled(self) -> bool:
+        """
+        Check if the heights are stored in a file.
+
+        Returns: Boolean indicating if the delta was spilled.
+        """
+        return self.__data is None
+
+    def spill(self, directory: str) -> None:
+        """
+        Move the heights to a file in the directory, freeing the memory used to store them.
+
+        Args:
+            directory: Directory where to create the file.
+
+        Returns: None
+        """
+        if self.__data is None:
+            return
+
+        file_descriptor, self.__file = tempfile.mkstemp(suffix='.delta', dir=directory)
+        with os.fdopen(file_descriptor, 'wb') as file:
+            file.write(self.__data)
+        self.__data = None
+
+
+class HeightHistory:
+    """
+    Class that store the modifications made to the heights of the maps so they can be undone and redone.
+
+    Only the regions of the maps modified are stored, compressed. When the memory used by the stored regions is
+    bigger than the memory budget, the oldest regions are moved to files in a temporary directory (that is deleted
+    when the history is cleared).
+    """
+
+    def __init__(self, memory_budget: int, max_entries: int = 50):
+        """
+        Constructor of the class.
+
+        Args:
+            memory_budget: Maximum number of bytes that the compressed regions can use in memory.
+            max_entries: Maximum number of modifications that can be undone.
+        """
+        self.__memory_budget = memory_budget
+        self.__max_entries = max_entries
+
+        self.__undo_list: List[HeightDelta] = []
+        self.__redo_list: List[HeightDelta] = []
+        self.__temp_directory: Union[str, None] = None
+
+    def __apply(self,
+                from_list: List[HeightDelta],
+                to_list: List[HeightDelta],
+                get_model_vertices: Callable[[str], np.ndarray]) -> Union[Tuple[str, Region], None]:
+        """
+        Restore the heights of the last delta of a list, storing the delta that reverts the operation in the other
+        list.
+
+        Deltas whose models no longer exist (or changed their shape) are discarded.
+
+        Args:
+            from_list: List with the delta to apply.
+            to_list: List where to store the delta that reverts the operation.
+            get_model_vertices: Function that returns the vertices of a model given its ID.
+
+        Returns: ID of the model modified and region of the model restored. None if there was no delta to apply.
+        """
+        while len(from_list) > 0:
+            delta = from_list.pop()
+
+            try:
+                heights = get_model_vertices(delta.get_model_id())[:, :, 2]
+            except (KeyError, TypeError):
+                heights = None
+
+            if heights is None or heights.shape != delta.get_model_shape():
+                log.debug(f'Discarding modification of the model {delta.get_model_id()}.')
+                delta.delete_file()
+                continue
+
+            to_list.append(delta.apply(heights))
+            delta.delete_file()
+            self.__enforce_budget()
+            return delta.get_model_id(), delta.get_region()
+
+        return None
+
+    def __enforce_budget(self) -> None:
+        """
+        Remove the oldest deltas if there are more than max_entries, and spill the oldest deltas to files until the
+        memory used is below the memory budget.
+
+        Returns: None
+        """
+        while len(self.__undo_list) > self.__max_entries:
+            self.__undo_list.pop(0).delete_file()
+
+        # Deltas that are less likely to be used first
+        deltas = self.__undo_list + self.__redo_list[::-1]
+        memory_used = sum(delta.get_memory_size() for delta in deltas)
+
+        for delta in deltas:
+            if memory_used <= self.__memory_budget:
+                break
+            if delta.is_spilled():
+                continue
+
+            if self.__temp_directory is None:
+                self.__temp_directory = tempfile.mkdtemp(prefix='relief_creator_history_')
+
+            memory_used -= delta.get_memory_size()
+            delta.spill(self.__temp_directory)
+
+    def add(self, delta: HeightDelta) -> None:
+        """
+        Add a modification to the history.
+
+        The modifications that were undone can not be redone after adding a new modification.
+
+        Args:
+            delta: Delta with the heights of the region before the modification.
+
+        Returns: None
+        """
+        self.__undo_list.append(delta)
+
+        for redo_delta in self.__redo_list:
+            redo_delta.delete_file()
+        self.__redo_list = []
+
+        self.__enforce_budget()
+
+    def can_redo(self) -> bool:
+        """
+        Check if there is modifications to redo.
+
+        Returns: Boolean indicating if there is modifications to redo.
+        """
+        return len(self.__redo_list) > 0
+
+    def can_undo(self) -> bool:
+        """
+        Check if there is modifications to undo.
+
+        Returns: Boolean indicating if there is modifications to undo.
+        """
+        return len(self.__undo_list) > 0
+
+    def clear(self) -> None:
+        """
+        Remove all the modifications from the history, deleting the temporary files.
+
+        Returns: None
+        """
+        self.__undo_list = []
+        self.__redo_list = []
+
+        if self.__temp_directory is not None:
+            shutil.rmtree(self.__temp_directory, ignore_errors=True)
+            self.__temp_directory = None
+
+    def get_memory_used(self) -> int:
+        """
+        Get the number of bytes used in memory by the history.
+
+        Returns: Number of bytes.
+        """
+        return sum(delta.get_memory_size() for delta in self.__undo_list + self.__redo_list)
+
+    def get_redo_model_id(self) -> Union[str, None]:
+        """
+        Get the ID of the model that is modified by the next redo.
+
+        Returns: ID of the model. None if there is nothing to redo.
+        """
+        return self.__redo_list[-1].get_model_id() if len(self.__redo_list) > 0 else None
+
+    def get_undo_model_id(self) -> Union[str, None]:
+        """
+        Get the ID of the model that is modified by the next undo.
+
+        Returns: ID of the model. None if there is nothing to undo.
+        """
+        return self.__undo_list[-1].get_model_id() if len(self.__undo_list) > 0 else None
+
+    def redo(self, get_model_vertices: Callable[[str], np.ndarray]) -> Union[Tuple[str, Region], None]:
+        """
+        Redo the last modification undone.
+
+        Args:
+            get_model_vertices: Function that returns the vertices of a model given its ID.
+
+        Returns: ID of the model modified and region of the model restored. None if there was nothing to redo.
+        """
+        return self.__apply(self.__redo_list, self.__undo_list, get_model_vertices)
+
+    def remove_model(self, model_id: str) -> None:
+        """
+        Remove the modifications of the model from the history.
+
+        Args:
+            model_id: ID of the model.
+
+        Returns: None
+        """
+        for delta in self.__undo_list + self.__redo_list:
+            if delta.get_model_id() == model_id:
+                delta.delete_file()
+
+        self.__undo_list = [delta for delta in self.__undo_list if delta.get_model_id() != model_id]
+        self.__redo_list = [delta for delta in self.__redo_list if delta.get_model_id() != model_id]
+
+    def set_memory_budget(self, memory_budget: int) -> None:
+        """
+        Change the memory budget of the history.
+
+        Args:
+            memory_budget: Maximum number of bytes that the compressed regions can use in memory.
+
+        Returns: None
+        """
+        self.__memory_budget = memory_budget
+        self.__enforce_budget()
+
+    def undo(self, get_model_vertices: Callable[[str], np.ndarray]) -> Union[Tuple[str, Region], None]:
+        """
+        Undo the last modification.
+
+        Args:
+            get_model_vertices: Function that returns the vertices of a model given its ID.
+
+        Returns: ID of the model modified and region of the model restored. None if there was nothing to undo.
+        """
+        return self.__apply(self.__undo_list, self.__redo_list, get_model_vertices)
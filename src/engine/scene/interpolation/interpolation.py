@@ -18,17 +18,19 @@
 """
 Module that defines the class interpolation. Base class to use for the definition of the other types of interpolation.
 """
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Tuple, Union
 
 import numpy as np
 
+from src.engine.scene.geometrical_operations import get_points_bounding_box
+from src.engine.scene.transformation_job import JobProgressMixin
 from src.error.interpolation_error import InterpolationError
 
 if TYPE_CHECKING:
     from src.engine.scene.scene import Scene
 
 
-class Interpolation:
+class Interpolation(JobProgressMixin):
     """
     Base class to use for the definition of the interpolation.
 
@@ -36,10 +38,14 @@ class Interpolation:
     """
 
     def __init__(self, model_id: str, polygon_id: str, distance: float):
+        super().__init__()
+
         self.__model_id = model_id
         self.__polygon_id = polygon_id
         self.__distance_interpolation = distance
 
+        self.__modified_area: Union[Tuple[float, float, float, float], None] = None
+
     @property
     def model_id(self) -> str:
         """Get the ID of the model used in the interpolation."""
@@ -73,6 +79,25 @@ class Interpolation:
         if self.distance <= 0:
             raise InterpolationError(2)
 
+        # The interpolation modify the points at the given distance of the polygon
+        # ------------------------------------------------------------------------
+        if self.polygon_id in scene.get_polygon_id_list():
+            bounding_box = get_points_bounding_box(scene.get_polygon_points(self.polygon_id))
+            if bounding_box is not None:
+                self.__modified_area = (bounding_box[0] - self.distance,
+                                        bounding_box[1] - self.distance,
+                                        bounding_box[2] + self.distance,
+                                        bounding_box[3] + self.distance)
+
+    def get_modified_area(self) -> Union[Tuple[float, float, float, float], None]:
+        """
+        Get the area of the map that can be modified by the interpolation.
+
+        Returns: Tuple with the minimum x, minimum y, maximum x and maximum y of the area. None if the interpolation
+                 can modify the whole map.
+        """
+        return self.__modified_area
+
     def apply(self) -> np.ndarray:
         """
         Apply the interpolation to the specified model.
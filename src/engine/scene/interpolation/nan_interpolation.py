@@ -79,6 +79,9 @@ class NanInterpolation(Interpolation, ABC):
         Fill the interpolation zone (points that are in the external polygon and outside of the internal polygon) with
         nan values.
 
+        The masks of the polygons are the first two of the three steps of the interpolations, the progress of both of
+        them is reported while they are generated.
+
         Args:
             model_vertices: Height array to modify (x, y)
             external_polygon_points: Points of the external polygon. [x, y, z, x, y, z, ...]
@@ -94,8 +97,8 @@ class NanInterpolation(Interpolation, ABC):
 
         # Generate masks to filter the points
         # -----------------------------------
-        mask_external = generate_mask(points_cut, self._external_polygon_points)
-        mask_internal = generate_mask(points_cut, self._polygon_points)
+        mask_external = generate_mask(points_cut, self._external_polygon_points, self.get_progress_callback(0, 3))
+        mask_internal = generate_mask(points_cut, self._polygon_points, self.get_progress_callback(1, 3))
 
         # Modify the vertices height
         # --------------------------
@@ -57,7 +57,10 @@ class NearestInterpolation(NanInterpolation):
         # --------------------------
         heights = self._model_vertices[:, :, 2]
         heights_cut = heights[min_y_index:max_y_index, min_x_index:max_x_index]
-        interpolated_heights = interpolate_nan(heights_cut, np.isnan(heights_cut), 'nearest')
+        interpolated_heights = interpolate_nan(heights_cut,
+                                               np.isnan(heights_cut),
+                                               'nearest',
+                                               self.get_progress_callback(2, 3))
         heights[min_y_index:max_y_index, min_x_index:max_x_index] = interpolated_heights
 
         return self._model_vertices
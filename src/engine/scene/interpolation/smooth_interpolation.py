@@ -26,8 +26,8 @@ import numpy as np
 from shapely.geometry.polygon import LinearRing
 from skimage.filters import gaussian
 
-from src.engine.scene.geometrical_operations import delete_z_axis, generate_mask, get_bounding_box_indexes, \
-    get_external_polygon_points
+from src.engine.scene.geometrical_operations import delete_z_axis, filter_in_row_blocks, generate_mask, \
+    get_bounding_box_indexes, get_external_polygon_points
 from src.engine.scene.interpolation.interpolation import Interpolation
 from src.error.interpolation_error import InterpolationError
 
@@ -102,10 +102,11 @@ class SmoothInterpolation(Interpolation):
 
         # Apply the filter to the points
         # ------------------------------
-        new_heights = gaussian(heights_cut)
+        # The default kernel of the gaussian filter (sigma 1, truncated at 4 sigmas) uses 4 rows on every side
+        new_heights = filter_in_row_blocks(heights_cut, gaussian, 4, self.get_progress_callback(0, 3))
 
-        mask = generate_mask(points_cut, self.__polygon_points)
-        mask_external = generate_mask(points_cut, self.__external_polygon_points)
+        mask = generate_mask(points_cut, self.__polygon_points, self.get_progress_callback(1, 3))
+        mask_external = generate_mask(points_cut, self.__external_polygon_points, self.get_progress_callback(2, 3))
         mask_in_between = mask != mask_external
 
         heights_cut[mask_in_between] = new_heights[mask_in_between]
@@ -49,6 +49,9 @@ class FillNanMapTransformation(MapTransformation):
         Get the information of the polygons that are loaded into the program and the information of the vertices of the
         model.
 
+        Only the polygons whose bounding boxes intersect the model are used, the rest of the polygons can not modify
+        the model.
+
         Args:
             scene: Scene to use to get the data.
 
@@ -64,9 +67,12 @@ class FillNanMapTransformation(MapTransformation):
 
         self.__model_vertices = scene.get_map2d_model_vertices_array(self.model_id)
 
-        # Get the information of the polygons
-        # -----------------------------------
-        polygon_id_list = scene.get_polygon_id_list()
+        # Get the information of the polygons that touch the model
+        # --------------------------------------------------------
+        polygon_id_list = scene.get_polygon_ids_in_bbox(float(np.min(self.__model_vertices[:, :, 0])),
+                                                        float(np.min(self.__model_vertices[:, :, 1])),
+                                                        float(np.max(self.__model_vertices[:, :, 0])),
+                                                        float(np.max(self.__model_vertices[:, :, 1])))
         for polygon_id in polygon_id_list:
             if not scene.is_polygon_planar(polygon_id):
                 raise MapTransformationError(2)
@@ -82,7 +88,8 @@ class FillNanMapTransformation(MapTransformation):
         points_array = self.__model_vertices
         height = self.__model_vertices[:, :, 2]
 
-        for polygon_id, polygon_points in self.__polygon_points.items():
+        for polygon_number, polygon_points in enumerate(self.__polygon_points.values()):
+            self.report_progress(polygon_number / len(self.__polygon_points))
 
             # Do nothing if polygon does not have enough points
             # -------------------------------------------------
@@ -106,7 +113,9 @@ class FillNanMapTransformation(MapTransformation):
 
             # Generate mask for the points
             # ----------------------------
-            flags = generate_mask(points_array_cut, polygon_points)
+            flags = generate_mask(points_array_cut,
+                                  polygon_points,
+                                  self.get_progress_callback(polygon_number, len(self.__polygon_points)))
 
             # Set nan to the height values
             # ----------------------------
@@ -85,7 +85,8 @@ class InterpolateNanMapTransformation(MapTransformation):
 
         new_heights = interpolate_nan(heights,
                                       nan_mask,
-                                      self.__interpolation_type.value)
+                                      self.__interpolation_type.value,
+                                      self.report_progress)
 
         self.__model_vertices[:, :, 2] = new_heights
         return self.__model_vertices
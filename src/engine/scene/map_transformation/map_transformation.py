@@ -20,22 +20,24 @@ Module that defines the main class to use for the transformation of the maps. Al
 complete maps must inherit from the class defined in this module.
 """
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Tuple, Union
 
 import numpy as np
 
+from src.engine.scene.transformation_job import JobProgressMixin
 from src.error.map_transformation_error import MapTransformationError
 
 if TYPE_CHECKING:
     from src.engine.scene.scene import Scene
 
 
-class MapTransformation:
+class MapTransformation(JobProgressMixin):
     """
     Base class to use for the transformation of the maps.
     """
 
     def __init__(self, model_to_modify: str):
+        super().__init__()
         self.__modified_model_id: str = model_to_modify
 
     @property
@@ -60,6 +62,16 @@ class MapTransformation:
         if self.model_id is None:
             raise MapTransformationError(0)
 
+    def get_modified_area(self) -> Union[Tuple[float, float, float, float], None]:
+        """
+        Get the area of the map that can be modified by the transformation.
+
+        Map transformations modify the whole map.
+
+        Returns: None
+        """
+        return None
+
     def apply(self) -> np.ndarray:
         """
         Apply the transformation over the maps.
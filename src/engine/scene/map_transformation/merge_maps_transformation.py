@@ -27,7 +27,7 @@ from typing import TYPE_CHECKING
 
 import numpy as np
 
-from src.engine.scene.geometrical_operations import merge_matrices
+from src.engine.scene.geometrical_operations import get_row_blocks, merge_matrices
 from src.engine.scene.map_transformation.map_transformation import MapTransformation
 from src.error.map_transformation_error import MapTransformationError
 
@@ -78,7 +78,10 @@ class MergeMapsTransformation(MapTransformation):
         base_model_heights = self.__base_model_vertices[:, :, 2]
         second_model_heights = self.__second_model_vertices[:, :, 2]
 
-        new_heights = merge_matrices(base_model_heights, second_model_heights)
+        blocks = get_row_blocks(*base_model_heights.shape)
+        for block_number, (start, end) in enumerate(blocks):
+            base_model_heights[start:end] = merge_matrices(base_model_heights[start:end],
+                                                           second_model_heights[start:end])
+            self.report_progress((block_number + 1) / len(blocks))
 
-        self.__base_model_vertices[:, :, 2] = new_heights
         return self.__base_model_vertices
@@ -25,6 +25,7 @@ from typing import TYPE_CHECKING
 import cv2
 import numpy as np
 
+from src.engine.scene.geometrical_operations import filter_in_row_blocks
 from src.engine.scene.map_transformation.map_transformation import MapTransformation
 from src.error.map_transformation_error import MapTransformationError
 
@@ -89,7 +90,10 @@ class NanConvolutionMapTransformation(MapTransformation):
 
         # Apply the kernel to the vertices
         # --------------------------------
-        nan_percentage_mask = cv2.filter2D(heights_nan_int, -1, kernel)
+        nan_percentage_mask = filter_in_row_blocks(heights_nan_int,
+                                                   lambda block: cv2.filter2D(block, -1, kernel),
+                                                   self.__kernel_diameter // 2,
+                                                   self.report_progress)
 
         # Modify values on the height matrix
         # ----------------------------------
@@ -23,6 +23,7 @@ from typing import TYPE_CHECKING
 
 import numpy as np
 
+from src.engine.scene.geometrical_operations import get_row_blocks
 from src.engine.scene.map_transformation.map_transformation import MapTransformation
 from src.error.map_transformation_error import MapTransformationError
 
@@ -70,7 +71,10 @@ class ReplaceNanValuesInMap(MapTransformation):
         main_model_heights = self.__main_model_vertices[:, :, 2]
         secondary_model_heights = self.__secondary_model_vertices[:, :, 2]
 
-        values_to_modify = np.logical_not(np.isnan(secondary_model_heights))
-        main_model_heights[values_to_modify] = np.nan
+        blocks = get_row_blocks(*main_model_heights.shape)
+        for block_number, (start, end) in enumerate(blocks):
+            values_to_modify = np.logical_not(np.isnan(secondary_model_heights[start:end]))
+            main_model_heights[start:end][values_to_modify] = np.nan
+            self.report_progress((block_number + 1) / len(blocks))
 
         return self.__main_model_vertices
@@ -22,6 +22,7 @@ from typing import TYPE_CHECKING
 
 import numpy as np
 
+from src.engine.scene.geometrical_operations import get_row_blocks
 from src.engine.scene.map_transformation.map_transformation import MapTransformation
 from src.error.map_transformation_error import MapTransformationError
 
@@ -75,9 +76,11 @@ class SubtractMap(MapTransformation):
         Returns: Vertices of the main model modified.
         """
         main_model_heights = self.__main_model_vertices[:, :, 2]
-        secondary_model_heights = np.nan_to_num(self.__secondary_model_vertices[:, :, 2])
+        secondary_model_heights = self.__secondary_model_vertices[:, :, 2]
 
-        main_model_heights = main_model_heights - secondary_model_heights
-        self.__main_model_vertices[:, :, 2] = main_model_heights
+        blocks = get_row_blocks(*main_model_heights.shape)
+        for block_number, (start, end) in enumerate(blocks):
+            main_model_heights[start:end] -= np.nan_to_num(secondary_model_heights[start:end])
+            self.report_progress((block_number + 1) / len(blocks))
 
         return self.__main_model_vertices
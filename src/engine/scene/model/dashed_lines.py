@@ -18,24 +18,37 @@
 """
 Files with the DashedLines class. Class is in charge of render dashed lines on the screen.
 """
+from typing import Union
+
 import OpenGL.GL as GL
+import numpy as np
 
 from src.engine.scene.model.lines import Lines
+from src.engine.scene.model.polygon_geometry import PolygonGeometry
+from src.engine.scene.model.shader_cache import ShaderCache
 
 
 class DashedLines(Lines):
     """
     Class in charge of render dashed lines.
+
+    If a PolygonGeometry is given, the model draw only the line that joins the last point of the geometry with the
+    first one (the line that closes the polygon), and only if the geometry has three or more points.
     """
 
-    def __init__(self, scene):
+    def __init__(self, scene, geometry: Union[PolygonGeometry, None] = None):
         """
         Constructor of the class.
 
         Args:
             scene: Scene to use for rendering.
+            geometry: Geometry with the points of the polygon to close.
         """
-        super().__init__(scene)
+        super().__init__(scene, geometry=geometry)
+
+        if geometry is not None:
+            self.draw_mode = GL.GL_LINES
+        self.__closed_points = 0  # Number of points of the geometry when the closing line was generated
 
         self.transparency = 0.3
         self.dash_size = 10
@@ -52,6 +65,24 @@ class DashedLines(Lines):
 
         self.set_shaders(self.__vertex_shader_file, self.__fragment_shader_file)
 
+    def _update_geometry_range(self) -> None:
+        """
+        Update the indices of the line that closes the polygon of the geometry.
+
+        The indices are only sent to the GPU when the number of points of the geometry changes.
+
+        Returns: None
+        """
+        number_of_points = self.get_geometry().get_number_of_points()
+        if number_of_points == self.__closed_points:
+            return
+
+        self.__closed_points = number_of_points
+        if number_of_points >= 3:
+            self.set_indices(np.array([number_of_points - 1, 0], dtype=np.uint32))
+        else:
+            self.indices_size = 0
+
     def _update_uniforms(self) -> None:
         """
         Update the uniforms of the model
@@ -60,12 +91,9 @@ class DashedLines(Lines):
         """
         super()._update_uniforms()
 
-        u_resolution_location = GL.glGetUniformLocation(self.shader_program, "u_resolution")
-        u_dashSize_location = GL.glGetUniformLocation(self.shader_program, "u_dashSize")
-        u_gapSize_location = GL.glGetUniformLocation(self.shader_program, "u_gapSize")
+        u_dashSize_location = ShaderCache.get_uniform_location(self.shader_program, "u_dashSize")
+        u_gapSize_location = ShaderCache.get_uniform_location(self.shader_program, "u_gapSize")
 
-        scene_settings = self.scene.get_scene_setting_data()
-        GL.glUniform2f(u_resolution_location, scene_settings["SCENE_WIDTH_X"], scene_settings["SCENE_HEIGHT_Y"])
         GL.glUniform1f(u_dashSize_location, self.dash_size)
         GL.glUniform1f(u_gapSize_location, self.gap_size)
 
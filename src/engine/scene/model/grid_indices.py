@@ -0,0 +1,143 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+Module with the functions used to generate the indices of the triangles of the grids used by the map models.
+"""
+from typing import Union
+
+import numpy as np
+
+# Index used to separate the triangle strips in the element buffers (GL_PRIMITIVE_RESTART).
+PRIMITIVE_RESTART_INDEX = np.uint32(0xFFFFFFFF)
+
+
+def generate_grid_indices(rows: np.ndarray,
+                          cols: np.ndarray,
+                          grid_cols: int,
+                          nan_mask: Union[np.ndarray, None] = None,
+                          triangle_strips: bool = False) -> np.ndarray:
+    """
+    Generate the indices of the triangles that join the selected vertices of a grid.
+
+    The vertices are expected to be stored as in the Map2DModel, this is, the index of the vertex in the row r and
+    column c is r * grid_cols + c.
+
+    If the nan_mask is given, the triangles whose three vertices are NaN are not generated.
+
+    If triangle_strips is True, the indices are generated as triangle strips (one for every row of cells) separated
+    by the PRIMITIVE_RESTART_INDEX, using one third of the memory used by the list of triangles. In this case, the
+    cells are dropped only if their four vertices are NaN.
+
+    Args:
+        rows: Rows of the grid to use, in ascending order.
+        cols: Columns of the grid to use, in ascending order.
+        grid_cols: Number of columns of the grid.
+        nan_mask: Boolean matrix of shape (len(rows), len(cols)) indicating the selected vertices that are NaN.
+        triangle_strips: If the indices are generated as triangle strips or as a list of triangles.
+
+    Returns: Array of type uint32 with the indices.
+    """
+    if len(rows) < 2 or len(cols) < 2:
+        return np.zeros(0, dtype=np.uint32)
+
+    rows = np.asarray(rows, dtype=np.uint32)
+    cols = np.asarray(cols, dtype=np.uint32)
+    grid_cols = np.uint32(grid_cols)
+
+    if triangle_strips:
+        return _generate_strips(rows, cols, grid_cols, nan_mask)
+
+    bottom_rows = (rows[:-1] * grid_cols)[:, np.newaxis]
+    top_rows = (rows[1:] * grid_cols)[:, np.newaxis]
+    left_cols = cols[:-1][np.newaxis, :]
+    right_cols = cols[1:][np.newaxis, :]
+
+    indices = np.empty((len(rows) - 1, len(cols) - 1, 6), dtype=np.uint32)
+    indices[:, :, 0] = bottom_rows + left_cols
+    indices[:, :, 1] = bottom_rows + right_cols
+    indices[:, :, 2] = top_rows + left_cols
+    indices[:, :, 3] = bottom_rows + right_cols
+    indices[:, :, 4] = top_rows + right_cols
+    indices[:, :, 5] = top_rows + left_cols
+
+    if nan_mask is None:
+        return indices.reshape(-1)
+
+    # Drop the triangles with all their vertices NaN
+    # ----------------------------------------------
+    bottom_left = nan_mask[:-1, :-1]
+    bottom_right = nan_mask[:-1, 1:]
+    top_left = nan_mask[1:, :-1]
+    top_right = nan_mask[1:, 1:]
+
+    keep = np.empty((len(rows) - 1, len(cols) - 1, 2), dtype=bool)
+    keep[:, :, 0] = ~(bottom_left & bottom_right & top_left)
+    keep[:, :, 1] = ~(bottom_right & top_right & top_left)
+
+    return indices.reshape(-1, 3)[keep.reshape(-1)].reshape(-1)
+
+
+def _generate_strips(rows: np.ndarray,
+                     cols: np.ndarray,
+                     grid_cols: np.uint32,
+                     nan_mask: Union[np.ndarray, None]) -> np.ndarray:
+    """
+    Generate the indices of the grid as triangle strips separated by the PRIMITIVE_RESTART_INDEX.
+
+    Every group of consecutive cells of a row of cells that are not NaN generates one strip.
+
+    Args:
+        rows: Rows of the grid to use, in ascending order.
+        cols: Columns of the grid to use, in ascending order.
+        grid_cols: Number of columns of the grid.
+        nan_mask: Boolean matrix of shape (len(rows), len(cols)) indicating the selected vertices that are NaN.
+
+    Returns: Array of type uint32 with the indices.
+    """
+    if nan_mask is None:
+        keep = np.ones((len(rows) - 1, len(cols) - 1), dtype=bool)
+    else:
+        keep = ~(nan_mask[:-1, :-1] & nan_mask[:-1, 1:] & nan_mask[1:, :-1] & nan_mask[1:, 1:])
+
+    # Find the groups of consecutive cells to keep in every row of cells
+    # ------------------------------------------------------------------
+    padded = np.zeros((keep.shape[0], keep.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = keep
+    changes = np.diff(padded, axis=1)
+    strip_rows, strip_starts = np.nonzero(changes == 1)
+    _, strip_ends = np.nonzero(changes == -1)
+
+    if len(strip_rows) == 0:
+        return np.zeros(0, dtype=np.uint32)
+
+    # Every strip uses the columns from the start to the end of the group (both included)
+    # -----------------------------------------------------------------------------------
+    strip_lengths = strip_ends - strip_starts + 1
+    strip_ids = np.repeat(np.arange(len(strip_lengths)), strip_lengths)
+    first_position = np.cumsum(strip_lengths) - strip_lengths
+    strip_cols = strip_starts[strip_ids] + np.arange(len(strip_ids)) - first_position[strip_ids]
+    strip_grid_rows = strip_rows[strip_ids]
+
+    # Every column of the strip adds two indices, and every strip ends with a restart index
+    # -------------------------------------------------------------------------------------
+    indices = np.full(2 * len(strip_ids) + len(strip_lengths), PRIMITIVE_RESTART_INDEX, dtype=np.uint32)
+    positions = 2 * np.arange(len(strip_ids)) + strip_ids
+    indices[positions] = rows[strip_grid_rows] * grid_cols + cols[strip_cols]
+    indices[positions + 1] = rows[strip_grid_rows + 1] * grid_cols + cols[strip_cols]
+
+    return indices
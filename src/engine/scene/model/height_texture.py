@@ -0,0 +1,74 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+Module with the functions used to generate the height textures used to render the maps in 2D as rasters.
+"""
+from typing import List
+
+import numpy as np
+
+
+def downsample_heights(heights: np.ndarray) -> np.ndarray:
+    """
+    Reduce the size of the heights matrix to the half, using the mean of every block of 2x2 values.
+
+    NaN values are ignored when calculating the mean, blocks with only NaN values generate a NaN value. The size of the
+    result is the half of the size of the matrix rounded down (and at least 1), as OpenGL expects from the levels of a
+    texture, so the last row or column of matrices with an odd number of rows or columns is added to the last block.
+
+    Args:
+        heights: Matrix with the heights.
+
+    Returns: Matrix of type float32 with the half of the rows and columns (rounded down).
+    """
+    heights = np.asarray(heights, dtype=np.float64)
+    rows, cols = heights.shape
+    row_starts = np.arange(max(rows // 2, 1)) * 2
+    col_starts = np.arange(max(cols // 2, 1)) * 2
+
+    nan_mask = np.isnan(heights)
+    sums = np.add.reduceat(np.add.reduceat(np.where(nan_mask, 0, heights), row_starts, axis=0), col_starts, axis=1)
+    counts = np.add.reduceat(np.add.reduceat(~nan_mask, row_starts, axis=0, dtype=np.int64), col_starts, axis=1)
+
+    with np.errstate(invalid='ignore'):  # mean of blocks with only NaN values
+        return (sums / counts).astype(np.float32)
+
+
+def generate_height_pyramid(heights: np.ndarray, max_texture_size: int) -> List[np.ndarray]:
+    """
+    Generate the levels of the texture used to render the heights of the map.
+
+    The first level is the matrix of heights (reduced until it fits in the max texture size supported) and every level
+    after that is half the size of the previous one (rounded down), until the last level, that has only one value.
+
+    Args:
+        heights: Matrix with the heights of the map.
+        max_texture_size: Max number of values in every dimension of the texture.
+
+    Returns: List with the levels of the texture, from the biggest to the smallest.
+    """
+    level = np.ascontiguousarray(heights, dtype=np.float32)
+    while level.shape[0] > max_texture_size or level.shape[1] > max_texture_size:
+        level = downsample_heights(level)
+
+    pyramid = [level]
+    while level.shape[0] > 1 or level.shape[1] > 1:
+        level = downsample_heights(level)
+        pyramid.append(level)
+
+    return pyramid
@@ -19,10 +19,14 @@
 File with the class Lines, class in charge of storing all the information related to the models that draw lines on
 the scene.
 """
+from typing import Union
+
 import OpenGL.GL as GL
 import numpy as np
 
 from src.engine.scene.model.model import Model
+from src.engine.scene.model.polygon_geometry import PolygonGeometry
+from src.engine.scene.model.shader_cache import ShaderCache
 from src.utils import get_logger
 
 log = get_logger(module="LINES")
@@ -31,9 +35,12 @@ log = get_logger(module="LINES")
 class Lines(Model):
     """
     Class in charge of the modeling and drawing lines in the engine.
+
+    The lines can be defined by pairs of points (added with the method add_line) or by the points of a PolygonGeometry
+    shared with other models, in which case the lines join every point of the geometry with the next one.
     """
 
-    def __init__(self, scene, point_list: np.ndarray = None):
+    def __init__(self, scene, point_list: np.ndarray = None, geometry: Union[PolygonGeometry, None] = None):
         """
         Constructor of the class
 
@@ -43,10 +50,11 @@ class Lines(Model):
         Args:
             point_list: List of points to use as initial value. This array will not be modified.
                         Format of the array must be [[x, y, z], [x, y, z], ...]
+            geometry: Geometry with the points to join with lines. If given, the point_list is ignored.
         """
         super().__init__(scene)
 
-        self.draw_mode = GL.GL_LINES
+        self.draw_mode = GL.GL_LINES if geometry is None else GL.GL_LINE_STRIP
 
         self.update_uniform_values = True
 
@@ -60,10 +68,16 @@ class Lines(Model):
         self.__border_color = (0, 0, 0, 1)
         self.__use_border = False
 
+        self.__geometry = geometry
+
         self.set_shaders(self.__vertex_shader_file, self.__fragment_shader_file)
 
+        # use the vertex buffer of the geometry if given
+        if geometry is not None:
+            self.set_vertex_buffer(geometry.get_vertex_buffer())
+
         # initialize model if data is given
-        if point_list is not None:
+        elif point_list is not None:
             points_copy = point_list.copy()
 
             # Check points
@@ -82,6 +96,16 @@ class Lines(Model):
             self.__indices_list = list(np.arange(0, (number_points - 1) * 2))
             self.set_indices(np.array(self.__indices_list, dtype=np.uint32))
 
+    def _update_geometry_range(self) -> None:
+        """
+        Update the vertices of the geometry drawn by the model.
+
+        The lines join all the points of the geometry in order.
+
+        Returns: None
+        """
+        self.vertex_range = (0, self.__geometry.get_number_of_points())
+
     def _update_uniforms(self) -> None:
         """
         Update the uniforms values for the model.
@@ -90,16 +114,15 @@ class Lines(Model):
         """
 
         # Update values for the polygon shader
-        projection_location = GL.glGetUniformLocation(self.shader_program, "projection")
-        polygon_color_location = GL.glGetUniformLocation(self.shader_program, "lines_color")
+        # The projection matrix is read from the uniform block shared by all the shaders (CameraUniformBuffer)
+        polygon_color_location = ShaderCache.get_uniform_location(self.shader_program, "lines_color")
 
-        # Set the color and projection matrix to use
+        # Set the color to use
         GL.glUniform4f(polygon_color_location,
                        self.__line_color[0],
                        self.__line_color[1],
                        self.__line_color[2],
                        self.__line_color[3])
-        GL.glUniformMatrix4fv(projection_location, 1, GL.GL_TRUE, self.scene.get_projection_matrix_2D())
 
     def add_line(self, first_point: tuple, second_point: tuple):
         """
@@ -135,6 +158,8 @@ class Lines(Model):
 
         Returns: Number of points in the model.
         """
+        if self.__geometry is not None:
+            return self.__geometry.get_number_of_points()
         return int(len(self.__point_list) / 3)
 
     def draw(self) -> None:
@@ -144,8 +169,13 @@ class Lines(Model):
         Returns: None
         """
 
+        # send the new points of the geometry to the GPU
+        if self.__geometry is not None:
+            self.__geometry.update_buffer()
+            self._update_geometry_range()
+
         # draw if there is at least one line to draw
-        if len(self.__point_list) / 3 > 1:
+        if self.get_number_of_points() > 1:
 
             # Get the data to draw the lines
             render_settings = self.scene.get_render_settings()
@@ -228,6 +258,14 @@ class Lines(Model):
         """
         self.__border_color = (color[0], color[1], color[2], color[3])
 
+    def get_geometry(self) -> Union[PolygonGeometry, None]:
+        """
+        Get the geometry with the points joined by the lines.
+
+        Returns: Geometry used by the model. None if the lines are defined by pairs of points.
+        """
+        return self.__geometry
+
     def get_line_color(self) -> tuple:
         """
         Get the color of the lines.
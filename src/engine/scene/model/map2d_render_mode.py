@@ -0,0 +1,32 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+Module that defines an Enum with the modes accepted to render the maps in 2D.
+"""
+from enum import Enum
+
+
+class Map2DRenderMode(Enum):
+    """
+    Render modes accepted by the 2D maps.
+
+    mesh: The map is rendered as a mesh of triangles, with the definition depending on the zoom level.
+    raster: The map is rendered as an image, using a texture with the heights of the map.
+    """
+    mesh = 1
+    raster = 2
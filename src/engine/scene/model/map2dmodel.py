@@ -18,12 +18,21 @@
 """
 Class in charge of managing the models of the maps in 2 dimensions.
 """
-from typing import List, Union
+import ctypes
+from typing import Dict, List, Tuple, Union
 
 import OpenGL.GL as GL
 import numpy as np
 
+from src.engine.cancellation_token import CancellationToken
+from src.engine.scene.model.grid_indices import PRIMITIVE_RESTART_INDEX
+from src.engine.scene.model.height_texture import generate_height_pyramid
+from src.engine.scene.model.map2d_render_mode import Map2DRenderMode
 from src.engine.scene.model.mapmodel import MapModel
+from src.engine.scene.model.refresh_debouncer import RefreshDebouncer
+from src.engine.scene.model.shader_cache import ShaderCache
+from src.engine.scene.model.tile_quadtree import TileKey, TileLRUCache, TileQuadtree
+from src.engine.thread_task_priority import ThreadTaskPriority
 from src.input.CTP import read_file
 from src.utils import get_logger
 
@@ -38,6 +47,21 @@ class Map2DModel(MapModel):
     The height of the points of the model are passed as a vertex array to the shaders and the data from the color files
     is passed as an uniform. The coloration of the models is done inside the shaders.
 
+    The triangles of the model are divided in tiles of a quadtree (TileQuadtree), each tile with its own element
+    buffer. Only the tiles that are showed on the screen are drawn, using the level of detail required by the zoom
+    level of the scene. The tiles that are not loaded yet are replaced by the tiles of the upper levels until they are
+    generated in another thread, and the tiles that were not used for the longest time are deleted from the GPU when
+    the memory used by them exceeds the budget defined in the settings.
+
+    Triangles whose vertices are all NaN are not added to the tiles. When the heights of the model are updated, only
+    the loaded tiles that cover the region where the NaN values changed are generated again. The tiles can also be
+    generated as triangle strips (separated by the PRIMITIVE_RESTART_INDEX) if configured in the settings.
+
+    The model can also be rendered as a raster (Map2DRenderMode.raster). In this mode, the heights of the model are
+    stored in a float texture with a level for every zoom level (each one with the mean of the values of the previous
+    level) and a quad covering the whole map is drawn sampling the texture, showing every cell of the map at any zoom
+    level. The raster mode expects the values of the axis of the grid to be spaced uniformly.
+
     Open GL variables:
         glVertexAttributePointer 1: Heights of the vertices.
 
@@ -59,77 +83,35 @@ class Map2DModel(MapModel):
         self.__x = None  # Values used for the x-axis of the model
         self.__y = None  # Values used for the y-axis of the model
 
+        # Tiles variables
+        # ---------------
+        self.__quadtree: Union[TileQuadtree, None] = None
+        self.__tile_cache: Union[TileLRUCache, None] = None
+        self.__tile_buffers: Dict[TileKey, Tuple[int, int]] = {}  # key -> (element buffer, number of indices)
+        self.__visible_tiles: List[TileKey] = []  # tiles that should be drawn with the current zoom level
+        self.__tiles_to_draw: List[TileKey] = []  # loaded tiles used to draw the visible tiles
+        self.__loading_tiles_then: List[callable] = []  # routines to execute after the tiles being generated are loaded
+        self.__last_showed_limits: Union[dict, None] = None  # limits used to calculate the visible tiles
+        self.__last_refreshed_limits: Union[dict, None] = None  # limits used the last time that tiles were loaded
+        self.__tiles_debouncer: Union[RefreshDebouncer, None] = None
+        self.__quality: int = 1
+        self.__use_triangle_strips: bool = False
+        self.__nan_mask: Union[np.ndarray, None] = None  # NaN vertices used to generate the loaded tiles
+
+        # Raster variables
+        # ----------------
+        self.__render_mode = Map2DRenderMode.mesh
+        self.__raster_vao = None
+        self.__raster_vbo = None
+        self.__raster_vertex_shader_file = './src/engine/shaders/model_2d_raster_vertex.glsl'
+        self.__raster_fragment_shader_file = './src/engine/shaders/model_2d_raster_fragment.glsl'
+        self.__height_texture = None
+        self.__height_texture_outdated: bool = True  # if the texture does not have the last heights of the model
+        self.__loading_height_texture: bool = False  # if there is a thread generating the levels of the texture
+
         # utilities variables
-        self.__triangles_to_delete = np.array([])  # triangles overlapped to delete when optimizing memory
         self.__name = name  # name of the model. Can be None
 
-    def __add_triangles_inside_zone_to_delete_list(self,
-                                                   left_coordinate: float,
-                                                   right_coordinate: float,
-                                                   top_coordinate: float,
-                                                   bottom_coordinate: float) -> None:
-        """
-        Delete all the indices of the the triangles that are inside the zone from the
-        list of indices.
-
-        Args:
-            left_coordinate: Left coordinate to check
-            right_coordinate: Right coordinate to check
-            top_coordinate: Top coordinate to check
-            bottom_coordinate: Bottom coordinate to check
-
-        Returns: None
-        """
-        log.debug('Add triangles inside zone to delete list...')
-
-        # Get the variables and matrix to use
-        # --------------------------
-        log.debug('Converting array in array')
-        indices_array = self.get_indices_array()
-        indices_array = indices_array.reshape(-1)
-        vertices_array = self.get_vertices_array().reshape((-1, 3))
-
-        log.debug('Apply of masks and reshape')
-        indices_with_coords_array = vertices_array[indices_array]  # time consuming
-        indices_with_coords_array = indices_with_coords_array.reshape((-1, 3, 3))
-        log.debug('End of applying masks and reshape')
-
-        # find out the indices with triangles inside the zone using masks
-        # ---------------------------------------------------------------
-        indices_with_coords_array = indices_with_coords_array.reshape((-1, 9)).transpose()
-
-        log.debug('Generating mask with values')
-        mask = np.ones(len(indices_with_coords_array[0]), dtype=bool)
-
-        mask[np.where(indices_with_coords_array[0] < left_coordinate)[0]] = False
-        mask[np.where(indices_with_coords_array[3] < left_coordinate)[0]] = False
-        mask[np.where(indices_with_coords_array[6] < left_coordinate)[0]] = False
-
-        mask[np.where(indices_with_coords_array[0] > right_coordinate)[0]] = False
-        mask[np.where(indices_with_coords_array[3] > right_coordinate)[0]] = False
-        mask[np.where(indices_with_coords_array[6] > right_coordinate)[0]] = False
-
-        mask[np.where(indices_with_coords_array[1] < bottom_coordinate)[0]] = False
-        mask[np.where(indices_with_coords_array[4] < bottom_coordinate)[0]] = False
-        mask[np.where(indices_with_coords_array[7] < bottom_coordinate)[0]] = False
-
-        mask[np.where(indices_with_coords_array[1] > top_coordinate)[0]] = False
-        mask[np.where(indices_with_coords_array[4] > top_coordinate)[0]] = False
-        mask[np.where(indices_with_coords_array[7] > top_coordinate)[0]] = False
-
-        inside = np.where(mask == True)[0]  # noqa
-
-        log.debug('Converting array to list')
-        to_delete = inside
-
-        log.debug(f"Triangles to delete added: {len(to_delete)}")
-
-        # Add triangles to delete to the list of the model
-        # ------------------------------------------------
-        log.debug('Concatenating arrays')
-        self.__triangles_to_delete = np.concatenate((self.__triangles_to_delete, to_delete))
-        log.debug('Ended concatenating arrays')
-
     # noinspection SpellCheckingInspection
     def __bilinear_interpolation(self, x: float, y: float, points: List[tuple]) -> float:
         """
@@ -156,38 +138,47 @@ class Map2DModel(MapModel):
                 q22 * (x - x1) * (y - y1)
                 ) / ((x2 - x1) * (y2 - y1) + 0.0)
 
-    def __generate_index_list(self,
-                              step_x: int,
-                              step_y: int,
-                              left_coordinate: float = -180,
-                              right_coordinate: float = 180,
-                              top_coordinate: float = 90,
-                              bottom_coordinate: float = -90) -> np.ndarray:
+    def __delete_tile(self, key: TileKey) -> None:
         """
-        Generate an index list given an already loaded list of vertices.
+        Delete the element buffer of the tile from the GPU.
 
-        Vertices are expected to be given as in the output of the __generate_vertices_list method.
+        Args:
+            key: Key of the tile to delete.
 
-        The coordinates values are used to generate the index of just a part of the total of the vertices.
+        Returns: None
+        """
+        ebo, _ = self.__tile_buffers.pop(key)
+        GL.glDeleteBuffers(1, [ebo])
+        self.__tile_cache.remove(key)
 
-        Args:
-            left_coordinate: Left coordinate to cut the map.
-            right_coordinate: Right coordinate to cut the map.
-            top_coordinate: Top coordinate to cut the map.
-            bottom_coordinate: Bottom coordinate to cut the map.
-            step_x: Number of vertices in the x axis
-            step_y: Number of elements in the y axis
-
-        Returns: List of index
-        """
-        return self._generate_index_list(step_x,
-                                         step_y,
-                                         self.__x,
-                                         self.__y,
-                                         left_coordinate,
-                                         right_coordinate,
-                                         top_coordinate,
-                                         bottom_coordinate)
+    def __delete_tiles_over_budget(self) -> None:
+        """
+        Delete the least recently used tiles until the memory used by the tiles is under the budget.
+
+        The tiles being drawn are never deleted.
+
+        Returns: None
+        """
+        for key in self.__tile_cache.get_keys_to_evict(self.__tiles_to_draw):
+            self.__delete_tile(key)
+
+    def __draw_raster(self) -> None:
+        """
+        Draw the model as a raster, using the height texture of the model.
+
+        Returns: None
+        """
+        raster_shader_program = ShaderCache.get_program(self.__raster_vertex_shader_file,
+                                                        self.__raster_fragment_shader_file)
+        GL.glUseProgram(raster_shader_program)
+
+        GL.glUniform1i(ShaderCache.get_uniform_location(raster_shader_program, "height_texture"), 0)
+        self.__update_colors_uniforms(raster_shader_program)
+
+        GL.glActiveTexture(GL.GL_TEXTURE0)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, self.__height_texture)
+        GL.glBindVertexArray(self.__raster_vao)
+        GL.glDrawArrays(GL.GL_TRIANGLE_FAN, 0, 4)
 
     def __generate_vertices_list(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
         """
@@ -237,6 +228,68 @@ class Map2DModel(MapModel):
         """
         return self._get_index_closest_value(list_to_evaluate, value)
 
+    def __get_index_range(self, showed_limits: dict, extra_proportion: float = 1) -> Tuple[int, int, int, int]:
+        """
+        Get the range of vertices of the grid showed on the screen.
+
+        Args:
+            showed_limits: Dictionary with the coordinates showed on the screen.
+            extra_proportion: Proportion to extend the limits in every direction.
+
+        Returns: Range of vertices as (row_min, row_max, col_min, col_max).
+        """
+        extra_x = (showed_limits['right'] - showed_limits['left']) * (extra_proportion - 1)
+        extra_y = (showed_limits['top'] - showed_limits['bottom']) * (extra_proportion - 1)
+
+        col_left = self.__get_index_closest_value(self.__x, showed_limits['left'] - extra_x)
+        col_right = self.__get_index_closest_value(self.__x, showed_limits['right'] + extra_x)
+        row_bottom = self.__get_index_closest_value(self.__y, showed_limits['bottom'] - extra_y)
+        row_top = self.__get_index_closest_value(self.__y, showed_limits['top'] + extra_y)
+
+        return min(row_bottom, row_top), max(row_bottom, row_top), min(col_left, col_right), max(col_left, col_right)
+
+    def __get_prefetch_tiles(self, last_limits: Union[dict, None], showed_limits: dict, level: int) -> List[TileKey]:
+        """
+        Get the tiles that will be showed on the screen if the map keeps moving in the same direction.
+
+        The direction is calculated from the difference between the last limits used to load the tiles and the
+        new ones. If the zoom changed or the map did not move, then no tiles are returned.
+
+        Args:
+            last_limits: Dictionary with the coordinates showed on the screen the last time that tiles were loaded.
+            showed_limits: Dictionary with the coordinates showed on the screen.
+            level: Level of the tiles to return.
+
+        Returns: List with the keys of the tiles to prefetch.
+        """
+        if last_limits is None:
+            return []
+
+        width = showed_limits['right'] - showed_limits['left']
+        height = showed_limits['top'] - showed_limits['bottom']
+        if not np.isclose(width, last_limits['right'] - last_limits['left']) or \
+                not np.isclose(height, last_limits['top'] - last_limits['bottom']):
+            return []
+
+        movement_x = showed_limits['left'] - last_limits['left']
+        movement_y = showed_limits['bottom'] - last_limits['bottom']
+        movement_norm = np.hypot(movement_x, movement_y)
+        if movement_norm == 0:
+            return []
+
+        # Move the limits a whole screen in the direction of the movement
+        # ---------------------------------------------------------------
+        offset_x = width * movement_x / movement_norm
+        offset_y = height * movement_y / movement_norm
+        prefetch_limits = {
+            'left': showed_limits['left'] + offset_x,
+            'right': showed_limits['right'] + offset_x,
+            'top': showed_limits['top'] + offset_y,
+            'bottom': showed_limits['bottom'] + offset_y
+        }
+
+        return self.__quadtree.get_tiles_in_range(level, *self.__get_index_range(prefetch_limits))
+
     def __get_vertex_index(self, x_pos: int, y_pos: int) -> int:
         """
         Get the vertex index in the buffer given the x and y position.
@@ -252,62 +305,403 @@ class Map2DModel(MapModel):
         """
         return self._get_vertex_index(x_pos, y_pos, self.__x)
 
-    def __is_triangle_inside_zone(self,
-                                  index_triangle: list,
-                                  left_coordinate: float,
-                                  right_coordinate: float,
-                                  top_coordinate: float,
-                                  bottom_coordinate: float) -> bool:
+    def __get_visible_tiles(self, showed_limits: dict, quality: int) -> List[TileKey]:
         """
-        Checks if a triangle is contained inside a certain zone given their indices.
+        Get the tiles needed to fill the screen with the definition required by the zoom level.
 
         Args:
-            index_triangle: Indices of the vertices of the triangle. List of 3 elements.
-            left_coordinate: Left coordinate to check
-            right_coordinate: Right coordinate to check
-            top_coordinate: Top coordinate to check
-            bottom_coordinate: Bottom coordinate to check
-
-        Returns: Boolean indicating if the triangle is contained in the zone.
-        """
-        # Check the vertices given the indices
-        # :::: Remember that vertices are composed of 3 values, thus, we need to
-        # :::: multiply the index value by 3
-        # ---------------------------------------------------------------------
-        for coordinate in index_triangle:
-            vertices = self.get_vertices_array()
-            if vertices[coordinate * 3] < left_coordinate or \
-                    vertices[coordinate * 3] > right_coordinate or \
-                    vertices[coordinate * 3 + 1] < bottom_coordinate or \
-                    vertices[coordinate * 3 + 1] > top_coordinate:
-                return False
-
-        # Return true if triangle is inside
-        # ---------------------------------
-        return True
+            showed_limits: Dictionary with the coordinates showed on the screen.
+            quality: Quality of the rendering process. 1 for max quality, 2 or more for less quality.
 
-    def _update_uniforms(self) -> None:
+        Returns: List with the keys of the tiles.
         """
-        Update the uniforms in the model.
+        row_min, row_max, col_min, col_max = self.__get_index_range(showed_limits)
+
+        # Calculate the definition to use given the number of vertices showed on the screen
+        # ---------------------------------------------------------------------------------
+        scene_data = self.scene.get_scene_setting_data()
+        step_x = int((col_max - col_min) / scene_data['SCENE_WIDTH_X']) + quality
+        step_y = int((row_max - row_min) / scene_data['SCENE_HEIGHT_Y']) + quality
+        level = self.__quadtree.get_level_from_step(max(step_x, step_y))
+
+        extra_proportion = self.scene.get_extra_reload_proportion_setting()
+        return self.__quadtree.get_tiles_in_range(level, *self.__get_index_range(showed_limits, extra_proportion))
+
+    def __is_showed(self, showed_limits: dict) -> bool:
+        """
+        Check if some part of the map is inside the coordinates showed on the screen.
+
+        Args:
+            showed_limits: Dictionary with the coordinates showed on the screen.
+
+        Returns: Boolean indicating if the map is showed on the screen.
+        """
+        return min(self.__x[0], self.__x[-1]) <= showed_limits['right'] and \
+            max(self.__x[0], self.__x[-1]) >= showed_limits['left'] and \
+            min(self.__y[0], self.__y[-1]) <= showed_limits['top'] and \
+            max(self.__y[0], self.__y[-1]) >= showed_limits['bottom']
+
+    def __load_tiles_async(self,
+                           keys: List[TileKey],
+                           then: callable = lambda: None,
+                           priority: ThreadTaskPriority = ThreadTaskPriority.interactive) -> None:
+        """
+        Generate the indices of the tiles in another thread and send them to the GPU.
+
+        Only one group of tiles is generated at the same time, if there is a group of tiles being generated when this
+        method is called, then that group is cancelled and only the new group is loaded. The routines of the cancelled
+        groups are executed after loading the new group. Tiles already loaded are ignored.
+
+        Args:
+            keys: Keys of the tiles to load.
+            then: Routine to execute after the tiles are loaded.
+            priority: Priority of the task that generates the tiles.
 
-        Set the maximum and minimum height of the vertices.
         Returns: None
         """
-        # get the location
-        projection_location = GL.glGetUniformLocation(self.shader_program, "projection")
+        keys = [key for key in dict.fromkeys(keys) if key not in self.__tile_buffers]
+        if len(keys) == 0:
+            then()
+            return
+
+        self.__loading_tiles_then.append(then)
+        quadtree = self.__quadtree
+        heights = self.get_height_array()
+        use_triangle_strips = self.__use_triangle_strips
+        token = CancellationToken()
+
+        # noinspection PyMissingOrEmptyDocstring
+        def parallel_routine():
+            log.debug(f"Generating indices of {len(keys)} tiles")
+            tiles_indices = []
+            for key in keys:
+                if token.is_cancelled():
+                    log.debug("Generation of tiles cancelled")
+                    break
+                tiles_indices.append((key, quadtree.generate_tile_indices(key, heights, use_triangle_strips)))
+            return tiles_indices
+
+        # noinspection PyMissingOrEmptyDocstring
+        def upload_tiles(tiles_indices, then_list):
+            # Send one tile to the GPU every slice of work
+            for key, indices in tiles_indices:
+
+                # Ignore the tiles if the grid of the model changed while generating them
+                if quadtree is not self.__quadtree:
+                    break
+
+                if key not in self.__tile_buffers:
+                    self.__upload_tile(key, indices)
+                    self.__update_tiles_to_draw()
+                    yield
+
+            if quadtree is self.__quadtree:
+                self.__delete_tiles_over_budget()
+
+            for then_function in then_list:
+                then_function()
+
+        # noinspection PyMissingOrEmptyDocstring
+        def then_routine(tiles_indices):
+            then_list = self.__loading_tiles_then
+            self.__loading_tiles_then = []
+            return upload_tiles(tiles_indices, then_list)
 
-        # set the value
-        GL.glUniformMatrix4fv(projection_location, 1, GL.GL_TRUE, self.scene.get_projection_matrix_2D())
+        self.scene.set_thread_task(parallel_routine, then_routine, priority, key=(self, 'load_tiles'), token=token)
 
+    def __update_colors_uniforms(self, shader_program: int) -> None:
+        """
+        Update the uniforms with the data of the color file in the shader program.
+
+        Args:
+            shader_program: Shader program being used.
+
+        Returns: None
+        """
+        colors_location = ShaderCache.get_uniform_location(shader_program, "colors")
+        height_color_location = ShaderCache.get_uniform_location(shader_program, "height_color")
+        length_location = ShaderCache.get_uniform_location(shader_program, "length")
+
+        GL.glUniform3fv(colors_location, len(self.__colors), self.__colors)
+        GL.glUniform1fv(height_color_location, len(self.__height_limit), self.__height_limit)
+        GL.glUniform1i(length_location, len(self.__colors))
+
+    def __update_height_texture_async(self) -> None:
+        """
+        Generate the levels of the height texture in another thread and send them to the GPU.
+
+        The quad used to draw the texture is also updated, so the center of the texels of the texture are in the
+        same coordinates as the vertices of the model.
+
+        Returns: None
+        """
+        self.__loading_height_texture = True
+        self.__height_texture_outdated = False
+
+        max_texture_size = int(GL.glGetIntegerv(GL.GL_MAX_TEXTURE_SIZE))
+        heights = self.get_height_array()
+
+        # noinspection PyMissingOrEmptyDocstring
+        def parallel_routine():
+            log.debug("Generating levels of the height texture")
+            return generate_height_pyramid(heights, max_texture_size)
+
+        # noinspection PyMissingOrEmptyDocstring
+        def then_routine(pyramid):
+            self.__loading_height_texture = False
+
+            if self.__raster_vao is None:
+                self.__raster_vao = GL.glGenVertexArrays(1)
+                self.__raster_vbo = GL.glGenBuffers(1)
+                ShaderCache.get_program(self.__raster_vertex_shader_file, self.__raster_fragment_shader_file)
+
+            # Send the levels of the texture to the GPU
+            # -----------------------------------------
+            if self.__height_texture is not None:
+                GL.glDeleteTextures(1, [self.__height_texture])
+
+            self.__height_texture = GL.glGenTextures(1)
+            GL.glBindTexture(GL.GL_TEXTURE_2D, self.__height_texture)
+            GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_S, GL.GL_CLAMP_TO_EDGE)
+            GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_T, GL.GL_CLAMP_TO_EDGE)
+            GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, GL.GL_NEAREST_MIPMAP_NEAREST)
+            GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, GL.GL_NEAREST)
+            GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_BASE_LEVEL, 0)
+            GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAX_LEVEL, len(pyramid) - 1)
+
+            for level, level_heights in enumerate(pyramid):
+                GL.glTexImage2D(GL.GL_TEXTURE_2D, level, GL.GL_R32F, level_heights.shape[1], level_heights.shape[0],
+                                0, GL.GL_RED, GL.GL_FLOAT, level_heights)
+            self._set_gpu_memory('height_texture',
+                                 sum(level_heights.size for level_heights in pyramid) * self.scene.get_float_bytes())
+
+            # Update the quad used to draw the texture
+            # ----------------------------------------
+            texel_width = 0.5 / pyramid[0].shape[1]
+            texel_height = 0.5 / pyramid[0].shape[0]
+            quad = np.array([self.__x[0], self.__y[0], texel_width, texel_height,
+                             self.__x[-1], self.__y[0], 1 - texel_width, texel_height,
+                             self.__x[-1], self.__y[-1], 1 - texel_width, 1 - texel_height,
+                             self.__x[0], self.__y[-1], texel_width, 1 - texel_height], dtype=np.float32)
+
+            float_bytes = self.scene.get_float_bytes()
+            GL.glBindVertexArray(self.__raster_vao)
+            GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.__raster_vbo)
+            GL.glBufferData(GL.GL_ARRAY_BUFFER, len(quad) * float_bytes, quad, GL.GL_STATIC_DRAW)
+            self._set_gpu_memory('raster_vbo', len(quad) * float_bytes)
+            GL.glVertexAttribPointer(0, 2, GL.GL_FLOAT, GL.GL_FALSE, 4 * float_bytes, ctypes.c_void_p(0))
+            GL.glEnableVertexAttribArray(0)
+            GL.glVertexAttribPointer(1, 2, GL.GL_FLOAT, GL.GL_FALSE, 4 * float_bytes,
+                                     ctypes.c_void_p(2 * float_bytes))
+            GL.glEnableVertexAttribArray(1)
+
+        self.scene.set_thread_task(parallel_routine, then_routine, ThreadTaskPriority.reload)
+
+    def __update_nan_tiles_async(self) -> None:
+        """
+        Generate again the loaded tiles that cover the vertices that changed from or to NaN values since the last
+        time that the tiles were generated.
+
+        The region is calculated and the tiles are generated in another thread. The old tiles are drawn until the new
+        ones are sent to the GPU. Calling this method again before the tiles are sent cancels the previous generation,
+        since the new one also covers its changes.
+
+        Returns: None
+        """
+        if self.__quadtree is None:
+            return
+
+        quadtree = self.__quadtree
+        loaded_keys = list(self.__tile_buffers.keys())
+        heights = self.get_height_array()
+        old_nan_mask = self.__nan_mask
+        use_triangle_strips = self.__use_triangle_strips
+
+        # noinspection PyMissingOrEmptyDocstring
+        def parallel_routine():
+            new_nan_mask = np.isnan(heights)
+            changed_vertices = new_nan_mask != old_nan_mask
+            if not changed_vertices.any():
+                return new_nan_mask, []
+
+            # Get the region with changes and the tiles that cover it
+            # -------------------------------------------------------
+            changed_rows = np.flatnonzero(changed_vertices.any(axis=1))
+            changed_cols = np.flatnonzero(changed_vertices.any(axis=0))
+            region = (changed_rows[0], changed_rows[-1], changed_cols[0], changed_cols[-1])
+            log.debug(f"Region with new NaN values (rows and cols): {region}")
+
+            keys = [key for key in loaded_keys if quadtree.intersects_range(key, *region)]
+            return new_nan_mask, [(key, quadtree.generate_tile_indices(key, heights, use_triangle_strips))
+                                  for key in keys]
+
+        # noinspection PyMissingOrEmptyDocstring
+        def then_routine(nan_mask_tiles):
+            if quadtree is not self.__quadtree:
+                return
+
+            self.__nan_mask, tiles_indices = nan_mask_tiles
+            for key, indices in tiles_indices:
+                if key in self.__tile_buffers:
+                    pinned = self.__tile_cache.is_pinned(key)
+                    self.__delete_tile(key)
+                    self.__upload_tile(key, indices, pinned)
+
+            self.__update_tiles_to_draw()
+
+        self.scene.set_thread_task(parallel_routine, then_routine, ThreadTaskPriority.reload, key=(self, 'nan_tiles'))
+
+    def __update_tiles(self) -> None:
+        """
+        Update the tiles to draw if the coordinates showed on the screen changed since the last update.
+
+        While the map is being moved or zoomed, only the tiles already loaded are used to draw the map. The tiles
+        needed that are not loaded are generated in another thread when the coordinates showed on the screen did not
+        change for the time defined in the settings, along with the tiles in the direction in which the map was moved.
+
+        The tiles are not generated if the map is not showed on the screen or if all the tiles needed are loaded.
+
+        Returns: None
+        """
+        showed_limits = self.scene.get_2D_showed_limits()
+
+        # Use the loaded tiles to draw the new coordinates showed
+        # -------------------------------------------------------
+        if showed_limits != self.__last_showed_limits:
+            self.__visible_tiles = self.__get_visible_tiles(showed_limits, self.__quality)
+            self.__last_showed_limits = showed_limits
+            self.__update_tiles_to_draw()
+
+        # Load the tiles missing after the view stops changing
+        # ----------------------------------------------------
+        if not self.__tiles_debouncer.update(showed_limits):
+            return
+
+        last_refreshed_limits = self.__last_refreshed_limits
+        self.__last_refreshed_limits = showed_limits
+
+        if not self.__is_showed(showed_limits):
+            return
+
+        if all(key in self.__tile_buffers for key in self.__visible_tiles):
+            log.debug("Tiles showed on the screen already loaded")
+            return
+
+        level = self.__visible_tiles[0][0]
+        prefetch_tiles = self.__get_prefetch_tiles(last_refreshed_limits, showed_limits, level)
+        self.__load_tiles_async(self.__visible_tiles + prefetch_tiles)
+
+    def __update_tiles_to_draw(self) -> None:
+        """
+        Update the list of loaded tiles used to draw the visible tiles.
+
+        Visible tiles that are not loaded are replaced by the first loaded tile of the upper levels that covers them.
+        The list is ordered from the coarsest to the finest level, so the finer tiles are drawn over the coarser ones.
+
+        Returns: None
+        """
+        tiles_to_draw = set()
+        for key in self.__visible_tiles:
+            while key not in self.__tile_buffers and key != self.__quadtree.get_parent(key):
+                key = self.__quadtree.get_parent(key)
+
+            if key in self.__tile_buffers:
+                tiles_to_draw.add(key)
+
+        # Root tiles are always loaded, use them if the visible tiles are not calculated yet
+        if len(tiles_to_draw) == 0:
+            tiles_to_draw.update(key for key in self.__quadtree.get_root_tiles() if key in self.__tile_buffers)
+
+        self.__tiles_to_draw = sorted(tiles_to_draw, key=lambda tile_key: -tile_key[0])
+        for key in self.__tiles_to_draw:
+            self.__tile_cache.touch(key)
+
+    def __upload_tile(self, key: TileKey, indices: np.ndarray, pinned: bool = False) -> None:
+        """
+        Send the indices of the tile to the GPU using a new element buffer.
+
+        Args:
+            key: Key of the tile.
+            indices: Indices of the tile.
+            pinned: If the tile can be deleted when the memory used by the tiles exceeds the budget.
+
+        Returns: None
+        """
+        ebo = GL.glGenBuffers(1)
+
+        GL.glBindVertexArray(self.vao)
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, ebo)
+        GL.glBufferData(GL.GL_ELEMENT_ARRAY_BUFFER,
+                        indices.nbytes,
+                        indices,
+                        GL.GL_STATIC_DRAW)
+
+        self.__tile_buffers[key] = (ebo, len(indices))
+        self.__tile_cache.add(key, indices.nbytes, pinned)
+
+    def _update_uniforms(self) -> None:
+        """
+        Update the uniforms in the model.
+
+        The projection matrix is read from the uniform block shared by all the shaders (CameraUniformBuffer).
+
+        Returns: None
+        """
         # set colors if using
         if self.__color_file is not None:
-            colors_location = GL.glGetUniformLocation(self.shader_program, "colors")
-            height_color_location = GL.glGetUniformLocation(self.shader_program, "height_color")
-            length_location = GL.glGetUniformLocation(self.shader_program, "length")
+            self.__update_colors_uniforms(self.shader_program)
+
+    def draw(self) -> None:
+        """
+        Draw the tiles of the model that are showed on the screen, or the raster of the model if using the raster
+        render mode.
+
+        If the coordinates showed on the screen changed since the last draw, the tiles to draw are updated before
+        drawing them.
+
+        Returns: None
+        """
+        if self.__quadtree is None:
+            return
+
+        # Draw the model as a raster if the texture is ready, otherwise, use the mesh until the texture is generated
+        # ----------------------------------------------------------------------------------------------------------
+        if self.__render_mode == Map2DRenderMode.raster and self.__color_file is not None:
+            if self.__height_texture_outdated and not self.__loading_height_texture:
+                self.__update_height_texture_async()
+
+            if self.__height_texture is not None:
+                self.__draw_raster()
+                return
+
+        self.__update_tiles()
+
+        GL.glPolygonMode(GL.GL_FRONT, self.polygon_mode)
+        GL.glPolygonMode(GL.GL_BACK, self.polygon_mode)
 
-            GL.glUniform3fv(colors_location, len(self.__colors), self.__colors)
-            GL.glUniform1fv(height_color_location, len(self.__height_limit), self.__height_limit)
-            GL.glUniform1i(length_location, len(self.__colors))
+        GL.glUseProgram(self.shader_program)
+        self._update_uniforms()
+
+        GL.glBindVertexArray(self.vao)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vbo)
+
+        draw_mode = self.draw_mode
+        if self.__use_triangle_strips:
+            draw_mode = GL.GL_TRIANGLE_STRIP
+            GL.glEnable(GL.GL_PRIMITIVE_RESTART)
+            GL.glPrimitiveRestartIndex(PRIMITIVE_RESTART_INDEX)
+
+        # Draw the tiles from the coarsest to the finest level
+        for key in self.__tiles_to_draw:
+            ebo, indices_size = self.__tile_buffers[key]
+            GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, ebo)
+            GL.glDrawElements(draw_mode, indices_size, GL.GL_UNSIGNED_INT, None)
+
+        if self.__use_triangle_strips:
+            GL.glDisable(GL.GL_PRIMITIVE_RESTART)
+
+        GL.glPolygonMode(GL.GL_FRONT, GL.GL_FILL)
+        GL.glPolygonMode(GL.GL_BACK, GL.GL_FILL)
 
     def get_color_file(self) -> str:
         """
@@ -380,6 +774,26 @@ class Map2DModel(MapModel):
                                                  (x_values[x_ind_2], y_values[y_ind_2], z_values[y_ind_2, x_ind_2])
                                              ])
 
+    def get_memory_usage(self) -> Dict[str, int]:
+        """
+        Get the number of bytes used by the model in the CPU and in the GPU.
+
+        The memory of the CPU includes the vertices, the axis of the grid, the NaN mask and the colors of the model. The
+        memory of the GPU includes the vertices, the tiles loaded and the texture used by the raster mode.
+
+        Returns: Dictionary with the keys CPU and GPU.
+        """
+        memory_usage = super().get_memory_usage()
+
+        for array in [self.__x, self.__y, self.__nan_mask, self.__colors, self.__height_limit]:
+            if array is not None:
+                memory_usage['CPU'] += int(np.asarray(array).nbytes)
+
+        if self.__tile_cache is not None:
+            memory_usage['GPU'] += self.__tile_cache.get_memory_used()
+
+        return memory_usage
+
     def get_model_coordinate_array(self) -> (np.ndarray, np.ndarray):
         """
         Return the arrays containing the information used to generate the models in the format
@@ -399,6 +813,14 @@ class Map2DModel(MapModel):
         """
         return self.__name
 
+    def get_render_mode(self) -> Map2DRenderMode:
+        """
+        Get the mode used to render the model.
+
+        Returns: Render mode used by the model.
+        """
+        return self.__render_mode
+
     def get_vertices_shape(self) -> tuple:
         """
         get the shape of the vertices of the model.
@@ -407,56 +829,43 @@ class Map2DModel(MapModel):
         """
         return len(self.__y), len(self.__x), 3
 
-    def optimize_gpu_memory_async(self, then: callable) -> None:
+    def is_tiles_refresh_pending(self) -> bool:
         """
-        Optimize the memory allocated in the GPU deleting the triangles stored in the
-        list self.__triangles_to_delete.
+        Check if the model is waiting for the view to stop changing to load the tiles showed on the screen.
 
-        The triangles on the list are the ones that are bellow another triangle rendered after them (this is,
-        the triangles that overlap with other triangles rendered over them).
-
-        Args:
-            then: Routine to execute after the deleting.
+        The tiles are loaded when drawing the model, so the model must keep being drawn while this is True.
 
-        Returns: None
+        Returns: Boolean indicating if there is a refresh of the tiles pending.
         """
-        log.debug("Optimizing gpu memory of the model deleting triangles")
-
-        # noinspection PyMissingOrEmptyDocstring
-        def parallel_routine():
-            # Delete the triangles from the list
-            log.debug("Deleting repeated triangles")
-            self.__triangles_to_delete = list(set(self.__triangles_to_delete))
+        return self.__tiles_debouncer is not None and self.__tiles_debouncer.is_pending()
 
-            log.debug("Generating list of indices")
-
-            triangles_array = np.array(self.__triangles_to_delete)
-            vertex_1 = triangles_array * 3
-            vertex_2 = triangles_array * 3 + 1
-            vertex_3 = triangles_array * 3 + 2
-
-            indices_to_delete = np.concatenate((vertex_1, vertex_2, vertex_3)).astype(int)
+    def optimize_gpu_memory_async(self, then: callable) -> None:
+        """
+        Optimize the memory allocated in the GPU deleting the tiles that were not used for the longest time until
+        the memory used by the tiles is under the budget defined in the settings.
 
-            log.debug("Generating mask for the indices")
-            mask = np.ones(len(self.get_indices_array()), dtype=bool)
-            mask[indices_to_delete] = False
+        Tiles being drawn and the tiles of the coarsest level of the quadtree are never deleted.
 
-            log.debug("Applying mask to the indices")
+        The tiles are chosen and deleted in the main thread (the cost is linear in the number of tiles loaded), since
+        the cache of tiles is modified by the main thread every time that the model is drawn. The then routine is
+        called before returning.
 
-            # noinspection PyTypeChecker
-            new_indices = self.get_indices_array()[mask]
-            log.debug('Ended applying mask to indices')
+        Args:
+            then: Routine to execute after the deleting.
 
-            self.__triangles_to_delete = np.array([])
+        Returns: None
+        """
+        log.debug("Optimizing gpu memory of the model deleting tiles")
 
-            return new_indices
+        if self.__tile_cache is not None:
+            keys_to_delete = self.__tile_cache.get_keys_to_evict(self.__tiles_to_draw)
 
-        # noinspection PyMissingOrEmptyDocstring
-        def then_routine(new_indices):
-            self.set_indices(np.array(new_indices, dtype=np.uint32))
-            then()
+            log.debug(f"Deleting {len(keys_to_delete)} tiles")
+            for key in keys_to_delete:
+                if key in self.__tile_buffers and key not in self.__tiles_to_draw:
+                    self.__delete_tile(key)
 
-        self.scene.set_thread_task(parallel_task=parallel_routine, then=then_routine)
+        then()
 
     def set_color_file(self, filename: str) -> None:
         """
@@ -495,15 +904,28 @@ class Map2DModel(MapModel):
         self.__colors = np.array(colors, dtype=np.float32)
         self.__height_limit = np.array(height_limit, dtype=np.float32)
 
+    def set_render_mode(self, render_mode: Map2DRenderMode) -> None:
+        """
+        Change the mode used to render the model.
+
+        The texture used by the raster mode is generated the first time that the model is drawn in that mode.
+
+        Args:
+            render_mode: Render mode to use.
+
+        Returns: None
+        """
+        self.__render_mode = render_mode
+
     def set_vertices_from_grid_async(self, x, y, z, quality=1, then=lambda: None) -> None:
         """
         Set the vertices of the model from a grid.
 
         This method:
          - Store in the class variables the original values of the grid loaded.
-         - Set the vertices of the model after applying a decimation algorithm over them to reduce the number
-           of vertices to render.
-         - Set the height buffer with the height of the vertices.
+         - Set the vertices of the model.
+         - Divide the grid in the tiles of a quadtree and load the tiles of the coarsest level. The rest of the tiles
+           are loaded when they are showed on the screen.
 
         Args:
             then: Task too do after the thread execution
@@ -519,6 +941,7 @@ class Map2DModel(MapModel):
         # store the data for future operations.
         self.__x = np.array(x)
         self.__y = np.array(y)
+        self.__quality = quality
 
         def parallel_routine():
             """
@@ -529,29 +952,54 @@ class Map2DModel(MapModel):
             log.debug("Loading buffers")
             vertices = self.__generate_vertices_list(x, y, z)
 
-            log.debug("Generating Indices")
-            scene_data = self.scene.get_scene_setting_data()
-            indices = self.__generate_index_list(int(len(self.__x) / scene_data['SCENE_WIDTH_X']) + quality,
-                                                 int(len(self.__y) / scene_data['SCENE_HEIGHT_Y']) + quality)
-            return vertices, indices
-
-        def then_routine(vertices_indices):
+            log.debug("Generating tiles of the coarsest level")
+            heights = np.array(z)
+            tiles_settings = self.scene.get_map_tiles_settings()
+            quadtree = TileQuadtree(len(self.__y), len(self.__x), tiles_settings['MAP_TILE_SIZE'])
+            root_tiles = [(key, quadtree.generate_tile_indices(key,
+                                                               heights,
+                                                               tiles_settings['MAP_TILES_USE_TRIANGLE_STRIPS']))
+                          for key in quadtree.get_root_tiles()]
+            return vertices, quadtree, root_tiles, np.isnan(heights)
+
+        def then_routine(vertices_tiles):
             """
             Routine to be executed after the parallel routine
 
+            The vertices are sent to the GPU in chunks, yielding after every chunk so the scheduler of the engine can
+            split the upload between several frames. The model is not drawn until all the vertices are sent.
+
             Args:
-                vertices_indices: Tuple with the list of vertices and indices to use in the model.
+                vertices_tiles: Tuple with the list of vertices, the quadtree, the indices of the root tiles and the
+                                NaN vertices of the grid.
             """
-            vertices = vertices_indices[0]
-            indices = vertices_indices[1]
-
-            self.set_vertices(
-                np.array(
-                    vertices,
-                    dtype=np.float32,
-                )
-            )
-            self.set_indices(np.array(indices, dtype=np.uint32))
+            vertices, quadtree, root_tiles, nan_mask = vertices_tiles
+
+            # Delete the tiles of the old grid, the model is not drawn without a quadtree
+            # ---------------------------------------------------------------------------
+            for key in list(self.__tile_buffers.keys()):
+                self.__delete_tile(key)
+            self.__quadtree = None
+
+            tiles_settings = self.scene.get_map_tiles_settings()
+            yield from self.set_vertices_in_chunks(np.array(vertices, dtype=np.float32),
+                                                   tiles_settings['MAP_TILES_UPLOAD_CHUNK_SIZE'])
+
+            # Use the tiles of the new grid
+            # -----------------------------
+            self.__quadtree = quadtree
+            self.__tile_cache = TileLRUCache(tiles_settings['MAP_TILES_GPU_MEMORY_BUDGET'])
+            self.__use_triangle_strips = tiles_settings['MAP_TILES_USE_TRIANGLE_STRIPS']
+            self.__nan_mask = nan_mask
+            self.__visible_tiles = []
+            self.__last_showed_limits = None
+            self.__last_refreshed_limits = None
+            self.__tiles_debouncer = RefreshDebouncer(tiles_settings['MAP_TILES_REFRESH_DELAY'])
+
+            for key, indices in root_tiles:
+                self.__upload_tile(key, indices, pinned=True)
+            self.__update_tiles_to_draw()
+            self.__height_texture_outdated = True
 
             # Only select this shader if there is no shader selected.
             if self.shader_program is None:
@@ -562,14 +1010,15 @@ class Map2DModel(MapModel):
             # call the then routine
             then()
 
-        self.scene.set_thread_task(parallel_routine, then_routine)
+        self.scene.set_thread_task(parallel_routine, then_routine, ThreadTaskPriority.reload)
 
     def update_indices_async(self, quality: int = 2, then=lambda: None) -> None:
         """
-        Recalculate vertices from grid.
+        Load the tiles needed to show the map on the screen with the given quality.
 
-        Recalculate the vertices with a new definition given the zoom level and the borders used in the
-        projection matrix.
+        The tiles are selected using the coordinates showed on the screen and the zoom level. Tiles are also
+        updated automatically when drawing the model, so this method only needs to be called to change the quality
+        used. Tiles being generated by a previous call are cancelled, so only the last reload of the model is loaded.
 
         Returns: None
 
@@ -577,79 +1026,44 @@ class Map2DModel(MapModel):
             then: Routine to execute after the parallel tasks.
             quality: quality of the rendering process.
         """
+        self.__quality = quality
 
-        # noinspection PyMissingOrEmptyDocstring
-        def parallel_tasks():
-            showed_limits = self.scene.get_2D_showed_limits()
-            right_coordinate = showed_limits['right']
-            left_coordinate = showed_limits['left']
-            top_coordinate = showed_limits['top']
-            bottom_coordinate = showed_limits['bottom']
-
-            log.debug("Coordinates actually showing on the screen:")
-            log.debug(f"left: {left_coordinate}")
-            log.debug(f"right: {right_coordinate}")
-            log.debug(f"top:{top_coordinate} ")
-            log.debug(f"bottom: {bottom_coordinate}")
-
-            # Calculate the definition to use in the reload
-            # ---------------------------------------------
-            elements_on_screen_x = abs(self.__get_index_closest_value(self.__x, right_coordinate) -
-                                       self.__get_index_closest_value(self.__x, left_coordinate))
-            elements_on_screen_y = abs(self.__get_index_closest_value(self.__y, top_coordinate) -
-                                       self.__get_index_closest_value(self.__y, bottom_coordinate))
-
-            log.debug(f"Number of vertices on screen axis X: {elements_on_screen_x}")
-            log.debug(f"Number of vertices on screen axis Y: {elements_on_screen_y}")
-
-            scene_data = self.scene.get_scene_setting_data()
-            step_x = int(elements_on_screen_x / scene_data['SCENE_WIDTH_X'])  # + 2
-            step_y = int(elements_on_screen_y / scene_data['SCENE_HEIGHT_Y'])  # + 2
-
-            log.debug(f"Step used to generate index list on x axis {step_x}")
-            log.debug(f"Step used to generate index list on y axis {step_y}")
-
-            # Generate new list of triangles to add to the model
-            # --------------------------------------------------
-            # check for the extra proportion to reload.
-            extra_proportion = self.scene.get_extra_reload_proportion_setting()
-            extra_x = (right_coordinate - left_coordinate) * (extra_proportion - 1)
-            extra_y = (top_coordinate - bottom_coordinate) * (extra_proportion - 1)
-
-            new_indices = self.__generate_index_list(step_x + quality,
-                                                     step_y + quality,
-                                                     left_coordinate - extra_x,
-                                                     right_coordinate + extra_x,
-                                                     top_coordinate + extra_y,
-                                                     bottom_coordinate - extra_y)
-
-            # Delete old triangles that are in the same place as the new ones
-            # ---------------------------------------------------------------
-            self.__add_triangles_inside_zone_to_delete_list(
-                self.__x[self.__get_index_closest_value(self.__x, left_coordinate)],
-                self.__x[self.__get_index_closest_value(self.__x, right_coordinate)],
-                top_coordinate,
-                bottom_coordinate)
-
-            return new_indices
+        if self.__quadtree is None:
+            then()
+            return
 
-        # noinspection PyMissingOrEmptyDocstring
-        def then_routine(new_indices):
-            updated_indices = np.concatenate((self.get_indices_array(), new_indices))
-            self.set_indices(np.array(updated_indices, dtype=np.uint32))
+        showed_limits = self.scene.get_2D_showed_limits()
+        log.debug(f"Coordinates actually showing on the screen: {showed_limits}")
 
-            # call the then routine
-            then()
+        self.__visible_tiles = self.__get_visible_tiles(showed_limits, quality)
+        self.__last_showed_limits = showed_limits
+        self.__last_refreshed_limits = showed_limits
+        self.__tiles_debouncer.mark_refreshed(showed_limits)
+        self.__update_tiles_to_draw()
 
-        self.scene.set_thread_task(parallel_tasks, then_routine)
+        self.__load_tiles_async(self.__visible_tiles, then, ThreadTaskPriority.reload)
 
-    def update_vertices(self) -> None:
+    def update_vertices(self, rows: Union[Tuple[int, int], None] = None) -> None:
         """
         Update the vertices array of the model.
 
         Update the vertices array used on the GPU with the actual information of the vertices stored in the model.
+        The vertices are sent in chunks by the scheduler of the main thread, so big maps are updated in several
+        frames. Only the rows of the grid specified are sent.
+
+        The loaded tiles that cover vertices that changed from or to NaN values are generated again in another thread.
+
+        Args:
+            rows: First row and the row after the last row of the grid to update. None to update all the rows.
 
         Returns: None
         """
-        vertices = self.get_vertices_array().reshape(-1)
-        self.set_vertices(vertices)
+        number_of_rows, number_of_cols = self.get_vertices_shape()[:2]
+        first_row, last_row = (0, number_of_rows) if rows is None else rows
+
+        chunk_size = self.scene.get_map_tiles_settings()['MAP_TILES_UPLOAD_CHUNK_SIZE']
+        self.scene.set_main_thread_work(lambda: self.update_vertices_in_chunks(first_row * number_of_cols,
+                                                                               last_row * number_of_cols,
+                                                                               chunk_size))
+        self.__height_texture_outdated = True
+        self.__update_nan_tiles_async()
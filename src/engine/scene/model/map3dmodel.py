@@ -18,15 +18,19 @@
 """
 File with the definition of the class Map3DModel, class in charge of the 3D representation of the maps.
 """
+import copy
 import ctypes as ctypes
-from typing import TYPE_CHECKING
+from typing import Dict, TYPE_CHECKING, Union
 
 import OpenGL.GL as GL
 import numpy as np
 
 from src.engine.scene.model.mapmodel import MapModel
+from src.engine.scene.model.shader_cache import ShaderCache
+from src.engine.scene.model.terrain_chunks import TerrainChunks
 from src.engine.scene.model.tranformations.transformations import identity
 from src.engine.scene.unit_converter import UnitConverter
+from src.engine.thread_task_priority import ThreadTaskPriority
 from src.input.CTP import read_file
 from src.utils import get_logger
 
@@ -40,12 +44,22 @@ log = get_logger(module='MAP3D_MODEL')
 class Map3DModel(MapModel):
     """
     Class that manage all things related to the representation in 3D of the maps.
+
+    The model does not store a copy of the vertices of the 2D model, the buffer of vertices of the 2D model is used
+    directly to render the grid, scaling the heights of the vertices in the shaders.
+
+    Open GL variables:
+        glVertexAttributePointer 0: Vertices of the 2D model (vertices of the skirts in the vao of the skirts).
+        glVertexAttributePointer 1: Heights of the vertices, used to color them.
     """
 
     def __init__(self, scene: 'Scene', model_2d: 'Map2DModel', height_measure_unit: str = 'meters',
                  vertices_measure_unit: str = 'degrees'):
         """
         Constructor of the class.
+
+        The model is created without data, the method update_values_from_2D_model_async must be called to load the
+        data of the 2D model.
         """
         super().__init__(scene)
 
@@ -63,48 +77,48 @@ class Map3DModel(MapModel):
         # Vertices variables
         # ------------------
         self.__vertices_measure_unit = vertices_measure_unit
-        self.__vertices_shape = model_2d.get_vertices_shape()
 
         # Height variables
         # ----------------
-        self.hbo = GL.glGenBuffers(1)
-        self.__height_array = np.array([])  # Unidimensional array
+        self.hbo = GL.glGenBuffers(1)  # Heights of the vertices of the skirts
 
         self.__height_exaggeration_factor = 1
         self.__height_measure_unit = height_measure_unit
 
+        # Skirts variables
+        # ----------------
+        # The skirts use their own buffers, self.vbo stores the vertices of the skirts and self.hbo their heights.
+        self.__skirt_vao = GL.glGenVertexArrays(1)
+        self.__skirt_ebo = GL.glGenBuffers(1)
+
         # Rendering variables
         # -------------------
         self.__model = identity()  # Model matrix to use in the rendering
-        self.__quality = 0  # Quality of the 3D model (0 is maximum)
 
-        # Set the data for the model
-        # --------------------------
-        self.update_values_from_2D_model()
+        # Level of detail variables
+        # -------------------------
+        self.__terrain_chunks = None
+        self.__terrain_nan_mask = None  # Vertices with NaN values when the indices of the chunks were generated
+        self.__terrain_chunk_size = None  # Size of the chunks in the settings when the chunks were generated
+        self.__selected_index_ranges = []
+        self.__selected_skirt_index_ranges = []
+        self.__last_selection_matrices = None  # View and projection matrices used in the last selection of chunks
 
-    def __set_height_buffer(self, new_height: np.ndarray) -> None:
+    def __draw_index_ranges(self, index_ranges: list) -> None:
         """
-        Set the buffer object for the heights to be used in the shaders.
+        Draw the ranges of indices of the element buffer currently bound.
 
-        IMPORTANT:
-            Uses the index 1 of the attributes pointers.
+        Args:
+            index_ranges: List with the offsets (in number of indices) and the number of indices to draw.
 
         Returns: None
-
         """
-        self.__height_array = np.array(new_height, dtype=np.float32).reshape(-1)
-
-        # Set the buffer data in the buffer
-        GL.glBindVertexArray(self.vao)
-        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.hbo)
-        GL.glBufferData(GL.GL_ARRAY_BUFFER,
-                        len(self.__height_array) * self.scene.get_float_bytes(),
-                        self.__height_array,
-                        GL.GL_STATIC_DRAW)
-
-        # Enable the data to the shaders
-        GL.glVertexAttribPointer(1, 1, GL.GL_FLOAT, GL.GL_FALSE, 0, ctypes.c_void_p(0))
-        GL.glEnableVertexAttribArray(1)
+        index_bytes = np.dtype(np.uint32).itemsize
+        for offset, indices_size in index_ranges:
+            GL.glDrawElements(self.draw_mode,
+                              indices_size,
+                              GL.GL_UNSIGNED_INT,
+                              ctypes.c_void_p(offset * index_bytes))
 
     def __get_conversion_factor(self) -> float:
         """
@@ -128,26 +142,152 @@ class Map3DModel(MapModel):
             raise NotImplementedError(f'Conversion of unit {self.__vertices_measure_unit} not implemented '
                                       f'in the model 3D')
 
+    def __set_color_data(self, filename: str, file_data: list) -> None:
+        """
+        Set the colors to use in the model from the data read from the color file.
+
+        Args:
+            filename: File used for the colors.
+            file_data: Data of the file, as returned by the function read_file.
+
+        Returns: None
+        """
+        self.__color_file = filename
+
+        colors = []
+        height_limit = []
+
+        for element in file_data:
+            colors.append(element['color'])
+            height_limit.append(element['height'])
+
+        # Store the data of the coloration to be passed to the shader
+        # -----------------------------------------------------------
+        if len(colors) > 500:
+            raise BufferError('Shader used does not support more than 500 colors in the file.')
+
+        self.__colors = np.array(colors, dtype=np.float32)
+        self.__height_color_limits = np.array(height_limit, dtype=np.float32)
+
+    def __set_grid_buffers(self, indices: np.ndarray) -> None:
+        """
+        Configure the vao of the model to use the buffer of vertices of the 2D model and set the indices of the
+        chunks of the grid.
+
+        IMPORTANT:
+            Uses the index 0 and 1 of the attributes pointers. The height of the vertices (attribute 1) is read from
+            the third coordinate of the vertices of the 2D model.
+
+        Args:
+            indices: Indices of all the chunks and levels of the grid.
+
+        Returns: None
+        """
+        float_bytes = self.scene.get_float_bytes()
+
+        GL.glBindVertexArray(self.vao)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.__model_2D_used.vbo)
+
+        GL.glVertexAttribPointer(0, 3, GL.GL_FLOAT, GL.GL_FALSE, 3 * float_bytes, ctypes.c_void_p(0))
+        GL.glEnableVertexAttribArray(0)
+        GL.glVertexAttribPointer(1, 1, GL.GL_FLOAT, GL.GL_FALSE, 3 * float_bytes, ctypes.c_void_p(2 * float_bytes))
+        GL.glEnableVertexAttribArray(1)
+
+        self.set_indices(indices)
+
+    def __set_skirt_buffers(self,
+                            vertices: np.ndarray,
+                            heights: np.ndarray,
+                            indices: Union[np.ndarray, None]) -> None:
+        """
+        Set the buffers used to render the skirts of the chunks.
+
+        IMPORTANT:
+            Uses the index 0 and 1 of the attributes pointers of the vao of the skirts.
+
+        Args:
+            vertices: Vertices of the skirts.
+            heights: Heights of the vertices of the skirts.
+            indices: Indices of the skirts of all the chunks and levels. None to keep the indices already sent.
+
+        Returns: None
+        """
+        float_bytes = self.scene.get_float_bytes()
+
+        GL.glBindVertexArray(self.__skirt_vao)
+
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vbo)
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, len(vertices) * float_bytes, vertices, GL.GL_STATIC_DRAW)
+        GL.glVertexAttribPointer(0, 3, GL.GL_FLOAT, GL.GL_FALSE, 0, ctypes.c_void_p(0))
+        GL.glEnableVertexAttribArray(0)
+
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.hbo)
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, len(heights) * float_bytes, heights, GL.GL_STATIC_DRAW)
+        GL.glVertexAttribPointer(1, 1, GL.GL_FLOAT, GL.GL_FALSE, 0, ctypes.c_void_p(0))
+        GL.glEnableVertexAttribArray(1)
+
+        self._set_gpu_memory('vbo', len(vertices) * float_bytes)
+        self._set_gpu_memory('hbo', len(heights) * float_bytes)
+
+        if indices is not None:
+            GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, self.__skirt_ebo)
+            GL.glBufferData(GL.GL_ELEMENT_ARRAY_BUFFER, len(indices) * float_bytes, indices, GL.GL_STATIC_DRAW)
+            self._set_gpu_memory('skirt_ebo', len(indices) * float_bytes)
+
+    def __update_selected_chunks(self) -> None:
+        """
+        Update the chunks to draw and the level of detail to use in each one of them.
+
+        The chunks are only selected again if the view or the projection matrix changed since the last selection.
+
+        Returns: None
+        """
+        view_matrix = self.scene.get_camera_view_matrix()
+        projection_matrix = self.scene.get_projection_matrix_3D()
+
+        if self.__last_selection_matrices is not None and \
+                np.array_equal(self.__last_selection_matrices[0], view_matrix) and \
+                np.array_equal(self.__last_selection_matrices[1], projection_matrix):
+            return
+
+        self.__last_selection_matrices = (view_matrix, projection_matrix)
+        chunks, levels = self.__terrain_chunks.select_chunks(
+            view_matrix,
+            projection_matrix,
+            self.scene.get_scene_setting_data()['SCENE_HEIGHT_Y'],
+            self.__height_exaggeration_factor * self.__get_conversion_factor(),
+            self.scene.get_terrain_lod_settings()['TERRAIN_MAX_SCREEN_ERROR']
+        )
+
+        offsets, counts = self.__terrain_chunks.get_index_ranges(chunks, levels)
+        self.__selected_index_ranges = [(int(offset), int(count))
+                                        for offset, count in zip(offsets, counts) if count > 0]
+
+        offsets, counts = self.__terrain_chunks.get_skirt_index_ranges(chunks, levels)
+        self.__selected_skirt_index_ranges = [(int(offset), int(count))
+                                              for offset, count in zip(offsets, counts) if count > 0]
+
     def _update_uniforms(self) -> None:
         """
         Method to update the uniforms used in the shader programs.
 
+        The view and projection matrices are read from the uniform block shared by all the shaders
+        (CameraUniformBuffer).
+
         Returns: None
         """
-        model_location = GL.glGetUniformLocation(self.shader_program, "model")
-        view_location = GL.glGetUniformLocation(self.shader_program, "view")
-        projection_location = GL.glGetUniformLocation(self.shader_program, "projection")
+        model_location = ShaderCache.get_uniform_location(self.shader_program, "model")
+        height_scale_location = ShaderCache.get_uniform_location(self.shader_program, "height_scale")
 
         # set the value
         GL.glUniformMatrix4fv(model_location, 1, GL.GL_TRUE, self.__model)
-        GL.glUniformMatrix4fv(view_location, 1, GL.GL_TRUE, self.scene.get_camera_view_matrix())
-        GL.glUniformMatrix4fv(projection_location, 1, GL.GL_TRUE, self.scene.get_projection_matrix_3D())
+        GL.glUniform1f(height_scale_location, self.__height_exaggeration_factor * self.__get_conversion_factor())
 
         # set colors if using
         if self.__color_file is not None:
-            colors_location = GL.glGetUniformLocation(self.shader_program, "colors")
-            height_color_location = GL.glGetUniformLocation(self.shader_program, "height_color")
-            length_location = GL.glGetUniformLocation(self.shader_program, "length")
+            colors_location = ShaderCache.get_uniform_location(self.shader_program, "colors")
+            height_color_location = ShaderCache.get_uniform_location(self.shader_program, "height_color")
+            length_location = ShaderCache.get_uniform_location(self.shader_program, "length")
 
             GL.glUniform3fv(colors_location, len(self.__colors), self.__colors)
             GL.glUniform1fv(height_color_location, len(self.__height_color_limits), self.__height_color_limits)
@@ -163,33 +303,23 @@ class Map3DModel(MapModel):
         Returns: None
         """
         self.__height_measure_unit = new_measure_unit
+        self.__last_selection_matrices = None
 
     def change_height_normalization_factor(self, new_value: float) -> None:
         """
         Change the normalization factor used to modify the heights of the model.
 
-        Do nothing if the new factor is the same than the previous one.
+        The heights are scaled in the shaders, so there is no need to modify the buffers of the model.
 
         Args:
             new_value: New interpolation factor.
 
         Returns: None
         """
-
-        # Do nothing if the value is the same than the before.
-        if self.__height_exaggeration_factor == new_value:
-            return
-
-        # Update the value
         self.__height_exaggeration_factor = new_value
 
-        # Modify the vertices array to fit the new heights
-        height_array = self.__height_array * self.__height_exaggeration_factor * self.__get_conversion_factor()
-        height_array = height_array.reshape(self.__vertices_shape[:2])
-
-        vertices_array = self.get_vertices_array().reshape(self.__vertices_shape)
-        vertices_array[:, :, 2] = height_array
-        self.set_vertices(vertices_array.reshape(-1))
+        # The error of the chunks on the screen depends on the heights
+        self.__last_selection_matrices = None
 
     def change_vertices_measure_unit(self, new_measure_unit: str) -> None:
         """
@@ -201,14 +331,55 @@ class Map3DModel(MapModel):
         Returns: None
         """
         self.__vertices_measure_unit = new_measure_unit
+        self.__last_selection_matrices = None
 
     def draw(self) -> None:
         """
-        Draw the model on the screen.
+        Draw the chunks of the model that are inside the view of the camera, each one with the level of detail
+        selected from the error that the chunk generates on the screen.
+
+        Do nothing if the data of the model is not loaded yet.
 
         Returns: None
         """
-        super().draw()
+        if self.__terrain_chunks is None:
+            return
+
+        self.__update_selected_chunks()
+
+        GL.glPolygonMode(GL.GL_FRONT, self.polygon_mode)
+        GL.glPolygonMode(GL.GL_BACK, self.polygon_mode)
+
+        GL.glUseProgram(self.shader_program)
+        self._update_uniforms()
+
+        # Draw the grid using the vertices of the 2D model
+        # ------------------------------------------------
+        GL.glBindVertexArray(self.vao)
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, self.ebo)
+        self.__draw_index_ranges(self.__selected_index_ranges)
+
+        # Draw the skirts of the chunks
+        # -----------------------------
+        GL.glBindVertexArray(self.__skirt_vao)
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, self.__skirt_ebo)
+        self.__draw_index_ranges(self.__selected_skirt_index_ranges)
+
+        GL.glPolygonMode(GL.GL_FRONT, GL.GL_FILL)
+        GL.glPolygonMode(GL.GL_BACK, GL.GL_FILL)
+
+    def get_memory_usage(self) -> Dict[str, int]:
+        """
+        Get the number of bytes used by the model in the CPU and in the GPU.
+
+        The vertices of the grid are stored in the buffer of the 2D model, so they are not included.
+
+        Returns: Dictionary with the keys CPU and GPU.
+        """
+        memory_usage = super().get_memory_usage()
+        for array in [self.__colors, self.__height_color_limits]:
+            memory_usage['CPU'] += int(np.asarray(array).nbytes)
+        return memory_usage
 
     def get_normalization_height_factor(self) -> float:
         """
@@ -227,63 +398,95 @@ class Map3DModel(MapModel):
 
         Returns: None
         """
-        if len(self.get_vertices_array()) == 0:
-            raise AssertionError('Did you forget to set the vertices? (set_vertices_from_grid)')
+        if self.__terrain_chunks is None:
+            raise AssertionError('Did you forget to load the data of the model? (update_values_from_2D_model_async)')
 
-        # Extract the data for the coloration from the file
-        # -------------------------------------------------
-        self.__color_file = filename
+        self.__set_color_data(filename, read_file(filename))
 
-        file_data = read_file(filename)
-        colors = []
-        height_limit = []
+    def update_values_from_2D_model_async(self, then: callable = lambda: None) -> None:
+        """
+        Update the chunks of the model, their skirts and the colors from the 2D model.
 
-        for element in file_data:
-            colors.append(element['color'])
-            height_limit.append(element['height'])
+        The division of the grid in chunks, the generation of the indices and the read of the color file are executed
+        in another thread, only the upload of the data to the GPU is executed in the main thread.
 
-        # Store the data of the coloration to be passed to the shader
-        # -----------------------------------------------------------
-        if len(colors) > 500:
-            raise BufferError('Shader used does not support more than 500 colors in the file.')
+        If the chunks were already generated and the vertices with NaN values of the 2D model did not change (as it
+        happens after modifying the heights of the map), the indices of the chunks are kept and only the bounds and
+        errors of the chunks and the vertices of the skirts are calculated again.
 
-        self.__colors = np.array(colors, dtype=np.float32)
-        self.__height_color_limits = np.array(height_limit, dtype=np.float32)
+        IMPORTANT:
+            This method is asynchronous, this is, the data of the model is loaded after this method returns. To
+            execute logic after the load of the data, use the 'then' parameter.
 
-    def update_values_from_2D_model(self) -> None:
-        """
-        Update the vertices and height arrays from the 2D model.
+        Args:
+            then: Function to execute after the data of the model is loaded.
 
         Returns: None
         """
         log.debug('Updating GPU arrays...')
 
-        # Get and set the vertices on the model
-        # -------------------------------------
-        self.__vertices_shape = self.__model_2D_used.get_vertices_shape()
-
-        # Get a copy of the arrays and transform the height of the points to the same unit as the other coordinates
-        # ---------------------------------------------------------------------------------------------------------
-        self.__vertices_array = self.__model_2D_used.get_vertices_array().copy()
-        self.__vertices_array = self.__vertices_array.reshape(self.__model_2D_used.get_vertices_shape())
-        self.__vertices_array[:, :, 2] = self.__vertices_array[:, :, 2] * self.__height_exaggeration_factor * \
-                                         self.__get_conversion_factor()
-        self.set_vertices(self.__vertices_array.reshape(-1))
-
-        # Get the information about the height
-        # ------------------------------------
-        self.__set_height_buffer(self.__model_2D_used.get_height_array())
-
-        # Update the array of indices used in the model
-        # ---------------------------------------------
-        x_values = self.__vertices_array[0, :, 0].reshape(-1)
-        y_values = self.__vertices_array[:, 0, 1].reshape(-1)
-        index_array = self._generate_index_list(self.__quality,
-                                                self.__quality,
-                                                x_values,
-                                                y_values)
-        self.set_indices(index_array)
-
-        # Set the color file
-        # ------------------
-        self.set_color_file(self.__model_2D_used.get_color_file())
+        color_file = self.__model_2D_used.get_color_file()
+        chunk_size = self.scene.get_terrain_lod_settings()['TERRAIN_CHUNK_SIZE']
+        last_terrain_chunks = self.__terrain_chunks if self.__terrain_chunk_size == chunk_size else None
+        last_nan_mask = self.__terrain_nan_mask
+
+        def parallel_routine():
+            """
+            Divide the grid in chunks and generate the vertices and indices of the chunks and their skirts.
+            """
+            rows, cols, _ = self.__model_2D_used.get_vertices_shape()
+            vertices_array = self.__model_2D_used.get_vertices_array().reshape((rows, cols, 3))
+            nan_mask = np.isnan(vertices_array[:, :, 2])
+
+            if last_terrain_chunks is not None and np.array_equal(nan_mask, last_nan_mask):
+                # Only the heights changed, update the bounds on a copy of the chunks since the model is still
+                # using them to render
+                # ------------------------------------------------------------------------------------------------
+                terrain_chunks = copy.copy(last_terrain_chunks)
+                terrain_chunks.update_bounds(vertices_array[0, :, 0],
+                                             vertices_array[:, 0, 1],
+                                             vertices_array[:, :, 2])
+                indices, skirt_indices = None, None
+
+            else:
+                # Divide the grid in chunks and generate the indices of all their levels of detail
+                # --------------------------------------------------------------------------------
+                terrain_chunks = TerrainChunks(rows, cols, chunk_size)
+                indices, skirt_indices = terrain_chunks.build(vertices_array[0, :, 0],
+                                                              vertices_array[:, 0, 1],
+                                                              vertices_array[:, :, 2])
+
+            # Generate the vertices of the skirts, the borders of the chunks and copies of them located below
+            # -----------------------------------------------------------------------------------------------
+            border_vertices = vertices_array.reshape(-1, 3)[terrain_chunks.get_skirt_vertices()]
+            lowered_vertices = border_vertices.copy()
+            lowered_vertices[:, 2] -= terrain_chunks.get_skirt_depth()
+
+            skirt_vertices = np.concatenate((border_vertices, lowered_vertices)).astype(np.float32).reshape(-1)
+            skirt_heights = np.concatenate((border_vertices[:, 2], border_vertices[:, 2])).astype(np.float32)
+
+            return (terrain_chunks, nan_mask, indices, skirt_vertices, skirt_heights, skirt_indices,
+                    read_file(color_file))
+
+        def then_routine(model_data):
+            """
+            Upload the data of the model to the GPU.
+
+            Args:
+                model_data: Tuple with the data generated in the parallel routine.
+            """
+            terrain_chunks, nan_mask, indices, skirt_vertices, skirt_heights, skirt_indices, color_data = model_data
+
+            if indices is not None:
+                self.__set_grid_buffers(indices)
+            self.__set_skirt_buffers(skirt_vertices, skirt_heights, skirt_indices)
+            self.__set_color_data(color_file, color_data)
+
+            self.__terrain_chunks = terrain_chunks
+            self.__terrain_nan_mask = nan_mask
+            self.__terrain_chunk_size = chunk_size
+            self.__last_selection_matrices = None
+
+            then()
+
+        self.scene.set_thread_task(parallel_routine, then_routine, ThreadTaskPriority.reload)
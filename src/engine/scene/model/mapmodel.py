@@ -23,6 +23,7 @@ from typing import Union
 
 import numpy as np
 
+from src.engine.scene.model.grid_indices import generate_grid_indices
 from src.engine.scene.model.model import Model
 
 
@@ -67,7 +68,8 @@ class MapModel(Model):
                              left_coordinate: float = -180,
                              right_coordinate: float = 180,
                              top_coordinate: float = 90,
-                             bottom_coordinate: float = -90) -> np.ndarray:
+                             bottom_coordinate: float = -90,
+                             height_array: Union[np.ndarray, None] = None) -> np.ndarray:
         """
         Generate an index list given an already loaded list of vertices.
 
@@ -75,6 +77,8 @@ class MapModel(Model):
 
         The coordinates values are used to generate the index of just a part of the total of the vertices.
 
+        If the heights of the vertices are given, the triangles whose vertices are all NaN are not generated.
+
         Args:
             left_coordinate: Left coordinate to cut the map.
             right_coordinate: Right coordinate to cut the map.
@@ -84,6 +88,7 @@ class MapModel(Model):
             step_y: Number of elements in the y axis
             x_value_array: Values used in the x-axis
             y_value_array: Values used in the y-axis
+            height_array: Heights of the vertices, with shape (len(y_value_array), len(x_value_array)).
 
         Returns: List of index
         """
@@ -112,56 +117,14 @@ class MapModel(Model):
         index_maximum_x = new_index_maximum_x
         index_minimum_x = new_index_minimum_x
 
-        # calculate the indices to add to the program using numpy
-        # -------------------------------------------------------
+        # calculate the rows and columns of the vertices to use
+        # -----------------------------------------------------
         cushion_rows = step_y - (index_maximum_y - index_minimum_y) % step_y + 1
         cushion_cols = step_x - (index_maximum_x - index_minimum_x) % step_x + 1
 
-        rows = range(len(y_value_array))[index_minimum_y:index_maximum_y + cushion_rows:step_y]
-        cols = range(len(x_value_array))[index_minimum_x:index_maximum_x + cushion_cols:step_x]
-        len_rows = len(rows)
-        len_cols = len(cols)
-
-        rows = np.tile(np.array(rows), (len_cols, 1)).transpose()
-        cols = np.tile(np.array(cols), (len_rows, 1))
-
-        other_cols = cols[:-1, :-1]
-        other_rows = rows[:-1, :-1]
-
-        # first part of the triangles
-        # ---------------------------
-
-        # noinspection PyTypeChecker
-        index_1: np.ndarray = self._get_vertex_index(other_cols, other_rows, x_value_array)
-        # noinspection PyTypeChecker
-        index_2: np.ndarray = self._get_vertex_index(other_cols + step_x, other_rows, x_value_array)
-        # noinspection PyTypeChecker
-        index_3: np.ndarray = self._get_vertex_index(other_cols, other_rows + step_y, x_value_array)
-
-        index_1 = index_1.reshape(-1)
-        index_2 = index_2.reshape(-1)
-        index_3 = index_3.reshape(-1)
-
-        # second part of the triangles
-        # ---------------------------
-        # noinspection PyTypeChecker
-        index_4: np.ndarray = self._get_vertex_index(other_cols + step_x, other_rows, x_value_array)
-        # noinspection PyTypeChecker
-        index_5: np.ndarray = self._get_vertex_index(other_cols + step_x, other_rows + step_y, x_value_array)
-        # noinspection PyTypeChecker
-        index_6: np.ndarray = self._get_vertex_index(other_cols, other_rows + step_y, x_value_array)
-
-        index_4 = index_4.reshape(-1)
-        index_5 = index_5.reshape(-1)
-        index_6 = index_6.reshape(-1)
-
-        indices = np.zeros((len(index_1), 6))
-        indices[:, 0] = index_1
-        indices[:, 1] = index_2
-        indices[:, 2] = index_3
-        indices[:, 3] = index_4
-        indices[:, 4] = index_5
-        indices[:, 5] = index_6
-        indices = indices.reshape(-1).astype(np.uint32)
-
-        return indices
+        rows = np.arange(len(y_value_array))[index_minimum_y:index_maximum_y + cushion_rows:step_y]
+        cols = np.arange(len(x_value_array))[index_minimum_x:index_maximum_x + cushion_cols:step_x]
+
+        nan_mask = np.isnan(height_array[np.ix_(rows, cols)]) if height_array is not None else None
+
+        return generate_grid_indices(rows, cols, len(x_value_array), nan_mask)
@@ -17,10 +17,12 @@
 
 """Model class to manage models in the engine."""
 import ctypes as ctypes
+from typing import Dict, Generator, Union
 
 import OpenGL.GL as GL
 import numpy as np
-from OpenGL.GL.shaders import compileShader
+
+from src.engine.scene.model.shader_cache import ShaderCache
 
 
 class Model:
@@ -43,13 +45,17 @@ class Model:
         self.vbo = GL.glGenBuffers(1)
         self.ebo = GL.glGenBuffers(1)
 
-        self.shader_program = None
+        self.__shader_files = None
 
         self.position = np.array([0, 0, 0], dtype=np.float32)
         self.rotation = np.array([0, 0, 0], dtype=np.float32)
 
         self.indices_size = 0
 
+        # Range of vertices (first, count) to draw without using the element buffer. If None, the indices of the
+        # element buffer are used to draw the model.
+        self.vertex_range = None
+
         self.polygon_mode = GL.GL_FILL
         self.draw_mode = GL.GL_TRIANGLES
 
@@ -63,6 +69,19 @@ class Model:
         # -------------------
         self.__vertices_array = np.array([])
         self.__indices_array = np.array([])
+        self.__gpu_memory: Dict[str, int] = {}  # bytes used by the objects created in the GPU, indexed by name
+
+    @property
+    def shader_program(self) -> Union[int, None]:
+        """
+        Get the shader program used by the model (None if the shaders of the model were not set).
+
+        The program is taken from the ShaderCache every time, so the model uses the program compiled when the shaders
+        are reloaded.
+        """
+        if self.__shader_files is None:
+            return None
+        return ShaderCache.get_program(*self.__shader_files)
 
     def __str__(self) -> str:
         """Return the string representing the model object.
@@ -73,6 +92,21 @@ class Model:
 
         return f"Model with vao={self.vao}."
 
+    def _set_gpu_memory(self, name: str, nbytes: int) -> None:
+        """
+        Set the number of bytes used by an object of the model in the GPU (buffer or texture).
+
+        Args:
+            name: Name of the object.
+            nbytes: Bytes used by the object. Zero if the object was deleted (or it is owned by another model).
+
+        Returns: None
+        """
+        if nbytes > 0:
+            self.__gpu_memory[name] = int(nbytes)
+        else:
+            self.__gpu_memory.pop(name, None)
+
     def _update_uniforms(self) -> None:
         """
         Method called to updated uniforms in the model.
@@ -99,10 +133,13 @@ class Model:
         GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vbo)
         GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, self.ebo)
 
-        # Render the active element buffer with the active shader program
-        GL.glDrawElements(
-            self.draw_mode, self.indices_size, GL.GL_UNSIGNED_INT, None
-        )
+        # Render the active element buffer (or the range of vertices) with the active shader program
+        if self.vertex_range is not None:
+            GL.glDrawArrays(self.draw_mode, self.vertex_range[0], self.vertex_range[1])
+        else:
+            GL.glDrawElements(
+                self.draw_mode, self.indices_size, GL.GL_UNSIGNED_INT, None
+            )
 
         GL.glPolygonMode(GL.GL_FRONT, GL.GL_FILL)
         GL.glPolygonMode(GL.GL_BACK, GL.GL_FILL)
@@ -115,6 +152,18 @@ class Model:
         """
         return self.__indices_array
 
+    def get_memory_usage(self) -> Dict[str, int]:
+        """
+        Get the number of bytes used by the model in the CPU (arrays stored in the model) and in the GPU (buffers and
+        textures created by the model).
+
+        Returns: Dictionary with the keys CPU and GPU.
+        """
+        return {
+            'CPU': int(self.__vertices_array.nbytes + self.__indices_array.nbytes),
+            'GPU': sum(self.__gpu_memory.values())
+        }
+
     def get_vertices_array(self) -> np.ndarray:
         """
         Get the array of vertices currently being used in the model.
@@ -141,24 +190,39 @@ class Model:
 
         self.__indices_array = indices
         self.indices_size = len(indices)
+        self._set_gpu_memory('ebo', len(indices) * self.scene.get_float_bytes())
 
     def set_shaders(self, vertex_shader: str, fragment_shader: str) -> None:
         """Set the shaders to use in the model.
 
-        Set the shaders of the model, compiling them and creating a program.
+        Set the shaders of the model. The program is taken from the ShaderCache, so the shaders are only compiled
+        the first time that they are used in the application.
 
         Args:
             vertex_shader: Path to the vertex shader location.
             fragment_shader: Path to the fragment shader location.
         """
+        self.__shader_files = (vertex_shader, fragment_shader)
+        ShaderCache.get_program(vertex_shader, fragment_shader)
+
+    def set_vertex_buffer(self, vertex_buffer: int) -> None:
+        """Set a vertex buffer created outside the model as the buffer with the vertices of the model.
 
-        vertex_shader = open(vertex_shader, "r").read()
-        fragment_shader = open(fragment_shader, "r").read()
+        Used by the models that share the same vertices. The buffer previously used by the model is deleted.
 
-        self.shader_program = GL.OpenGL.GL.shaders.compileProgram(
-            compileShader(vertex_shader, GL.GL_VERTEX_SHADER),
-            compileShader(fragment_shader, GL.GL_FRAGMENT_SHADER),
+        Args:
+            vertex_buffer: Buffer with the vertices, 3 floats per vertex.
+        """
+        GL.glDeleteBuffers(1, [self.vbo])
+        self.vbo = vertex_buffer
+        self._set_gpu_memory('vbo', 0)
+
+        GL.glBindVertexArray(self.vao)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vbo)
+        GL.glVertexAttribPointer(
+            0, 3, GL.GL_FLOAT, GL.GL_FALSE, 0, ctypes.c_void_p(0)
         )
+        GL.glEnableVertexAttribArray(0)
 
     def set_vertices(self, vertex: np.ndarray) -> None:
         """Set the vertices buffers inside the model.
@@ -181,3 +245,55 @@ class Model:
         GL.glEnableVertexAttribArray(0)
 
         self.__vertices_array = vertex
+        self._set_gpu_memory('vbo', len(vertex) * self.scene.get_float_bytes())
+
+    def set_vertices_in_chunks(self, vertex: np.ndarray, chunk_size: int) -> Generator[None, None, None]:
+        """Set the vertices buffers inside the model, sending the vertices to the GPU in chunks.
+
+        The method is a generator that yields after sending every chunk, so the vertices can be sent in several
+        frames. The buffer must not be drawn until the generator is exhausted.
+
+        Args:
+            vertex: List of vertices of type np.float32.
+            chunk_size: Number of bytes sent to the GPU every chunk.
+        """
+        self.__vertices_array = vertex
+        vertex_float = np.ascontiguousarray(vertex, dtype=np.float32).reshape(-1)
+        float_bytes = self.scene.get_float_bytes()
+
+        GL.glBindVertexArray(self.vao)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vbo)
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, len(vertex_float) * float_bytes, None, GL.GL_STATIC_DRAW)
+        self._set_gpu_memory('vbo', len(vertex_float) * float_bytes)
+        GL.glVertexAttribPointer(
+            0, 3, GL.GL_FLOAT, GL.GL_FALSE, 0, ctypes.c_void_p(0)
+        )
+        GL.glEnableVertexAttribArray(0)
+
+        yield from self.update_vertices_in_chunks(0, len(vertex_float) // 3, chunk_size)
+
+    def update_vertices_in_chunks(self,
+                                  first_vertex: int,
+                                  last_vertex: int,
+                                  chunk_size: int) -> Generator[None, None, None]:
+        """Send again to the GPU a range of the vertices of the model, in chunks.
+
+        The method is a generator that yields after sending every chunk, so the vertices can be sent in several
+        frames. The values sent are read from the vertices of the model when every chunk is sent.
+
+        Args:
+            first_vertex: Index of the first vertex to send.
+            last_vertex: Index of the vertex after the last vertex to send.
+            chunk_size: Number of bytes sent to the GPU every chunk.
+        """
+        float_bytes = self.scene.get_float_bytes()
+        vertices_per_chunk = max(chunk_size // (3 * float_bytes), 1)
+
+        for start in range(first_vertex, last_vertex, vertices_per_chunk):
+            end = min(start + vertices_per_chunk, last_vertex)
+            vertex_float = np.ascontiguousarray(self.__vertices_array.reshape(-1)[start * 3:end * 3], dtype=np.float32)
+
+            GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vbo)
+            GL.glBufferSubData(GL.GL_ARRAY_BUFFER, start * 3 * float_bytes, len(vertex_float) * float_bytes,
+                               vertex_float)
+            yield
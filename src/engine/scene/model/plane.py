@@ -22,6 +22,7 @@ import OpenGL.GL as GL
 import numpy as np
 
 from src.engine.scene.model.model import Model
+from src.engine.scene.model.shader_cache import ShaderCache
 from src.utils import get_logger
 
 log = get_logger(module="PLANE")
@@ -72,17 +73,16 @@ class Plane(Model):
 
         # update values for the polygon shader
         # ------------------------------------
-        projection_location = GL.glGetUniformLocation(self.shader_program, "projection")
-        plane_color_location = GL.glGetUniformLocation(self.shader_program, "plane_color")
+        # The projection matrix is read from the uniform block shared by all the shaders (CameraUniformBuffer)
+        plane_color_location = ShaderCache.get_uniform_location(self.shader_program, "plane_color")
 
-        # set the color and projection matrix to use
-        # ------------------------------------------
+        # set the color to use
+        # --------------------
         GL.glUniform4f(plane_color_location,
                        self.__plane_color[0],
                        self.__plane_color[1],
                        self.__plane_color[2],
                        self.__plane_color[3])
-        GL.glUniformMatrix4fv(projection_location, 1, GL.GL_TRUE, self.scene.get_projection_matrix_2D())
 
     def set_triangles(self, vertices: np.ndarray) -> None:
         """
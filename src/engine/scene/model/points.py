@@ -19,12 +19,14 @@
 File with the class Points, class in charge of storing all the information related to the models that draw points on
 the scene
 """
-import ctypes as ctypes
+from typing import Union
 
 import OpenGL.GL as GL
 import numpy as np
 
 from src.engine.scene.model.model import Model
+from src.engine.scene.model.polygon_geometry import PolygonGeometry
+from src.engine.scene.model.shader_cache import ShaderCache
 from src.utils import get_logger
 
 log = get_logger(module="POINTS")
@@ -33,9 +35,12 @@ log = get_logger(module="POINTS")
 class Points(Model):
     """
     Class in charge of the modeling of points in the program.
+
+    The points are stored in a PolygonGeometry, that can be shared with other models that draw the same points. The
+    color of every point is selected in the shaders, the first and the last points use their own colors.
     """
 
-    def __init__(self, scene, point_list: np.ndarray = None):
+    def __init__(self, scene, point_list: np.ndarray = None, geometry: Union[PolygonGeometry, None] = None):
         """
         Constructor of the class.
 
@@ -45,97 +50,31 @@ class Points(Model):
         Args:
             point_list: List of points to use as initial value. This array will not be modified.
                         Format of the array must be [[x, y, z], [x, y, z], ...]
+            geometry: Geometry with the points to use. Ignored if point_list is given.
         """
         super().__init__(scene)
 
         # Properties of the model
         # -----------------------
-        self.cbo = GL.glGenBuffers(1)
         self.draw_mode = GL.GL_POINTS
-        self.update_uniform_values = False
+        self.update_uniform_values = True
 
         self.__vertex_shader_file = './src/engine/shaders/point_vertex.glsl'
         self.__fragment_shader_file = './src/engine/shaders/point_fragment.glsl'
 
         # Data of the points
         # ------------------
-        self.__point_list = []
-        self.__indices_list = []
-        self.__color_list = []
+        if point_list is not None:
+            assert len(point_list) > 0, 'Trying to load points with an array with no data.'
+            geometry = PolygonGeometry(point_list)
+
+        self.__geometry = geometry if geometry is not None else PolygonGeometry()
         self.__normal_color = (1, 1, 0, 1)  # RGBA
         self.__first_point_color = (1, 0, 0, 1)  # RGBA
         self.__last_point_color = (0, 0, 1, 1)  # RGBA
 
         self.set_shaders(self.__vertex_shader_file, self.__fragment_shader_file)
-
-        # Initialize model if data is given
-        # ---------------------------------
-        if point_list is not None:
-            point_list_copy = point_list.copy()
-
-            # Set points
-            # ----------
-            self.__point_list = list(point_list.reshape(-1))
-            self.set_vertices(np.array(self.__point_list, dtype=np.float32))
-
-            point_number = len(point_list_copy)
-            assert point_number > 0, 'Trying to load points with an array with no data.'
-
-            # Set colors
-            # ----------
-            if point_number == 1:
-                self.__color_list = list(self.__first_point_color)
-            elif point_number == 2:
-                self.__color_list = list(self.__first_point_color) + list(self.__last_point_color)
-            elif point_number > 2:
-                self.__color_list = list(self.__first_point_color) + list(self.__normal_color) * (point_number - 2) + \
-                                    list(self.__last_point_color)
-            self.set_color_buffer(np.array(self.__color_list, dtype=np.float32))
-
-            # Set indices
-            # -----------
-            self.__indices_list = list(range(point_number))
-            self.set_indices(np.array(self.__indices_list, dtype=np.uint32))
-
-    def __add_color_to_color_list(self, color: tuple) -> None:
-        """
-        Add a color to the color list.
-
-        Args:
-            color: New color to add (must have 4 elements)
-
-        Returns: None
-        """
-        if len(color) < 4:
-            raise AssertionError("Trying to add a color with fewer than 4 components.")
-
-        self.__color_list.append(color[0])
-        self.__color_list.append(color[1])
-        self.__color_list.append(color[2])
-        self.__color_list.append(color[3])
-
-    def __remove_last_color_from_color_list(self) -> None:
-        """
-        Remove the last color from the color list.
-
-        Returns: None
-        """
-        if len(self.__color_list) >= 4:
-            self.__color_list.pop()
-            self.__color_list.pop()
-            self.__color_list.pop()
-            self.__color_list.pop()
-
-    def __remove_last_point_from_point_list(self) -> None:
-        """
-        Remove the last point from the list of points.
-
-        Returns: None
-        """
-        if len(self.__point_list) >= 3:
-            self.__point_list.pop()
-            self.__point_list.pop()
-            self.__point_list.pop()
+        self.set_vertex_buffer(self.__geometry.get_vertex_buffer())
 
     def __str__(self) -> str:
         """
@@ -145,15 +84,11 @@ class Points(Model):
         """
         string_to_print = f"Points model data:\n"
 
-        points = np.array(self.__point_list).reshape((-1, 3))
-        colors = np.array(self.__color_list).reshape((-1, 4))
-        for index in range(len(points)):
-            string_to_print += f"Index: {index} - coordinates: {points[index]} - color: {colors[index]}"
+        for index, point in enumerate(self.__geometry.get_points()):
+            string_to_print += f"Index: {index} - coordinates: {point}"
             string_to_print += "\n"
 
-        string_to_print += f"\nIndices list: {self.__indices_list}"
-        string_to_print += f"\nPoint list: {self.__point_list}"
-        string_to_print += f"\nColor list: {self.__color_list}"
+        string_to_print += f"\nPoint list: {self.get_point_list()}"
 
         return string_to_print
 
@@ -161,16 +96,18 @@ class Points(Model):
         """
         Update the uniforms values for the model.
 
+        The projection matrix is read from the uniform block shared by all the shaders (CameraUniformBuffer).
+
         Returns: None
         """
-
-        # Update values for the polygon shader
-        # ------------------------------------
-        projection_location = GL.glGetUniformLocation(self.shader_program, "projection")
-
-        # Set the color and projection matrix to use
-        # ------------------------------------------
-        GL.glUniformMatrix4fv(projection_location, 1, GL.GL_TRUE, self.scene.get_projection_matrix_2D())
+        GL.glUniform4f(ShaderCache.get_uniform_location(self.shader_program, "first_point_color"),
+                       *self.__first_point_color)
+        GL.glUniform4f(ShaderCache.get_uniform_location(self.shader_program, "normal_color"),
+                       *self.__normal_color)
+        GL.glUniform4f(ShaderCache.get_uniform_location(self.shader_program, "last_point_color"),
+                       *self.__last_point_color)
+        GL.glUniform1i(ShaderCache.get_uniform_location(self.shader_program, "number_of_points"),
+                       self.__geometry.get_number_of_points())
 
     def add_point(self, x: float, y: float, z: float) -> None:
         """
@@ -183,43 +120,23 @@ class Points(Model):
 
         Returns: None
         """
-
-        # Update the vertices buffer
-        # --------------------------
-        self.__point_list.append(x)
-        self.__point_list.append(y)
-        self.__point_list.append(z)
-        self.set_vertices(np.array(self.__point_list, dtype=np.float32))
-
-        # Update the color buffer
-        # -----------------------
-        if len(self.__color_list) / 4 == 0:
-            self.__add_color_to_color_list(self.__first_point_color)
-
-        elif len(self.__color_list) / 4 == 1:
-            self.__add_color_to_color_list(self.__last_point_color)
-
-        else:
-            self.__remove_last_color_from_color_list()
-            self.__add_color_to_color_list(self.__normal_color)
-            self.__add_color_to_color_list(self.__last_point_color)
-
-        self.set_color_buffer(np.array(self.__color_list, dtype=np.float32))
-
-        # Update the indices buffer
-        # -------------------------
-        self.__indices_list.append(len(self.__point_list) / 3 - 1)
-        self.set_indices(np.array(self.__indices_list, dtype=np.uint32))
+        self.__geometry.append(x, y, z)
 
     def draw(self) -> None:
         """
         Draw the points on the scene
 
+        Only the points added since the last draw are sent to the GPU.
+
         Returns: None
         """
 
         # draw if there is at least one point
-        if len(self.__point_list) / 3 > 0:
+        number_of_points = self.__geometry.get_number_of_points()
+        if number_of_points > 0:
+            self.__geometry.update_buffer()
+            self.vertex_range = (0, number_of_points)
+
             # get the settings of the points to draw
             render_settings = self.scene.get_render_settings()
             dot_size = render_settings["DOT_SIZE"]
@@ -238,6 +155,14 @@ class Points(Model):
         """
         return self.__first_point_color
 
+    def get_geometry(self) -> PolygonGeometry:
+        """
+        Get the geometry with the points of the model.
+
+        Returns: Geometry used by the model.
+        """
+        return self.__geometry
+
     def get_last_point_color(self) -> tuple:
         """
         get the color to use in the drawing of the last point
@@ -261,144 +186,45 @@ class Points(Model):
 
         Returns: Point list
         """
-        return self.__point_list
+        return self.__geometry.get_point_list()
 
     def remove_last_added_point(self) -> None:
         """
         Remove the last added point to the list of points.
 
-        This update the buffers in the GPU
-
         Returns: None
         """
-
-        # only works when there is one point or more
-        if len(self.__point_list) / 3 > 0:
-
-            # remove the last point
-            self.__remove_last_point_from_point_list()
-
-            # remove the index representing the old last point
-            if len(self.__indices_list) > 0:
-                self.__indices_list.pop()
-
-            # remove the color of the removed point and change the color of the new last point
-            self.__remove_last_color_from_color_list()
-
-            # only change color if there is more than one point in the list
-            if len(self.__point_list) / 3 > 1:
-                self.__remove_last_color_from_color_list()
-                self.__add_color_to_color_list(self.__last_point_color)
-
-            # update the buffers on the GPU
-            self.set_vertices(np.array(self.__point_list, dtype=np.float32))
-            self.set_color_buffer(np.array(self.__color_list, dtype=np.float32))
-            self.set_indices(np.array(self.__indices_list, dtype=np.uint32))
-
-        log.debug(self)
-
-    def set_color_buffer(self, colors: np.ndarray) -> None:
-        """
-        Set the color buffer in opengl with the colors of the array
-
-        Args:
-            colors: Colors to use in the buffer
-
-        Returns: None
-        """
-        GL.glBindVertexArray(self.vao)
-        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.cbo)
-        GL.glBufferData(
-            GL.GL_ARRAY_BUFFER,
-            len(colors) * self.scene.get_float_bytes(),
-            colors,
-            GL.GL_STATIC_DRAW
-        )
-        GL.glVertexAttribPointer(
-            1, 4, GL.GL_FLOAT, GL.GL_FALSE, 0, ctypes.c_void_p(0)
-        )
-        GL.glEnableVertexAttribArray(1)
+        self.__geometry.pop()
 
     def set_first_point_color(self, new_color: tuple) -> None:
         """
         Set the color to use to coloring the first point.
 
         Args:
-            new_color: New color to use for the first point. (R, G, B)
+            new_color: New color to use for the first point. (R, G, B, A)
 
         Returns: None
         """
-        self.__first_point_color = new_color
-
-        # update the color buffer if there is at least one point defined
-        if len(self.__point_list) / 3 > 0:
-            self.__color_list[0] = new_color[0]
-            self.__color_list[1] = new_color[1]
-            self.__color_list[2] = new_color[2]
-            self.__color_list[3] = new_color[3]
-
-            self.set_color_buffer(np.array(self.__color_list, dtype=np.float32))
+        self.__first_point_color = tuple(new_color)
 
     def set_last_point_color(self, new_color: tuple) -> None:
         """
         Set the color to use in the last point
 
         Args:
-            new_color: New color to use in the last point. (R, G, B)
+            new_color: New color to use in the last point. (R, G, B, A)
 
         Returns: None
         """
-        self.__last_point_color = new_color
-
-        # update the color buffer if there is at least two point defined
-        if len(self.__point_list) / 3 > 1:
-            self.__color_list.pop()
-            self.__color_list.pop()
-            self.__color_list.pop()
-            self.__color_list.pop()
-
-            self.__color_list.append(new_color[0])
-            self.__color_list.append(new_color[1])
-            self.__color_list.append(new_color[2])
-            self.__color_list.append(new_color[3])
-
-            self.set_color_buffer(np.array(self.__color_list, dtype=np.float32))
+        self.__last_point_color = tuple(new_color)
 
     def set_normal_color(self, new_color: tuple) -> None:
         """
         Set the normal color to use to coloring the points.
 
         Args:
-            new_color: New color to use. (R, G, B)
+            new_color: New color to use. (R, G, B, A)
 
         Returns: None
         """
-        self.__normal_color = new_color
-
-        # update the color buffer if there is at least three points defined
-        if len(self.__point_list) / 3 > 2:
-            number_of_point = int(len(self.__point_list) / 3)
-
-            self.__color_list = []
-
-            # append the initial color
-            self.__color_list.append(self.__first_point_color[0])
-            self.__color_list.append(self.__first_point_color[1])
-            self.__color_list.append(self.__first_point_color[2])
-            self.__color_list.append(self.__first_point_color[3])
-
-            # append the new color to the list
-            for _ in range(number_of_point - 2):
-                self.__color_list.append(self.__normal_color[0])
-                self.__color_list.append(self.__normal_color[1])
-                self.__color_list.append(self.__normal_color[2])
-                self.__color_list.append(self.__normal_color[3])
-
-            # append the last color
-            self.__color_list.append(self.__last_point_color[0])
-            self.__color_list.append(self.__last_point_color[1])
-            self.__color_list.append(self.__last_point_color[2])
-            self.__color_list.append(self.__last_point_color[3])
-
-            # update the color buffer
-            self.set_color_buffer(np.array(self.__color_list, dtype=np.float32))
+        self.__normal_color = tuple(new_color)
@@ -20,6 +20,8 @@ File containing the class polygon.
 
 This class stores all the information related to the polygons that can be draw on the screen of the program.
 """
+from typing import Dict
+
 import OpenGL.GL as GL
 import numpy as np
 from shapely.geometry import LineString
@@ -28,6 +30,8 @@ from src.engine.scene.model.dashed_lines import DashedLines
 from src.engine.scene.model.lines import Lines
 from src.engine.scene.model.model import Model
 from src.engine.scene.model.points import Points
+from src.engine.scene.model.polygon_geometry import PolygonGeometry
+from src.engine.scene.model.segment_grid import SegmentGrid
 from src.error.polygon_error import PolygonError
 from src.utils import get_logger
 
@@ -66,11 +70,15 @@ class Polygon(Model):
         self.update_uniform_values = False
         self.__name = self.get_id()
 
-        # Models used to generate the polygon on the scene
-        # ------------------------------------------------
-        self.__point_model = Points(scene)  # model to use to draw the points
-        self.__lines_model = Lines(scene)  # model to use to draw the lines
-        self.__last_line_model = DashedLines(scene)  # model to use to render the last line of the polygon
+        # Models used to generate the polygon on the scene, all of them use the points stored in the geometry
+        # --------------------------------------------------------------------------------------------------
+        self.__geometry = PolygonGeometry()  # points of the polygon
+        self.__point_model = Points(scene, geometry=self.__geometry)  # model to use to draw the points
+        self.__lines_model = Lines(scene, geometry=self.__geometry)  # model to use to draw the lines
+        self.__last_line_model = DashedLines(scene, geometry=self.__geometry)  # model to render the last line
+
+        # Grid with the lines of the polygon, used to check the intersections of the new lines
+        self.__segment_grid = SegmentGrid()
 
         # Parameters stored in the polygon to use when exporting to shapefile
         # -------------------------------------------------------------------
@@ -81,6 +89,10 @@ class Polygon(Model):
         self.__is_planar = True
         self.__default_height_value = 0.5
 
+        # Number of modifications made to the points and colors of the polygon, used by the PolygonLayer to know when
+        # the data of the polygon must be sent again to the GPU
+        self.__version = 0
+
         # Initialize polygon if data is given
         # -----------------------------------
         if point_list is not None:
@@ -102,37 +114,12 @@ class Polygon(Model):
             points[:, 1] = point_array[:, 1]
             points[:, 2] = self.__default_height_value
 
-            self.__point_model = Points(scene, points)
-            self.__lines_model = Lines(scene, point_list=points)
+            self.__geometry.extend(points)
+            for point in points:
+                self.__segment_grid.add_point(point[0], point[1], point[2])
 
             self.__update_planar_state()
-            self.update_last_line()
-
-    def __check_intersection(self, points: list = None) -> bool:
-        """
-        Join the points given in a line and check if there is intersections.
-
-        Args:
-            points: List with the points to check. [x,y,z,x,y,z,x,y,z,...]
-        """
-        points_array = np.array(points)
-        points_array = points_array.reshape((-1, 3))
-        return not LineString(points_array).is_simple
-
-    def __check_repeated_point(self, x: float, y: float, z: float) -> bool:
-        """
-        Check if a point already exist on the polygon.
-
-        Args:
-            x: x-coordinate of the point
-            y: y-coordinate of the point
-            z: z-coordinate of the point
-
-        Returns: Boolean representing if point already exist in the polygon.
-        """
-        point_list_array = np.array(self.get_point_list() + [x, y, z])
-        point_list_array = point_list_array.reshape((-1, 3))
-        return len(np.unique(point_list_array, axis=0)) != len(point_list_array)
+            self.__version += 1
 
     def __str__(self):
         """
@@ -149,12 +136,8 @@ class Polygon(Model):
         Returns: None
         """
         if self.get_point_number() > 2:
-            # ask for intersections on the closed polygon.
-            point_list = self.get_point_list()
-            if self.__check_intersection(points=point_list + [point_list[0], point_list[1], point_list[2]]):
-                self.__is_planar = False
-            else:
-                self.__is_planar = True
+            # ask for intersections of the line that closes the polygon.
+            self.__is_planar = not self.__segment_grid.intersects_closing_segment()
 
     def add_point(self, x: float, y: float, z: float = None) -> None:
         """
@@ -171,36 +154,23 @@ class Polygon(Model):
             z = self.__default_height_value
 
         # check if point is already on the polygon
-        if self.__check_repeated_point(x, y, z):
+        if self.__segment_grid.contains_point(x, y, z):
             raise PolygonError(1, {'repeated_point': (x, y, z)})
 
-        # check if lines intersect
+        # check if lines intersect, only the lines near the new lines are checked
         if self.get_point_number() > 2:
-            point_list = self.get_point_list()
 
             # do not let the creation of lines that intersect
-            if self.__check_intersection(point_list + [x, y, z]):
+            if self.__segment_grid.intersects_new_segment(x, y):
                 raise PolygonError(0)
 
             # if the completion line intersect, then change the state of the polygon.
-            if self.__check_intersection(point_list + [x, y, z, point_list[0], point_list[1], point_list[2]]):
-                self.__is_planar = False
-            else:
-                self.__is_planar = True
-
-        # add points to the point model
-        self.__point_model.add_point(x, y, z)
+            self.__is_planar = not self.__segment_grid.intersects_closing_segment(x, y)
 
-        # list of points
-        point_list = self.get_point_list()
-
-        # draw line only if there is more than one point
-        if self.get_point_number() > 1:
-            self.__lines_model.add_line((point_list[-6], point_list[-5], point_list[-4]),
-                                        (point_list[-3], point_list[-2], point_list[-1]))
-
-        # update the last line of the model
-        self.update_last_line()
+        # add the point to the geometry, the lines and the last line of the polygon are generated from its points
+        self.__geometry.append(x, y, z)
+        self.__segment_grid.add_point(x, y, z)
+        self.__version += 1
 
     def remove_parameter(self, key: str) -> None:
         """
@@ -230,6 +200,16 @@ class Polygon(Model):
         self.__last_line_model.draw()
         self.__point_model.draw()
 
+    def get_dot_colors(self) -> tuple:
+        """
+        Get the colors used to draw the dots of the polygon.
+
+        Returns: Tuple with the color of the first, the normal and the last dots of the polygon in RGBA format.
+        """
+        return (self.__point_model.get_first_point_color(),
+                self.__point_model.get_normal_color(),
+                self.__point_model.get_last_point_color())
+
     def get_id(self) -> str:
         """
         Get the id of the polygon.
@@ -238,6 +218,28 @@ class Polygon(Model):
         """
         return self.id
 
+    def get_line_color(self) -> tuple:
+        """
+        Get the color used to draw the lines of the polygon.
+
+        Returns: Color of the lines in RGBA format.
+        """
+        return self.__lines_model.get_line_color()
+
+    def get_memory_usage(self) -> Dict[str, int]:
+        """
+        Get the number of bytes used by the points of the polygon and by the models used to draw them, in the CPU and
+        in the GPU.
+
+        Returns: Dictionary with the keys CPU and GPU.
+        """
+        memory_usage = self.__geometry.get_memory_usage()
+        for model in [super(), self.__point_model, self.__lines_model, self.__last_line_model]:
+            model_memory_usage = model.get_memory_usage()
+            memory_usage['CPU'] += model_memory_usage['CPU']
+            memory_usage['GPU'] += model_memory_usage['GPU']
+        return memory_usage
+
     def get_name(self) -> str:
         """
         Get the name of the polygon.
@@ -272,7 +274,17 @@ class Polygon(Model):
 
         Returns: List of points
         """
-        return self.__point_model.get_point_list()
+        return self.__geometry.get_point_list()
+
+    def get_point_array(self) -> np.ndarray:
+        """
+        Get the points of the polygon as an array.
+
+        The array returned is a view of the array used to store the points, it must not be modified.
+
+        Returns: Array of shape (number_of_points, 3) with the points.
+        """
+        return self.__geometry.get_points()
 
     def get_point_number(self) -> int:
         """
@@ -280,8 +292,17 @@ class Polygon(Model):
 
         Returns: Number of points of the polygon.
         """
-        # return int(len(self.__point_list) / 3)
-        return int(len(self.get_point_list()) / 3)
+        return self.__geometry.get_number_of_points()
+
+    def get_version(self) -> int:
+        """
+        Get the number of modifications made to the points and colors of the polygon.
+
+        The value changes every time that a point is added or removed, or a color of the polygon is changed.
+
+        Returns: Version of the polygon.
+        """
+        return self.__version
 
     def is_planar(self) -> bool:
         """
@@ -302,11 +323,10 @@ class Polygon(Model):
 
         # only works when there is points in the model
         if self.get_point_number() > 0:
-            self.__point_model.remove_last_added_point()
-            self.__lines_model.remove_last_added_line()
-
-            self.update_last_line()
+            self.__geometry.pop()
+            self.__segment_grid.remove_last_point()
             self.__update_planar_state()
+            self.__version += 1
 
     def set_dot_color(self, color: list) -> None:
         """
@@ -321,6 +341,7 @@ class Polygon(Model):
         """
         log.debug(f"Changing polygon dot color to {color}")
         self.__point_model.set_normal_color(tuple(color))
+        self.__version += 1
 
     def set_id(self, new_id: str) -> None:
         """
@@ -347,6 +368,7 @@ class Polygon(Model):
         log.debug(f"Changing polygon color to {color}")
         self.__lines_model.set_line_color(color)
         self.__last_line_model.set_line_color(color)
+        self.__version += 1
 
     def set_name(self, new_name: str) -> None:
         """
@@ -370,20 +392,3 @@ class Polygon(Model):
         Returns: None
         """
         self.__parameters[key] = value
-
-    def update_last_line(self) -> None:
-        """
-        Update the last line of the polygon.
-
-        Returns: None
-        """
-        # Remove the last line if exist
-        point_list = self.get_point_list()
-        point_number = self.get_point_number()
-
-        self.__last_line_model.remove_last_added_line()
-
-        # Add a new line only if there is 3 or more points
-        if point_number >= 3:
-            self.__last_line_model.add_line((point_list[-3], point_list[-2], point_list[-1]),
-                                            (point_list[0], point_list[1], point_list[2]))
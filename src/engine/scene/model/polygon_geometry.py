@@ -0,0 +1,208 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+File with the class PolygonGeometry, class that stores the coordinates of the points of a polygon.
+"""
+from typing import Dict, Tuple, Union
+
+import OpenGL.GL as GL
+import numpy as np
+
+
+class PolygonGeometry:
+    """
+    Class that store the coordinates of the points of a polygon in an array and in a vertex buffer in the GPU.
+
+    The array (and the buffer) has more capacity than the number of points stored, and the capacity is doubled every
+    time that it is not enough to store a new point, so adding points does not need to create a new array every time.
+
+    The buffer is shared by all the models used to draw the polygon (points, lines and the last line), every model
+    draw a range of the points stored in it. When points are added, only the new points are sent to the GPU.
+    """
+
+    def __init__(self, points: Union[np.ndarray, None] = None, initial_capacity: int = 16):
+        """
+        Constructor of the class.
+
+        The buffer is created in the GPU the first time that it is asked for.
+
+        Args:
+            points: Initial points of the polygon. Array of shape (number_of_points, 3).
+            initial_capacity: Initial number of points that can be stored without increasing the capacity.
+        """
+        points = np.zeros((0, 3)) if points is None else np.asarray(points, dtype=np.float64).reshape((-1, 3))
+
+        self.__size = len(points)
+        self.__coordinates = np.zeros((max(initial_capacity, self.__size, 1), 3), dtype=np.float64)
+        self.__coordinates[:self.__size] = points
+
+        # Data of the buffer in the GPU
+        # -----------------------------
+        self.__vbo = None
+        self.__buffer_capacity = 0  # Number of points that the buffer can store
+        self.__uploaded_size = 0  # Number of points of the array that are updated in the buffer
+
+    def append(self, x: float, y: float, z: float) -> None:
+        """
+        Add a point at the end of the polygon.
+
+        The capacity of the array is doubled if there is no space to store the new point.
+
+        Args:
+            x: x-coordinate of the point.
+            y: y-coordinate of the point.
+            z: z-coordinate of the point.
+
+        Returns: None
+        """
+        if self.__size == len(self.__coordinates):
+            new_coordinates = np.zeros((2 * len(self.__coordinates), 3), dtype=np.float64)
+            new_coordinates[:self.__size] = self.__coordinates
+            self.__coordinates = new_coordinates
+
+        self.__coordinates[self.__size] = (x, y, z)
+        self.__size += 1
+
+    def extend(self, points: np.ndarray) -> None:
+        """
+        Add a group of points at the end of the polygon.
+
+        The capacity of the array is doubled until the new points can be stored.
+
+        Args:
+            points: Points to add. Array of shape (number_of_points, 3).
+
+        Returns: None
+        """
+        points = np.asarray(points, dtype=np.float64).reshape((-1, 3))
+
+        capacity = len(self.__coordinates)
+        while capacity < self.__size + len(points):
+            capacity *= 2
+
+        if capacity != len(self.__coordinates):
+            new_coordinates = np.zeros((capacity, 3), dtype=np.float64)
+            new_coordinates[:self.__size] = self.__coordinates[:self.__size]
+            self.__coordinates = new_coordinates
+
+        self.__coordinates[self.__size:self.__size + len(points)] = points
+        self.__size += len(points)
+
+    def get_capacity(self) -> int:
+        """
+        Get the number of points that can be stored without increasing the capacity of the array.
+
+        Returns: Capacity of the array.
+        """
+        return len(self.__coordinates)
+
+    def get_memory_usage(self) -> Dict[str, int]:
+        """
+        Get the number of bytes used by the array with the points and by the buffer in the GPU.
+
+        Returns: Dictionary with the keys CPU and GPU.
+        """
+        return {
+            'CPU': int(self.__coordinates.nbytes),
+            'GPU': self.__buffer_capacity * 3 * np.dtype(np.float32).itemsize
+        }
+
+    def get_number_of_points(self) -> int:
+        """
+        Get the number of points stored.
+
+        Returns: Number of points.
+        """
+        return self.__size
+
+    def get_outdated_range(self) -> Tuple[int, int, bool]:
+        """
+        Get the range of points that must be sent to the buffer in the GPU.
+
+        Returns: Tuple with the first and last (not inclusive) points to send and a boolean indicating if the buffer
+                 must be created again with the new capacity of the array (in which case all the points are sent).
+        """
+        if self.__buffer_capacity != len(self.__coordinates):
+            return 0, self.__size, True
+        return self.__uploaded_size, self.__size, False
+
+    def get_point_list(self) -> list:
+        """
+        Get the list of points.
+        The format of the list is as follows: [x1, y1, z1, x2, y2, z2, ...]
+
+        Returns: List of points
+        """
+        return self.__coordinates[:self.__size].reshape(-1).tolist()
+
+    def get_points(self) -> np.ndarray:
+        """
+        Get the points stored.
+
+        The array returned is a view of the array used to store the points, it must not be modified.
+
+        Returns: Array of shape (number_of_points, 3) with the points.
+        """
+        return self.__coordinates[:self.__size]
+
+    def get_vertex_buffer(self) -> int:
+        """
+        Get the vertex buffer with the points of the polygon.
+
+        The buffer is created if it does not exist.
+
+        Returns: Vertex buffer.
+        """
+        if self.__vbo is None:
+            self.__vbo = GL.glGenBuffers(1)
+        return self.__vbo
+
+    def pop(self) -> None:
+        """
+        Remove the last point of the polygon.
+
+        Does nothing if there is no points.
+
+        Returns: None
+        """
+        if self.__size > 0:
+            self.__size -= 1
+            self.__uploaded_size = min(self.__uploaded_size, self.__size)
+
+    def update_buffer(self) -> None:
+        """
+        Send the points that changed since the last update to the buffer in the GPU.
+
+        If the capacity of the array changed, then the buffer is created again with the new capacity.
+
+        Returns: None
+        """
+        start, end, reallocate = self.get_outdated_range()
+        if not reallocate and start == end:
+            return
+
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.get_vertex_buffer())
+        if reallocate:
+            coordinates = self.__coordinates.astype(np.float32)
+            GL.glBufferData(GL.GL_ARRAY_BUFFER, coordinates.nbytes, coordinates, GL.GL_DYNAMIC_DRAW)
+            self.__buffer_capacity = len(self.__coordinates)
+        else:
+            coordinates = self.__coordinates[start:end].astype(np.float32)
+            GL.glBufferSubData(GL.GL_ARRAY_BUFFER, start * coordinates.itemsize * 3, coordinates.nbytes, coordinates)
+
+        self.__uploaded_size = end
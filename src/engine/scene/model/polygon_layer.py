@@ -0,0 +1,449 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+File with the class PolygonLayer, class in charge of drawing all the polygons of the scene using buffers shared by all
+of them.
+"""
+import ctypes as ctypes
+import math
+from typing import Dict, List, Tuple, Union
+
+import OpenGL.GL as GL
+import numpy as np
+
+from src.engine.scene.geometrical_operations import get_effective_areas
+from src.engine.scene.model.shader_cache import ShaderCache
+from src.utils import get_logger
+
+log = get_logger(module="POLYGON_LAYER")
+
+# Number of texels (RGBA) used by every polygon in the buffer with the data of the polygons
+POLYGON_DATA_TEXELS = 5
+
+
+def get_polygon_depths(number_of_polygons: int) -> np.ndarray:
+    """
+    Get the depth (in normalized device coordinates) to use for the polygons given their draw priority.
+
+    The polygon with the highest priority (position 0) gets the depth closest to the camera, this way, the depth test
+    keeps the order in which the polygons must be drawn independently of the order in which they are sent to the GPU.
+
+    Args:
+        number_of_polygons: Number of polygons to draw.
+
+    Returns: Array with the depth of every position of the draw priority.
+    """
+    return -1 + 2 * (np.arange(number_of_polygons, dtype=np.float32) + 1) / (number_of_polygons + 1)
+
+
+def get_simplification_area(pixel_size: float, tolerance: float) -> float:
+    """
+    Get the minimum effective area that the points of the polygons must have to be drawn.
+
+    The size of the pixels is rounded down to a power of two, so the polygons are only simplified again when the zoom
+    changes the size of the pixels to the next power of two.
+
+    Args:
+        pixel_size: Size of the pixels of the screen in the coordinates of the map.
+        tolerance: Size (in pixels) of the triangles formed by the points that can be removed. 0 to draw all the
+                   points.
+
+    Returns: Minimum effective area of the points to draw.
+    """
+    if tolerance <= 0 or pixel_size <= 0:
+        return 0
+    return (2.0 ** math.floor(math.log2(pixel_size * tolerance))) ** 2
+
+
+def pack_polygon_geometry(point_arrays: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pack the points of the polygons in the arrays used to draw all the polygons using the same buffers.
+
+    The indices are stored in three blocks: the lines between consecutive points of every polygon, the last line of
+    every polygon (the one that closes the polygon, only for polygons with three or more points) and the points of
+    every polygon.
+
+    Args:
+        point_arrays: List with the points of every polygon, each one with shape (number_of_points, 3).
+
+    Returns: Tuple with the vertices (shape (n, 3)), the index of the polygon and the role of every vertex in the
+             polygon (shape (n, 2), role is 0 for the first point, 1 for the normal points and 2 for the last one), the
+             indices and the ranges (offset, number of indices) of every polygon in the three blocks of indices
+             (shape (number_of_polygons, 3, 2)).
+    """
+    number_of_polygons = len(point_arrays)
+    point_counts = np.array([len(points) for points in point_arrays], dtype=np.int64)
+    first_vertices = np.cumsum(point_counts) - point_counts
+    last_vertices = first_vertices + point_counts - 1
+    number_of_vertices = int(point_counts.sum())
+
+    # Vertices and data of every vertex
+    # ---------------------------------
+    if number_of_vertices > 0:
+        vertices = np.concatenate([np.asarray(points, dtype=np.float32).reshape((-1, 3))
+                                   for points in point_arrays if len(points) > 0])
+    else:
+        vertices = np.zeros((0, 3), dtype=np.float32)
+
+    vertex_data = np.ones((number_of_vertices, 2), dtype=np.float32)
+    vertex_data[:, 0] = np.repeat(np.arange(number_of_polygons), point_counts)
+    with_points = point_counts > 0
+    with_last_point = point_counts > 1
+    vertex_data[last_vertices[with_last_point], 1] = 2
+    vertex_data[first_vertices[with_points], 1] = 0
+
+    # Indices of the lines, the last lines and the points
+    # ---------------------------------------------------
+    line_starts = np.setdiff1d(np.arange(number_of_vertices), last_vertices[with_points])
+    line_indices = np.column_stack((line_starts, line_starts + 1)).reshape(-1)
+
+    closed = point_counts > 2
+    last_line_indices = np.column_stack((last_vertices[closed], first_vertices[closed])).reshape(-1)
+
+    point_indices = np.arange(number_of_vertices)
+
+    indices = np.concatenate((line_indices, last_line_indices, point_indices)).astype(np.uint32)
+
+    # Ranges of every polygon in the blocks of indices
+    # ------------------------------------------------
+    ranges = np.zeros((number_of_polygons, 3, 2), dtype=np.int64)
+    counts = np.column_stack((2 * np.maximum(point_counts - 1, 0), 2 * closed, point_counts))
+    block_offsets = [0, len(line_indices), len(line_indices) + len(last_line_indices)]
+    for block in range(3):
+        ranges[:, block, 1] = counts[:, block]
+        ranges[:, block, 0] = block_offsets[block] + np.cumsum(counts[:, block]) - counts[:, block]
+
+    return vertices, vertex_data, indices, ranges
+
+
+class PolygonLayer:
+    """
+    Class that draw all the polygons of the scene using the same buffers.
+
+    The points of all the polygons are packed in one vertex buffer and one element buffer, so all the lines, the last
+    lines and the points of the polygons are drawn with one multi-draw call each (plus the borders of the active
+    polygon). The colors of every polygon, if the polygon is active or not and its depth are stored in a texture
+    buffer that is read in the shaders.
+
+    The draw priority of the polygons is kept using the depth test, every polygon is drawn with a depth that
+    depends on its position in the draw priority.
+
+    Dense polygons are simplified before drawing them, removing the points whose effective area (calculated with
+    the Visvalingam-Whyatt algorithm when the polygon changes) is smaller than the size of the pixels of the screen.
+    Only the drawing is simplified, the polygons keep all their points.
+
+    The data is only sent to the GPU when the polygons, their versions, the level of simplification, the draw
+    priority or the active polygon change.
+    """
+
+    def __init__(self, scene):
+        """
+        Constructor of the class.
+
+        The buffers are created in the GPU the first time that the polygons are drawn.
+
+        Args:
+            scene: Scene to use for rendering.
+        """
+        self.scene = scene
+
+        self.vao = None
+        self.vbo = None
+        self.dbo = None
+        self.ebo = None
+        self.polygon_data_buffer = None
+        self.polygon_data_texture = None
+
+        self.transparency = 0.3
+        self.dash_size = 10
+        self.gap_size = 5
+        self.border_color = (0, 0, 0, 1)
+
+        self.__vertex_shader_file = './src/engine/shaders/polygon_layer_vertex.glsl'
+        self.__fragment_shader_file = './src/engine/shaders/polygon_layer_fragment.glsl'
+        self.__dashed_fragment_shader_file = './src/engine/shaders/polygon_layer_dashed_fragment.glsl'
+
+        # Data of the polygons packed in the buffers
+        # ------------------------------------------
+        self.__polygon_ids: List[str] = []
+        self.__polygon_versions: List[int] = []
+        self.__polygon_positions: Dict[str, int] = {}
+        self.__point_arrays: Dict[str, Tuple[int, np.ndarray, np.ndarray]] = {}  # version, points and areas
+        self.__simplification_area = 0
+        self.__ranges = np.zeros((0, 3, 2), dtype=np.int64)
+        self.__gpu_memory: Dict[str, int] = {}  # bytes used by the buffers, indexed by the name of the buffer
+
+        # Data of the polygons to draw
+        # ----------------------------
+        self.__draw_priority: List[str] = []
+        self.__active_polygon_id: Union[str, None] = None
+        self.__draw_ranges = [(np.zeros(0, dtype=np.int32), None)] * 3
+
+    def __create_buffers(self) -> None:
+        """
+        Create the buffers and the shader programs used to draw the polygons.
+
+        Returns: None
+        """
+        self.vao = GL.glGenVertexArrays(1)
+        self.vbo = GL.glGenBuffers(1)
+        self.dbo = GL.glGenBuffers(1)
+        self.ebo = GL.glGenBuffers(1)
+        self.polygon_data_buffer = GL.glGenBuffers(1)
+        self.polygon_data_texture = GL.glGenTextures(1)
+
+        ShaderCache.get_program(self.__vertex_shader_file, self.__fragment_shader_file)
+        ShaderCache.get_program(self.__vertex_shader_file, self.__dashed_fragment_shader_file)
+
+    def __draw_element(self, dashed: bool, draw_mode: int, block: int, element: int) -> None:
+        """
+        Draw the block of indices of the polygons using one multi-draw call.
+
+        The program is taken from the ShaderCache, so the programs reloaded in the cache are used.
+
+        Args:
+            dashed: If the elements must be drawn using the dashed shaders.
+            draw_mode: Primitive to draw.
+            block: Block of indices to draw (0 lines, 1 last lines, 2 points).
+            element: Element of the polygon to draw in the shader (0 lines, 1 borders, 2 points).
+
+        Returns: None
+        """
+        counts, offsets = self.__draw_ranges[block]
+        if len(counts) == 0:
+            return
+
+        shader_program = ShaderCache.get_program(self.__vertex_shader_file,
+                                                 self.__dashed_fragment_shader_file if dashed else
+                                                 self.__fragment_shader_file)
+
+        GL.glUseProgram(shader_program)
+        GL.glUniform1i(ShaderCache.get_uniform_location(shader_program, "polygon_data"), 0)
+        GL.glUniform1i(ShaderCache.get_uniform_location(shader_program, "element"), element)
+        GL.glUniform4f(ShaderCache.get_uniform_location(shader_program, "border_color"), *self.border_color)
+
+        if dashed:
+            GL.glUniform1f(ShaderCache.get_uniform_location(shader_program, "u_dashSize"), self.dash_size)
+            GL.glUniform1f(ShaderCache.get_uniform_location(shader_program, "u_gapSize"), self.gap_size)
+            GL.glUniform1f(ShaderCache.get_uniform_location(shader_program, "transparency"), self.transparency)
+
+        GL.glMultiDrawElements(draw_mode, counts, GL.GL_UNSIGNED_INT, offsets, len(counts))
+
+    def __update_draw_ranges(self) -> None:
+        """
+        Update the ranges of indices to draw using the polygons in the draw priority.
+
+        Returns: None
+        """
+        positions = np.array([self.__polygon_positions[polygon_id]
+                              for polygon_id in self.__draw_priority
+                              if polygon_id in self.__polygon_positions], dtype=np.int64)
+
+        index_bytes = np.dtype(np.uint32).itemsize
+        self.__draw_ranges = []
+        for block in range(3):
+            block_ranges = self.__ranges[positions, block] if len(positions) > 0 else np.zeros((0, 2), np.int64)
+            block_ranges = block_ranges[block_ranges[:, 1] > 0]
+
+            offsets = (ctypes.c_void_p * len(block_ranges))(*[int(offset * index_bytes)
+                                                              for offset in block_ranges[:, 0]])
+            self.__draw_ranges.append((block_ranges[:, 1].astype(np.int32), offsets))
+
+    def __update_geometry(self, polygons: Dict[str, 'Polygon'], simplification_area: float) -> bool:
+        """
+        Pack the points of the polygons and send them to the GPU if any polygon or the level of simplification
+        changed since the last update.
+
+        Args:
+            polygons: Dictionary with the polygons of the scene.
+            simplification_area: Minimum effective area of the points to draw.
+
+        Returns: Boolean indicating if the buffers were updated.
+        """
+        polygon_ids = list(polygons.keys())
+        polygon_versions = [polygon.get_version() for polygon in polygons.values()]
+        if polygon_ids == self.__polygon_ids and polygon_versions == self.__polygon_versions and \
+                simplification_area == self.__simplification_area:
+            return False
+
+        # Only the points (and the effective areas) of the polygons that changed are calculated again
+        point_arrays = []
+        for polygon_id, version in zip(polygon_ids, polygon_versions):
+            if polygon_id not in self.__point_arrays or self.__point_arrays[polygon_id][0] != version:
+                points = polygons[polygon_id].get_point_array().astype(np.float32)
+                self.__point_arrays[polygon_id] = (version, points, get_effective_areas(points))
+
+            _, points, areas = self.__point_arrays[polygon_id]
+            point_arrays.append(points[areas >= simplification_area])
+
+        for polygon_id in set(self.__point_arrays.keys()) - set(polygon_ids):
+            self.__point_arrays.pop(polygon_id)
+
+        vertices, vertex_data, indices, self.__ranges = pack_polygon_geometry(point_arrays)
+        self.__polygon_ids = polygon_ids
+        self.__polygon_versions = polygon_versions
+        self.__simplification_area = simplification_area
+        self.__polygon_positions = {polygon_id: position for position, polygon_id in enumerate(polygon_ids)}
+
+        log.debug(f'Packing {len(polygon_ids)} polygons with {len(vertices)} vertices.')
+
+        GL.glBindVertexArray(self.vao)
+
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vbo)
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL.GL_DYNAMIC_DRAW)
+        GL.glVertexAttribPointer(0, 3, GL.GL_FLOAT, GL.GL_FALSE, 0, ctypes.c_void_p(0))
+        GL.glEnableVertexAttribArray(0)
+
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.dbo)
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, vertex_data.nbytes, vertex_data, GL.GL_DYNAMIC_DRAW)
+        GL.glVertexAttribPointer(1, 2, GL.GL_FLOAT, GL.GL_FALSE, 0, ctypes.c_void_p(0))
+        GL.glEnableVertexAttribArray(1)
+
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, self.ebo)
+        GL.glBufferData(GL.GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL.GL_DYNAMIC_DRAW)
+
+        GL.glBindVertexArray(0)
+
+        self.__gpu_memory['vbo'] = vertices.nbytes
+        self.__gpu_memory['dbo'] = vertex_data.nbytes
+        self.__gpu_memory['ebo'] = indices.nbytes
+        return True
+
+    def __update_polygon_data(self, polygons: Dict[str, 'Polygon']) -> None:
+        """
+        Send the colors, active state and depth of every polygon to the texture buffer.
+
+        Args:
+            polygons: Dictionary with the polygons of the scene.
+
+        Returns: None
+        """
+        polygon_data = np.zeros((len(self.__polygon_ids), POLYGON_DATA_TEXELS, 4), dtype=np.float32)
+        for position, polygon_id in enumerate(self.__polygon_ids):
+            polygon = polygons[polygon_id]
+            polygon_data[position, 0] = polygon.get_line_color()
+            polygon_data[position, 1:4] = polygon.get_dot_colors()
+
+        drawn_polygons = [polygon_id for polygon_id in self.__draw_priority if polygon_id in self.__polygon_positions]
+        for polygon_id, depth in zip(drawn_polygons, get_polygon_depths(len(drawn_polygons))):
+            polygon_data[self.__polygon_positions[polygon_id], 4] = (polygon_id == self.__active_polygon_id,
+                                                                     depth, 0, 0)
+
+        GL.glBindBuffer(GL.GL_TEXTURE_BUFFER, self.polygon_data_buffer)
+        GL.glBufferData(GL.GL_TEXTURE_BUFFER, max(polygon_data.nbytes, 16), polygon_data, GL.GL_DYNAMIC_DRAW)
+        self.__gpu_memory['polygon_data_buffer'] = max(polygon_data.nbytes, 16)
+        GL.glBindTexture(GL.GL_TEXTURE_BUFFER, self.polygon_data_texture)
+        GL.glTexBuffer(GL.GL_TEXTURE_BUFFER, GL.GL_RGBA32F, self.polygon_data_buffer)
+        GL.glBindTexture(GL.GL_TEXTURE_BUFFER, 0)
+        GL.glBindBuffer(GL.GL_TEXTURE_BUFFER, 0)
+
+    def draw(self, polygons: Dict[str, 'Polygon'], draw_priority: List[str], active_polygon_id: str) -> None:
+        """
+        Draw the polygons in the order given by the draw priority.
+
+        Polygons that are not in the draw priority are not drawn. The first polygon of the draw priority is drawn
+        over all the others.
+
+        Args:
+            polygons: Dictionary with the polygons of the scene.
+            draw_priority: List with the ids of the polygons to draw, ordered from the highest to the lowest priority.
+            active_polygon_id: ID of the active polygon, drawn with borders.
+
+        Returns: None
+        """
+        if self.vao is None:
+            self.__create_buffers()
+
+        # Simplify the polygons depending on the size of the pixels of the screen
+        render_settings = self.scene.get_render_settings()
+        showed_limits = self.scene.get_2D_showed_limits()
+        pixel_size = (showed_limits['right'] - showed_limits['left']) / \
+            self.scene.get_scene_setting_data()['SCENE_WIDTH_X']
+        simplification_area = get_simplification_area(pixel_size,
+                                                       render_settings['POLYGON_SIMPLIFICATION_TOLERANCE'])
+
+        geometry_updated = self.__update_geometry(polygons, simplification_area)
+        if geometry_updated or draw_priority != self.__draw_priority or active_polygon_id != self.__active_polygon_id:
+            self.__draw_priority = list(draw_priority)
+            self.__active_polygon_id = active_polygon_id
+            self.__update_draw_ranges()
+            self.__update_polygon_data(polygons)
+
+        if len(self.__draw_priority) == 0:
+            return
+
+        # Get the data to draw the polygons
+        depth_test_enabled = GL.glIsEnabled(GL.GL_DEPTH_TEST)
+
+        GL.glEnable(GL.GL_DEPTH_TEST)
+        GL.glDepthFunc(GL.GL_LEQUAL)
+
+        GL.glBindVertexArray(self.vao)
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, self.ebo)
+        GL.glActiveTexture(GL.GL_TEXTURE0)
+        GL.glBindTexture(GL.GL_TEXTURE_BUFFER, self.polygon_data_texture)
+
+        # Lines and the borders of the active polygon
+        GL.glLineWidth(render_settings["ACTIVE_POLYGON_LINE_WIDTH"])
+        self.__draw_element(False, GL.GL_LINES, 0, 1)
+        GL.glLineWidth(render_settings["POLYGON_LINE_WIDTH"])
+        self.__draw_element(False, GL.GL_LINES, 0, 0)
+
+        # Last lines of the polygons, the transparent lines do not hide the elements drawn after them
+        GL.glDepthMask(GL.GL_FALSE)
+        GL.glLineWidth(render_settings["ACTIVE_POLYGON_LINE_WIDTH"])
+        self.__draw_element(True, GL.GL_LINES, 1, 1)
+        GL.glLineWidth(render_settings["POLYGON_LINE_WIDTH"])
+        self.__draw_element(True, GL.GL_LINES, 1, 0)
+        GL.glDepthMask(GL.GL_TRUE)
+        GL.glLineWidth(render_settings["LINE_WIDTH"])
+
+        # Points of the polygons
+        GL.glPointSize(render_settings["POLYGON_DOT_SIZE"])
+        self.__draw_element(False, GL.GL_POINTS, 2, 2)
+        GL.glPointSize(render_settings["DOT_SIZE"])
+
+        GL.glBindTexture(GL.GL_TEXTURE_BUFFER, 0)
+        GL.glBindVertexArray(0)
+        GL.glDepthFunc(GL.GL_LESS)
+        if not depth_test_enabled:
+            GL.glDisable(GL.GL_DEPTH_TEST)
+
+    def get_memory_usage(self) -> Dict[str, int]:
+        """
+        Get the number of bytes used by the layer in the CPU (points of the polygons packed in the buffers) and in the
+        GPU (buffers shared by all the polygons).
+
+        Returns: Dictionary with the keys CPU and GPU.
+        """
+        cpu_memory = self.__ranges.nbytes
+        for _, points, areas in self.__point_arrays.values():
+            cpu_memory += points.nbytes + areas.nbytes
+
+        return {
+            'CPU': int(cpu_memory),
+            'GPU': int(sum(self.__gpu_memory.values()))
+        }
+
+    def get_number_of_polygons(self) -> int:
+        """
+        Get the number of polygons packed in the buffers.
+
+        Returns: Number of polygons.
+        """
+        return len(self.__polygon_ids)
@@ -0,0 +1,112 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+File with the class RefreshDebouncer, class used by the 2D maps to refresh the tiles only after the view stops
+changing.
+"""
+import time
+from typing import Any, Union
+
+
+class RefreshDebouncer:
+    """
+    Class that decides when to refresh something that depends on a state that changes continuously (like the
+    coordinates showed on the screen while moving the map).
+
+    The refresh is made only when the state did not change for a given time. The intermediate states are ignored, so
+    only the last state is refreshed, and the same state is never refreshed twice.
+    """
+
+    def __init__(self, delay: float):
+        """
+        Constructor of the class.
+
+        Args:
+            delay: Seconds that the state must not change before refreshing it.
+        """
+        self.__delay = delay
+
+        self.__pending_state: Any = None  # last state received
+        self.__pending_since: Union[float, None] = None  # time when the last state was received
+        self.__refreshed_state: Any = None  # last state refreshed
+
+    def get_refreshed_state(self) -> Any:
+        """
+        Get the last state that was refreshed.
+
+        Returns: Last state refreshed. None if no state was refreshed.
+        """
+        return self.__refreshed_state
+
+    def is_pending(self) -> bool:
+        """
+        Check if there is a state waiting to be refreshed.
+
+        Returns: Boolean indicating if the last state received was not refreshed.
+        """
+        return self.__pending_since is not None and self.__pending_state != self.__refreshed_state
+
+    def mark_refreshed(self, state: Any) -> None:
+        """
+        Set the state as refreshed, used when the state is refreshed without the debouncer (for example, when
+        forcing a reload).
+
+        Args:
+            state: State refreshed.
+
+        Returns: None
+        """
+        self.__pending_state = state
+        self.__pending_since = None
+        self.__refreshed_state = state
+
+    def reset(self) -> None:
+        """
+        Forget the states received and refreshed, so the next state is always refreshed.
+
+        Returns: None
+        """
+        self.__pending_state = None
+        self.__pending_since = None
+        self.__refreshed_state = None
+
+    def update(self, state: Any, current_time: Union[float, None] = None) -> bool:
+        """
+        Register the current state and check if it must be refreshed.
+
+        Args:
+            state: Current state.
+            current_time: Time (in seconds) of the update. None to use the time of the performance counter.
+
+        Returns: Boolean indicating if the state must be refreshed now. If True, the state is marked as refreshed.
+        """
+        if current_time is None:
+            current_time = time.perf_counter()
+
+        if self.__pending_since is None or state != self.__pending_state:
+            self.__pending_state = state
+            self.__pending_since = current_time
+
+        if state == self.__refreshed_state:
+            return False
+
+        if current_time - self.__pending_since < self.__delay:
+            return False
+
+        self.__refreshed_state = state
+        return True
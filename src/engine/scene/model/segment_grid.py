@@ -0,0 +1,375 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+File with the class SegmentGrid, class used by the polygons to check the intersections of their lines without
+checking all the lines of the polygon.
+"""
+import math
+from typing import Dict, List, Set, Tuple
+
+# Point in 2D: (x, y)
+Point2D = Tuple[float, float]
+
+
+def get_orientation(a: Point2D, b: Point2D, c: Point2D) -> int:
+    """
+    Get the orientation of the triangle formed by the three points.
+
+    Args:
+        a: First point.
+        b: Second point.
+        c: Third point.
+
+    Returns: 1 if the points are in counterclockwise order, -1 if they are in clockwise order and 0 if they are
+             collinear.
+    """
+    cross = (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+    return (cross > 0) - (cross < 0)
+
+
+def is_in_segment_box(a: Point2D, b: Point2D, c: Point2D) -> bool:
+    """
+    Check if the point c is inside the bounding box of the segment ab.
+
+    Used to check if a point collinear with a segment is part of the segment.
+
+    Args:
+        a: First point of the segment.
+        b: Second point of the segment.
+        c: Point to check.
+
+    Returns: Boolean indicating if the point is inside the bounding box.
+    """
+    return min(a[0], b[0]) <= c[0] <= max(a[0], b[0]) and min(a[1], b[1]) <= c[1] <= max(a[1], b[1])
+
+
+def segments_intersect(a: Point2D, b: Point2D, c: Point2D, d: Point2D) -> bool:
+    """
+    Check if the segment ab and the segment cd have at least one point in common.
+
+    Args:
+        a: First point of the first segment.
+        b: Second point of the first segment.
+        c: First point of the second segment.
+        d: Second point of the second segment.
+
+    Returns: Boolean indicating if the segments intersect.
+    """
+    o1 = get_orientation(a, b, c)
+    o2 = get_orientation(a, b, d)
+    o3 = get_orientation(c, d, a)
+    o4 = get_orientation(c, d, b)
+
+    if o1 != o2 and o3 != o4:
+        return True
+
+    return (o1 == 0 and is_in_segment_box(a, b, c)) or \
+           (o2 == 0 and is_in_segment_box(a, b, d)) or \
+           (o3 == 0 and is_in_segment_box(c, d, a)) or \
+           (o4 == 0 and is_in_segment_box(c, d, b))
+
+
+def segments_overlap_from_shared_point(shared: Point2D, a: Point2D, b: Point2D) -> bool:
+    """
+    Check if two segments that share one of their points have more points in common.
+
+    This only happens if the segments are collinear and go in the same direction from the shared point.
+
+    Args:
+        shared: Point shared by both segments.
+        a: Other point of the first segment.
+        b: Other point of the second segment.
+
+    Returns: Boolean indicating if the segments have more than the shared point in common.
+    """
+    if get_orientation(shared, a, b) != 0:
+        return False
+    return (a[0] - shared[0]) * (b[0] - shared[0]) + (a[1] - shared[1]) * (b[1] - shared[1]) > 0
+
+
+class SegmentGrid:
+    """
+    Class that store the lines of an open polygonal chain in a uniform grid, so the intersections of new lines can be
+    checked only against the lines stored in the cells that the new line crosses.
+
+    The points are also stored in a set, so repeated points can be detected without checking all the points of the
+    chain.
+
+    The size of the cells depends on the mean length of the lines, and the grid is generated again every time that the
+    number of lines doubles or when a line crosses too many cells.
+    """
+
+    def __init__(self, max_cells_per_segment: int = 64):
+        """
+        Constructor of the class.
+
+        Args:
+            max_cells_per_segment: Number of cells that a line can cross before generating the grid again with bigger
+                                   cells.
+        """
+        self.__max_cells_per_segment = max_cells_per_segment
+
+        self.__points: List[Point2D] = []
+        self.__point_set: Set[Tuple[float, float, float]] = set()
+        self.__point_keys: List[Tuple[float, float, float]] = []
+
+        # Grid with the lines, line i joins the point i with the point i + 1
+        # ------------------------------------------------------------------
+        self.__cell_size = None
+        self.__cells: Dict[Tuple[int, int], List[int]] = {}
+        self.__segments_in_grid = 0
+        self.__segments_at_last_rebuild = 0
+
+    def __add_segment_to_grid(self, segment: int) -> None:
+        """
+        Add the line to the cells that it crosses.
+
+        Args:
+            segment: Index of the line.
+
+        Returns: None
+        """
+        cells = self.__get_cells(self.__points[segment], self.__points[segment + 1])
+        if len(cells) > self.__max_cells_per_segment:
+            self.__rebuild(self.__get_segment_length(segment))
+            return
+
+        for cell in cells:
+            self.__cells.setdefault(cell, []).append(segment)
+        self.__segments_in_grid = segment + 1
+
+    def __get_candidate_segments(self, a: Point2D, b: Point2D) -> Set[int]:
+        """
+        Get the lines stored in the cells crossed by the segment ab.
+
+        Args:
+            a: First point of the segment.
+            b: Second point of the segment.
+
+        Returns: Set with the index of the lines.
+        """
+        if self.__cell_size is None:
+            return set()
+
+        candidates = set()
+        for cell in self.__get_cells(a, b):
+            candidates.update(self.__cells.get(cell, ()))
+        return candidates
+
+    def __get_cells(self, a: Point2D, b: Point2D) -> List[Tuple[int, int]]:
+        """
+        Get the cells of the grid crossed by the segment ab.
+
+        The cells are calculated column by column, using the range of heights of the segment inside every column. The
+        ranges are slightly enlarged so segments that touch the border of the cells are not missed.
+
+        Args:
+            a: First point of the segment.
+            b: Second point of the segment.
+
+        Returns: List with the cells crossed by the segment.
+        """
+        cell_size = self.__cell_size
+        epsilon = cell_size * 1e-9
+
+        min_x, max_x = min(a[0], b[0]), max(a[0], b[0])
+        first_col = math.floor((min_x - epsilon) / cell_size)
+        last_col = math.floor((max_x + epsilon) / cell_size)
+
+        cells = []
+        for col in range(first_col, last_col + 1):
+            if a[0] == b[0]:
+                y_start, y_end = a[1], b[1]
+            else:
+                x_start = max(col * cell_size, min_x)
+                x_end = min((col + 1) * cell_size, max_x)
+                slope = (b[1] - a[1]) / (b[0] - a[0])
+                y_start = a[1] + (x_start - a[0]) * slope
+                y_end = a[1] + (x_end - a[0]) * slope
+
+            first_row = math.floor((min(y_start, y_end) - epsilon) / cell_size)
+            last_row = math.floor((max(y_start, y_end) + epsilon) / cell_size)
+            cells.extend((col, row) for row in range(first_row, last_row + 1))
+
+        return cells
+
+    def __get_segment_length(self, segment: int) -> float:
+        """
+        Get the length of the line.
+
+        Args:
+            segment: Index of the line.
+
+        Returns: Length of the line.
+        """
+        a, b = self.__points[segment], self.__points[segment + 1]
+        return math.hypot(b[0] - a[0], b[1] - a[1])
+
+    def __rebuild(self, min_cell_size: float = 0) -> None:
+        """
+        Generate the grid again using a cell size of twice the mean length of the lines.
+
+        Args:
+            min_cell_size: Minimum size of the cells.
+
+        Returns: None
+        """
+        number_of_segments = len(self.__points) - 1
+        mean_length = sum(self.__get_segment_length(segment) for segment in range(number_of_segments)) / \
+            max(number_of_segments, 1)
+
+        self.__cell_size = max(2 * mean_length, min_cell_size) or 1.0
+        self.__cells = {}
+        self.__segments_at_last_rebuild = number_of_segments
+
+        for segment in range(number_of_segments):
+            for cell in self.__get_cells(self.__points[segment], self.__points[segment + 1]):
+                self.__cells.setdefault(cell, []).append(segment)
+        self.__segments_in_grid = number_of_segments
+
+    def add_point(self, x: float, y: float, z: float) -> None:
+        """
+        Add a point at the end of the chain, adding the line that joins it with the previous point.
+
+        Args:
+            x: x-coordinate of the point.
+            y: y-coordinate of the point.
+            z: z-coordinate of the point.
+
+        Returns: None
+        """
+        key = (float(x), float(y), float(z))
+        self.__point_set.add(key)
+        self.__point_keys.append(key)
+        self.__points.append((float(x), float(y)))
+
+        number_of_segments = len(self.__points) - 1
+        if number_of_segments < 1:
+            return
+
+        if self.__cell_size is None or number_of_segments >= 2 * max(self.__segments_at_last_rebuild, 1):
+            self.__rebuild()
+        else:
+            self.__add_segment_to_grid(number_of_segments - 1)
+
+    def contains_point(self, x: float, y: float, z: float) -> bool:
+        """
+        Check if the point is already in the chain.
+
+        Args:
+            x: x-coordinate of the point.
+            y: y-coordinate of the point.
+            z: z-coordinate of the point.
+
+        Returns: Boolean indicating if the point is in the chain.
+        """
+        return (float(x), float(y), float(z)) in self.__point_set
+
+    def get_number_of_points(self) -> int:
+        """
+        Get the number of points of the chain.
+
+        Returns: Number of points.
+        """
+        return len(self.__points)
+
+    def intersects_closing_segment(self, x: float = None, y: float = None) -> bool:
+        """
+        Check if the line that closes the chain (the line from the last point to the first one) intersects the chain.
+
+        If a point is given, the check is made as if the point were added at the end of the chain.
+
+        Args:
+            x: x-coordinate of the point to add.
+            y: y-coordinate of the point to add.
+
+        Returns: Boolean indicating if the closing line intersects the chain.
+        """
+        points = self.__points
+        new_point = x is not None and y is not None
+
+        last = (float(x), float(y)) if new_point else points[-1]
+        last_index = len(points) if new_point else len(points) - 1
+        first = points[0]
+
+        # The closing line must only share the first point with the first line of the chain
+        if segments_overlap_from_shared_point(first, last, points[1]):
+            return True
+
+        # The closing line must only share the last point with the last line of the chain
+        if segments_overlap_from_shared_point(last, first, points[last_index - 1]):
+            return True
+
+        # Check the lines that are not next to the closing line
+        for segment in self.__get_candidate_segments(last, first):
+            if 0 < segment < last_index - 1 and \
+                    segments_intersect(points[segment], points[segment + 1], last, first):
+                return True
+
+        return False
+
+    def intersects_new_segment(self, x: float, y: float) -> bool:
+        """
+        Check if the line that joins the last point of the chain with the given point intersects the chain.
+
+        Args:
+            x: x-coordinate of the point to add.
+            y: y-coordinate of the point to add.
+
+        Returns: Boolean indicating if the new line intersects the chain.
+        """
+        points = self.__points
+        if len(points) < 2:
+            return False
+
+        last = points[-1]
+        new_point = (float(x), float(y))
+        last_segment = len(points) - 2
+
+        # The new line must only share the last point with the last line of the chain
+        if segments_overlap_from_shared_point(last, points[-2], new_point):
+            return True
+
+        for segment in self.__get_candidate_segments(last, new_point):
+            if segment < last_segment and segments_intersect(points[segment], points[segment + 1], last, new_point):
+                return True
+
+        return False
+
+    def remove_last_point(self) -> None:
+        """
+        Remove the last point of the chain and the line that joins it with the previous point.
+
+        Does nothing if there is no points.
+
+        Returns: None
+        """
+        if len(self.__points) == 0:
+            return
+
+        # Remove the last line from the cells that it crosses
+        segment = len(self.__points) - 2
+        if 0 <= segment < self.__segments_in_grid:
+            for cell in self.__get_cells(self.__points[segment], self.__points[segment + 1]):
+                cell_segments = self.__cells.get(cell, [])
+                if segment in cell_segments:
+                    cell_segments.remove(segment)
+            self.__segments_in_grid = segment
+
+        self.__point_set.discard(self.__point_keys.pop())
+        self.__points.pop()
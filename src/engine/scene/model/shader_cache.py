@@ -0,0 +1,191 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+File with the class ShaderCache, class that stores the shader programs compiled by the models so they can be
+shared between all the models of the program.
+"""
+import hashlib
+from typing import Dict, Tuple
+
+import OpenGL.GL as GL
+from OpenGL.GL.shaders import compileProgram, compileShader
+
+from src.engine.scene.camera_uniform_buffer import CAMERA_UNIFORM_BLOCK_BINDING, CAMERA_UNIFORM_BLOCK_NAME
+from src.utils import get_logger
+
+log = get_logger(module='SHADER_CACHE')
+
+
+class ShaderCache:
+    """
+    Static class that store the shader programs compiled in the application and the location of their uniforms.
+
+    Programs are identified by the path of their shader files, so programs are compiled only once for all the models
+    that use the same files. The content of the files is only checked again when the method reload is called, compiling
+    new programs for the files that changed (allowing the modification of the shaders while the application is
+    running).
+
+    Since the programs belong to the OpenGL context, the cache must be cleared when the context is destroyed.
+    """
+
+    __programs: Dict[Tuple[str, str], int] = {}
+    __file_hashes: Dict[Tuple[str, str], Tuple[str, str]] = {}
+    __uniform_locations: Dict[Tuple[int, str], int] = {}
+
+    @staticmethod
+    def __compile_program(vertex_shader: str, fragment_shader: str) -> int:
+        """
+        Compile a shader program and bind the uniform block of the camera used in the shaders (if any) to the uniform
+        buffer of the camera.
+
+        Args:
+            vertex_shader: Source code of the vertex shader.
+            fragment_shader: Source code of the fragment shader.
+
+        Returns: Shader program.
+        """
+        program = compileProgram(
+            compileShader(vertex_shader, GL.GL_VERTEX_SHADER),
+            compileShader(fragment_shader, GL.GL_FRAGMENT_SHADER),
+        )
+
+        block_index = GL.glGetUniformBlockIndex(program, CAMERA_UNIFORM_BLOCK_NAME)
+        if block_index != GL.GL_INVALID_INDEX:
+            GL.glUniformBlockBinding(program, block_index, CAMERA_UNIFORM_BLOCK_BINDING)
+
+        return program
+
+    @staticmethod
+    def __read_files(vertex_shader_file: str, fragment_shader_file: str) -> Tuple[str, str, Tuple[str, str]]:
+        """
+        Read the content of the shader files.
+
+        Args:
+            vertex_shader_file: Path to the vertex shader file.
+            fragment_shader_file: Path to the fragment shader file.
+
+        Returns: Source code of the vertex shader, source code of the fragment shader and hashes of both files.
+        """
+        with open(vertex_shader_file, 'r') as file:
+            vertex_shader = file.read()
+        with open(fragment_shader_file, 'r') as file:
+            fragment_shader = file.read()
+
+        hashes = (hashlib.sha1(vertex_shader.encode()).hexdigest(),
+                  hashlib.sha1(fragment_shader.encode()).hexdigest())
+        return vertex_shader, fragment_shader, hashes
+
+    @staticmethod
+    def clear() -> None:
+        """
+        Remove all the programs and uniform locations stored in the cache.
+
+        The programs are not deleted from the GPU, this method must be called when the OpenGL context used to
+        compile the programs is destroyed.
+
+        Returns: None
+        """
+        ShaderCache.__programs.clear()
+        ShaderCache.__file_hashes.clear()
+        ShaderCache.__uniform_locations.clear()
+
+    @staticmethod
+    def get_number_of_programs() -> int:
+        """
+        Get the number of programs compiled and stored in the cache.
+
+        Returns: Number of programs.
+        """
+        return len(ShaderCache.__programs)
+
+    @staticmethod
+    def get_program(vertex_shader_file: str, fragment_shader_file: str) -> int:
+        """
+        Get the shader program generated by the given shader files.
+
+        The files are only read and compiled the first time that they are used. Changes made to the files after that
+        are only applied when the method reload is called.
+
+        Args:
+            vertex_shader_file: Path to the vertex shader file.
+            fragment_shader_file: Path to the fragment shader file.
+
+        Returns: Shader program.
+        """
+        key = (vertex_shader_file, fragment_shader_file)
+
+        if key not in ShaderCache.__programs:
+            log.debug(f'Compiling shader program using {vertex_shader_file} and {fragment_shader_file}')
+            vertex_shader, fragment_shader, hashes = ShaderCache.__read_files(vertex_shader_file, fragment_shader_file)
+            ShaderCache.__programs[key] = ShaderCache.__compile_program(vertex_shader, fragment_shader)
+            ShaderCache.__file_hashes[key] = hashes
+
+        return ShaderCache.__programs[key]
+
+    @staticmethod
+    def get_uniform_location(shader_program: int, uniform_name: str) -> int:
+        """
+        Get the location of an uniform of the shader program.
+
+        The location is only asked to OpenGL the first time that the uniform of the program is used.
+
+        Args:
+            shader_program: Shader program that uses the uniform.
+            uniform_name: Name of the uniform in the shaders.
+
+        Returns: Location of the uniform.
+        """
+        key = (shader_program, uniform_name)
+        if key not in ShaderCache.__uniform_locations:
+            ShaderCache.__uniform_locations[key] = GL.glGetUniformLocation(shader_program, uniform_name)
+        return ShaderCache.__uniform_locations[key]
+
+    @staticmethod
+    def reload() -> int:
+        """
+        Read again the files of the programs stored in the cache and compile new programs for the files that changed.
+
+        The programs replaced are deleted from the GPU. If the new shaders can not be compiled, the error is logged
+        and the previous program is kept.
+
+        Models must ask the cache for their programs when drawing to use the reloaded programs.
+
+        Returns: Number of programs reloaded.
+        """
+        programs_reloaded = 0
+        for key, old_program in list(ShaderCache.__programs.items()):
+            vertex_shader, fragment_shader, hashes = ShaderCache.__read_files(*key)
+            if hashes == ShaderCache.__file_hashes[key]:
+                continue
+
+            log.debug(f'Reloading shader program using {key[0]} and {key[1]}')
+            try:
+                new_program = ShaderCache.__compile_program(vertex_shader, fragment_shader)
+            except RuntimeError as e:
+                log.error(f'Shader program using {key[0]} and {key[1]} could not be reloaded: {e}')
+                continue
+
+            GL.glDeleteProgram(old_program)
+            for location_key in [k for k in ShaderCache.__uniform_locations if k[0] == old_program]:
+                del ShaderCache.__uniform_locations[location_key]
+
+            ShaderCache.__programs[key] = new_program
+            ShaderCache.__file_hashes[key] = hashes
+            programs_reloaded += 1
+
+        return programs_reloaded
@@ -0,0 +1,436 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+File with the class TerrainChunks, class used by the 3D maps to render the grid of vertices in chunks with a level of
+detail depending on the distance to the camera.
+"""
+import math
+import warnings
+from typing import Tuple
+
+import numpy as np
+
+from src.engine.scene.model.grid_indices import generate_grid_indices
+
+
+def get_frustum_planes(view_projection_matrix: np.ndarray) -> np.ndarray:
+    """
+    Get the planes of the frustum defined by a view-projection matrix.
+
+    The planes are returned as an array of shape (6, 4) with the values (a, b, c, d) of the equation of every plane,
+    with the normal of the planes pointing to the inside of the frustum.
+
+    Args:
+        view_projection_matrix: Matrix generated by the multiplication of the projection and view matrices.
+
+    Returns: Array with the planes of the frustum.
+    """
+    matrix = np.asarray(view_projection_matrix, dtype=np.float64)
+    return np.array([
+        matrix[3] + matrix[0],  # left
+        matrix[3] - matrix[0],  # right
+        matrix[3] + matrix[1],  # bottom
+        matrix[3] - matrix[1],  # top
+        matrix[3] + matrix[2],  # near
+        matrix[3] - matrix[2],  # far
+    ])
+
+
+def get_boxes_inside_frustum(frustum_planes: np.ndarray,
+                             min_corners: np.ndarray,
+                             max_corners: np.ndarray) -> np.ndarray:
+    """
+    Check which of the axis aligned boxes are (totally or partially) inside the frustum.
+
+    The test is conservative, boxes near the corners of the frustum can be marked as inside even if they are outside.
+
+    Args:
+        frustum_planes: Planes of the frustum, as returned by get_frustum_planes.
+        min_corners: Array of shape (n, 3) with the minimum corner of the boxes.
+        max_corners: Array of shape (n, 3) with the maximum corner of the boxes.
+
+    Returns: Boolean array of length n.
+    """
+    inside = np.ones(len(min_corners), dtype=bool)
+    for plane in frustum_planes:
+        # Use the corner of the box that is the farthest in the direction of the normal of the plane
+        farthest_corners = np.where(plane[:3] >= 0, max_corners, min_corners)
+        inside &= farthest_corners @ plane[:3] + plane[3] >= 0
+    return inside
+
+
+class TerrainChunks:
+    """
+    Class that divide a grid of vertices in square chunks, each one with the indices of their triangles generated with
+    different levels of detail.
+
+    The level k of a chunk uses one of every 2^k vertices of the grid. For every level, the geometrical error
+    (maximum difference of height inside the cells of the level) is calculated, so the level used to draw every chunk
+    can be selected from the error that the level generates on the screen.
+
+    To hide the cracks generated between chunks using different levels, every chunk has skirts on the borders that
+    are shared with other chunks, this is, triangles that go from the border of the chunk to a copy of the vertices
+    of the border located lower than the original ones. The skirts use their own array of vertices, formed by the
+    vertices of the grid returned by get_skirt_vertices followed by the lowered copies of the same vertices.
+
+    The indices of all the chunks and levels are stored in a single array (and the ones of the skirts in another
+    one), the offset and the number of indices of each chunk and level can be obtained with the methods
+    get_index_ranges and get_skirt_index_ranges.
+    """
+
+    def __init__(self, rows: int, cols: int, chunk_size: int, max_chunks: int = 4096):
+        """
+        Constructor of the class.
+
+        The size of the chunks is doubled until the number of chunks is less or equal than max_chunks.
+
+        Args:
+            rows: Number of rows of vertices in the grid.
+            cols: Number of columns of vertices in the grid.
+            chunk_size: Number of cells in each side of the chunks.
+            max_chunks: Max number of chunks to use.
+        """
+        self.__rows = rows
+        self.__cols = cols
+
+        chunk_size = max(1, chunk_size)
+        while math.ceil(max(1, rows - 1) / chunk_size) * math.ceil(max(1, cols - 1) / chunk_size) > max_chunks:
+            chunk_size *= 2
+
+        self.__chunk_size = chunk_size
+        self.__chunk_rows = math.ceil(max(1, rows - 1) / chunk_size)
+        self.__chunk_cols = math.ceil(max(1, cols - 1) / chunk_size)
+        self.__levels = int(math.floor(math.log2(chunk_size))) + 1
+
+        # Data of the chunks, calculated in the method build
+        # ---------------------------------------------------
+        number_of_chunks = self.__chunk_rows * self.__chunk_cols
+        self.__min_corners = np.zeros((number_of_chunks, 3))
+        self.__max_corners = np.zeros((number_of_chunks, 3))
+        self.__errors = np.zeros((number_of_chunks, self.__levels))
+        self.__offsets = np.zeros((number_of_chunks, self.__levels), dtype=np.int64)
+        self.__counts = np.zeros((number_of_chunks, self.__levels), dtype=np.int64)
+        self.__skirt_offsets = np.zeros((number_of_chunks, self.__levels), dtype=np.int64)
+        self.__skirt_counts = np.zeros((number_of_chunks, self.__levels), dtype=np.int64)
+        self.__empty_chunks = np.zeros(number_of_chunks, dtype=bool)  # Chunks with only NaN values
+
+    def __get_axis_values(self, start: int, end: int, stride: int) -> np.ndarray:
+        """
+        Get the positions of the vertices to use in one of the axis of a chunk.
+
+        The end of the range is always included so the chunks next to each other do not leave holes between them.
+
+        Args:
+            start: First vertex of the axis.
+            end: Last vertex of the axis.
+            stride: Distance between the vertices to use.
+
+        Returns: Array with the positions of the vertices.
+        """
+        values = np.arange(start, end + 1, stride, dtype=np.uint32)
+        if values[-1] != end:
+            values = np.append(values, np.uint32(end))
+        return values
+
+    def __get_level_error(self, heights: np.ndarray, stride: int) -> float:
+        """
+        Get the max difference of height inside the cells of a level.
+
+        Args:
+            heights: Heights of the chunk.
+            stride: Number of vertices of the grid in every cell of the level.
+
+        Returns: Max difference of heights inside the cells.
+        """
+        if stride == 1:
+            return 0
+
+        rows, cols = heights.shape
+        padded_rows = math.ceil(rows / stride) * stride
+        padded_cols = math.ceil(cols / stride) * stride
+        padded = np.full((padded_rows, padded_cols), np.nan)
+        padded[:rows, :cols] = heights
+
+        blocks = padded.reshape(padded_rows // stride, stride, padded_cols // stride, stride)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)  # blocks with only NaN values
+            block_range = np.nanmax(blocks, axis=(1, 3)) - np.nanmin(blocks, axis=(1, 3))
+
+        if np.isnan(block_range).all():
+            return 0
+        return float(np.nanmax(block_range))
+
+    def __get_skirt_indices(self, border: np.ndarray, skirt_vertices: int) -> np.ndarray:
+        """
+        Get the indices of the triangles of the skirt of a border.
+
+        Args:
+            border: Indices of the vertices of the border in the array of vertices of the skirts.
+            skirt_vertices: Number of vertices of the grid copied to be used by the skirts.
+
+        Returns: Indices of the triangles of the skirt.
+        """
+        lowered = border + skirt_vertices
+
+        indices = np.empty((len(border) - 1, 6), dtype=np.uint32)
+        indices[:, 0] = border[:-1]
+        indices[:, 1] = border[1:]
+        indices[:, 2] = lowered[1:]
+        indices[:, 3] = border[:-1]
+        indices[:, 4] = lowered[1:]
+        indices[:, 5] = lowered[:-1]
+        return indices.reshape(-1)
+
+    def build(self, x: np.ndarray, y: np.ndarray, heights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate the bounds and errors of the chunks and generate the indices of all the chunks and levels.
+
+        Triangles with all their vertices NaN are not generated.
+
+        Args:
+            x: Values of the x-axis of the grid.
+            y: Values of the y-axis of the grid.
+            heights: Heights of the grid, with shape (rows, cols).
+
+        Returns: Tuple with the arrays of type uint32 with the indices of the grid and the indices of the skirts.
+        """
+        self.update_bounds(x, y, heights)
+
+        skirt_vertices = len(self.get_skirt_vertices())
+        horizontal_skirts = self.__chunk_rows - 1
+        nan_mask = np.isnan(heights)
+
+        indices_list = []
+        skirt_indices_list = []
+        offset = 0
+        skirt_offset = 0
+        for chunk_row in range(self.__chunk_rows):
+            for chunk_col in range(self.__chunk_cols):
+                chunk = chunk_row * self.__chunk_cols + chunk_col
+                row_start = chunk_row * self.__chunk_size
+                row_end = min((chunk_row + 1) * self.__chunk_size, self.__rows - 1)
+                col_start = chunk_col * self.__chunk_size
+                col_end = min((chunk_col + 1) * self.__chunk_size, self.__cols - 1)
+
+                # Indices of the levels of the chunk
+                # ----------------------------------
+                for level in range(self.__levels):
+                    stride = 2 ** level
+                    rows = self.__get_axis_values(row_start, row_end, stride)
+                    cols = self.__get_axis_values(col_start, col_end, stride)
+
+                    level_indices = generate_grid_indices(rows, cols, self.__cols, nan_mask[np.ix_(rows, cols)])
+
+                    # Skirts of the borders shared with other chunks
+                    level_skirt_indices = [np.zeros(0, dtype=np.uint32)]
+                    if chunk_row > 0:
+                        border = (chunk_row - 1) * self.__cols + cols
+                        level_skirt_indices.append(self.__get_skirt_indices(border, skirt_vertices))
+                    if chunk_row < self.__chunk_rows - 1:
+                        border = chunk_row * self.__cols + cols
+                        level_skirt_indices.append(self.__get_skirt_indices(border, skirt_vertices))
+                    if chunk_col > 0:
+                        border = horizontal_skirts * self.__cols + (chunk_col - 1) * self.__rows + rows
+                        level_skirt_indices.append(self.__get_skirt_indices(border, skirt_vertices))
+                    if chunk_col < self.__chunk_cols - 1:
+                        border = horizontal_skirts * self.__cols + chunk_col * self.__rows + rows
+                        level_skirt_indices.append(self.__get_skirt_indices(border, skirt_vertices))
+                    level_skirt_indices = np.concatenate(level_skirt_indices).astype(np.uint32)
+
+                    indices_list.append(level_indices)
+                    skirt_indices_list.append(level_skirt_indices)
+
+                    self.__offsets[chunk, level] = offset
+                    self.__counts[chunk, level] = len(level_indices)
+                    self.__skirt_offsets[chunk, level] = skirt_offset
+                    self.__skirt_counts[chunk, level] = len(level_skirt_indices)
+                    offset += len(level_indices)
+                    skirt_offset += len(level_skirt_indices)
+
+        return np.concatenate(indices_list), np.concatenate(skirt_indices_list)
+
+    def get_chunk_size(self) -> int:
+        """
+        Get the number of cells in each side of the chunks.
+
+        Returns: Size of the chunks.
+        """
+        return self.__chunk_size
+
+    def get_index_ranges(self, chunks: np.ndarray, levels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the position of the indices of the chunks in the array of indices of the grid returned by build.
+
+        Args:
+            chunks: Chunks to get the indices from.
+            levels: Level of detail to use in each chunk.
+
+        Returns: Tuple with the offsets (in number of indices) and the number of indices of the chunks.
+        """
+        return self.__offsets[chunks, levels], self.__counts[chunks, levels]
+
+    def get_number_of_chunks(self) -> int:
+        """
+        Get the number of chunks used to divide the grid.
+
+        Returns: Number of chunks.
+        """
+        return self.__chunk_rows * self.__chunk_cols
+
+    def get_skirt_depth(self) -> float:
+        """
+        Get the distance (in the units of the heights used to build the chunks) that the copies of the vertices used
+        by the skirts must be located below the original vertices to cover the cracks between chunks.
+
+        Returns: Depth of the skirts.
+        """
+        return float(np.max(self.__errors)) if self.__errors.size > 0 else 0
+
+    def get_skirt_index_ranges(self, chunks: np.ndarray, levels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the position of the indices of the skirts of the chunks in the array of indices of the skirts returned by
+        build.
+
+        Args:
+            chunks: Chunks to get the indices from.
+            levels: Level of detail to use in each chunk.
+
+        Returns: Tuple with the offsets (in number of indices) and the number of indices of the skirts of the chunks.
+        """
+        return self.__skirt_offsets[chunks, levels], self.__skirt_counts[chunks, levels]
+
+    def get_skirt_vertices(self) -> np.ndarray:
+        """
+        Get the indices of the vertices of the grid that must be copied to be used by the skirts.
+
+        The vertices of the skirts must be generated in the same order as returned by this method, followed by the
+        lowered copies of them.
+
+        Returns: Array with the indices of the vertices to copy.
+        """
+        horizontal_lines = np.arange(1, self.__chunk_rows) * self.__chunk_size
+        vertical_lines = np.arange(1, self.__chunk_cols) * self.__chunk_size
+
+        horizontal = (horizontal_lines[:, np.newaxis] * self.__cols + np.arange(self.__cols)).reshape(-1)
+        vertical = (np.arange(self.__rows)[np.newaxis, :] * self.__cols + vertical_lines[:, np.newaxis]).reshape(-1)
+        return np.concatenate((horizontal, vertical)).astype(np.uint32)
+
+    def select_chunks(self,
+                      view_matrix: np.ndarray,
+                      projection_matrix: np.ndarray,
+                      viewport_height: int,
+                      height_scale: float,
+                      max_screen_error: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Select the chunks to draw and the level of detail to use in each one.
+
+        Chunks outside of the frustum are not selected. For the rest of the chunks, the coarsest level whose error
+        projected on the screen is less or equal than max_screen_error pixels is used.
+
+        The matrices are expected to be used multiplying column vectors (projection * view * vertex).
+
+        Args:
+            view_matrix: View matrix used to render the grid.
+            projection_matrix: Perspective projection matrix used to render the grid.
+            viewport_height: Height in pixels of the viewport.
+            height_scale: Factor used to multiply the heights of the grid when rendering it.
+            max_screen_error: Max error (in pixels) allowed on the screen.
+
+        Returns: Tuple with the chunks to draw and the level of detail to use in each one of them.
+        """
+        view_matrix = np.asarray(view_matrix, dtype=np.float64)
+        projection_matrix = np.asarray(projection_matrix, dtype=np.float64)
+
+        # Bounds of the chunks with the heights used to render them
+        # --------------------------------------------------------
+        min_corners = self.__min_corners.copy()
+        max_corners = self.__max_corners.copy()
+        min_corners[:, 2] = np.minimum(self.__min_corners[:, 2] * height_scale, self.__max_corners[:, 2] * height_scale)
+        max_corners[:, 2] = np.maximum(self.__min_corners[:, 2] * height_scale, self.__max_corners[:, 2] * height_scale)
+
+        # Frustum culling
+        # ---------------
+        visible = get_boxes_inside_frustum(get_frustum_planes(projection_matrix @ view_matrix),
+                                           min_corners,
+                                           max_corners)
+        visible &= ~self.__empty_chunks
+        visible_chunks = np.flatnonzero(visible)
+
+        # Select the level of every chunk from the error on the screen
+        # ------------------------------------------------------------
+        camera_position = np.linalg.inv(view_matrix)[:3, 3]
+        closest_points = np.clip(camera_position, min_corners[visible_chunks], max_corners[visible_chunks])
+        distances = np.maximum(np.linalg.norm(closest_points - camera_position, axis=1), 1e-6)
+
+        pixels_per_unit = viewport_height / 2 * projection_matrix[1, 1]
+        screen_errors = self.__errors[visible_chunks] * abs(height_scale) * pixels_per_unit / distances[:, np.newaxis]
+        levels = np.count_nonzero(screen_errors <= max_screen_error, axis=1) - 1
+        levels = np.maximum(levels, 0)
+
+        return visible_chunks, levels
+
+    def update_bounds(self, x: np.ndarray, y: np.ndarray, heights: np.ndarray) -> None:
+        """
+        Calculate the bounds and the errors of the levels of the chunks.
+
+        Used to update the chunks when the heights of the grid change without changing the vertices with NaN values,
+        since the indices generated by the method build are still valid in that case.
+
+        The arrays with the data of the chunks are replaced instead of modified, so the chunks can be updated on a
+        copy of the object while the original one is still being used.
+
+        Args:
+            x: Values of the x-axis of the grid.
+            y: Values of the y-axis of the grid.
+            heights: Heights of the grid, with shape (rows, cols).
+
+        Returns: None
+        """
+        number_of_chunks = self.__chunk_rows * self.__chunk_cols
+        min_corners = np.zeros((number_of_chunks, 3))
+        max_corners = np.zeros((number_of_chunks, 3))
+        errors = np.zeros((number_of_chunks, self.__levels))
+        empty_chunks = np.zeros(number_of_chunks, dtype=bool)
+
+        for chunk_row in range(self.__chunk_rows):
+            for chunk_col in range(self.__chunk_cols):
+                chunk = chunk_row * self.__chunk_cols + chunk_col
+                row_start = chunk_row * self.__chunk_size
+                row_end = min((chunk_row + 1) * self.__chunk_size, self.__rows - 1)
+                col_start = chunk_col * self.__chunk_size
+                col_end = min((chunk_col + 1) * self.__chunk_size, self.__cols - 1)
+
+                chunk_heights = heights[row_start:row_end + 1, col_start:col_end + 1]
+                chunk_x = x[col_start:col_end + 1]
+                chunk_y = y[row_start:row_end + 1]
+                empty_chunks[chunk] = np.isnan(chunk_heights).all()
+                if empty_chunks[chunk]:
+                    min_height, max_height = 0, 0
+                else:
+                    min_height, max_height = np.nanmin(chunk_heights), np.nanmax(chunk_heights)
+                min_corners[chunk] = (np.min(chunk_x), np.min(chunk_y), min_height)
+                max_corners[chunk] = (np.max(chunk_x), np.max(chunk_y), max_height)
+
+                for level in range(self.__levels):
+                    errors[chunk, level] = self.__get_level_error(chunk_heights, 2 ** level)
+
+        # Coarser levels can not have less error than the finer ones
+        self.__errors = np.maximum.accumulate(errors, axis=1)
+        self.__min_corners = min_corners
+        self.__max_corners = max_corners
+        self.__empty_chunks = empty_chunks
\ No newline at end of file
@@ -0,0 +1,379 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+File with the classes TileQuadtree and TileLRUCache, used by the 2D maps to render the grid of vertices in tiles with
+different levels of detail.
+"""
+import math
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from src.engine.scene.model.grid_indices import generate_grid_indices
+
+# Key used to identify a tile: (level, tile_row, tile_col)
+TileKey = Tuple[int, int, int]
+
+
+class TileQuadtree:
+    """
+    Class that divide a grid of vertices in a quadtree of tiles of fixed size.
+
+    Every tile is formed by (at most) tile_size x tile_size cells, where the distance between the vertices used by the
+    cells of the tile depends on the level of the tile. Tiles of level 0 use all the vertices of the grid, tiles of
+    level 1 use one of every two vertices, tiles of level 2 one of every four and so on. This way, every tile covers
+    the same area that the four tiles of the level below it.
+
+    The last level of the quadtree (the coarsest one) only have one tile covering the whole grid.
+
+    The vertices of the grid are expected to be stored in the same way as the Map2DModel does, this is, the index of
+    the vertex in the row r and column c is r * cols + c.
+    """
+
+    def __init__(self, rows: int, cols: int, tile_size: int):
+        """
+        Constructor of the class.
+
+        Args:
+            rows: Number of rows of vertices in the grid.
+            cols: Number of columns of vertices in the grid.
+            tile_size: Number of cells in each side of the tiles.
+        """
+        self.__rows = rows
+        self.__cols = cols
+        self.__tile_size = max(1, tile_size)
+
+        # Calculate the level in which only one tile is needed to cover the whole grid
+        # ----------------------------------------------------------------------------
+        max_cells = max(1, rows - 1, cols - 1)
+        self.__max_level = max(0, math.ceil(math.log2(max_cells / self.__tile_size)))
+
+    def __get_axis_values(self, start: int, end: int, stride: int) -> np.ndarray:
+        """
+        Get the positions of the vertices to use in one of the axis of a tile.
+
+        The end of the range is always included so the tiles next to each other do not leave holes between them.
+
+        Args:
+            start: First vertex of the axis.
+            end: Last vertex of the axis.
+            stride: Distance between the vertices to use.
+
+        Returns: Array with the positions of the vertices.
+        """
+        values = np.arange(start, end + 1, stride, dtype=np.uint32)
+        if len(values) > 0 and values[-1] != end:
+            values = np.append(values, np.uint32(end))
+        return values
+
+    def generate_tile_indices(self,
+                              key: TileKey,
+                              heights: Union[np.ndarray, None] = None,
+                              triangle_strips: bool = False) -> np.ndarray:
+        """
+        Generate the indices of the triangles of the tile.
+
+        Two triangles are generated for every cell of the tile. The last row and column of the tile can be smaller
+        than the rest if the grid ends before the end of the tile.
+
+        If the heights of the grid are given, the triangles whose vertices are all NaN are not generated.
+
+        Args:
+            key: Key of the tile.
+            heights: Matrix with the heights of the grid, of shape (rows, cols).
+            triangle_strips: If the indices are generated as triangle strips separated by the
+                             PRIMITIVE_RESTART_INDEX or as a list of triangles.
+
+        Returns: Array of type uint32 with the indices of the triangles.
+        """
+        row_start, row_end, col_start, col_end = self.get_cell_range(key)
+        stride = 2 ** key[0]
+
+        rows = self.__get_axis_values(row_start, row_end, stride)
+        cols = self.__get_axis_values(col_start, col_end, stride)
+        nan_mask = np.isnan(heights[np.ix_(rows, cols)]) if heights is not None else None
+
+        return generate_grid_indices(rows, cols, self.__cols, nan_mask, triangle_strips)
+
+    def get_cell_range(self, key: TileKey) -> Tuple[int, int, int, int]:
+        """
+        Get the range of vertices covered by the tile.
+
+        The range of vertices is returned as (row_start, row_end, col_start, col_end), where the end values are
+        inclusive (tiles next to each other share the vertices of the border).
+
+        Args:
+            key: Key of the tile.
+
+        Returns: Tuple with the range of vertices covered by the tile.
+        """
+        level, tile_row, tile_col = key
+        tile_cells = self.__tile_size * 2 ** level
+
+        row_start = min(tile_row * tile_cells, self.__rows - 1)
+        row_end = min((tile_row + 1) * tile_cells, self.__rows - 1)
+        col_start = min(tile_col * tile_cells, self.__cols - 1)
+        col_end = min((tile_col + 1) * tile_cells, self.__cols - 1)
+
+        return row_start, row_end, col_start, col_end
+
+    def get_level_from_step(self, step: float) -> int:
+        """
+        Get the level of the quadtree to use to render the grid skipping the given number of vertices.
+
+        Args:
+            step: Number of vertices to skip between the vertices used.
+
+        Returns: Level of the tiles to use.
+        """
+        if step <= 1:
+            return 0
+        return min(self.__max_level, int(math.floor(math.log2(step))))
+
+    def get_max_level(self) -> int:
+        """
+        Get the coarsest level of the quadtree.
+
+        Returns: Max level of the quadtree.
+        """
+        return self.__max_level
+
+    def get_parent(self, key: TileKey) -> TileKey:
+        """
+        Get the key of the tile of the upper level that covers the given tile.
+
+        Args:
+            key: Key of the tile.
+
+        Returns: Key of the parent tile. The same key if the tile is in the coarsest level.
+        """
+        level, tile_row, tile_col = key
+        if level >= self.__max_level:
+            return key
+        return level + 1, tile_row // 2, tile_col // 2
+
+    def get_root_tiles(self) -> List[TileKey]:
+        """
+        Get the tiles of the coarsest level of the quadtree.
+
+        Returns: List with the keys of the tiles of the coarsest level.
+        """
+        return self.get_tiles_in_range(self.__max_level, 0, self.__rows - 1, 0, self.__cols - 1)
+
+    def get_tiles_in_range(self, level: int, row_min: int, row_max: int, col_min: int, col_max: int) -> List[TileKey]:
+        """
+        Get the tiles of the level that cover the given range of vertices.
+
+        The range is clipped to the vertices of the grid.
+
+        Args:
+            level: Level of the tiles to return.
+            row_min: Minimum row of the range.
+            row_max: Maximum row of the range.
+            col_min: Minimum col of the range.
+            col_max: Maximum col of the range.
+
+        Returns: List with the key of the tiles.
+        """
+        tile_cells = self.__tile_size * 2 ** level
+        last_tile_row = max(0, (self.__rows - 2) // tile_cells)
+        last_tile_col = max(0, (self.__cols - 2) // tile_cells)
+
+        first_row = int(np.clip(min(row_min, row_max) // tile_cells, 0, last_tile_row))
+        last_row = int(np.clip(max(row_min, row_max) // tile_cells, 0, last_tile_row))
+        first_col = int(np.clip(min(col_min, col_max) // tile_cells, 0, last_tile_col))
+        last_col = int(np.clip(max(col_min, col_max) // tile_cells, 0, last_tile_col))
+
+        return [(level, tile_row, tile_col)
+                for tile_row in range(first_row, last_row + 1)
+                for tile_col in range(first_col, last_col + 1)]
+
+    def intersects_range(self, key: TileKey, row_min: int, row_max: int, col_min: int, col_max: int) -> bool:
+        """
+        Check if the tile covers any of the vertices of the range.
+
+        Args:
+            key: Key of the tile.
+            row_min: Minimum row of the range.
+            row_max: Maximum row of the range.
+            col_min: Minimum col of the range.
+            col_max: Maximum col of the range.
+
+        Returns: Boolean indicating if the tile intersects the range.
+        """
+        row_start, row_end, col_start, col_end = self.get_cell_range(key)
+        return row_start <= row_max and row_min <= row_end and col_start <= col_max and col_min <= col_end
+
+
+class TileLRUCache:
+    """
+    Class that keeps track of the tiles stored in the GPU and the memory used by them.
+
+    The tiles are stored in order of use, so the tiles that were not used for the longest time are the first ones to
+    be selected to be deleted when the memory used exceeds the budget. Pinned tiles are never selected to be deleted.
+    """
+
+    def __init__(self, memory_budget: int):
+        """
+        Constructor of the class.
+
+        Args:
+            memory_budget: Number of bytes that the tiles can use in the GPU.
+        """
+        self.__memory_budget = memory_budget
+        self.__memory_used = 0
+        self.__tiles: 'OrderedDict[TileKey, int]' = OrderedDict()
+        self.__pinned_tiles: Dict[TileKey, bool] = {}
+
+    def __contains__(self, key: TileKey) -> bool:
+        """
+        Check if the tile is stored in the cache.
+
+        Args:
+            key: Key of the tile.
+
+        Returns: Boolean indicating if the tile is in the cache.
+        """
+        return key in self.__tiles
+
+    def __len__(self) -> int:
+        """
+        Get the number of tiles stored in the cache.
+
+        Returns: Number of tiles.
+        """
+        return len(self.__tiles)
+
+    def add(self, key: TileKey, size: int, pinned: bool = False) -> None:
+        """
+        Add a tile to the cache as the most recently used one.
+
+        Args:
+            key: Key of the tile.
+            size: Number of bytes used by the tile.
+            pinned: If the tile can be selected to be deleted or not.
+
+        Returns: None
+        """
+        if key in self.__tiles:
+            self.remove(key)
+
+        self.__tiles[key] = size
+        self.__memory_used += size
+        if pinned:
+            self.__pinned_tiles[key] = True
+
+    def clear(self) -> None:
+        """
+        Remove all the tiles from the cache.
+
+        Returns: None
+        """
+        self.__tiles.clear()
+        self.__pinned_tiles.clear()
+        self.__memory_used = 0
+
+    def get_keys(self) -> List[TileKey]:
+        """
+        Get the keys of the tiles stored, ordered from the least to the most recently used.
+
+        Returns: List with the keys of the tiles.
+        """
+        return list(self.__tiles.keys())
+
+    def get_keys_to_evict(self, protected_keys=None) -> List[TileKey]:
+        """
+        Get the keys of the tiles that must be deleted so the memory used does not exceed the budget.
+
+        Tiles are selected from the least recently used one. Pinned tiles and tiles in the protected keys are not
+        selected.
+
+        Args:
+            protected_keys: Collection of keys that can not be selected.
+
+        Returns: List with the keys of the tiles to delete.
+        """
+        protected_keys = set() if protected_keys is None else set(protected_keys)
+
+        keys_to_evict = []
+        memory_used = self.__memory_used
+        for key, size in self.__tiles.items():
+            if memory_used <= self.__memory_budget:
+                break
+            if key in self.__pinned_tiles or key in protected_keys:
+                continue
+
+            keys_to_evict.append(key)
+            memory_used -= size
+
+        return keys_to_evict
+
+    def get_memory_used(self) -> int:
+        """
+        Get the number of bytes used by the tiles stored.
+
+        Returns: Number of bytes used.
+        """
+        return self.__memory_used
+
+    def is_pinned(self, key: TileKey) -> bool:
+        """
+        Check if the tile is pinned, this is, if the tile can not be selected to be deleted.
+
+        Args:
+            key: Key of the tile.
+
+        Returns: Boolean indicating if the tile is pinned.
+        """
+        return key in self.__pinned_tiles
+
+    def remove(self, key: TileKey) -> None:
+        """
+        Remove the tile from the cache.
+
+        Args:
+            key: Key of the tile.
+
+        Returns: None
+        """
+        self.__memory_used -= self.__tiles.pop(key)
+        self.__pinned_tiles.pop(key, None)
+
+    def set_memory_budget(self, memory_budget: int) -> None:
+        """
+        Change the number of bytes that the tiles can use.
+
+        Args:
+            memory_budget: Number of bytes that the tiles can use in the GPU.
+
+        Returns: None
+        """
+        self.__memory_budget = memory_budget
+
+    def touch(self, key: TileKey) -> None:
+        """
+        Mark the tile as the most recently used one.
+
+        Args:
+            key: Key of the tile.
+
+        Returns: None
+        """
+        if key in self.__tiles:
+            self.__tiles.move_to_end(key)
@@ -0,0 +1,354 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+File with the class PolygonSpatialIndex, class used by the scene to find the polygons that are on a point or inside
+an area without checking all the polygons of the scene.
+"""
+import heapq
+import math
+from typing import Dict, List, Set, TYPE_CHECKING, Tuple, Union
+
+import numpy as np
+from shapely.geometry import Point, Polygon as ShapelyPolygon
+
+if TYPE_CHECKING:
+    from src.engine.scene.model.polygon import Polygon
+
+
+def get_distance_to_polygon(x: float, y: float, points: np.ndarray) -> float:
+    """
+    Get the distance from the point to the closed polygon formed by the given points.
+
+    The distance is 0 if the point is inside the polygon.
+
+    Args:
+        x: x-coordinate of the point.
+        y: y-coordinate of the point.
+        points: Points of the polygon. Array of shape (number_of_points, 2) or (number_of_points, 3).
+
+    Returns: Distance to the polygon.
+    """
+    points = np.asarray(points, dtype=np.float64)[:, :2]
+
+    if len(points) >= 3 and ShapelyPolygon(points).covers(Point(x, y)):
+        return 0.0
+
+    start = points
+    end = np.roll(points, -1, axis=0)
+    direction = end - start
+    length = np.einsum('ij,ij->i', direction, direction)
+
+    # Projection of the point over every line of the polygon, limited to the extremes of the line
+    t = np.einsum('ij,ij->i', np.array([x, y]) - start, direction) / np.where(length == 0, 1, length)
+    closest = start + np.clip(t, 0, 1)[:, np.newaxis] * direction
+
+    return float(np.min(np.hypot(closest[:, 0] - x, closest[:, 1] - y)))
+
+
+class PolygonSpatialIndex:
+    """
+    Class that store the bounding boxes of the polygons of the scene in an R-tree, so the polygons that are on a point
+    or that touch an area can be found checking only the polygons whose bounding boxes are near.
+
+    The tree is packed using the Sort-Tile-Recursive algorithm: the bounding boxes are sorted in vertical slices and
+    then grouped in nodes of node_capacity elements, and the nodes are grouped in the same way until only one node
+    remains. Every level of the tree is stored as an array of bounding boxes, where the children of the node i are the
+    elements [i * node_capacity, (i + 1) * node_capacity) of the level below.
+
+    The polygons are modified every time that a point is added or removed, so the owner of the polygons must call
+    mark_polygon_modified after modifying the points of a polygon. The bounding boxes are only calculated again for the
+    polygons marked as modified, and the tree is only packed again when a bounding box changes or when polygons are
+    added or removed, and only when a query needs it.
+    """
+
+    def __init__(self, node_capacity: int = 16):
+        """
+        Constructor of the class.
+
+        Args:
+            node_capacity: Maximum number of children of every node of the tree.
+        """
+        self.__node_capacity = max(2, node_capacity)
+
+        # Polygons stored and the polygons modified since the last update
+        # ----------------------------------------------------------------
+        self.__polygons: Dict[str, 'Polygon'] = {}
+        self.__modified_ids: Set[str] = set()
+        self.__bounding_boxes: Dict[str, Union[Tuple[float, float, float, float], None]] = {}
+
+        # Tree with the bounding boxes, the first level have the bounding boxes of the polygons
+        # -------------------------------------------------------------------------------------
+        self.__levels: List[np.ndarray] = []
+        self.__leaf_ids: List[str] = []
+        self.__leaf_order: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.__outdated = True
+
+    def __get_leaves_intersecting(self, min_x: float, min_y: float, max_x: float, max_y: float) -> np.ndarray:
+        """
+        Get the leaves of the tree whose bounding boxes intersect the given bounding box.
+
+        Args:
+            min_x: Minimum x-coordinate of the bounding box.
+            min_y: Minimum y-coordinate of the bounding box.
+            max_x: Maximum x-coordinate of the bounding box.
+            max_y: Maximum y-coordinate of the bounding box.
+
+        Returns: Array with the index of the leaves, sorted in the order in which the polygons were added.
+        """
+        self.__update()
+        if len(self.__levels) == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        nodes = np.arange(len(self.__levels[-1]))
+        for level_number in range(len(self.__levels) - 1, -1, -1):
+            level = self.__levels[level_number]
+            boxes = level[nodes]
+            nodes = nodes[(boxes[:, 0] <= max_x) & (boxes[:, 2] >= min_x) &
+                          (boxes[:, 1] <= max_y) & (boxes[:, 3] >= min_y)]
+
+            if level_number > 0:
+                children = (nodes[:, np.newaxis] * self.__node_capacity + np.arange(self.__node_capacity)).reshape(-1)
+                nodes = children[children < len(self.__levels[level_number - 1])]
+
+        return nodes[np.argsort(self.__leaf_order[nodes])]
+
+    def __pack(self) -> None:
+        """
+        Pack the bounding boxes of the polygons in the tree using the Sort-Tile-Recursive algorithm.
+
+        Returns: None
+        """
+        ids = [polygon_id for polygon_id in self.__polygons if self.__bounding_boxes[polygon_id] is not None]
+        self.__levels = []
+        self.__outdated = False
+
+        if len(ids) == 0:
+            self.__leaf_ids = []
+            self.__leaf_order = np.zeros(0, dtype=np.int64)
+            return
+
+        boxes = np.array([self.__bounding_boxes[polygon_id] for polygon_id in ids], dtype=np.float64)
+        order = self.__sort_tile(boxes)
+
+        level = boxes[order]
+        self.__levels.append(level)
+
+        # Every node of the next level covers the bounding boxes of node_capacity elements of the level below
+        while len(level) > 1:
+            starts = np.arange(0, len(level), self.__node_capacity)
+            level = np.column_stack((np.minimum.reduceat(level[:, 0], starts),
+                                     np.minimum.reduceat(level[:, 1], starts),
+                                     np.maximum.reduceat(level[:, 2], starts),
+                                     np.maximum.reduceat(level[:, 3], starts)))
+            self.__levels.append(level)
+
+        self.__leaf_ids = [ids[index] for index in order]
+        self.__leaf_order = order
+
+    def __sort_tile(self, boxes: np.ndarray) -> np.ndarray:
+        """
+        Sort the bounding boxes in vertical slices, and the bounding boxes of every slice from bottom to top, so
+        neighbouring bounding boxes are stored together in the nodes of the tree.
+
+        Args:
+            boxes: Bounding boxes to sort. Array of shape (number_of_boxes, 4).
+
+        Returns: Array with the order of the bounding boxes.
+        """
+        number_of_nodes = math.ceil(len(boxes) / self.__node_capacity)
+        slice_size = math.ceil(math.sqrt(number_of_nodes)) * self.__node_capacity
+
+        center_x = (boxes[:, 0] + boxes[:, 2]) / 2
+        center_y = (boxes[:, 1] + boxes[:, 3]) / 2
+
+        order = np.argsort(center_x, kind='stable')
+        for start in range(0, len(order), slice_size):
+            slice_order = order[start:start + slice_size]
+            order[start:start + slice_size] = slice_order[np.argsort(center_y[slice_order], kind='stable')]
+
+        return order
+
+    def __update(self) -> None:
+        """
+        Calculate the bounding boxes of the polygons modified since the last update and pack the tree again if any
+        bounding box changed.
+
+        Returns: None
+        """
+        for polygon_id in self.__modified_ids:
+            points = self.__polygons[polygon_id].get_point_array()
+            bounding_box = None if len(points) == 0 else (float(np.min(points[:, 0])),
+                                                          float(np.min(points[:, 1])),
+                                                          float(np.max(points[:, 0])),
+                                                          float(np.max(points[:, 1])))
+
+            if bounding_box != self.__bounding_boxes.get(polygon_id):
+                self.__bounding_boxes[polygon_id] = bounding_box
+                self.__outdated = True
+        self.__modified_ids.clear()
+
+        if self.__outdated:
+            self.__pack()
+
+    def add_polygon(self, polygon_id: str, polygon: 'Polygon') -> None:
+        """
+        Add a polygon to the index.
+
+        Args:
+            polygon_id: ID of the polygon.
+            polygon: Polygon to add.
+
+        Returns: None
+        """
+        self.__polygons[polygon_id] = polygon
+        self.__modified_ids.add(polygon_id)
+        self.__bounding_boxes[polygon_id] = None
+        self.__outdated = True
+
+    def get_bounding_box(self, polygon_id: str) -> Union[Tuple[float, float, float, float], None]:
+        """
+        Get the bounding box of the polygon.
+
+        Args:
+            polygon_id: ID of the polygon.
+
+        Returns: Tuple with the minimum x, minimum y, maximum x and maximum y of the polygon. None if the polygon does
+                 not have points or if it is not in the index.
+        """
+        self.__update()
+        return self.__bounding_boxes.get(polygon_id)
+
+    def get_depth(self) -> int:
+        """
+        Get the number of levels of the tree.
+
+        Returns: Number of levels.
+        """
+        self.__update()
+        return len(self.__levels)
+
+    def get_nearest(self, x: float, y: float) -> Union[str, None]:
+        """
+        Get the polygon nearest to the point.
+
+        The nodes of the tree are visited in order of distance to the point, and the exact distance to the polygons is
+        only calculated for the polygons whose bounding boxes are nearer than the nearest polygon found.
+
+        Args:
+            x: x-coordinate of the point.
+            y: y-coordinate of the point.
+
+        Returns: ID of the nearest polygon. None if there is no polygons with points.
+        """
+        self.__update()
+        if len(self.__levels) == 0:
+            return None
+
+        def get_box_distances(boxes: np.ndarray) -> np.ndarray:
+            dx = np.maximum(np.maximum(boxes[:, 0] - x, x - boxes[:, 2]), 0)
+            dy = np.maximum(np.maximum(boxes[:, 1] - y, y - boxes[:, 3]), 0)
+            return np.hypot(dx, dy)
+
+        root_level = len(self.__levels) - 1
+        queue = [(float(distance), root_level, node)
+                 for node, distance in enumerate(get_box_distances(self.__levels[root_level]))]
+        heapq.heapify(queue)
+
+        nearest_id, nearest_distance = None, math.inf
+        while queue and queue[0][0] < nearest_distance:
+            _, level_number, node = heapq.heappop(queue)
+
+            if level_number == 0:
+                polygon_id = self.__leaf_ids[node]
+                distance = get_distance_to_polygon(x, y, self.__polygons[polygon_id].get_point_array())
+                if distance < nearest_distance:
+                    nearest_id, nearest_distance = polygon_id, distance
+                continue
+
+            first_child = node * self.__node_capacity
+            children = self.__levels[level_number - 1][first_child:first_child + self.__node_capacity]
+            for child, distance in enumerate(get_box_distances(children)):
+                heapq.heappush(queue, (float(distance), level_number - 1, first_child + child))
+
+        return nearest_id
+
+    def get_polygons_in_bbox(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[str]:
+        """
+        Get the polygons whose bounding boxes intersect the given bounding box.
+
+        Args:
+            min_x: Minimum x-coordinate of the bounding box.
+            min_y: Minimum y-coordinate of the bounding box.
+            max_x: Maximum x-coordinate of the bounding box.
+            max_y: Maximum y-coordinate of the bounding box.
+
+        Returns: List with the ID of the polygons, in the order in which they were added.
+        """
+        return [self.__leaf_ids[leaf] for leaf in self.__get_leaves_intersecting(min_x, min_y, max_x, max_y)]
+
+    def get_polygons_on_point(self, x: float, y: float) -> List[str]:
+        """
+        Get the polygons that have the point inside them (or over their lines).
+
+        Only the polygons whose bounding boxes have the point inside are checked.
+
+        Args:
+            x: x-coordinate of the point.
+            y: y-coordinate of the point.
+
+        Returns: List with the ID of the polygons, in the order in which they were added.
+        """
+        polygon_ids = []
+        for leaf in self.__get_leaves_intersecting(x, y, x, y):
+            polygon_id = self.__leaf_ids[leaf]
+            if get_distance_to_polygon(x, y, self.__polygons[polygon_id].get_point_array()) == 0:
+                polygon_ids.append(polygon_id)
+        return polygon_ids
+
+    def mark_polygon_modified(self, polygon_id: str) -> None:
+        """
+        Mark the points of the polygon as modified, so its bounding box is calculated again in the next query.
+
+        Does nothing if the polygon is not in the index.
+
+        Args:
+            polygon_id: ID of the polygon.
+
+        Returns: None
+        """
+        if polygon_id in self.__polygons:
+            self.__modified_ids.add(polygon_id)
+
+    def remove_polygon(self, polygon_id: str) -> None:
+        """
+        Remove a polygon from the index.
+
+        Does nothing if the polygon is not in the index.
+
+        Args:
+            polygon_id: ID of the polygon.
+
+        Returns: None
+        """
+        if polygon_id not in self.__polygons:
+            return
+
+        self.__polygons.pop(polygon_id)
+        self.__modified_ids.discard(polygon_id)
+        self.__bounding_boxes.pop(polygon_id, None)
+        self.__outdated = True
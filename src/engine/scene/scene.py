@@ -20,25 +20,35 @@ File that contain the Scene class. This class is in charge of the management of
 
 Class is in charge of the drawing of the models2D, models3D and polygons.
 """
-from typing import Callable, Dict, List, TYPE_CHECKING, Union
+from typing import Callable, Dict, Hashable, List, TYPE_CHECKING, Tuple, Union
 
 import OpenGL.GL as GL
 # noinspection PyPep8Naming
 import OpenGL.constant as OGLConstant
 import numpy as np
 
+from src.engine.cancellation_token import CancellationToken
+from src.engine.frame_profiler import FrameProfiler
 from src.engine.scene.camera import Camera
+from src.engine.scene.camera_uniform_buffer import CameraUniformBuffer
 from src.engine.scene.geometrical_operations import get_external_polygon_points, get_max_min_inside_polygon
+from src.engine.scene.height_history import HeightHistory
 from src.engine.scene.interpolation.interpolation import Interpolation
 from src.engine.scene.map_transformation.map_transformation import MapTransformation
 from src.engine.scene.model.lines import Lines
+from src.engine.scene.model.map2d_render_mode import Map2DRenderMode
 from src.engine.scene.model.map2dmodel import Map2DModel
 from src.engine.scene.model.map3dmodel import Map3DModel
 from src.engine.scene.model.model import Model
 from src.engine.scene.model.polygon import Polygon
+from src.engine.scene.model.polygon_layer import PolygonLayer
 from src.engine.scene.model.tranformations.transformations import ortho, perspective
+from src.engine.scene.polygon_spatial_index import PolygonSpatialIndex
 from src.engine.scene.transformation.transformation import Transformation
+from src.engine.scene.transformation_job import TransformationJob
+from src.engine.thread_task_priority import ThreadTaskPriority
 from src.error.scene_error import SceneError
+from src.error.transformation_job_error import TransformationJobError
 from src.program.view_mode import ViewMode
 from src.utils import get_logger
 
@@ -83,6 +93,16 @@ class Scene:
         # high priority can be draw over the polygons with less priority. Polygons that are not in the list will not
         # be draw.
         self.__polygon_draw_priority: List[str] = []
+        self.__polygon_layer = PolygonLayer(self)  # Draw all the polygons using the same buffers
+        self.__polygon_index = PolygonSpatialIndex()  # Bounding boxes of the polygons used to search them by location
+
+        # Jobs applying transformations in other threads, only one job can modify a model at the same time
+        self.__transformation_jobs: Dict[str, TransformationJob] = {}
+
+        # Heights of the regions of the maps modified by the transformations, used to undo and redo them
+        history_settings = engine.get_height_history_settings()
+        self.__height_history = HeightHistory(history_settings['HEIGHT_HISTORY_MEMORY_BUDGET'],
+                                              history_settings['HEIGHT_HISTORY_MAX_ENTRIES'])
 
         # Polygons can be draw in different orders, this list store the priority of each model so the models with
         # high priority can be draw over the models with less priority. Models that are not in the list will not
@@ -93,9 +113,16 @@ class Scene:
         # -----------------------------------------------------
         self.__engine = engine
         self.__camera = Camera()
+        self.__camera_uniform_buffer = CameraUniformBuffer()  # Matrices and viewport shared by all the shaders
         self.__width_viewport: int = 0
         self.__height_viewport: int = 0
 
+        scene_data = self.__engine.get_scene_setting_data()
+        self.__camera_uniform_buffer.set_viewport(scene_data['SCENE_BEGIN_X'],
+                                                  scene_data['SCENE_BEGIN_Y'],
+                                                  scene_data['SCENE_WIDTH_X'],
+                                                  scene_data['SCENE_HEIGHT_Y'])
+
         # Variables used to calculate the projection matrix used on the scene
         # -------------------------------------------------------------------
         self.__projection_matrix_2D = None
@@ -110,6 +137,9 @@ class Scene:
 
         self.__projection_matrix_3D = None
 
+        # Mode used to render the 2D models
+        self.__map_2d_render_mode = Map2DRenderMode.mesh
+
         # Auxiliary variables
         # -------------------
 
@@ -134,6 +164,75 @@ class Scene:
         """
         return self.__hidden_models
 
+    def __apply_transformation_job(self,
+                                   transformation: Union['Transformation', 'MapTransformation', 'Interpolation'],
+                                   then: Callable) -> None:
+        """
+        Apply the transformation in a different thread using a TransformationJob, updating the vertices of the model
+        in the GPU and storing the previous heights in the history of modifications when the job finish.
+
+        Only one job can modify a model at the same time, a TransformationJobError with code 1 is raised if there is
+        already a job modifying the model of the transformation.
+
+        Args:
+            transformation: Transformation (or map transformation, or interpolation) to apply. Must be initialized.
+            then: Logic to execute after the end of the job. Receives a boolean indicating if the transformation was
+                  applied (False if the job was cancelled or failed) and the error raised by the transformation (None
+                  if no error was raised).
+
+        Returns: None
+        """
+        model_id = transformation.model_id
+        if model_id in self.__transformation_jobs:
+            # noinspection PyTypeChecker
+            raise TransformationJobError(1)
+
+        job = TransformationJob(transformation, self.get_map2d_model_vertices_array(model_id))
+        self.__transformation_jobs[model_id] = job
+
+        # noinspection PyShadowingNames
+        def parallel_task():
+            """
+            Task to run in parallel in a different thread.
+
+            The errors raised by the transformation are stored in the job and given to the then function, so the then
+            task is always executed (with or without threads) and the job is removed from the running jobs.
+            """
+            try:
+                job.run()
+            except Exception as e:
+                log.debug(f'Error applying the transformation to the model {model_id}: {e}')
+
+        # noinspection PyShadowingNames
+        def then_task():
+            """Task to execute after the parallel routine."""
+            self.__transformation_jobs.pop(model_id, None)
+            if job.is_finished() and model_id in self.__model_hash:
+                height_delta = job.get_height_delta()
+                self.__height_history.add(height_delta)
+                self.__update_model_vertices(model_id, height_delta.get_region()[:2])
+            then(job.is_finished(), job.get_error())
+
+        self.__engine.set_thread_task(parallel_task, then_task)
+
+    def __update_model_vertices(self, model_id: str, rows: Union[Tuple[int, int], None] = None) -> None:
+        """
+        Update the vertices of the model in the GPU after modifying its heights.
+
+        If the model has a 3D model, the chunks and skirts of the 3D model are also updated, since they are generated
+        from the heights of the map.
+
+        Args:
+            model_id: ID of the model modified.
+            rows: Range of rows (start, end) of the map that were modified. None to update all the vertices.
+
+        Returns: None
+        """
+        self.__model_hash[model_id].update_vertices(rows)
+
+        if model_id in self.__3d_model_hash:
+            self.__3d_model_hash[model_id].update_values_from_2D_model_async()
+
     def add_new_vertex_to_polygon_using_map_coords(self,
                                                    x_coord: float,
                                                    y_coord: float,
@@ -153,6 +252,7 @@ class Scene:
         """
         if polygon_id in self.__polygon_hash:
             self.__polygon_hash[polygon_id].add_point(x_coord, y_coord)
+            self.__polygon_index.mark_polygon_modified(polygon_id)
 
     def add_new_vertex_to_polygon_using_window_coords(self,
                                                       position_x: int,
@@ -196,10 +296,11 @@ class Scene:
                                                                    allow_outside_map=True,
                                                                    allow_outside_scene=False)
             self.__polygon_hash[polygon_id].add_point(new_x, new_y)
+            self.__polygon_index.mark_polygon_modified(polygon_id)
 
     def apply_interpolation(self,
                             interpolation: Interpolation,
-                            then: Callable = lambda: None) -> None:
+                            then: Callable = lambda applied, error: None) -> None:
         """
         Interpolate the points at the exterior of the polygon using the given interpolation.
 
@@ -208,52 +309,55 @@ class Scene:
             the main thread. This method returns immediately after being called.
 
         Args:
-            interpolation: Interpolation to use to modify the models height values.
-            then: Logic to execute after the end of the task.
+            interpolation: Interpolation to use to modify the models height values. Must be initialized.
+            then: Logic to execute after the end of the task. Receives a boolean indicating if the interpolation was
+                  applied (False if it was cancelled or failed) and the error raised by the interpolation (None if no
+                  error was raised).
 
         Returns: None
         """
+        self.__apply_transformation_job(interpolation, then)
 
-        # noinspection PyShadowingNames
-        def parallel_task():
-            """Task to run in parallel in a different thread."""
-            interpolation.apply()
-
-        # noinspection PyShadowingNames
-        def then_task():
-            """Task to execute after the parallel routine."""
-            self.__model_hash[interpolation.model_id].update_vertices()
-            then()
-
-        self.__engine.set_thread_task(parallel_task, then_task)
-
-    def apply_map_transformation(self, map_transformation: 'MapTransformation') -> None:
+    def apply_map_transformation(self,
+                                 map_transformation: 'MapTransformation',
+                                 then: Callable = lambda applied, error: None) -> None:
         """
         Modify the model specified in the transformation using the transformation itself and update the vertices of
         the model.
 
+        Warnings:
+            This method is asynchronous, this is, the transformation is applied in another thread parallel to the main
+            thread. This method returns immediately after being called.
+
         Args:
-            map_transformation: MapTransformation to apply on the models.
+            map_transformation: MapTransformation to apply on the models. Must be initialized.
+            then: Logic to execute after the end of the transformation. Receives a boolean indicating if the
+                  transformation was applied (False if it was cancelled or failed) and the error raised by the
+                  transformation (None if no error was raised).
 
         Returns: None
         """
-        map_transformation.apply()
-        self.__model_hash[map_transformation.model_id].update_vertices()
+        self.__apply_transformation_job(map_transformation, then)
 
-    def apply_transformation(self, transformation: 'Transformation') -> None:
+    def apply_transformation(self,
+                             transformation: 'Transformation',
+                             then: Callable = lambda applied, error: None) -> None:
         """
-        Modify the points inside the polygon from the specified model using a linear transformation.
+        Modify the points inside the polygon from the specified model using a transformation.
+
+        Warnings:
+            This method is asynchronous, this is, the transformation is applied in another thread parallel to the main
+            thread. This method returns immediately after being called.
 
         Args:
-            transformation: transformation to apply.
+            transformation: Transformation to apply. Must be initialized.
+            then: Logic to execute after the end of the transformation. Receives a boolean indicating if the
+                  transformation was applied (False if it was cancelled or failed) and the error raised by the
+                  transformation (None if no error was raised).
 
         Returns: None
         """
-        # Apply the transformation
-        transformation.apply()
-
-        # Modify the height of the modified model
-        self.__model_hash[transformation.model_id].update_vertices()
+        self.__apply_transformation_job(transformation, then)
 
     def calculate_map_position_from_window(self,
                                            position_x: int,
@@ -366,6 +470,17 @@ class Scene:
 
         return get_max_min_inside_polygon(vertex_array, polygon_points, height_array)
 
+    def cancel_transformation_jobs(self) -> None:
+        """
+        Cancel all the jobs that are applying transformations.
+
+        The models modified by the cancelled jobs keep the heights that they had before applying the transformations.
+
+        Returns: None
+        """
+        for job in self.__transformation_jobs.values():
+            job.cancel()
+
     def change_camera_azimuthal_angle(self, angle):
         """
         Change the camera azimuthal angle
@@ -513,18 +628,32 @@ class Scene:
         # Insert element in the new position
         self.__polygon_draw_priority.insert(new_priority, polygon_id)
 
+    def clear_height_history(self) -> None:
+        """
+        Remove all the modifications of the heights of the maps stored to undo and redo them.
+
+        Returns: None
+        """
+        self.__height_history.clear()
+
     def create_3D_model_if_not_exists(self,
-                                      model_id: Union[str, None]) -> None:
+                                      model_id: Union[str, None],
+                                      then: callable = lambda: None) -> None:
         """
         Create a new map3D_model object and add it to the scene.
 
         This method creates the 3D model of an existent 2D model if the 3D model does not exists. Also, removes all
         the other 3D models loaded into the program.
 
+        IMPORTANT:
+            This method is asynchronous, the data of the 3D model is generated in another thread. The 'then' function
+            is called after the data of the model is loaded (or immediately if the model is not created).
+
         Args:
             model_id: ID of the model to generate the 3D model.
+            then: Function to execute after the model is created.
 
-        Returns: Id of the new map3D_model
+        Returns: None
         """
         if model_id in self.__model_hash and model_id not in self.__3d_model_hash:
             self.reset_camera_values()
@@ -534,8 +663,12 @@ class Scene:
             # Remove all the other models loaded into the scene
             self.remove_all_3d_models()
 
-            # Add model to the scene
+            # Add model to the scene, the model is not drawn until its data is loaded
             self.__3d_model_hash[model_id] = new_model
+            new_model.update_values_from_2D_model_async(then)
+
+        else:
+            then()
 
     def create_model_from_data_async(self,
                                      path_color_file: str,
@@ -622,6 +755,7 @@ class Scene:
             # Initialize model information
             # -----------------------------
             model.set_color_file(path_color_file)
+            model.set_render_mode(self.__map_2d_render_mode)
             model.id = str(self.__model_id_count)
             self.__model_id_count += 1
 
@@ -667,6 +801,7 @@ class Scene:
         # ---------------------------------------------------------
         polygon = Polygon(self, new_polygon_id, point_list, parameters)
         self.__polygon_hash[polygon.get_id()] = polygon
+        self.__polygon_index.add_polygon(polygon.get_id(), polygon)
 
         # Add the id to the list of drawing polygons
         # ------------------------------------------
@@ -690,6 +825,7 @@ class Scene:
         """
         if polygon_id in self.__polygon_hash:
             self.__polygon_hash.pop(polygon_id)
+            self.__polygon_index.remove_polygon(polygon_id)
 
         # remove the interpolation area if they have
         if polygon_id in self.__interpolation_area_hash:
@@ -736,6 +872,13 @@ class Scene:
             active_polygon_id: ID of the active polygon on the program.
             program_view_mode: String representing if the program is in 2D or 3D mode.
         """
+        # Send the matrices to the shaders, only the ones that changed since the last frame are sent to the GPU
+        # ------------------------------------------------------------------------------------------------------
+        self.__camera_uniform_buffer.set_projection_matrix_2D(self.get_projection_matrix_2D())
+        self.__camera_uniform_buffer.set_projection_matrix_3D(self.get_projection_matrix_3D())
+        self.__camera_uniform_buffer.set_view_matrix(self.__camera.get_view_matrix())
+        self.__camera_uniform_buffer.update()
+
         # check if draw the 2D or the 3D of the models.
         if program_view_mode == ViewMode.mode_2d:
 
@@ -743,22 +886,24 @@ class Scene:
             for model_2d in reversed(self.__model_draw_priority):
                 # Change the height of the maps and draw them
                 if model_2d not in self.__hidden_models:
-                    self.__model_hash[model_2d].draw()
+                    with FrameProfiler.scope('draw_model', model_2d):
+                        self.__model_hash[model_2d].draw()
 
             # Draw all the interpolation areas
-            for area_models in self.__interpolation_area_hash.values():
-                for model in area_models:
-                    model.draw()
+            with FrameProfiler.scope('draw_interpolation_areas'):
+                for area_models in self.__interpolation_area_hash.values():
+                    for model in area_models:
+                        model.draw()
 
-            # Draw all the polygons
-            for polygon in reversed(self.__polygon_draw_priority):
-                # Draw the polygons in order
-                self.__polygon_hash[polygon].draw(active_polygon_id == polygon)
+            # Draw all the polygons in order
+            with FrameProfiler.scope('draw_polygons'):
+                self.__polygon_layer.draw(self.__polygon_hash, self.__polygon_draw_priority, active_polygon_id)
 
         elif program_view_mode == ViewMode.mode_3d:
             # Draw model if it exists
             if active_model_id in self.__3d_model_hash:
-                self.__3d_model_hash[active_model_id].draw()
+                with FrameProfiler.scope('draw_model_3d', active_model_id):
+                    self.__3d_model_hash[active_model_id].draw()
 
     # noinspection PyUnresolvedReferences
     def get_2D_showed_limits(self) -> dict:
@@ -866,6 +1011,62 @@ class Scene:
         vertices_array = model.get_vertices_array().reshape(model.get_vertices_shape())
         return vertices_array
 
+    def get_map_2d_render_mode(self) -> Map2DRenderMode:
+        """
+        Get the mode used to render the 2D models.
+
+        Returns: Render mode used by the 2D models.
+        """
+        return self.__map_2d_render_mode
+
+    def get_map_tiles_settings(self) -> dict:
+        """
+        Ask the engine for the settings related to the tiles used to render the maps in 2D.
+
+        Returns: Dictionary with the settings of the tiles.
+        """
+        return self.__engine.get_map_tiles_settings()
+
+    def get_memory_usage(self) -> dict:
+        """
+        Get the number of bytes used by the models of the scene in the CPU and in the GPU.
+
+        The memory of the polygons (and of the layer used to draw them) and the memory of the interpolation areas is
+        added in one entry for each group.
+
+        Returns: Dictionary with the list of models (each one a dictionary with the keys NAME, TYPE, CPU and GPU) and
+                 the total of bytes used in the CPU and the GPU.
+        """
+        models = []
+        for model_id, model in self.__model_hash.items():
+            models.append({'NAME': model.get_name() or model_id, 'TYPE': '2D', **model.get_memory_usage()})
+
+        for model_id, model in self.__3d_model_hash.items():
+            name = self.__model_hash[model_id].get_name() if model_id in self.__model_hash else None
+            models.append({'NAME': name or model_id, 'TYPE': '3D', **model.get_memory_usage()})
+
+        polygons = {'NAME': 'Polygons', 'TYPE': 'Polygons', **self.__polygon_layer.get_memory_usage()}
+        for polygon in self.__polygon_hash.values():
+            polygon_memory_usage = polygon.get_memory_usage()
+            polygons['CPU'] += polygon_memory_usage['CPU']
+            polygons['GPU'] += polygon_memory_usage['GPU']
+        models.append(polygons)
+
+        if len(self.__interpolation_area_hash) > 0:
+            areas = {'NAME': 'Interpolation areas', 'TYPE': 'Areas', 'CPU': 0, 'GPU': 0}
+            for area_models in self.__interpolation_area_hash.values():
+                for model in area_models:
+                    model_memory_usage = model.get_memory_usage()
+                    areas['CPU'] += model_memory_usage['CPU']
+                    areas['GPU'] += model_memory_usage['GPU']
+            models.append(areas)
+
+        return {
+            'MODELS': models,
+            'CPU': sum(model['CPU'] for model in models),
+            'GPU': sum(model['GPU'] for model in models)
+        }
+
     def get_model_coordinates_arrays(self, model_id: str) -> (Union[np.ndarray, None], Union[np.ndarray, None]):
         """
         Get two arrays, the first containing the coordinates used in the model for the x-axis and the second
@@ -944,6 +1145,21 @@ class Scene:
         """
         return list(self.__model_hash.keys())
 
+    def get_nearest_polygon_id(self, x: float, y: float) -> Union[str, None]:
+        """
+        Get the polygon nearest to the given point.
+
+        The distance is measured to the lines of the polygons, polygons that have the point inside them are at
+        distance 0.
+
+        Args:
+            x: x-coordinate of the point (map coordinates).
+            y: y-coordinate of the point (map coordinates).
+
+        Returns: ID of the nearest polygon. None if there is no polygons with points in the scene.
+        """
+        return self.__polygon_index.get_nearest(x, y)
+
     def get_point_list_from_polygon(self, polygon_id: str) -> list:
         """
         Return the list of points from a given polygon.
@@ -967,6 +1183,34 @@ class Scene:
         """
         return list(self.__polygon_hash.keys())
 
+    def get_polygon_ids_in_bbox(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[str]:
+        """
+        Get the polygons whose bounding boxes intersect the given bounding box.
+
+        Polygons without points are not returned.
+
+        Args:
+            min_x: Minimum x-coordinate of the bounding box (map coordinates).
+            min_y: Minimum y-coordinate of the bounding box (map coordinates).
+            max_x: Maximum x-coordinate of the bounding box (map coordinates).
+            max_y: Maximum y-coordinate of the bounding box (map coordinates).
+
+        Returns: List with the ID of the polygons, in the order in which they were created.
+        """
+        return self.__polygon_index.get_polygons_in_bbox(min_x, min_y, max_x, max_y)
+
+    def get_polygon_ids_on_point(self, x: float, y: float) -> List[str]:
+        """
+        Get the polygons that have the given point inside them or over their lines.
+
+        Args:
+            x: x-coordinate of the point (map coordinates).
+            y: y-coordinate of the point (map coordinates).
+
+        Returns: List with the ID of the polygons, in the order in which they were created.
+        """
+        return self.__polygon_index.get_polygons_on_point(x, y)
+
     def get_polygon_name(self, polygon_id: str) -> str:
         """
         Get the name of a polygon given its id
@@ -1061,6 +1305,25 @@ class Scene:
         """
         return self.__engine.get_scene_setting_data()
 
+    def get_terrain_lod_settings(self) -> dict:
+        """
+        Ask the engine for the settings related to the chunks used to render the maps in 3D.
+
+        Returns: Dictionary with the settings of the chunks.
+        """
+        return self.__engine.get_terrain_lod_settings()
+
+    def get_transformation_progress(self) -> Union[float, None]:
+        """
+        Get the progress of the jobs that are applying transformations.
+
+        Returns: Number between 0 and 1 with the mean progress of the jobs. None if there is no jobs running.
+        """
+        if len(self.__transformation_jobs) == 0:
+            return None
+
+        return sum(job.get_progress() for job in self.__transformation_jobs.values()) / len(self.__transformation_jobs)
+
     def is_polygon_planar(self, polygon_id: str) -> bool:
         """
         Check if the polygon is planar or not.
@@ -1075,6 +1338,16 @@ class Scene:
         if polygon_id in self.__polygon_hash:
             return self.__polygon_hash[polygon_id].is_planar()
 
+    def is_refresh_pending(self) -> bool:
+        """
+        Check if some of the 2D models showed on the scene is waiting to refresh its tiles.
+
+        Returns: Boolean indicating if the scene must keep being drawn to refresh the models.
+        """
+        return any(model.is_tiles_refresh_pending()
+                   for model_id, model in self.__model_hash.items()
+                   if model_id not in self.__hidden_models)
+
     def load_preview_interpolation_area(self,
                                         distance: float,
                                         polygon_id: str) -> None:
@@ -1159,6 +1432,29 @@ class Scene:
         if len(self.__model_hash) == 0:
             then()
 
+    def redo_height_modification(self) -> bool:
+        """
+        Redo the last modification of the heights of the maps that was undone.
+
+        Only the region of the map modified is restored, and the vertices of the map are updated in the GPU.
+
+        A TransformationJobError with code 1 is raised if the model modified by the redo is being modified by a
+        transformation job.
+
+        Returns: Boolean indicating if there was a modification to redo.
+        """
+        if self.__height_history.get_redo_model_id() in self.__transformation_jobs:
+            # noinspection PyTypeChecker
+            raise TransformationJobError(1)
+
+        modification = self.__height_history.redo(self.get_map2d_model_vertices_array)
+        if modification is None:
+            return False
+
+        model_id, region = modification
+        self.__update_model_vertices(model_id, region[:2])
+        return True
+
     def reload_models_async(self, quality: int, then: Callable):
         """
         Ask the 2D models to reload with the new resolution of the screen.
@@ -1215,6 +1511,7 @@ class Scene:
         Returns: None
         """
         self.__model_hash = {}
+        self.__height_history.clear()
 
     def remove_interpolation_preview(self, polygon_id: str) -> None:
         """
@@ -1246,6 +1543,7 @@ class Scene:
         log.debug(f'Removing last point from polygon {polygon_id}')
         if polygon_id in self.__polygon_hash:
             self.__polygon_hash[polygon_id].remove_last_added_point()
+            self.__polygon_index.mark_polygon_modified(polygon_id)
             return
 
         raise AssertionError('Active polygon is not in the list of polygons')
@@ -1264,6 +1562,8 @@ class Scene:
         if id_model in self.__model_draw_priority:
             self.__model_draw_priority.remove(id_model)
 
+        self.__height_history.remove_model(id_model)
+
     def remove_model_3d(self, id_model: str) -> None:
         """
         Remove the 3D model with the specified id.
@@ -1286,6 +1586,33 @@ class Scene:
         """
         self.__camera.reset_values()
 
+    def set_main_thread_work(self, work: Callable) -> None:
+        """
+        Add a work to execute in the main thread without exceeding the time budget of the frames.
+
+        Args:
+            work: Function without arguments to execute. If the function returns a generator, then the generator is
+                  executed in slices.
+
+        Returns: None
+        """
+        self.__engine.set_main_thread_work(work)
+
+    def set_map_2d_render_mode(self, render_mode: Map2DRenderMode) -> None:
+        """
+        Change the mode used to render the 2D models.
+
+        The mode is applied to all the 2D models of the scene and to the models created after calling this method.
+
+        Args:
+            render_mode: Render mode to use.
+
+        Returns: None
+        """
+        self.__map_2d_render_mode = render_mode
+        for model in self.__model_hash.values():
+            model.set_render_mode(render_mode)
+
     def set_models_polygon_mode(self, polygon_mode: OGLConstant.IntConstant) -> None:
         """
         Change the polygon mode used by the models.
@@ -1337,28 +1664,64 @@ class Scene:
             # noinspection PyTypeChecker
             raise SceneError(5)
 
-    def set_thread_task(self, parallel_task, then):
+    def set_thread_task(self,
+                        parallel_task,
+                        then,
+                        priority: ThreadTaskPriority = ThreadTaskPriority.interactive,
+                        key: Hashable = None,
+                        token: CancellationToken = None) -> CancellationToken:
         """
         Set a parallel task in the engine.
 
         Args:
             parallel_task: Task to execute in parallel
             then: Task to execute after the parallel task
+            priority: Priority of the task.
+            key: Key used to cancel the older tasks with the same key. None to not cancel tasks.
+            token: Token to use to cancel the task. A new token is created if not specified.
 
-        Returns: None
+        Returns: Token that can be used to cancel the task.
+        """
+        return self.__engine.set_thread_task(parallel_task, then, priority=priority, key=key, token=token)
+
+    def undo_height_modification(self) -> bool:
+        """
+        Undo the last modification of the heights of the maps made by a transformation, map transformation or
+        interpolation.
+
+        Only the region of the map modified is restored, and the vertices of the map are updated in the GPU.
+
+        A TransformationJobError with code 1 is raised if the model modified by the undo is being modified by a
+        transformation job.
+
+        Returns: Boolean indicating if there was a modification to undo.
         """
-        self.__engine.set_thread_task(parallel_task, then)
+        if self.__height_history.get_undo_model_id() in self.__transformation_jobs:
+            # noinspection PyTypeChecker
+            raise TransformationJobError(1)
+
+        modification = self.__height_history.undo(self.get_map2d_model_vertices_array)
+        if modification is None:
+            return False
+
+        model_id, region = modification
+        self.__update_model_vertices(model_id, region[:2])
+        return True
 
-    def update_3D_model(self, model_id: str) -> None:
+    def update_3D_model(self, model_id: str, then: callable = lambda: None) -> None:
         """
         Ask the 3D model to update its values from the 2D model.
 
+        IMPORTANT:
+            This method is asynchronous, the 'then' function is called after the values of the model are updated.
+
         Args:
             model_id: id of the model to update.
+            then: Function to execute after the model is updated.
 
         Returns: None
         """
-        self.__3d_model_hash[model_id].update_values_from_2D_model()
+        self.__3d_model_hash[model_id].update_values_from_2D_model_async(then)
 
     def update_models_colors(self) -> None:
         """
@@ -1494,6 +1857,10 @@ class Scene:
         log.debug("Updating viewport")
         self.__width_viewport = scene_data['SCENE_WIDTH_X']
         self.__height_viewport = scene_data['SCENE_HEIGHT_Y']
+        self.__camera_uniform_buffer.set_viewport(scene_data['SCENE_BEGIN_X'],
+                                                  scene_data['SCENE_BEGIN_Y'],
+                                                  scene_data['SCENE_WIDTH_X'],
+                                                  scene_data['SCENE_HEIGHT_Y'])
 
         GL.glViewport(scene_data['SCENE_BEGIN_X'],
                       scene_data['SCENE_BEGIN_Y'],
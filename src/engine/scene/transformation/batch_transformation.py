@@ -0,0 +1,244 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+Module that defines the class BatchTransformation, class that applies a transformation over all the polygons of a
+list, applying the transformations of the polygons that do not share points of the map in parallel.
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, TYPE_CHECKING, Tuple, Union
+
+import numpy as np
+
+from src.engine.scene.geometrical_operations import get_region_indexes
+from src.engine.scene.transformation.transformation import Transformation
+from src.error.transformation_error import TransformationError
+from src.error.transformation_job_error import TransformationJobError
+from src.utils import get_logger
+
+if TYPE_CHECKING:
+    from src.engine.scene.scene import Scene
+
+log = get_logger(module='BATCH_TRANSFORMATION')
+
+# Region of the map: (min_row, max_row, min_col, max_col), the max values are not inclusive.
+Region = Tuple[int, int, int, int]
+
+
+def regions_overlap(region_a: Region, region_b: Region) -> bool:
+    """
+    Check if two regions of the map have at least one point in common.
+
+    Args:
+        region_a: First region. (min_row, max_row, min_col, max_col)
+        region_b: Second region. (min_row, max_row, min_col, max_col)
+
+    Returns: Boolean indicating if the regions overlap.
+    """
+    return region_a[0] < region_b[1] and region_b[0] < region_a[1] and \
+        region_a[2] < region_b[3] and region_b[2] < region_a[3]
+
+
+def group_disjoint_regions(region_list: List[Region]) -> List[List[int]]:
+    """
+    Group the regions in batches where no region overlaps other region of the same batch.
+
+    The regions are assigned, in order, to the first batch where they do not overlap other region.
+
+    Args:
+        region_list: List with the regions. (min_row, max_row, min_col, max_col)
+
+    Returns: List with the batches, every batch is a list with the index of the regions in it.
+    """
+    batches: List[List[int]] = []
+    for index, region in enumerate(region_list):
+        for batch in batches:
+            if not any(regions_overlap(region, region_list[other]) for other in batch):
+                batch.append(index)
+                break
+        else:
+            batches.append([index])
+
+    return batches
+
+
+class BatchTransformation(Transformation):
+    """
+    Class that defines the base logic for the transformations applied over all the polygons of a list.
+
+    A transformation is created for every polygon of the list. The transformations are grouped in batches where the
+    region of the map that they can modify do not overlap, so all the transformations of a batch can be applied at the
+    same time on a pool of threads. The batches are applied one after the other.
+
+    The modified area of the batch transformation is the union of the areas of the transformations of the polygons, so
+    the scene updates the vertices of the model in the GPU only one time after applying all the transformations.
+
+    The subclasses must define the method create_transformation, that returns the transformation to apply for every
+    polygon of the list.
+    """
+
+    def __init__(self, model_id: str, polygon_id_list: List[str], filter_list=None, max_workers: int = None):
+        """
+        Constructor of the class.
+
+        Args:
+            model_id: ID of the model to modify.
+            polygon_id_list: List with the IDs of the polygons to use.
+            filter_list: Filters to use in the transformations of every polygon.
+            max_workers: Maximum number of threads to use. None to let python decide it.
+        """
+        super().__init__(model_id, None, filter_list)
+
+        self.__polygon_id_list = list(polygon_id_list)
+        self.__max_workers = max_workers
+
+        self.__transformation_list: List[Transformation] = []
+        self.__batches: List[List[int]] = []
+        self.__modified_area: Union[Tuple[float, float, float, float], None] = None
+        self.__vertex_array: np.ndarray = np.array([])
+
+    def __apply_batch(self, executor: ThreadPoolExecutor, batch: List[int], applied: int) -> None:
+        """
+        Apply the transformations of the batch at the same time using the threads of the executor.
+
+        The progress of the batch transformation is reported every time that one of the transformations ends. If the
+        job applying the batch transformation is cancelled, the transformations that did not start are cancelled and
+        the method waits for the transformations that are running.
+
+        Args:
+            executor: Executor to use to apply the transformations.
+            batch: List with the index of the transformations to apply.
+            applied: Number of transformations applied before this batch.
+
+        Returns: None
+        """
+        futures = [executor.submit(self.__transformation_list[index].apply) for index in batch]
+        try:
+            for future in as_completed(futures):
+                future.result()
+                applied += 1
+                self.report_progress(applied / len(self.__transformation_list))
+
+        except TransformationJobError as e:
+            for future in futures:
+                future.cancel()
+            for future in futures:
+                if not future.cancelled():
+                    future.exception()
+            raise e
+
+    def __calculate_modified_area(self) -> Union[Tuple[float, float, float, float], None]:
+        """
+        Calculate the union of the areas that the transformations of the polygons can modify.
+
+        Returns: Tuple with the minimum x, minimum y, maximum x and maximum y of the area. None if one of the
+                 transformations can modify the whole map.
+        """
+        area_list = [transformation.get_modified_area() for transformation in self.__transformation_list]
+        if any(area is None for area in area_list):
+            return None
+
+        return min(area[0] for area in area_list), min(area[1] for area in area_list), \
+            max(area[2] for area in area_list), max(area[3] for area in area_list)
+
+    def apply(self) -> np.ndarray:
+        """
+        Apply the transformations of all the polygons over the vertices of the model.
+
+        The vertices of the model are modified directly, the returned array is a reference to the vertices of the
+        model modified.
+
+        Returns: Model vertices modified.
+        """
+        applied = 0
+        with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+            for batch in self.__batches:
+                log.debug(f'Applying {len(batch)} transformations at the same time.')
+                self.__apply_batch(executor, batch, applied)
+                applied += len(batch)
+
+        return self.__vertex_array
+
+    def create_transformation(self, polygon_id: str, scene: 'Scene') -> Transformation:
+        """
+        Create the transformation to apply using the specified polygon.
+
+        The transformation returned must not be initialized.
+
+        Args:
+            polygon_id: ID of the polygon to use in the transformation.
+            scene: Scene to use to get the data of the polygon.
+
+        Returns: Transformation to apply.
+        """
+        raise NotImplementedError('Method not implemented.')
+
+    def get_batches(self) -> List[List[str]]:
+        """
+        Get the batches of polygons whose transformations are applied at the same time.
+
+        Returns: List with the batches, every batch is a list with the IDs of the polygons in it.
+        """
+        return [[self.__polygon_id_list[index] for index in batch] for batch in self.__batches]
+
+    def get_modified_area(self) -> Union[Tuple[float, float, float, float], None]:
+        """
+        Get the area of the map that can be modified by the transformations of all the polygons.
+
+        Returns: Tuple with the minimum x, minimum y, maximum x and maximum y of the area. None if the transformation
+                 can modify the whole map.
+        """
+        return self.__modified_area
+
+    def get_polygon_id_list(self) -> List[str]:
+        """
+        Get the list with the IDs of the polygons used in the transformation.
+
+        Returns: List with the IDs of the polygons.
+        """
+        return self.__polygon_id_list
+
+    def initialize(self, scene: 'Scene') -> None:
+        """
+        Initialize the transformations of all the polygons and group them in batches.
+
+        Args:
+            scene: Scene to use to initialize the parameters of the transformations.
+
+        Returns: None
+        """
+        if self.model_id is None:
+            raise TransformationError(10)
+
+        if self.model_id not in scene.get_model_list():
+            raise TransformationError(12)
+
+        if len(self.__polygon_id_list) == 0:
+            raise TransformationError(14)
+
+        self.__vertex_array = scene.get_map2d_model_vertices_array(self.model_id)
+
+        self.__transformation_list = []
+        for polygon_id in self.__polygon_id_list:
+            transformation = self.create_transformation(polygon_id, scene)
+            transformation.initialize(scene)
+            self.__transformation_list.append(transformation)
+
+        region_list = [get_region_indexes(self.__vertex_array, transformation.get_modified_area())
+                       for transformation in self.__transformation_list]
+        self.__batches = group_disjoint_regions(region_list)
+        self.__modified_area = self.__calculate_modified_area()
@@ -0,0 +1,46 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+Module that defines the class FillNanBatchTransformation, class that fill with nan the points inside all the polygons
+of a list.
+"""
+from typing import TYPE_CHECKING
+
+from src.engine.scene.transformation.batch_transformation import BatchTransformation
+from src.engine.scene.transformation.fill_nan_transformation import FillNanTransformation
+
+if TYPE_CHECKING:
+    from src.engine.scene.scene import Scene
+
+
+class FillNanBatchTransformation(BatchTransformation):
+    """
+    Class in charge of changing to nan the heights of the points inside all the polygons of a list.
+    """
+
+    def create_transformation(self, polygon_id: str, scene: 'Scene') -> FillNanTransformation:
+        """
+        Create the transformation that fill with nan the points inside the polygon.
+
+        Args:
+            polygon_id: ID of the polygon to use in the transformation.
+            scene: Scene to use to get the data of the polygon.
+
+        Returns: Transformation to apply.
+        """
+        return FillNanTransformation(self.model_id, polygon_id, self.filter_list)
@@ -88,8 +88,8 @@ class FillNanTransformation(Transformation):
         if len(points_array_cut) == 0:
             return self.__vertex_array
 
-        polygon_flags = generate_mask(points_array_cut, self.__polygon_points)
-        filtered_flags = self.apply_filters(points_array_cut)
+        polygon_flags = generate_mask(points_array_cut, self.__polygon_points, self.get_progress_callback(0, 2))
+        filtered_flags = self.apply_filters(points_array_cut, self.get_progress_callback(1, 2))
         flags = polygon_flags & filtered_flags
 
         # set nan to the values of the height
@@ -0,0 +1,83 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+Module that defines the class LinearBatchTransformation, class that applies a linear transformation over all the
+polygons of a list using the heights stored in the parameters of the polygons.
+"""
+from typing import List, TYPE_CHECKING
+
+from src.engine.scene.transformation.batch_transformation import BatchTransformation
+from src.engine.scene.transformation.linear_transformation import LinearTransformation
+from src.error.transformation_error import TransformationError
+
+if TYPE_CHECKING:
+    from src.engine.scene.scene import Scene
+
+
+class LinearBatchTransformation(BatchTransformation):
+    """
+    Class in charge of the linear transformation of the points inside all the polygons of a list.
+
+    The minimum and maximum heights used for every polygon are read from the parameters of the polygon, like the
+    attributes of the polygons loaded from shapefiles.
+    """
+
+    def __init__(self,
+                 model_id: str,
+                 polygon_id_list: List[str],
+                 min_height_parameter: str,
+                 max_height_parameter: str,
+                 filter_list=None,
+                 max_workers: int = None):
+        """
+        Constructor of the class.
+
+        Args:
+            model_id: ID of the model to modify.
+            polygon_id_list: List with the IDs of the polygons to use.
+            min_height_parameter: Name of the parameter of the polygons with the new minimum height.
+            max_height_parameter: Name of the parameter of the polygons with the new maximum height.
+            filter_list: Filters to use in the transformations of every polygon.
+            max_workers: Maximum number of threads to use. None to let python decide it.
+        """
+        super().__init__(model_id, polygon_id_list, filter_list, max_workers)
+
+        self.__min_height_parameter = min_height_parameter
+        self.__max_height_parameter = max_height_parameter
+
+    def create_transformation(self, polygon_id: str, scene: 'Scene') -> LinearTransformation:
+        """
+        Create the linear transformation of the polygon using the heights stored in its parameters.
+
+        Args:
+            polygon_id: ID of the polygon to use in the transformation.
+            scene: Scene to use to get the parameters of the polygon.
+
+        Returns: Linear transformation to apply.
+        """
+        if polygon_id not in scene.get_polygon_id_list():
+            raise TransformationError(13)
+
+        parameters = dict(scene.get_polygon_params(polygon_id))
+        try:
+            min_height = float(parameters[self.__min_height_parameter])
+            max_height = float(parameters[self.__max_height_parameter])
+        except (KeyError, ValueError):
+            raise TransformationError(15)
+
+        return LinearTransformation(self.model_id, polygon_id, min_height, max_height, self.filter_list)
@@ -21,29 +21,34 @@ Module that defines the class Transformation, class that stores the logic of the
 Every transformation must have, at least, one model and polygon associated to them. Otherwise, an exception is raised.
 """
 
-from typing import List, TYPE_CHECKING
+from typing import Callable, List, TYPE_CHECKING, Tuple, Union
 
 import numpy as np
 
 from src.engine.scene.filter.filter import Filter
+from src.engine.scene.geometrical_operations import get_points_bounding_box
+from src.engine.scene.transformation_job import JobProgressMixin
 from src.error.transformation_error import TransformationError
 
 if TYPE_CHECKING:
     from src.engine.scene.scene import Scene
 
 
-class Transformation:
+class Transformation(JobProgressMixin):
     """
     Class that defines the base logic for the transformations defined in the program.
     """
 
     def __init__(self, model_id: str, polygon_id: str, filter_list=None):
+        super().__init__()
+
         if filter_list is None:
             filter_list = []
 
         self.__model_id = model_id
         self.__polygon_id = polygon_id
         self.__filter_list: List[Filter] = filter_list
+        self.__modified_area: Union[Tuple[float, float, float, float], None] = None
 
     @property
     def model_id(self) -> str:
@@ -84,23 +89,37 @@ class Transformation:
         if self.polygon_id not in scene.get_polygon_id_list():
             raise TransformationError(13)
 
-    def apply_filters(self, model_vertices: np.ndarray) -> np.ndarray:
+        self.__modified_area = get_points_bounding_box(scene.get_polygon_points(self.polygon_id))
+
+    def apply_filters(self, model_vertices: np.ndarray, progress: Callable[[float], None] = None) -> np.ndarray:
         """
         Apply the filters defined in the transformation and returns the mask array.
 
         Args:
             model_vertices: Vertices of the model to use for the application of the filters. Shape must be (x, y, 3)
                             with each vertex containing the x-coordinate, y-coordinate and the height of the vertex.
+            progress: Function that receives the fraction of the filters applied. None to not report the progress.
 
         Returns: Numpy array with shape (x, y) with True in the values that should be considered for the transformation
                  and False in the values that should not be considered.
         """
         mask = np.full(model_vertices.shape[:2], True)
-        for transformation_filter in self.filter_list:
+        for filter_number, transformation_filter in enumerate(self.filter_list):
             mask = transformation_filter.get_mask(model_vertices, mask)
+            if progress is not None:
+                progress((filter_number + 1) / len(self.filter_list))
 
         return mask
 
+    def get_modified_area(self) -> Union[Tuple[float, float, float, float], None]:
+        """
+        Get the area of the map that can be modified by the transformation.
+
+        Returns: Tuple with the minimum x, minimum y, maximum x and maximum y of the area. None if the transformation
+                 can modify the whole map.
+        """
+        return self.__modified_area
+
     def apply(self) -> np.ndarray:
         """
         Apply the transformation to the specified points.
@@ -0,0 +1,271 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+File with the class TransformationJob, class used by the scene to apply the transformations in a thread different from
+the main thread, and the class JobProgressMixin, used by the transformations to report their progress to the job.
+"""
+from threading import Lock
+from typing import Callable, TYPE_CHECKING, Union
+
+import numpy as np
+
+from src.engine.scene.geometrical_operations import get_region_indexes
+from src.engine.scene.height_history import HeightDelta
+from src.error.transformation_job_error import TransformationJobError
+from src.utils import get_logger
+
+if TYPE_CHECKING:
+    from src.engine.scene.interpolation.interpolation import Interpolation
+    from src.engine.scene.map_transformation.map_transformation import MapTransformation
+    from src.engine.scene.transformation.transformation import Transformation
+
+log = get_logger(module='TRANSFORMATION_JOB')
+
+
+class JobProgressMixin:
+    """
+    Class inherited by the transformations, map transformations and interpolations that allows them to report their
+    progress to the TransformationJob that is applying them.
+    """
+
+    def __init__(self):
+        """
+        Constructor of the class.
+        """
+        self.__job: Union['TransformationJob', None] = None
+
+    @property
+    def job(self) -> Union['TransformationJob', None]:
+        """Get the job that is applying the transformation (None if the transformation is not applied by a job)."""
+        return self.__job
+
+    @job.setter
+    def job(self, new_value: Union['TransformationJob', None]) -> None:
+        """Set the job that is applying the transformation."""
+        self.__job = new_value
+
+    def get_progress_callback(self, step: int, number_of_steps: int) -> Callable[[float], None]:
+        """
+        Get a function that reports the progress of one of the steps of the transformation.
+
+        Used to give to the operations that split their work in blocks (like generate_mask or interpolate_nan) a
+        function to report their progress after every block.
+
+        Args:
+            step: Step of the transformation (starting from 0).
+            number_of_steps: Number of steps of the transformation.
+
+        Returns: Function that receives the progress (between 0 and 1) of the step.
+        """
+        return lambda progress: self.report_progress(progress, step, number_of_steps)
+
+    def report_progress(self, progress: float, step: int = 0, number_of_steps: int = 1) -> None:
+        """
+        Report the progress of the transformation to the job that is applying it.
+
+        The job raises a TransformationJobError if it was cancelled, so this method must be called regularly in the
+        method apply to allow the cancellation of the transformation. Does nothing if the transformation is not being
+        applied by a job.
+
+        If the transformation is divided in steps, the progress is the progress of the step being executed, and every
+        step counts as the same part of the whole transformation.
+
+        Args:
+            progress: Number between 0 and 1 with the progress of the transformation (or of the step).
+            step: Step of the transformation being executed (starting from 0).
+            number_of_steps: Number of steps of the transformation.
+
+        Returns: None
+        """
+        if self.__job is not None:
+            self.__job.set_progress((step + progress) / number_of_steps)
+
+
+class TransformationJob:
+    """
+    Class that applies a transformation (or a map transformation, or an interpolation) over the vertices of a model,
+    allowing the transformation to report its progress and to be cancelled from other threads.
+
+    The transformations modify the vertices of the model directly, so a copy of the heights of the region of the model
+    that the transformation can modify is made before applying the transformation. The heights are restored if the
+    job is cancelled, and are stored compressed in a HeightDelta (used to undo the transformation) if the job finish.
+    The vertices of the model in the GPU are not modified by the job, the scene update them (all at once) when the job
+    finish.
+
+    The transformations check if the job was cancelled every time that they report their progress, raising a
+    TransformationJobError that stops the transformation.
+    """
+
+    def __init__(self,
+                 transformation: Union['Transformation', 'MapTransformation', 'Interpolation'],
+                 model_vertices: np.ndarray):
+        """
+        Constructor of the class.
+
+        Args:
+            transformation: Transformation (or map transformation, or interpolation) to apply. Must be initialized.
+            model_vertices: Vertices of the model modified by the transformation. Array with shape (x, y, 3).
+        """
+        self.__transformation = transformation
+        self.__model_vertices = model_vertices
+
+        self.__lock = Lock()
+        self.__progress = 0.0
+        self.__cancelled = False
+        self.__finished = False
+        self.__error: Union[BaseException, None] = None
+        self.__height_delta: Union[HeightDelta, None] = None
+
+    def cancel(self) -> None:
+        """
+        Cancel the job.
+
+        The transformation stops the next time that it reports its progress. If the job did not start, then the
+        transformation is not applied.
+
+        Returns: None
+        """
+        with self.__lock:
+            self.__cancelled = True
+
+    def get_error(self) -> Union[BaseException, None]:
+        """
+        Get the error raised by the transformation.
+
+        Returns: Error raised by the transformation. None if the transformation did not raise an error or if it was
+                 cancelled.
+        """
+        with self.__lock:
+            return self.__error
+
+    def get_height_delta(self) -> Union[HeightDelta, None]:
+        """
+        Get the heights that the region modified by the transformation had before applying the transformation.
+
+        Returns: HeightDelta with the heights. None if the transformation was not applied.
+        """
+        return self.__height_delta
+
+    def get_progress(self) -> float:
+        """
+        Get the progress of the transformation.
+
+        Returns: Number between 0 and 1 with the progress.
+        """
+        with self.__lock:
+            return self.__progress
+
+    def get_transformation(self) -> Union['Transformation', 'MapTransformation', 'Interpolation']:
+        """
+        Get the transformation applied by the job.
+
+        Returns: Transformation.
+        """
+        return self.__transformation
+
+    def is_cancelled(self) -> bool:
+        """
+        Check if the job was cancelled.
+
+        Returns: Boolean indicating if the job was cancelled.
+        """
+        with self.__lock:
+            return self.__cancelled
+
+    def is_finished(self) -> bool:
+        """
+        Check if the transformation was applied completely.
+
+        Returns: Boolean indicating if the transformation was applied.
+        """
+        with self.__lock:
+            return self.__finished
+
+    def run(self) -> bool:
+        """
+        Apply the transformation over the vertices of the model.
+
+        This method is expected to be called from a thread different from the main thread. If the job is cancelled
+        while the transformation is running, the heights of the model are restored to the values that they had before
+        running the job.
+
+        The heights are also restored if the transformation raises an error. The error is stored in the job (to be
+        reported by the main thread) and raised again.
+
+        Returns: Boolean indicating if the transformation was applied.
+        """
+        if self.is_cancelled():
+            return False
+
+        region = get_region_indexes(self.__model_vertices, self.__transformation.get_modified_area())
+        min_row, max_row, min_col, max_col = region
+        previous_heights = self.__model_vertices[min_row:max_row, min_col:max_col, 2].copy()
+
+        self.__transformation.job = self
+        try:
+            self.__transformation.apply()
+
+        except TransformationJobError as e:
+            self.__model_vertices[min_row:max_row, min_col:max_col, 2] = previous_heights
+            if e.code != 0:
+                with self.__lock:
+                    self.__error = e
+                raise e
+
+            log.debug(f'Transformation cancelled, restoring the heights of the model '
+                      f'{self.__transformation.model_id}.')
+            return False
+
+        except BaseException as e:
+            log.debug(f'Error in the transformation, restoring the heights of the model '
+                      f'{self.__transformation.model_id}.')
+            self.__model_vertices[min_row:max_row, min_col:max_col, 2] = previous_heights
+            with self.__lock:
+                self.__error = e
+            raise e
+
+        finally:
+            self.__transformation.job = None
+
+        self.__height_delta = HeightDelta(self.__transformation.model_id,
+                                          self.__model_vertices.shape[:2],
+                                          region,
+                                          previous_heights)
+
+        with self.__lock:
+            self.__progress = 1.0
+            self.__finished = True
+        return True
+
+    def set_progress(self, progress: float) -> None:
+        """
+        Set the progress of the transformation.
+
+        Raise a TransformationJobError with code 0 if the job was cancelled.
+
+        Args:
+            progress: Number between 0 and 1 with the progress of the transformation.
+
+        Returns: None
+        """
+        with self.__lock:
+            self.__progress = min(max(float(progress), 0.0), 1.0)
+
+            if self.__cancelled:
+                # noinspection PyTypeChecker
+                raise TransformationJobError(0)
@@ -39,6 +39,35 @@ class Settings:
     # Extra reload proportion to use when reloading indices
     EXTRA_RELOAD_PROPORTION = 1.3
 
+    # Tiles used to render the maps in 2D
+    MAP_TILE_SIZE = 256  # Number of cells in each side of the tiles
+    MAP_TILES_GPU_MEMORY_BUDGET = 256 * 1024 * 1024  # Bytes that the tiles of each map can use in the GPU
+    MAP_TILES_USE_TRIANGLE_STRIPS = False  # Use triangle strips instead of list of triangles in the tiles
+    MAP_TILES_REFRESH_DELAY = 0.25  # Seconds that the view must be still before loading the tiles needed
+    MAP_TILES_UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024  # Bytes of the vertices of the maps sent to the GPU every frame
+
+    # Chunks used to render the maps in 3D
+    TERRAIN_CHUNK_SIZE = 64  # Number of cells in each side of the chunks
+    TERRAIN_MAX_SCREEN_ERROR = 2  # Max error (in pixels) allowed when selecting the level of detail of the chunks
+
+    # History of modifications of the heights of the maps (used to undo and redo them)
+    HEIGHT_HISTORY_MEMORY_BUDGET = 128 * 1024 * 1024  # Bytes of memory used before moving the history to files
+    HEIGHT_HISTORY_MAX_ENTRIES = 50  # Number of modifications that can be undone
+
+    # Transformations applied over all the polygons of a folder
+    BATCH_TRANSFORMATION_MIN_HEIGHT_PARAMETER = 'min_height'  # Parameter of the polygons with the new min height
+    BATCH_TRANSFORMATION_MAX_HEIGHT_PARAMETER = 'max_height'  # Parameter of the polygons with the new max height
+    BATCH_TRANSFORMATION_MAX_THREADS = 4  # Number of polygons transformed at the same time
+
+    # Threads used to execute the tasks in parallel to the render of the frames
+    THREAD_POOL_WORKERS = 4  # Number of tasks executed at the same time
+
+    # Processes used to execute the tasks that need more than one core
+    PROCESS_POOL_WORKERS = 4  # Number of processes created to execute the tasks
+
+    # Work executed in the main thread after the parallel tasks (like sending data to the GPU)
+    MAIN_THREAD_TIME_BUDGET = 0.008  # Seconds used every frame to execute the work
+
     # FRAME OPTIONS
     LEFT_FRAME_WIDTH = 315
     TOP_FRAME_HEIGHT = 0
@@ -57,6 +86,7 @@ class Settings:
     ACTIVE_POLYGON_LINE_WIDTH = POLYGON_LINE_WIDTH * 2
     DOT_SIZE = 1
     POLYGON_DOT_SIZE = 10
+    POLYGON_SIMPLIFICATION_TOLERANCE = 1  # Size (in pixels) of the details of the polygons that can be simplified
 
     # SCENE settings
     SCENE_BEGIN_X = LEFT_FRAME_WIDTH
@@ -68,6 +98,24 @@ class Settings:
     # GUI settings
     FIXED_FRAMES = True
 
+    # Render of the frames only when something changes
+    ON_DEMAND_RENDERING = True
+    ON_DEMAND_RENDERING_TIMEOUT = 0.1  # Max seconds waiting for events before updating the tasks again
+    ON_DEMAND_RENDERING_EXTRA_FRAMES = 3  # Frames rendered after every input or task finished
+
+    # Measure of the time used by the parts of the frames
+    FRAME_PROFILER_ENABLED = False
+    FRAME_PROFILER_HISTORY = 300  # Number of frames used to calculate the statistics and exported in the traces
+
+    # Records of the times of the jobs executed in the background (threads, processes and tasks)
+    TASK_TELEMETRY_ENABLED = False
+    TASK_TELEMETRY_HISTORY = 200  # Number of records stored
+    TASK_TELEMETRY_FILE = None  # JSONL file where the records are written when the jobs end, None to not write them
+
+    # Memory used by the models, showed in the debug frame
+    MEMORY_WARNING_MODEL = 2 * 1024 ** 3  # Bytes (CPU and GPU) that a model can use before showing a warning
+    MEMORY_WARNING_TOTAL = 8 * 1024 ** 3  # Bytes (CPU and GPU) that all the models can use before showing a warning
+
     # Type settings
     FLOAT_BYTES = 4  # float will be represented by 4 bytes.
 
@@ -26,15 +26,22 @@ in vec3 vertPos;
 // Color of the line
 uniform vec4 lines_color;
 
+layout (std140) uniform Camera
+{
+    mat4 projection_2d;
+    mat4 projection_3d;
+    mat4 view;
+    vec4 viewport;  // x, y, width and height of the viewport in pixels
+};
+
 // Uniforms that store data for the dashed logic
-uniform vec2  u_resolution;
 uniform float u_dashSize;
 uniform float u_gapSize;
 
 void main()
 {
     // Calcualte the direction and the distance of the line to be drawed
-    vec2  dir  = (vertPos.xy-startPos.xy) * u_resolution/2.0;
+    vec2  dir  = (vertPos.xy-startPos.xy) * viewport.zw/2.0;
     float dist = length(dir);
 
     // Discard fragments to create the effect of the dashed line
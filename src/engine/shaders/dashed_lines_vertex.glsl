@@ -23,12 +23,18 @@ layout (location = 0) in vec3 position;
 flat out vec3 startPos;
 out vec3 vertPos;
 
-uniform mat4 projection;
+layout (std140) uniform Camera
+{
+    mat4 projection_2d;
+    mat4 projection_3d;
+    mat4 view;
+    vec4 viewport;  // x, y, width and height of the viewport in pixels
+};
 uniform float z_offset;
 
 void main()
 {
-    vec4 pos = projection * vec4(position.xy, position.z + z_offset, 1.0f);
+    vec4 pos = projection_2d * vec4(position.xy, position.z + z_offset, 1.0f);
     vertPos     = pos.xyz / pos.w;
     startPos    = vertPos;
     gl_Position = pos;
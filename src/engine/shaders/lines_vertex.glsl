@@ -20,9 +20,15 @@
 
 layout (location = 0) in vec3 position;
 
-uniform mat4 projection;
+layout (std140) uniform Camera
+{
+    mat4 projection_2d;
+    mat4 projection_3d;
+    mat4 view;
+    vec4 viewport;  // x, y, width and height of the viewport in pixels
+};
 
 void main()
 {
-    gl_Position = projection * vec4(position.xy, position.z, 1.0f);
+    gl_Position = projection_2d * vec4(position.xy, position.z, 1.0f);
 }
\ No newline at end of file
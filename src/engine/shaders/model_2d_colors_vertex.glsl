@@ -20,7 +20,13 @@
 
 layout (location = 0) in vec3 position;
 
-uniform mat4 projection;
+layout (std140) uniform Camera
+{
+    mat4 projection_2d;
+    mat4 projection_3d;
+    mat4 view;
+    vec4 viewport;  // x, y, width and height of the viewport in pixels
+};
 
 out float height_value;
 
@@ -30,5 +36,5 @@ void main()
 
     // OpenGL need the coordinated to be between (-1, 1). The projection matrix is the one in charge of converting the
     // coordinates of the points to the range (-1, 1) and to keep the aspect ratio of the viewport used.
-    gl_Position = projection * vec4(position, 1.0f);
+    gl_Position = projection_2d * vec4(position, 1.0f);
 }
\ No newline at end of file
@@ -0,0 +1,40 @@
+/*
+* BEGIN GPL LICENSE BLOCK
+*
+*     This program is free software: you can redistribute it and/or modify
+*     it under the terms of the GNU General Public License as published by
+*     the Free Software Foundation, either version 3 of the License, or
+*     (at your option) any later version.
+*
+*     This program is distributed in the hope that it will be useful,
+*     but WITHOUT ANY WARRANTY; without even the implied warranty of
+*     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+*     GNU General Public License for more details.
+*
+*     You should have received a copy of the GNU General Public License
+*     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+*
+* END GPL LICENSE BLOCK
+*/
+#version 330 core
+
+layout (location = 0) in vec2 position;
+layout (location = 1) in vec2 texture_coordinates;
+
+layout (std140) uniform Camera
+{
+    mat4 projection_2d;
+    mat4 projection_3d;
+    mat4 view;
+    vec4 viewport;  // x, y, width and height of the viewport in pixels
+};
+
+out vec2 height_texture_coordinates;
+
+void main()
+{
+    height_texture_coordinates = texture_coordinates;
+
+    // The quad covers the whole map, the projection matrix is the same used by the mesh of the map.
+    gl_Position = projection_2d * vec4(position, 0.0f, 1.0f);
+}
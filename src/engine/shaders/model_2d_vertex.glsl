@@ -23,7 +23,13 @@ layout (location = 1) in float height;
 
 uniform float max_height;
 uniform float min_height;
-uniform mat4 projection;
+layout (std140) uniform Camera
+{
+    mat4 projection_2d;
+    mat4 projection_3d;
+    mat4 view;
+    vec4 viewport;  // x, y, width and height of the viewport in pixels
+};
 
 out float height_value;
 out float max_height_value;
@@ -35,5 +41,5 @@ void main()
     max_height_value = max_height;
     min_height_value = min_height;
 
-    gl_Position = projection * vec4(position, 1.0f);
+    gl_Position = projection_2d * vec4(position, 1.0f);
 }
\ No newline at end of file
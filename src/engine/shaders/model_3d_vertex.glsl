@@ -21,14 +21,20 @@
 layout (location = 0) in vec3 position;
 layout (location = 1) in float height;
 
-uniform mat4 projection;
-uniform mat4 view;
+layout (std140) uniform Camera
+{
+    mat4 projection_2d;
+    mat4 projection_3d;
+    mat4 view;
+    vec4 viewport;  // x, y, width and height of the viewport in pixels
+};
 uniform mat4 model;
+uniform float height_scale;
 
 out float height_value;
 
 void main()
 {
-    gl_Position = projection * view * model * vec4(position, 1);
+    gl_Position = projection_3d * view * model * vec4(position.xy, position.z * height_scale, 1);
     height_value = height;
 }
\ No newline at end of file
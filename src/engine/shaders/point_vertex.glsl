@@ -19,14 +19,36 @@
 #version 330 core
 
 layout (location = 0) in vec3 position;
-layout (location = 1) in vec4 color;
 
-uniform mat4 projection;
+layout (std140) uniform Camera
+{
+    mat4 projection_2d;
+    mat4 projection_3d;
+    mat4 view;
+    vec4 viewport;  // x, y, width and height of the viewport in pixels
+};
+
+// Colors of the points, the first and the last points of the model use their own colors
+uniform vec4 first_point_color;
+uniform vec4 normal_color;
+uniform vec4 last_point_color;
+uniform int number_of_points;
 
 out vec4 point_color;
 
 void main()
 {
-    point_color = color;
-    gl_Position = projection * vec4(position.xy, position.z, 1.0f);
+    if (gl_VertexID == 0)
+    {
+        point_color = first_point_color;
+    }
+    else if (gl_VertexID == number_of_points - 1)
+    {
+        point_color = last_point_color;
+    }
+    else
+    {
+        point_color = normal_color;
+    }
+    gl_Position = projection_2d * vec4(position.xy, position.z, 1.0f);
 }
\ No newline at end of file
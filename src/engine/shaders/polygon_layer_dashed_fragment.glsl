@@ -0,0 +1,52 @@
+/*
+* BEGIN GPL LICENSE BLOCK
+*
+*     This program is free software: you can redistribute it and/or modify
+*     it under the terms of the GNU General Public License as published by
+*     the Free Software Foundation, either version 3 of the License, or
+*     (at your option) any later version.
+*
+*     This program is distributed in the hope that it will be useful,
+*     but WITHOUT ANY WARRANTY; without even the implied warranty of
+*     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+*     GNU General Public License for more details.
+*
+*     You should have received a copy of the GNU General Public License
+*     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+*
+* END GPL LICENSE BLOCK
+*/
+#version 330 core
+
+out vec4 outColor;
+
+in vec4 vertex_color;
+flat in vec3 startPos;
+in vec3 vertPos;
+
+layout (std140) uniform Camera
+{
+    mat4 projection_2d;
+    mat4 projection_3d;
+    mat4 view;
+    vec4 viewport;  // x, y, width and height of the viewport in pixels
+};
+
+// Uniforms that store data for the dashed logic
+uniform float u_dashSize;
+uniform float u_gapSize;
+uniform float transparency;
+
+void main()
+{
+    // Calculate the direction and the distance of the line to be drawn
+    vec2  dir  = (vertPos.xy-startPos.xy) * viewport.zw/2.0;
+    float dist = length(dir);
+
+    // Discard fragments to create the effect of the dashed line
+    if (fract(dist / (u_dashSize + u_gapSize)) > u_dashSize/(u_dashSize + u_gapSize)){
+        discard;
+    }
+
+    outColor = vec4(vertex_color.rgb, transparency);
+}
\ No newline at end of file
@@ -0,0 +1,75 @@
+/*
+* BEGIN GPL LICENSE BLOCK
+*
+*     This program is free software: you can redistribute it and/or modify
+*     it under the terms of the GNU General Public License as published by
+*     the Free Software Foundation, either version 3 of the License, or
+*     (at your option) any later version.
+*
+*     This program is distributed in the hope that it will be useful,
+*     but WITHOUT ANY WARRANTY; without even the implied warranty of
+*     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+*     GNU General Public License for more details.
+*
+*     You should have received a copy of the GNU General Public License
+*     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+*
+* END GPL LICENSE BLOCK
+*/
+#version 330 core
+
+layout (location = 0) in vec3 position;
+layout (location = 1) in vec2 polygon_vertex;  // index of the polygon and role of the vertex (0 first, 1 normal, 2 last)
+
+layout (std140) uniform Camera
+{
+    mat4 projection_2d;
+    mat4 projection_3d;
+    mat4 view;
+    vec4 viewport;  // x, y, width and height of the viewport in pixels
+};
+
+// Data of the polygons, 5 texels for each polygon: color of the lines, color of the first, normal and last points and
+// the state of the polygon (active flag, depth).
+uniform samplerBuffer polygon_data;
+
+// Element of the polygons to draw: 0 lines, 1 borders of the active polygon, 2 points
+uniform int element;
+uniform vec4 border_color;
+
+out vec4 vertex_color;
+flat out vec3 startPos;
+out vec3 vertPos;
+
+void main()
+{
+    int polygon_texel = int(polygon_vertex.x + 0.5) * 5;
+    vec4 polygon_state = texelFetch(polygon_data, polygon_texel + 4);
+
+    // The depth of the vertex depends on the draw priority of the polygon
+    vec4 pos = projection_2d * vec4(position.xy, position.z, 1.0f);
+    pos.z = polygon_state.y * pos.w;
+
+    if (element == 0)
+    {
+        vertex_color = texelFetch(polygon_data, polygon_texel);
+    }
+    else if (element == 1)
+    {
+        vertex_color = border_color;
+
+        // Move the vertices of the inactive polygons out of the screen so their borders are clipped
+        if (polygon_state.x < 0.5)
+        {
+            pos = vec4(2.0f, 2.0f, 2.0f, 1.0f);
+        }
+    }
+    else
+    {
+        vertex_color = texelFetch(polygon_data, polygon_texel + 1 + int(polygon_vertex.y + 0.5));
+    }
+
+    vertPos     = pos.xyz / pos.w;
+    startPos    = vertPos;
+    gl_Position = pos;
+}
\ No newline at end of file
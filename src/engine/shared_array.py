@@ -0,0 +1,149 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+File with the class SharedArray, class used to share numpy arrays between the main process and the processes created
+by the ProcessManager without copying them.
+"""
+from multiprocessing import shared_memory
+from typing import Tuple, Union
+
+import numpy as np
+
+from src.utils import get_logger
+
+log = get_logger(module='SHARED_ARRAY')
+
+
+class SharedArray:
+    """
+    Class that stores a numpy array in a block of shared memory.
+
+    The array can be used as an argument of the tasks executed by the ProcessManager. Only the name of the block, the
+    shape and the type of the array are copied to the other process, and the other process maps the same block of
+    memory, so the changes made to the array in the other process are seen by the main process without copying the
+    data.
+
+    The process that creates the array owns the block of memory, and must release it calling the method release when
+    the array is not needed anymore.
+    """
+
+    def __init__(self, shape: Tuple[int, ...], dtype=np.float32, name: Union[str, None] = None):
+        """
+        Constructor of the class.
+
+        Args:
+            shape: Shape of the array.
+            dtype: Type of the elements of the array.
+            name: Name of an existent block of shared memory to use. None to create a new block.
+        """
+        self.__shape = tuple(int(size) for size in shape)
+        self.__dtype = np.dtype(dtype)
+        self.__owner = name is None
+
+        size = max(int(np.prod(self.__shape)) * self.__dtype.itemsize, 1)
+        self.__shared_memory = shared_memory.SharedMemory(name=name, create=self.__owner, size=size)
+        self.__array = np.ndarray(self.__shape, dtype=self.__dtype, buffer=self.__shared_memory.buf)
+
+    def __getstate__(self) -> dict:
+        """
+        Get the data copied to the other process when the array is pickled.
+
+        Returns: Dictionary with the name of the block of memory, the shape and the type of the array.
+        """
+        return {'name': self.__shared_memory.name, 'shape': self.__shape, 'dtype': self.__dtype.str}
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Map the block of memory of the array when the array is unpickled in the other process.
+
+        Args:
+            state: Dictionary returned by __getstate__.
+
+        Returns: None
+        """
+        self.__init__(state['shape'], state['dtype'], state['name'])
+
+    @staticmethod
+    def from_array(array: np.ndarray) -> 'SharedArray':
+        """
+        Create a new block of shared memory with a copy of the array.
+
+        Args:
+            array: Array to copy.
+
+        Returns: SharedArray with the values of the array.
+        """
+        array = np.asarray(array)
+        shared_array = SharedArray(array.shape, array.dtype)
+        shared_array.get_array()[...] = array
+        return shared_array
+
+    def get_array(self) -> np.ndarray:
+        """
+        Get the numpy array stored in the block of shared memory.
+
+        The array returned is a view of the block, so it must not be used after releasing the block.
+
+        Returns: Numpy array.
+        """
+        return self.__array
+
+    def get_name(self) -> str:
+        """
+        Get the name of the block of shared memory.
+
+        Returns: Name of the block.
+        """
+        return self.__shared_memory.name
+
+    def get_nbytes(self) -> int:
+        """
+        Get the number of bytes used by the array.
+
+        Returns: Number of bytes.
+        """
+        return self.__array.nbytes
+
+    def is_owner(self) -> bool:
+        """
+        Check if the array created the block of shared memory (and is thus in charge of releasing it).
+
+        Returns: Boolean indicating if the array owns the block.
+        """
+        return self.__owner
+
+    def release(self) -> None:
+        """
+        Close the block of shared memory, and delete it if the array owns the block.
+
+        If there are views of the array still being used, then the block is closed when the views are deleted.
+
+        Returns: None
+        """
+        self.__array = None
+        try:
+            self.__shared_memory.close()
+        except BufferError:
+            log.debug(f'Shared memory {self.__shared_memory.name} still in use, closing it when released.')
+
+        if self.__owner:
+            try:
+                self.__shared_memory.unlink()
+            except FileNotFoundError:
+                pass
+            self.__owner = False
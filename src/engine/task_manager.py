@@ -23,6 +23,9 @@ What are tasks?
     in another thread or process. To execute another thread check the ThreadManager class and for another process
     check the ProcessManager class.
 """
+from typing import Union
+
+from src.engine.task_telemetry import TaskTelemetry
 
 
 class TaskManager:
@@ -40,7 +43,15 @@ class TaskManager:
         """
         self.__pending_task_list = []
 
-    def set_task(self, task: callable, n_frames: int = 2) -> None:
+    def get_number_of_pending_tasks(self) -> int:
+        """
+        Get the number of tasks waiting for their frame to be executed.
+
+        Returns: Number of tasks.
+        """
+        return len(self.__pending_task_list)
+
+    def set_task(self, task: callable, n_frames: int = 2, kind: str = 'task', name: Union[str, None] = None) -> None:
         """
         Add a new task to the list of tasks to be executed.
 
@@ -49,6 +60,8 @@ class TaskManager:
         Args:
             task: Function with no arguments with the logic to execute.
             n_frames: Number of frames to wait for the execution of the function.
+            kind: Type of task used in the telemetry of the tasks.
+            name: Name used in the telemetry of the tasks. If not specified, the name of the function is used.
 
         Returns: None
         """
@@ -56,7 +69,8 @@ class TaskManager:
 
         self.__pending_task_list.append({
             'task': task,
-            'frames': n_frames  # need to be 2 to really wait one full frame
+            'frames': n_frames,  # need to be 2 to really wait one full frame
+            'telemetry': TaskTelemetry.create_record(kind, task, name)
         })
 
     def update_tasks(self) -> None:
@@ -78,7 +92,8 @@ class TaskManager:
 
             # Execute it if frames to wait is zero
             if task['frames'] == 0:
-                task['task']()
+                TaskTelemetry.run_task(task['telemetry'], task['task'], [])
+                TaskTelemetry.finish_record(task['telemetry'])
                 to_delete.append(task)
 
         # Delete tasks already executed
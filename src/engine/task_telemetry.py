@@ -0,0 +1,376 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+File with the class TaskTelemetry, static class used to record the times of the jobs executed by the engine in the
+background (threads, processes and tasks).
+
+For every job, a record is stored with the following keys:
+
+    - NAME: Name of the function executed.
+    - KIND: Type of job (thread, process, task or loading).
+    - STATUS: finished, cancelled or error.
+    - SUBMIT_TIME: Time (seconds since the epoch) when the job was added.
+    - START_TIME: Time when the job started.
+    - END_TIME: Time when the job ended.
+    - THEN_DURATION: Seconds used by the then function in the main thread (adding all its slices).
+    - RESULT_SIZE: Bytes of the value returned by the job (approximated for objects other than arrays).
+    - MEMORY_DELTA: Difference between the memory used by the process (RSS) after and before the job, in bytes.
+
+The times use the clock of the system so the jobs executed in other processes can be compared with the others.
+"""
+import json
+import os
+import sys
+import time
+from collections import deque
+from types import GeneratorType
+from typing import Any, Callable, Deque, List, Tuple, Union
+
+import numpy as np
+import psutil
+
+from src.engine.shared_array import SharedArray
+from src.utils import get_logger
+
+log = get_logger(module='TASK_TELEMETRY')
+
+# Process used to measure the memory, created by every process the first time that the memory is measured
+_process: Union[psutil.Process, None] = None
+
+
+def get_memory_usage() -> int:
+    """
+    Get the memory used by the process.
+
+    Returns: Bytes of the resident set size of the process.
+    """
+    global _process
+    if _process is None or _process.pid != os.getpid():
+        _process = psutil.Process(os.getpid())
+    return _process.memory_info().rss
+
+
+def get_result_size(result: Any) -> int:
+    """
+    Get the number of bytes used by the value returned by a job.
+
+    The size of arrays is the size of their data, the size of lists, tuples and dictionaries is the size of their
+    elements. The size of other objects is the size given by sys.getsizeof.
+
+    Args:
+        result: Value returned by the job.
+
+    Returns: Number of bytes.
+    """
+    if result is None:
+        return 0
+    if isinstance(result, np.ndarray):
+        return int(result.nbytes)
+    if isinstance(result, SharedArray):
+        return result.get_nbytes()
+    if isinstance(result, (list, tuple)):
+        return sum(get_result_size(element) for element in result)
+    if isinstance(result, dict):
+        return sum(get_result_size(element) for element in result.values())
+    return sys.getsizeof(result)
+
+
+def measure_task(function: Callable, *args) -> Tuple[Any, float, float, int]:
+    """
+    Execute the function measuring its times and the memory used.
+
+    Used to measure the jobs executed in other processes, where the records can not be modified. The function must be
+    public so it can be copied to the other process.
+
+    Args:
+        function: Function to execute.
+        *args: Arguments of the function.
+
+    Returns: Tuple with the value returned by the function, the time when it started, the time when it ended and the
+             difference of the memory used by the process.
+    """
+    start_memory = get_memory_usage()
+    start_time = time.time()
+    result = function(*args)
+    end_time = time.time()
+    return result, start_time, end_time, get_memory_usage() - start_memory
+
+
+class TaskTelemetry:
+    """
+    Static class that store the records of the last jobs executed in the background.
+
+    The records are created when the jobs are added and stored when their then function ends (or when they are
+    cancelled). If an output file is defined, the records are also written to the file in JSONL format (one record
+    per line).
+    """
+
+    __enabled: bool = False
+    __history_size: int = 200
+    __records: Deque[dict] = deque(maxlen=200)
+    __output_file: Union[str, None] = None
+
+    @staticmethod
+    def __get_name(function: Callable) -> str:
+        """
+        Get the name used in the records for the function.
+
+        Args:
+            function: Function executed by the job.
+
+        Returns: Qualified name of the function.
+        """
+        return getattr(function, '__qualname__', None) or repr(function)
+
+    @staticmethod
+    def __run_then_slices(record: dict, generator: GeneratorType):
+        """
+        Execute the slices of the generator returned by a then function, adding the time of every slice to the record.
+
+        The record is stored when the generator is exhausted.
+
+        Args:
+            record: Record of the job.
+            generator: Generator returned by the then function.
+
+        Returns: Generator that yields after every slice.
+        """
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    next(generator)
+                except StopIteration:
+                    return
+                finally:
+                    record['THEN_DURATION'] += time.perf_counter() - start
+                yield
+        finally:
+            TaskTelemetry.finish_record(record)
+
+    @staticmethod
+    def clear() -> None:
+        """
+        Delete the records stored.
+
+        Returns: None
+        """
+        TaskTelemetry.__records = deque(maxlen=TaskTelemetry.__history_size)
+
+    @staticmethod
+    def create_record(kind: str, function: Callable, name: Union[str, None] = None) -> Union[dict, None]:
+        """
+        Create the record of a job that was just added.
+
+        Args:
+            kind: Type of job.
+            function: Function executed by the job.
+            name: Name of the job. If not specified, the name of the function is used.
+
+        Returns: Record of the job, None if the telemetry is disabled.
+        """
+        if not TaskTelemetry.__enabled:
+            return None
+
+        return {
+            'NAME': name if name is not None else TaskTelemetry.__get_name(function),
+            'KIND': kind,
+            'STATUS': 'finished',
+            'SUBMIT_TIME': time.time(),
+            'START_TIME': None,
+            'END_TIME': None,
+            'THEN_DURATION': 0.0,
+            'RESULT_SIZE': 0,
+            'MEMORY_DELTA': 0
+        }
+
+    @staticmethod
+    def export_jsonl(filename: str) -> int:
+        """
+        Write the records stored to a file, one record per line in JSON format.
+
+        Args:
+            filename: Name of the file to create.
+
+        Returns: Number of records exported.
+        """
+        records = list(TaskTelemetry.__records)
+        with open(filename, 'w') as file:
+            for record in records:
+                file.write(json.dumps(record) + '\n')
+
+        log.debug(f'Exported {len(records)} records to {filename}')
+        return len(records)
+
+    @staticmethod
+    def finish_record(record: Union[dict, None], status: Union[str, None] = None) -> None:
+        """
+        Store the record of a job that ended.
+
+        Args:
+            record: Record of the job. Nothing is done if None.
+            status: Status of the job. None to keep the status of the record.
+
+        Returns: None
+        """
+        if record is None:
+            return
+
+        if status is not None:
+            record['STATUS'] = status
+
+        TaskTelemetry.__records.append(record)
+
+        if TaskTelemetry.__output_file is not None:
+            try:
+                with open(TaskTelemetry.__output_file, 'a') as file:
+                    file.write(json.dumps(record) + '\n')
+            except OSError as e:
+                log.error(f'Could not write the record to {TaskTelemetry.__output_file}: {e}')
+                TaskTelemetry.__output_file = None
+
+    @staticmethod
+    def get_records() -> List[dict]:
+        """
+        Get the records stored, from the oldest to the newest.
+
+        Returns: List with the records.
+        """
+        return list(TaskTelemetry.__records)
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """
+        Check if the records of the jobs are being created.
+
+        Returns: Boolean indicating if the telemetry is enabled.
+        """
+        return TaskTelemetry.__enabled
+
+    @staticmethod
+    def run_task(record: Union[dict, None], function: Callable, args: list) -> Any:
+        """
+        Execute the function of the job, storing its times, the size of its result and the memory used in the record.
+
+        If the function raises an exception, then the status of the record is changed to error and the exception is
+        raised again.
+
+        Args:
+            record: Record of the job. If None, the function is executed without measuring it.
+            function: Function of the job.
+            args: Arguments of the function.
+
+        Returns: Value returned by the function.
+        """
+        if record is None:
+            return function(*args)
+
+        start_memory = get_memory_usage()
+        record['START_TIME'] = time.time()
+        try:
+            result = function(*args)
+        except Exception:
+            record['STATUS'] = 'error'
+            raise
+        finally:
+            record['END_TIME'] = time.time()
+            record['MEMORY_DELTA'] = get_memory_usage() - start_memory
+
+        record['RESULT_SIZE'] = get_result_size(result)
+        return result
+
+    @staticmethod
+    def run_then(record: Union[dict, None], function: Callable, args: list) -> Any:
+        """
+        Execute the then function of the job, storing the time used in the record.
+
+        If the then function returns a generator, then a generator that measures every slice is returned and the record
+        is stored when the generator is exhausted. Otherwise, the record is stored when the function ends.
+
+        Args:
+            record: Record of the job. If None, the function is executed without measuring it.
+            function: Then function of the job.
+            args: Arguments of the function.
+
+        Returns: Value returned by the function.
+        """
+        if record is None:
+            return function(*args)
+
+        start = time.perf_counter()
+        try:
+            result = function(*args)
+        except Exception:
+            record['STATUS'] = 'error'
+            record['THEN_DURATION'] += time.perf_counter() - start
+            TaskTelemetry.finish_record(record)
+            raise
+        record['THEN_DURATION'] += time.perf_counter() - start
+
+        if isinstance(result, GeneratorType):
+            return TaskTelemetry.__run_then_slices(record, result)
+
+        TaskTelemetry.finish_record(record)
+        return result
+
+    @staticmethod
+    def set_enabled(enabled: bool, history_size: Union[int, None] = None) -> None:
+        """
+        Enable or disable the creation of records.
+
+        Args:
+            enabled: If create records for the new jobs or not.
+            history_size: Number of records to store. None to keep the actual number.
+
+        Returns: None
+        """
+        if history_size is not None and max(int(history_size), 1) != TaskTelemetry.__history_size:
+            TaskTelemetry.__history_size = max(int(history_size), 1)
+            TaskTelemetry.__records = deque(TaskTelemetry.__records, maxlen=TaskTelemetry.__history_size)
+        TaskTelemetry.__enabled = enabled
+
+    @staticmethod
+    def set_output_file(filename: Union[str, None]) -> None:
+        """
+        Set the file where the records are written when the jobs end.
+
+        Args:
+            filename: Name of the file. The records are added at the end of the file. None to not write the records.
+
+        Returns: None
+        """
+        TaskTelemetry.__output_file = filename
+
+    @staticmethod
+    def set_process_measures(record: Union[dict, None], measures: Tuple[Any, float, float, int]) -> Any:
+        """
+        Store in the record the measures of a job executed in another process with the function measure_task.
+
+        Args:
+            record: Record of the job. Nothing is stored if None.
+            measures: Tuple returned by the function measure_task.
+
+        Returns: Value returned by the function of the job.
+        """
+        result, start_time, end_time, memory_delta = measures
+        if record is not None:
+            record['START_TIME'] = start_time
+            record['END_TIME'] = end_time
+            record['MEMORY_DELTA'] = memory_delta
+            record['RESULT_SIZE'] = get_result_size(result)
+        return result
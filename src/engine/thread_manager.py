@@ -18,83 +18,247 @@
 """
 File with the class ThreadManager, class in charge of the management of the threads in the engine.
 
+The tasks are executed by a fixed number of worker threads, the tasks waiting for a free worker are executed in order
+of priority (and in the order in which they were added if they have the same priority).
+
 Threads must be update regularly so the function programmed as then should be called. Otherwise, even if the logic
-programmed in the thread ends, the then function will not be called.
+programmed in the thread ends, the then function will not be called. If the manager uses a MainThreadScheduler, then
+the then functions are given to the scheduler, that execute them without exceeding the time budget of the frames.
 """
-from threading import Thread
+from collections import deque
+from itertools import count
+from queue import PriorityQueue
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, Hashable, List, Union
+
+from src.engine.cancellation_token import CancellationToken
+from src.engine.main_thread_scheduler import MainThreadScheduler, complete_work
+from src.engine.task_telemetry import TaskTelemetry
+from src.engine.thread_task_priority import ThreadTaskPriority
+from src.utils import get_logger
+
+log = get_logger(module='THREAD_MANAGER')
 
 
 class ThreadManager:
     """
     Class in charge of the management of the threads on the program.
+
+    The tasks can be associated to a key. When a new task is added with the same key of a task that did not finish,
+    the old task is cancelled, so only the result of the last task is used.
     """
 
-    def __init__(self):
+    def __init__(self,
+                 max_workers: int = 4,
+                 scheduler: Union[MainThreadScheduler, None] = None,
+                 on_task_finished: Union[Callable[[], None], None] = None):
         """
         Constructor of the class.
+
+        The worker threads are created when the tasks are added, until the maximum number of workers is reached.
+
+        Args:
+            max_workers: Maximum number of threads used to execute the tasks.
+            scheduler: Scheduler used to execute the then functions. None to execute them when updating the threads.
+            on_task_finished: Function called from the worker threads every time that a task ends. Used to wake up
+                              the main thread if it is waiting for events.
         """
-        self.__threads_list = []
+        self.__max_workers = max(int(max_workers), 1)
+        self.__scheduler = scheduler
+        self.__on_task_finished = on_task_finished
+        self.__workers: List[Thread] = []
+
+        self.__task_queue = PriorityQueue()
+        self.__task_counter = count()
 
-    def update_threads(self):
+        # Tasks that ended and whose then function was not called yet
+        self.__finished_lock = Lock()
+        self.__finished_tasks = deque()
+
+        # Last task added with every key
+        self.__tasks_by_key: Dict[Hashable, dict] = {}
+
+    @staticmethod
+    def __run_then(task: dict) -> Any:
         """
-        Method that update the finished threads and calls the then_task associated to the threads.
+        Execute the then function of the task if the task was not cancelled.
+
+        Args:
+            task: Task with the then function to execute.
+
+        Returns: The value returned by the then function.
+        """
+        if task['token'].is_cancelled():
+            TaskTelemetry.finish_record(task['telemetry'], 'cancelled')
+            return None
+
+        # Check if the return object is None or not to give it to the then task
+        if task['return_value'] is not None:
+            return TaskTelemetry.run_then(task['telemetry'],
+                                          task['then_func'],
+                                          [task['return_value'], *task['then_args']])
+        else:
+            return TaskTelemetry.run_then(task['telemetry'], task['then_func'], task['then_args'])
+
+    def __start_worker(self) -> None:
+        """
+        Create and start a new worker thread if the maximum number of workers was not reached.
+
+        Returns: None
+        """
+        if len(self.__workers) >= self.__max_workers:
+            return
+
+        worker = Thread(target=self.__worker_routine, daemon=True, name=f'ThreadManager worker {len(self.__workers)}')
+        worker.start()
+        self.__workers.append(worker)
+
+    def __worker_routine(self) -> None:
+        """
+        Routine executed by the worker threads.
+
+        The workers take the task with more priority from the queue and execute it, storing the returned value in the
+        task. The workers end when they take an empty task from the queue.
+
+        Returns: None
+        """
+        while True:
+            _, _, task = self.__task_queue.get()
+            if task is None:
+                return
+
+            if not task['token'].is_cancelled():
+                try:
+                    task['return_value'] = TaskTelemetry.run_task(task['telemetry'],
+                                                                  task['parallel_task'],
+                                                                  task['parallel_task_args'])
+                except Exception as e:
+                    log.exception(f'Exception raised in a parallel task: {e}')
 
-        If the threads ended their execution, then the then_function is called, if they did not end their execution,
-        then this method does nothing.
+            with self.__finished_lock:
+                self.__finished_tasks.append(task)
+
+            if self.__on_task_finished is not None:
+                self.__on_task_finished()
+
+    def get_max_workers(self) -> int:
+        """
+        Get the maximum number of threads used to execute the tasks.
+
+        Returns: Maximum number of threads.
         """
-        to_delete = []
-        for thread_pair in self.__threads_list:
-            if not thread_pair['thread'].is_alive():
-                to_delete.append(thread_pair)
+        return self.__max_workers
 
-                # Check if the return object is None or not to give it to the then task
-                if thread_pair['return_array'][0] is not None:
-                    thread_pair['then_func'](thread_pair['return_array'][0], *thread_pair['then_args'])
-                else:
-                    thread_pair['then_func'](*thread_pair['then_args'])
+    def get_number_of_pending_tasks(self) -> int:
+        """
+        Get the number of tasks waiting for a worker.
 
-        for thread_ended in to_delete:
-            self.__threads_list.remove(thread_ended)
+        Returns: Number of tasks.
+        """
+        return self.__task_queue.qsize()
 
-    def set_thread_task(self, parallel_task, then, parallel_task_args=None, then_task_args=None) -> None:
+    def set_thread_task(self,
+                        parallel_task,
+                        then,
+                        parallel_task_args=None,
+                        then_task_args=None,
+                        priority: ThreadTaskPriority = ThreadTaskPriority.interactive,
+                        key: Union[Hashable, None] = None,
+                        token: Union[CancellationToken, None] = None) -> CancellationToken:
         """
-        Add and start a new thread with the current task. At the end of the thread, the then
-        function is called.
+        Add a new task to execute in another thread. At the end of the task, the then function is called.
 
         If the parallel task return something other than none, then the return object is added
         as the first parameter of the then function when called.
 
+        If the token of the task is cancelled, then the task is not started (if it did not start yet) and the then
+        function is not called.
+
         Args:
             then_task_args: List of argument to use in the then task
             parallel_task_args: List of argument to use in the parallel task
             parallel_task: Task to be executed in parallel
             then: Task to be executed in the main thread after the parallel task
+            priority: Priority of the task.
+            key: Key of the task. The tasks added before with the same key are cancelled. None to not cancel tasks.
+            token: Token to use to cancel the task. A new token is created if not specified.
 
-        Returns: None
+        Returns: Token that can be used to cancel the task.
         """
-        # Create and start the thread
         if then_task_args is None:
             then_task_args = []
         if parallel_task_args is None:
             parallel_task_args = []
+        if token is None:
+            token = CancellationToken()
+
+        task = {
+            'parallel_task': parallel_task,
+            'parallel_task_args': parallel_task_args,
+            'then_func': then,
+            'then_args': then_task_args,
+            'return_value': None,
+            'token': token,
+            'key': key,
+            'telemetry': TaskTelemetry.create_record('thread', parallel_task)
+        }
+
+        # Cancel the task with the same key
+        # ---------------------------------
+        if key is not None:
+            if key in self.__tasks_by_key:
+                log.debug(f'Task {key} superseded by a new task.')
+                self.__tasks_by_key[key]['token'].cancel()
+            self.__tasks_by_key[key] = task
+
+        self.__task_queue.put((priority.value, next(self.__task_counter), task))
+        self.__start_worker()
+
+        return token
+
+    def shutdown(self) -> None:
+        """
+        Cancel the tasks waiting for a worker and stop the workers after they finish their current task.
+
+        Returns: None
+        """
+        self.__on_task_finished = None
+
+        with self.__task_queue.mutex:
+            for _, _, task in self.__task_queue.queue:
+                task['token'].cancel()
+
+        for _ in self.__workers:
+            self.__task_queue.put((-1, next(self.__task_counter), None))
+        self.__workers = []
+
+    def update_threads(self) -> int:
+        """
+        Method that update the finished threads and calls the then_task associated to the threads.
+
+        If the threads ended their execution, then the then_function is called (or given to the scheduler), if they
+        did not end their execution, then this method does nothing.
+
+        Returns: Number of then functions called (or given to the scheduler).
+        """
+        with self.__finished_lock:
+            finished_tasks = list(self.__finished_tasks)
+            self.__finished_tasks.clear()
+
+        then_functions = 0
+        for task in finished_tasks:
+            if task['key'] is not None and self.__tasks_by_key.get(task['key']) is task:
+                del self.__tasks_by_key[task['key']]
+
+            if task['token'].is_cancelled():
+                TaskTelemetry.finish_record(task['telemetry'], 'cancelled')
+                continue
+
+            then_functions += 1
+
+            if self.__scheduler is not None:
+                self.__scheduler.set_work(lambda finished_task=task: self.__run_then(finished_task))
+            else:
+                complete_work(self.__run_then(task))
 
-        # Define a mutable object where to store the return value of the parallel task.
-        return_value_list = [None]
-
-        # Define a external function to act as a decorator for the parallel task given.
-        # noinspection PyMissingOrEmptyDocstring,PyShadowingNames
-        def parallel_routine(return_value_list, parallel_task, arg_list):
-            return_value = parallel_task(*arg_list)
-            return_value_list[0] = return_value
-
-        # Create a thread with the external function.
-        thread = Thread(target=parallel_routine, args=(return_value_list, parallel_task, parallel_task_args))
-        thread.start()
-
-        # Add thread to the list
-        self.__threads_list.append(
-            {'thread': thread,
-             'return_array': return_value_list,
-             'then_func': then,
-             'then_args': then_task_args}
-        )
+        return then_functions
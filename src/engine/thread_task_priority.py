@@ -0,0 +1,30 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+Module that defines an Enum with the priorities of the tasks executed by the ThreadManager.
+"""
+from enum import Enum
+
+
+class ThreadTaskPriority(Enum):
+    """
+    Priorities of the tasks executed in other threads. Tasks with lower values are executed first.
+    """
+    interactive = 0  # Tasks that the user is waiting for, like the tiles showed on the screen
+    reload = 1  # Tasks that update data already showed, like the reload of the models
+    background = 2  # Tasks whose result is not needed immediately, like the optimization of the memory
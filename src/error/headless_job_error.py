@@ -0,0 +1,46 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+Module that defines the class HeadlessJobError, class to use when errors related to the jobs executed without the
+graphical interface occur.
+"""
+from src.error.base_error import BaseError
+
+
+class HeadlessJobError(BaseError):
+    """
+    Class to use when there is an error in a job executed without the graphical interface.
+    """
+
+    def __init__(self, code: int = 0, data=None):
+        """
+        Constructor of the class.
+        """
+        super().__init__(code, data)
+
+        self.codes = {
+            0: 'Default Error.',
+            1: 'The job file could not be read.',
+            2: 'The job file must define a list of steps.',
+            3: 'Operation not recognized.',
+            4: 'There are no files that match the inputs of the job.',
+            5: 'One of the steps of the job does not define a required value.',
+            6: 'The shapefile file could not be read.',
+            7: 'The package PyYAML is needed to read YAML job files.',
+            8: 'Group of polygons not found.'
+        }
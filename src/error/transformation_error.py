@@ -46,5 +46,7 @@ class TransformationError(BaseError):
             10: 'Model not specified.',
             11: 'Polygon not specified.',
             12: 'Model not found in program.',
-            13: 'Polygon not found in program.'
+            13: 'Polygon not found in program.',
+            14: 'There are no polygons to use in the transformation.',
+            15: 'One of the polygons does not have a numeric value in the parameters with the heights.'
         }
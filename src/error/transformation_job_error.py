@@ -0,0 +1,39 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+Module that defines the class TransformationJobError, class to use when errors related to the jobs used to apply the
+transformations in other threads occur.
+"""
+from src.error.base_error import BaseError
+
+
+class TransformationJobError(BaseError):
+    """
+    Class to use when there is an error in the job that applies a transformation.
+    """
+
+    def __init__(self, code: int = 0, data=None):
+        """
+        Constructor of the class.
+        """
+        super().__init__(code, data)
+
+        self.codes = {
+            0: 'The job was cancelled.',
+            1: 'There is already a job modifying the model.'
+        }
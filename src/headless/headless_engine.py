@@ -0,0 +1,178 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+File with the class HeadlessEngine, class that loads, modifies and exports the maps without creating a window.
+"""
+import shutil
+from pathlib import Path
+from typing import Dict, List, TYPE_CHECKING, Union
+
+from src.error.headless_job_error import HeadlessJobError
+from src.error.polygon_error import PolygonError
+from src.headless.headless_scene import HeadlessScene
+from src.input.NetCDF import read_info
+from src.input.shapefile_importer import ShapefileImporter
+from src.output.netcdf_exporter import NetcdfExporter
+from src.utils import get_logger
+
+if TYPE_CHECKING:
+    from src.engine.scene.interpolation.interpolation import Interpolation
+    from src.engine.scene.map_transformation.map_transformation import MapTransformation
+    from src.engine.scene.transformation.transformation import Transformation
+
+log = get_logger(module='HEADLESS_ENGINE')
+
+
+class HeadlessEngine:
+    """
+    Class that executes the operations of the engine that do not need OpenGL: loading maps from netcdf files, loading
+    polygons from shapefile files, applying transformations, interpolations and map transformations, and exporting
+    the maps to netcdf files.
+
+    The operations are executed synchronously, in the thread that calls the methods.
+    """
+
+    def __init__(self):
+        """
+        Constructor of the class.
+        """
+        self.scene = HeadlessScene()
+
+        self.__model_files: Dict[str, str] = {}
+        self.__polygon_groups: Dict[str, List[str]] = {}
+
+    def apply_interpolation(self, interpolation: 'Interpolation') -> None:
+        """
+        Initialize and apply an interpolation over the map.
+
+        Args:
+            interpolation: Interpolation to apply.
+
+        Returns: None
+        """
+        interpolation.initialize(self.scene)
+        interpolation.apply()
+
+    def apply_map_transformation(self, map_transformation: 'MapTransformation') -> None:
+        """
+        Initialize and apply a map transformation over the map.
+
+        Args:
+            map_transformation: Map transformation to apply.
+
+        Returns: None
+        """
+        map_transformation.initialize(self.scene)
+        map_transformation.apply()
+
+    def apply_transformation(self, transformation: 'Transformation') -> None:
+        """
+        Initialize and apply a transformation over the map.
+
+        Args:
+            transformation: Transformation to apply.
+
+        Returns: None
+        """
+        transformation.initialize(self.scene)
+        transformation.apply()
+
+    def create_model_from_file(self, path_model: str) -> str:
+        """
+        Create a new map using the data of a netcdf file.
+
+        Args:
+            path_model: Path to the netcdf file.
+
+        Returns: ID of the map.
+        """
+        x, y, z = read_info(path_model)
+        model_id = self.scene.create_model_from_data(x, y, z, Path(path_model).name)
+        self.__model_files[model_id] = path_model
+
+        return model_id
+
+    def create_polygons_from_file(self, filename: str, group: str = None) -> List[str]:
+        """
+        Create the polygons stored in a shapefile file.
+
+        The polygons that intersect themselves or have repeated points are not created.
+
+        Args:
+            filename: Name of the shapefile file.
+            group: Name of the group where to store the polygons. The name of the file (without extension) is used if
+                   not specified.
+
+        Returns: List with the ID of the polygons created.
+        """
+        polygons_point_list, polygons_param_list = ShapefileImporter().get_polygon_information(filename)
+        if polygons_point_list is None and polygons_param_list is None:
+            raise HeadlessJobError(6, {'filename': filename})
+
+        polygon_id_list = []
+        for polygon_points, params in zip(polygons_point_list, polygons_param_list):
+            try:
+                polygon_id_list.append(self.scene.create_new_polygon(polygon_points, params))
+            except PolygonError as e:
+                log.warning(f'Polygon of the file {filename} not loaded: {e.get_code_message()}')
+
+        group = group if group is not None else Path(filename).stem
+        self.__polygon_groups.setdefault(group, []).extend(polygon_id_list)
+
+        return polygon_id_list
+
+    def export_model_as_netcdf(self, model_id: str, directory_file: str) -> str:
+        """
+        Save the heights of a map in a netcdf file.
+
+        The file used to load the map is copied and the heights stored in the copy are changed, keeping the variables
+        and the metadata of the original file.
+
+        Args:
+            model_id: ID of the map to export.
+            directory_file: Directory and filename to use to store the file.
+
+        Returns: Name of the file created.
+        """
+        if directory_file[-3:] != '.nc':
+            directory_file += '.nc'
+
+        Path(directory_file).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(self.__model_files[model_id], directory_file)
+
+        vertices = self.scene.get_map2d_model_vertices_array(model_id)
+        NetcdfExporter().modify_heights_existent_netcdf_file(vertices[:, :, 2], directory_file)
+
+        return directory_file
+
+    def get_polygon_group(self, group: Union[str, None]) -> List[str]:
+        """
+        Get the ID of the polygons of a group.
+
+        Args:
+            group: Name of the group. None to get all the polygons.
+
+        Returns: List with the ID of the polygons.
+        """
+        if group is None:
+            return self.scene.get_polygon_id_list()
+
+        if group not in self.__polygon_groups:
+            raise HeadlessJobError(8, {'group': group})
+
+        return list(self.__polygon_groups[group])
@@ -0,0 +1,483 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+File with the class HeadlessJob, class that applies a list of steps (defined in a job file) over many maps without
+creating a window.
+
+The job files are JSON (or YAML, if the package PyYAML is installed) files with the following format:
+
+    {
+        "inputs": ["maps/*.nc"],
+        "output_directory": "output",
+        "processes": 4,
+        "steps": [
+            {"operation": "load_polygons", "file": "polygons/lakes.shp", "group": "lakes"},
+            {"operation": "linear_transformation", "group": "lakes",
+             "min_height_parameter": "min_height", "max_height_parameter": "max_height"},
+            {"operation": "interpolation", "type": "smooth", "distance": 0.5},
+            {"operation": "export", "suffix": "_modified"}
+        ]
+    }
+
+The relative paths are relative to the directory of the job file. Every map that matches the inputs is loaded and
+modified independently, using one process of the computer per map.
+"""
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, List
+
+from src.engine.scene.filter.filter import Filter
+from src.engine.scene.filter.height_greater_than import HeightGreaterThan
+from src.engine.scene.filter.height_less_than import HeightLessThan
+from src.engine.scene.interpolation.cubic_interpolation import CubicInterpolation
+from src.engine.scene.interpolation.linear_interpolation import LinearInterpolation
+from src.engine.scene.interpolation.nearest_interpolation import NearestInterpolation
+from src.engine.scene.interpolation.smooth_interpolation import SmoothInterpolation
+from src.engine.scene.map_transformation.fill_nan_map_transformation import FillNanMapTransformation
+from src.engine.scene.map_transformation.interpolate_nan_map_transformation import \
+    InterpolateNanMapTransformation, InterpolateNanMapTransformationType
+from src.engine.scene.map_transformation.nan_convolution import NanConvolutionMapTransformation
+from src.engine.scene.transformation.fill_nan_batch_transformation import FillNanBatchTransformation
+from src.engine.scene.transformation.linear_batch_transformation import LinearBatchTransformation
+from src.engine.scene.transformation.linear_transformation import LinearTransformation
+from src.error.base_error import BaseError
+from src.error.headless_job_error import HeadlessJobError
+from src.headless.headless_engine import HeadlessEngine
+from src.utils import get_logger, json_to_dict
+
+log = get_logger(module='HEADLESS_JOB')
+
+INTERPOLATIONS = {
+    'linear': LinearInterpolation,
+    'cubic': CubicInterpolation,
+    'nearest': NearestInterpolation,
+    'smooth': SmoothInterpolation
+}
+
+OPERATIONS = ['load_polygons', 'linear_transformation', 'fill_nan', 'interpolation', 'fill_nan_map',
+              'interpolate_nan_map', 'nan_convolution', 'export']
+
+FILTERS = {
+    'height_greater_than': HeightGreaterThan,
+    'height_less_than': HeightLessThan
+}
+
+
+class HeadlessJob:
+    """
+    Class that stores the steps of a job and applies them over the maps that match the inputs of the job.
+
+    The operations that can be used in the steps are:
+        - load_polygons: Load the polygons of a shapefile file. Values: file, group (optional).
+        - linear_transformation: Change linearly the heights inside the polygons of a group. Values: group (optional),
+          min_height and max_height, or min_height_parameter and max_height_parameter to read the heights from the
+          parameters of every polygon, filters (optional).
+        - fill_nan: Change to nan the heights inside the polygons of a group. Values: group (optional), filters
+          (optional).
+        - interpolation: Interpolate the heights around the polygons of a group. Values: type (linear, cubic,
+          nearest or smooth), distance, group (optional).
+        - fill_nan_map: Change to nan the heights outside all the polygons.
+        - interpolate_nan_map: Interpolate the nan values of the map. Values: type (linear, cubic or nearest).
+        - nan_convolution: Convert to nan the points surrounded by nan. Values: radius, nan_limit.
+        - export: Export the map to a netcdf file. Values: directory (optional), suffix (optional).
+
+    The filters are a list of dictionaries with a type (height_greater_than or height_less_than) and a value.
+    """
+
+    def __init__(self, job_data: dict, base_directory: str = '.'):
+        """
+        Constructor of the class.
+
+        Args:
+            job_data: Dictionary with the data of the job.
+            base_directory: Directory to use to resolve the relative paths of the job.
+        """
+        self.__job_data = job_data
+        self.__base_directory = base_directory
+
+        steps = job_data.get('steps')
+        if not isinstance(steps, list) or len(steps) == 0:
+            raise HeadlessJobError(2)
+
+        for step in steps:
+            if not isinstance(step, dict) or step.get('operation') not in OPERATIONS:
+                raise HeadlessJobError(3, {'step': step})
+
+    def __get_filter_list(self, step: dict) -> List[Filter]:
+        """
+        Create the filters defined in a step.
+
+        Args:
+            step: Dictionary with the values of the step.
+
+        Returns: List with the filters.
+        """
+        filter_list = []
+        for filter_data in step.get('filters', []):
+            if filter_data.get('type') not in FILTERS:
+                raise HeadlessJobError(3, {'filter': filter_data})
+            filter_list.append(FILTERS[filter_data['type']](float(self.__get_value(filter_data, 'value'))))
+
+        return filter_list
+
+    def __get_operation(self, operation: str) -> Callable[[HeadlessEngine, str, str, dict], List[str]]:
+        """
+        Get the method that applies an operation.
+
+        The methods are not stored in the object since the jobs are copied to other processes, and the private
+        methods can not be copied.
+
+        Args:
+            operation: Name of the operation.
+
+        Returns: Method that receives the engine, the ID of the map, the file of the map and the values of the step,
+                 and returns a list with the files created.
+        """
+        return {
+            'load_polygons': self.__step_load_polygons,
+            'linear_transformation': self.__step_linear_transformation,
+            'fill_nan': self.__step_fill_nan,
+            'interpolation': self.__step_interpolation,
+            'fill_nan_map': self.__step_fill_nan_map,
+            'interpolate_nan_map': self.__step_interpolate_nan_map,
+            'nan_convolution': self.__step_nan_convolution,
+            'export': self.__step_export
+        }[operation]
+
+    def __get_path(self, path: str) -> str:
+        """
+        Get a path relative to the directory of the job.
+
+        Args:
+            path: Path to resolve. Absolute paths are not modified.
+
+        Returns: Path.
+        """
+        return str(Path(self.__base_directory, path))
+
+    @staticmethod
+    def __get_value(step: dict, key: str) -> any:
+        """
+        Get a value that must be defined in a step.
+
+        Args:
+            step: Dictionary with the values of the step.
+            key: Key of the value.
+
+        Returns: Value.
+        """
+        if key not in step:
+            raise HeadlessJobError(5, {'step': step, 'key': key})
+        return step[key]
+
+    def __step_export(self, engine: HeadlessEngine, model_id: str, input_file: str, step: dict) -> List[str]:
+        """
+        Export the map to a netcdf file.
+
+        Args:
+            engine: Engine with the map.
+            model_id: ID of the map.
+            input_file: File used to load the map.
+            step: Dictionary with the values of the step.
+
+        Returns: List with the name of the file created.
+        """
+        directory = step.get('directory', self.__job_data.get('output_directory'))
+        directory = self.__get_path(directory) if directory is not None else str(Path(input_file).parent)
+        filename = f'{Path(input_file).stem}{step.get("suffix", "")}.nc'
+
+        return [engine.export_model_as_netcdf(model_id, str(Path(directory, filename)))]
+
+    def __step_fill_nan(self, engine: HeadlessEngine, model_id: str, input_file: str, step: dict) -> List[str]:
+        """
+        Change to nan the heights inside the polygons of a group.
+
+        Args:
+            engine: Engine with the map.
+            model_id: ID of the map.
+            input_file: File used to load the map.
+            step: Dictionary with the values of the step.
+
+        Returns: Empty list.
+        """
+        engine.apply_transformation(FillNanBatchTransformation(model_id,
+                                                               engine.get_polygon_group(step.get('group')),
+                                                               self.__get_filter_list(step),
+                                                               self.__job_data.get('threads', 1)))
+        return []
+
+    def __step_fill_nan_map(self, engine: HeadlessEngine, model_id: str, input_file: str, step: dict) -> List[str]:
+        """
+        Change to nan the heights outside all the polygons.
+
+        Args:
+            engine: Engine with the map.
+            model_id: ID of the map.
+            input_file: File used to load the map.
+            step: Dictionary with the values of the step.
+
+        Returns: Empty list.
+        """
+        engine.apply_map_transformation(FillNanMapTransformation(model_id))
+        return []
+
+    def __step_interpolate_nan_map(self, engine: HeadlessEngine, model_id: str, input_file: str,
+                                   step: dict) -> List[str]:
+        """
+        Interpolate the nan values of the map.
+
+        Args:
+            engine: Engine with the map.
+            model_id: ID of the map.
+            input_file: File used to load the map.
+            step: Dictionary with the values of the step.
+
+        Returns: Empty list.
+        """
+        try:
+            interpolation_type = InterpolateNanMapTransformationType(step.get('type', 'linear'))
+        except ValueError:
+            raise HeadlessJobError(3, {'step': step})
+
+        engine.apply_map_transformation(InterpolateNanMapTransformation(model_id, interpolation_type))
+        return []
+
+    def __step_interpolation(self, engine: HeadlessEngine, model_id: str, input_file: str, step: dict) -> List[str]:
+        """
+        Interpolate the heights around the polygons of a group.
+
+        Args:
+            engine: Engine with the map.
+            model_id: ID of the map.
+            input_file: File used to load the map.
+            step: Dictionary with the values of the step.
+
+        Returns: Empty list.
+        """
+        interpolation_class = INTERPOLATIONS.get(self.__get_value(step, 'type'))
+        if interpolation_class is None:
+            raise HeadlessJobError(3, {'step': step})
+
+        distance = float(self.__get_value(step, 'distance'))
+        for polygon_id in engine.get_polygon_group(step.get('group')):
+            engine.apply_interpolation(interpolation_class(model_id, polygon_id, distance))
+        return []
+
+    def __step_linear_transformation(self, engine: HeadlessEngine, model_id: str, input_file: str,
+                                     step: dict) -> List[str]:
+        """
+        Change linearly the heights inside the polygons of a group.
+
+        Args:
+            engine: Engine with the map.
+            model_id: ID of the map.
+            input_file: File used to load the map.
+            step: Dictionary with the values of the step.
+
+        Returns: Empty list.
+        """
+        polygon_id_list = engine.get_polygon_group(step.get('group'))
+        filter_list = self.__get_filter_list(step)
+
+        if 'min_height_parameter' in step or 'max_height_parameter' in step:
+            engine.apply_transformation(LinearBatchTransformation(model_id,
+                                                                  polygon_id_list,
+                                                                  self.__get_value(step, 'min_height_parameter'),
+                                                                  self.__get_value(step, 'max_height_parameter'),
+                                                                  filter_list,
+                                                                  self.__job_data.get('threads', 1)))
+            return []
+
+        min_height = float(self.__get_value(step, 'min_height'))
+        max_height = float(self.__get_value(step, 'max_height'))
+        for polygon_id in polygon_id_list:
+            engine.apply_transformation(LinearTransformation(model_id, polygon_id, min_height, max_height,
+                                                             filter_list))
+        return []
+
+    def __step_load_polygons(self, engine: HeadlessEngine, model_id: str, input_file: str, step: dict) -> List[str]:
+        """
+        Load the polygons of a shapefile file.
+
+        Args:
+            engine: Engine with the map.
+            model_id: ID of the map.
+            input_file: File used to load the map.
+            step: Dictionary with the values of the step.
+
+        Returns: Empty list.
+        """
+        engine.create_polygons_from_file(self.__get_path(self.__get_value(step, 'file')), step.get('group'))
+        return []
+
+    def __step_nan_convolution(self, engine: HeadlessEngine, model_id: str, input_file: str,
+                               step: dict) -> List[str]:
+        """
+        Convert to nan the points surrounded by nan.
+
+        Args:
+            engine: Engine with the map.
+            model_id: ID of the map.
+            input_file: File used to load the map.
+            step: Dictionary with the values of the step.
+
+        Returns: Empty list.
+        """
+        engine.apply_map_transformation(NanConvolutionMapTransformation(model_id,
+                                                                        int(self.__get_value(step, 'radius')),
+                                                                        float(self.__get_value(step, 'nan_limit'))))
+        return []
+
+    def get_input_files(self) -> List[str]:
+        """
+        Get the files that match the inputs of the job.
+
+        Returns: Sorted list with the files.
+        """
+        inputs = self.__job_data.get('inputs', [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+
+        files = set()
+        for pattern in inputs:
+            files.update(glob.glob(self.__get_path(pattern)))
+
+        return sorted(files)
+
+    def get_processes(self) -> int:
+        """
+        Get the number of processes to use to apply the job.
+
+        Returns: Number of processes defined in the job. Number of CPUs of the computer if not defined.
+        """
+        return int(self.__job_data.get('processes', os.cpu_count() or 1))
+
+    def run_on_file(self, input_file: str) -> dict:
+        """
+        Load a map and apply all the steps of the job over it.
+
+        The errors raised by the steps are not propagated, they are returned in the result.
+
+        Args:
+            input_file: Netcdf file with the map.
+
+        Returns: Dictionary with the input file, the files created, the error (None if the steps were applied) and the
+                 seconds used to apply the job.
+        """
+        start_time = time.perf_counter()
+        outputs = []
+        error = None
+
+        try:
+            engine = HeadlessEngine()
+            model_id = engine.create_model_from_file(input_file)
+
+            for step in self.__job_data['steps']:
+                log.debug(f'Applying step {step["operation"]} over {input_file}.')
+                outputs.extend(self.__get_operation(step['operation'])(engine, model_id, input_file, step))
+
+        except (BaseError, OSError, ValueError, TypeError, KeyError) as e:
+            log.error(f'Error applying the job over {input_file}: {e}')
+            error = f'{type(e).__name__}: {e}'
+
+        return {
+            'input': input_file,
+            'outputs': outputs,
+            'error': error,
+            'time': time.perf_counter() - start_time
+        }
+
+
+def read_job_file(filename: str) -> HeadlessJob:
+    """
+    Read a job file.
+
+    Files with extension .yaml or .yml are read as YAML files, the other files are read as JSON files.
+
+    Args:
+        filename: Name of the job file.
+
+    Returns: Job defined in the file.
+    """
+    try:
+        if Path(filename).suffix.lower() in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise HeadlessJobError(7)
+
+            with open(filename) as job_file:
+                job_data = yaml.safe_load(job_file)
+        else:
+            job_data = json_to_dict(filename)
+
+    except HeadlessJobError as e:
+        raise e
+
+    except Exception as e:
+        raise HeadlessJobError(1, {'filename': filename, 'error': str(e)})
+
+    if not isinstance(job_data, dict):
+        raise HeadlessJobError(1, {'filename': filename})
+
+    return HeadlessJob(job_data, str(Path(filename).parent))
+
+
+def run_job_on_file(job: HeadlessJob, input_file: str) -> dict:
+    """
+    Apply a job over a map.
+
+    This function is executed in the processes created by run_job, so it must be public.
+
+    Args:
+        job: Job to apply.
+        input_file: Netcdf file with the map.
+
+    Returns: Dictionary with the result of the job. (see HeadlessJob.run_on_file)
+    """
+    return job.run_on_file(input_file)
+
+
+def run_job(job_filename: str, processes: int = None) -> List[dict]:
+    """
+    Apply the job defined in a job file over all the maps that match its inputs.
+
+    The maps are processed in parallel, using one process per map.
+
+    Args:
+        job_filename: Name of the job file.
+        processes: Number of processes to use. None to use the number defined in the job file.
+
+    Returns: List with the results of the job for every map, in the order of the input files.
+    """
+    job = read_job_file(job_filename)
+    input_files = job.get_input_files()
+    if len(input_files) == 0:
+        raise HeadlessJobError(4)
+
+    processes = min(processes if processes is not None else job.get_processes(), len(input_files))
+    log.info(f'Running job {job_filename} over {len(input_files)} files using {processes} processes.')
+
+    if processes <= 1:
+        return [run_job_on_file(job, input_file) for input_file in input_files]
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(run_job_on_file, [job] * len(input_files), input_files))
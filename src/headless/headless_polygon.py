@@ -0,0 +1,130 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+File with the class HeadlessPolygon, class that stores the data of a polygon when the program runs without a window.
+"""
+from typing import List
+
+import numpy as np
+from shapely.geometry import LineString
+
+from src.engine.scene.model.segment_grid import SegmentGrid
+from src.error.polygon_error import PolygonError
+
+
+class HeadlessPolygon:
+    """
+    Class that stores the points and the parameters of a polygon without creating the models used to draw it.
+
+    The polygons are checked in the same way that the polygons of the scene: the points can not be repeated, the lines
+    of the polygon can not intersect and the polygon is planar only if the line that closes it does not intersect
+    the other lines.
+    """
+
+    def __init__(self, id_polygon: str, point_list: list, parameters: dict = None, default_height_value: float = 0.5):
+        """
+        Constructor of the class.
+
+        Args:
+            id_polygon: ID of the polygon.
+            point_list: List with the points of the polygon. [[x,y],[x,y],...]
+            parameters: Dictionary with the parameters of the polygon. {parameter_name: value,...}
+            default_height_value: Value to use as the z-coordinate of the points.
+        """
+        self.__id = id_polygon
+        self.__name = id_polygon
+        self.__parameters = parameters if parameters is not None else {}
+
+        # check for consistency on the data
+        point_list = [tuple(point) for point in point_list]
+        if len(point_list) > 1 and not LineString(point_list).is_simple:
+            raise PolygonError(0)
+
+        if len(point_list) != len(set(point_list)):
+            raise PolygonError(1, {'point_list': point_list})
+
+        self.__points = np.empty((len(point_list), 3))
+        self.__points[:, :2] = np.array(point_list, dtype=np.float64).reshape((-1, 2))
+        self.__points[:, 2] = default_height_value
+
+        segment_grid = SegmentGrid()
+        for point in self.__points:
+            segment_grid.add_point(point[0], point[1], point[2])
+        self.__is_planar = len(point_list) < 3 or not segment_grid.intersects_closing_segment()
+
+    def get_id(self) -> str:
+        """
+        Get the ID of the polygon.
+
+        Returns: ID of the polygon.
+        """
+        return self.__id
+
+    def get_name(self) -> str:
+        """
+        Get the name of the polygon.
+
+        Returns: Name of the polygon.
+        """
+        return self.__name
+
+    def get_parameter_list(self) -> list:
+        """
+        Return all the parameters of the polygon as a list.
+
+        Returns: List with the parameters [(key, value), (key, value), ...]
+        """
+        return [(k, v) for k, v in self.__parameters.items()]
+
+    def get_point_array(self) -> np.ndarray:
+        """
+        Get the points of the polygon as an array.
+
+        The array returned must not be modified.
+
+        Returns: Array of shape (number_of_points, 3) with the points.
+        """
+        return self.__points
+
+    def get_point_list(self) -> List[float]:
+        """
+        Get the list of points.
+        The format of the list is as follows: [x1, y1, z1, x2, y2, z2, ...]
+
+        Returns: List of points
+        """
+        return self.__points.reshape(-1).tolist()
+
+    def is_planar(self) -> bool:
+        """
+        Check if the polygon is planar or not
+
+        Returns: Boolean indicating if the polygon is planar or not.
+        """
+        return self.__is_planar
+
+    def set_name(self, new_name: str) -> None:
+        """
+        Change the name of the polygon.
+
+        Args:
+            new_name: New name of the polygon.
+
+        Returns: None
+        """
+        self.__name = new_name
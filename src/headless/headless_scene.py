@@ -0,0 +1,228 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+File with the class HeadlessScene, class that stores the maps and the polygons when the program runs without a window.
+"""
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from src.engine.scene.polygon_spatial_index import PolygonSpatialIndex
+from src.error.scene_error import SceneError
+from src.headless.headless_polygon import HeadlessPolygon
+from src.utils import get_logger
+
+log = get_logger(module='HEADLESS_SCENE')
+
+
+class HeadlessScene:
+    """
+    Class that stores the vertices of the maps and the polygons without using OpenGL.
+
+    The class defines the same methods of the Scene that the transformations, interpolations, map transformations and
+    filters use to get their data, so they can be initialized and applied over the maps stored in this class exactly
+    as they are applied over the maps of the scene.
+
+    The vertices of the maps are stored in arrays with shape (rows, cols, 3), the same shape that the Map2DModel uses.
+    """
+
+    def __init__(self):
+        """
+        Constructor of the class.
+        """
+        self.__model_vertices: Dict[str, np.ndarray] = {}
+        self.__model_names: Dict[str, str] = {}
+        self.__model_id_count = 0
+
+        self.__polygon_hash: Dict[str, HeadlessPolygon] = {}
+        self.__polygon_index = PolygonSpatialIndex()
+        self.__polygon_id_count = 0
+
+    def create_model_from_data(self, x: np.ndarray, y: np.ndarray, z: np.ndarray, name: str = None) -> str:
+        """
+        Create a new map using the values of a grid.
+
+        Args:
+            x: Values of the x-axis of the grid. (shape (cols,))
+            y: Values of the y-axis of the grid. (shape (rows,))
+            z: Heights of the grid. (shape (rows, cols))
+            name: Name of the map.
+
+        Returns: ID of the map.
+        """
+        model_id = f'Model {self.__model_id_count}'
+        self.__model_id_count += 1
+
+        z = np.array(z, dtype=np.float64)
+        vertices = np.zeros((z.shape[0], z.shape[1], 3))
+        vertices[:, :, 0] = np.array(x).reshape((1, -1))
+        vertices[:, :, 1] = np.array(y).reshape((-1, 1))
+        vertices[:, :, 2] = z
+
+        self.__model_vertices[model_id] = vertices
+        self.__model_names[model_id] = name if name is not None else model_id
+        log.debug(f'Created model {model_id} with shape {vertices.shape[:2]}.')
+
+        return model_id
+
+    def create_new_polygon(self, point_list: list, parameters: dict = None) -> str:
+        """
+        Create a new polygon.
+
+        The list of points must define a simple/planar polygon, otherwise, a PolygonError is raised.
+
+        Args:
+            point_list: List with the points of the polygon. [[x,y],[x,y],...]
+            parameters: Parameters to set in the polygon. {parameter_name:value,...}
+
+        Returns: ID of the polygon.
+        """
+        polygon_id = f'Polygon {self.__polygon_id_count}'
+        polygon = HeadlessPolygon(polygon_id, point_list, parameters)
+        self.__polygon_id_count += 1
+
+        self.__polygon_hash[polygon_id] = polygon
+        self.__polygon_index.add_polygon(polygon_id, polygon)
+
+        return polygon_id
+
+    def get_map2d_model_vertices_array(self, model_id: str) -> np.ndarray:
+        """
+        Get the array of vertices of the specified map.
+
+        The array returned have shape (x, y, 3), with each vertex containing the x-coordinate, y-coordinate and the
+        height of the vertex.
+
+        Args:
+            model_id: ID of the map.
+
+        Returns: Array with the vertices of the map.
+        """
+        try:
+            return self.__model_vertices[model_id]
+        except KeyError:
+            raise SceneError(7)
+
+    def get_model_list(self) -> List[str]:
+        """
+        Get a list with the ID of all the maps.
+
+        Returns: List with the ID of the maps.
+        """
+        return list(self.__model_vertices.keys())
+
+    def get_model_name(self, model_id: str) -> Union[str, None]:
+        """
+        Get the name of a map.
+
+        Args:
+            model_id: ID of the map.
+
+        Returns: Name of the map. None if the map does not exist.
+        """
+        return self.__model_names.get(model_id)
+
+    def get_polygon_id_list(self) -> List[str]:
+        """
+        Return a list with the ids of the polygons.
+
+        Returns: list with polygon ids.
+        """
+        return list(self.__polygon_hash.keys())
+
+    def get_polygon_ids_in_bbox(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[str]:
+        """
+        Get the polygons whose bounding boxes intersect the given bounding box.
+
+        Args:
+            min_x: Minimum x-coordinate of the bounding box.
+            min_y: Minimum y-coordinate of the bounding box.
+            max_x: Maximum x-coordinate of the bounding box.
+            max_y: Maximum y-coordinate of the bounding box.
+
+        Returns: List with the ID of the polygons, in the order in which they were created.
+        """
+        return self.__polygon_index.get_polygons_in_bbox(min_x, min_y, max_x, max_y)
+
+    def get_polygon_name(self, polygon_id: str) -> Union[str, None]:
+        """
+        Get the name of a polygon.
+
+        Args:
+            polygon_id: ID of the polygon.
+
+        Returns: Name of the polygon. None if the polygon does not exist.
+        """
+        if polygon_id in self.__polygon_hash:
+            return self.__polygon_hash[polygon_id].get_name()
+
+    def get_polygon_params(self, polygon_id: str) -> List[Tuple[str, any]]:
+        """
+        Get the parameters of a polygon.
+
+        Args:
+            polygon_id: ID of the polygon.
+
+        Returns: List with the parameters of the polygon.
+        """
+        try:
+            return self.__polygon_hash[polygon_id].get_parameter_list()
+        except KeyError:
+            raise SceneError(5)
+
+    def get_polygon_points(self, polygon_id: str) -> List[float]:
+        """
+        Return the list of points of a polygon.
+        The points are formatted as follows: [x1, y1, z1, x2, y2, z2, ...]
+
+        Args:
+            polygon_id: ID of the polygon.
+
+        Returns: List with the points of the polygon.
+        """
+        try:
+            return self.__polygon_hash[polygon_id].get_point_list()
+        except KeyError:
+            raise SceneError(5)
+
+    def is_polygon_planar(self, polygon_id: str) -> Union[bool, None]:
+        """
+        Check if the polygon is planar or not.
+
+        Return None if polygon is not in the list of polygons.
+
+        Args:
+            polygon_id: Polygon id to check
+
+        Returns: boolean indicating if the polygon is planar or not
+        """
+        if polygon_id in self.__polygon_hash:
+            return self.__polygon_hash[polygon_id].is_planar()
+
+    def set_polygon_name(self, polygon_id: str, new_name: str) -> None:
+        """
+        Change the name of a polygon.
+
+        Args:
+            polygon_id: ID of the polygon.
+            new_name: New name of the polygon.
+
+        Returns: None
+        """
+        if polygon_id in self.__polygon_hash:
+            self.__polygon_hash[polygon_id].set_name(new_name)
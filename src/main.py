@@ -18,16 +18,39 @@
 """
 Main file of the relief application.
 
-Starts the main program, calling the engine and the logic.
+Starts the main program, calling the engine and the logic. If a job file is given, then the job is applied over the
+maps defined in it without creating a window.
 """
+import sys
+
 from src.program.parser import get_command_line_arguments
-from src.program.program import Program
 
 if __name__ == '__main__':
     # Get the arguments to use for the program.
     command_line_args = get_command_line_arguments()
     debug_mode = command_line_args.debug if 'debug' in command_line_args else False
 
+    # Run the job without creating a window if a job file is given
+    if command_line_args.job is not None:
+        from src.error.headless_job_error import HeadlessJobError
+        from src.headless.headless_job import run_job
+
+        try:
+            results = run_job(command_line_args.job, command_line_args.processes)
+        except HeadlessJobError as e:
+            print(f'Error: {e}')
+            sys.exit(2)
+
+        for result in results:
+            if result['error'] is None:
+                print(f"[OK] {result['input']} ({result['time']:.2f} s): {', '.join(result['outputs'])}")
+            else:
+                print(f"[ERROR] {result['input']} ({result['time']:.2f} s): {result['error']}")
+
+        sys.exit(1 if any(result['error'] is not None for result in results) else 0)
+
+    from src.program.program import Program
+
     # Create the program
     program = Program(debug_mode=debug_mode)
 
@@ -44,6 +44,10 @@ def get_command_line_arguments() -> 'argparse.Namespace':
                         help='A netcdf to load before running the program.')
     parser.add_argument('-debug', action='store_true',
                         help='If to start the program in debug mode.')
+    parser.add_argument('-job', metavar='<filename>', type=str,
+                        help='A job file (JSON or YAML) to apply over many maps without opening a window.')
+    parser.add_argument('-processes', metavar='<number>', type=int,
+                        help='Number of processes to use to apply the job. Overrides the value of the job file.')
 
     args = parser.parse_args()
     return args
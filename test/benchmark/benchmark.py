@@ -0,0 +1,565 @@
+#  BEGIN GPL LICENSE BLOCK
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  END GPL LICENSE BLOCK
+
+"""
+Benchmarks of the operations applied over the maps and the polygons, executed over synthetic maps and polygons.
+
+The benchmarks measure the time and the peak of memory of the geometrical operations (micro benchmarks) and of the
+transformations, interpolations, map transformations and the import/export of files executed with the headless engine
+(macro benchmarks). The results are stored in a JSON file and can be compared against the results of a previous
+execution to detect regressions.
+
+Usage:
+    python -m test.benchmark.benchmark -sizes 1000 2000 -vertices 10 100 1000 10000 -output results.json
+    python -m test.benchmark.benchmark -output results.json -baseline baseline.json -threshold 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Union
+
+import numpy as np
+
+from src.engine.scene.geometrical_operations import generate_mask, get_max_min_inside_polygon
+from src.engine.scene.interpolation.cubic_interpolation import CubicInterpolation
+from src.engine.scene.interpolation.linear_interpolation import LinearInterpolation
+from src.engine.scene.interpolation.nearest_interpolation import NearestInterpolation
+from src.engine.scene.interpolation.smooth_interpolation import SmoothInterpolation
+from src.engine.scene.map_transformation.fill_nan_map_transformation import FillNanMapTransformation
+from src.engine.scene.map_transformation.interpolate_nan_map_transformation import \
+    InterpolateNanMapTransformation, InterpolateNanMapTransformationType
+from src.engine.scene.map_transformation.merge_maps_transformation import MergeMapsTransformation
+from src.engine.scene.map_transformation.nan_convolution import NanConvolutionMapTransformation
+from src.engine.scene.map_transformation.replace_nan_values_in_map import ReplaceNanValuesInMap
+from src.engine.scene.map_transformation.subtract_map import SubtractMap
+from src.engine.scene.model.mapmodel import MapModel
+from src.engine.scene.transformation.fill_nan_batch_transformation import FillNanBatchTransformation
+from src.engine.scene.transformation.fill_nan_transformation import FillNanTransformation
+from src.engine.scene.transformation.linear_batch_transformation import LinearBatchTransformation
+from src.engine.scene.transformation.linear_transformation import LinearTransformation
+from src.headless.headless_engine import HeadlessEngine
+from src.input.NetCDF import read_info
+from src.input.shapefile_importer import ShapefileImporter
+from src.output.shapefile_exporter import ShapefileExporter
+from src.utils import get_logger
+from test.benchmark.synthetic_data import create_star_polygon, create_synthetic_grid, get_flat_point_list, \
+    get_grid_vertices, write_netcdf_file
+
+log = get_logger(module='BENCHMARK')
+
+DEFAULT_SIZES = [1000, 2000]
+DEFAULT_VERTICES = [10, 100, 1000, 10000]
+DEFAULT_THRESHOLD = 0.2
+
+# Metrics compared against the baseline
+COMPARED_METRICS = ['TIME_MEDIAN', 'PEAK_MEMORY']
+
+# Distance used by the interpolations (the synthetic maps cover the region [-10, 10] x [-10, 10])
+INTERPOLATION_DISTANCE = 0.5
+
+# Center of the polygons used by the batch transformations
+BATCH_POLYGON_CENTERS = [(-5, -5), (-5, 5), (5, -5), (5, 5)]
+
+POLYGON_PARAMETERS = {'min_height': 0.0, 'max_height': 1000.0}
+
+TRANSFORMATIONS = {
+    'LinearTransformation':
+        lambda model_id, polygon_ids: LinearTransformation(model_id, polygon_ids[0], 0, 1000),
+    'FillNanTransformation':
+        lambda model_id, polygon_ids: FillNanTransformation(model_id, polygon_ids[0]),
+    'LinearBatchTransformation':
+        lambda model_id, polygon_ids: LinearBatchTransformation(model_id, polygon_ids[1:], 'min_height', 'max_height'),
+    'FillNanBatchTransformation':
+        lambda model_id, polygon_ids: FillNanBatchTransformation(model_id, polygon_ids[1:]),
+}
+
+INTERPOLATIONS = {
+    'LinearInterpolation':
+        lambda model_id, polygon_ids: LinearInterpolation(model_id, polygon_ids[0], INTERPOLATION_DISTANCE),
+    'NearestInterpolation':
+        lambda model_id, polygon_ids: NearestInterpolation(model_id, polygon_ids[0], INTERPOLATION_DISTANCE),
+    'CubicInterpolation':
+        lambda model_id, polygon_ids: CubicInterpolation(model_id, polygon_ids[0], INTERPOLATION_DISTANCE),
+    'SmoothInterpolation':
+        lambda model_id, polygon_ids: SmoothInterpolation(model_id, polygon_ids[0], INTERPOLATION_DISTANCE),
+}
+
+# Map transformations that only use the map, and the ones that use a second map
+MAP_TRANSFORMATIONS = {
+    'InterpolateNanMapTransformation[linear]':
+        lambda model_id: InterpolateNanMapTransformation(model_id, InterpolateNanMapTransformationType.linear),
+    'InterpolateNanMapTransformation[nearest]':
+        lambda model_id: InterpolateNanMapTransformation(model_id, InterpolateNanMapTransformationType.nearest),
+    'InterpolateNanMapTransformation[cubic]':
+        lambda model_id: InterpolateNanMapTransformation(model_id, InterpolateNanMapTransformationType.cubic),
+    'NanConvolutionMapTransformation':
+        lambda model_id: NanConvolutionMapTransformation(model_id, 5, 0.5),
+}
+
+TWO_MAPS_TRANSFORMATIONS = {
+    'MergeMapsTransformation':
+        lambda model_id, second_model_id: MergeMapsTransformation(model_id, second_model_id),
+    'ReplaceNanValuesInMap':
+        lambda model_id, second_model_id: ReplaceNanValuesInMap(model_id, second_model_id),
+    'SubtractMap':
+        lambda model_id, second_model_id: SubtractMap(model_id, second_model_id),
+}
+
+
+def create_case(name: str, grid_size: Union[int, None], polygon_vertices: Union[int, None],
+                setup: Callable[[], Callable[[], Any]]) -> Dict[str, Any]:
+    """
+    Create the definition of a benchmark.
+
+    The setup function is executed before every measure and must return the function to measure, so the creation of
+    the data used by the operation is not measured.
+
+    Args:
+        name: Name of the operation.
+        grid_size: Number of values on every axis of the map used. None if the operation does not use a map.
+        polygon_vertices: Number of vertices of the polygons used. None if the operation does not use polygons.
+        setup: Function that prepares the data and returns the function to measure.
+
+    Returns: Dictionary with the definition of the benchmark.
+    """
+    return {
+        'KEY': get_case_key(name, grid_size, polygon_vertices),
+        'NAME': name,
+        'GRID_SIZE': grid_size,
+        'POLYGON_VERTICES': polygon_vertices,
+        'SETUP': setup
+    }
+
+
+def create_polygons(number_of_vertices: int) -> List[List[List[float]]]:
+    """
+    Create the polygons used by the benchmarks.
+
+    The first polygon is placed at the center of the map and the rest of the polygons at the center of every quadrant
+    of the map, without intersecting each other.
+
+    Args:
+        number_of_vertices: Number of vertices of every polygon.
+
+    Returns: List with the points of the polygons. [[[x,y],[x,y],...], ...]
+    """
+    polygons = [create_star_polygon(number_of_vertices, (0, 0), 5)]
+    for seed, center in enumerate(BATCH_POLYGON_CENTERS, start=1):
+        polygons.append(create_star_polygon(number_of_vertices, center, 4, seed))
+    return polygons
+
+
+def compare_results(results: Dict[str, Any],
+                    baseline: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compare the results of the benchmarks against the results of a baseline.
+
+    A metric is considered a regression if its value is greater than the value of the baseline by more than the
+    threshold (as a fraction of the value of the baseline).
+
+    Args:
+        results: Results of the benchmarks.
+        baseline: Results of the benchmarks to use as baseline.
+        threshold: Fraction of increase of the metrics considered a regression.
+
+    Returns: List with the comparison of every metric of every benchmark. Every element is a dictionary with the keys
+             KEY, METRIC, BASELINE, CURRENT, CHANGE and STATUS (REGRESSION, IMPROVEMENT, OK or NEW).
+    """
+    baseline_results = baseline.get('RESULTS', {})
+
+    comparison = []
+    for key, result in results.get('RESULTS', {}).items():
+        for metric in COMPARED_METRICS:
+            current = result[metric]
+            baseline_value = baseline_results[key][metric] if key in baseline_results else None
+
+            if baseline_value is None:
+                change = None
+                status = 'NEW'
+            else:
+                change = (current - baseline_value) / baseline_value if baseline_value > 0 else 0.0
+                if change > threshold:
+                    status = 'REGRESSION'
+                elif change < -threshold:
+                    status = 'IMPROVEMENT'
+                else:
+                    status = 'OK'
+
+            comparison.append({
+                'KEY': key,
+                'METRIC': metric,
+                'BASELINE': baseline_value,
+                'CURRENT': current,
+                'CHANGE': change,
+                'STATUS': status
+            })
+
+    return comparison
+
+
+def format_metric(metric: str, value: Union[float, None]) -> str:
+    """
+    Format the value of a metric to show it in the report.
+
+    Args:
+        metric: Name of the metric.
+        value: Value of the metric.
+
+    Returns: Text with the value and its units.
+    """
+    if value is None:
+        return '-'
+    if metric == 'PEAK_MEMORY':
+        return f'{value / 2 ** 20:.2f} MB'
+    return f'{value * 1000:.2f} ms'
+
+
+def get_case_key(name: str, grid_size: Union[int, None], polygon_vertices: Union[int, None]) -> str:
+    """
+    Get the key used to store the results of a benchmark.
+
+    Args:
+        name: Name of the operation.
+        grid_size: Number of values on every axis of the map used.
+        polygon_vertices: Number of vertices of the polygons used.
+
+    Returns: Key of the benchmark. (name/grid_size/polygon_vertices)
+    """
+    grid_text = '-' if grid_size is None else str(grid_size)
+    vertices_text = '-' if polygon_vertices is None else str(polygon_vertices)
+    return f'{name}/{grid_text}/{vertices_text}'
+
+
+def get_grid_cases(grid_size: int,
+                   vertices_list: List[int],
+                   directory: str,
+                   nan_fraction: float = 0.05) -> List[Dict[str, Any]]:
+    """
+    Get the benchmarks of the operations that use a map of the size specified.
+
+    Args:
+        grid_size: Number of values on every axis of the map.
+        vertices_list: List with the number of vertices of the polygons to use.
+        directory: Directory where to store the files generated.
+        nan_fraction: Fraction of the map to cover with NaN values.
+
+    Returns: List with the definition of the benchmarks.
+    """
+    x, y, z = create_synthetic_grid(grid_size, nan_fraction)
+    _, _, second_z = create_synthetic_grid(grid_size, nan_fraction, seed=1)
+    vertices = get_grid_vertices(x, y, z)
+
+    map_file = os.path.join(directory, f'map_{grid_size}.nc')
+    write_netcdf_file(map_file, x, y, z)
+
+    def create_engine(polygons: List[List[List[float]]] = None, second_map: bool = False) -> tuple:
+        engine = HeadlessEngine()
+        model_id = engine.create_model_from_file(map_file)
+        polygon_ids = [engine.scene.create_new_polygon(points, dict(POLYGON_PARAMETERS)) for points in polygons or []]
+        second_model_id = engine.scene.create_model_from_data(x, y, second_z) if second_map else None
+        return engine, model_id, polygon_ids, second_model_id
+
+    def setup_export_netcdf() -> Callable[[], Any]:
+        engine, model_id, _, _ = create_engine()
+        return lambda: engine.export_model_as_netcdf(model_id, os.path.join(directory, f'export_{grid_size}.nc'))
+
+    def setup_generate_index_list() -> Callable[[], Any]:
+        model = MapModel.__new__(MapModel)
+        return lambda: model._generate_index_list(1, 1, x, y, x[0], x[-1], y[-1], y[0], z)
+
+    cases = [
+        create_case('read_info', grid_size, None, lambda: lambda: read_info(map_file)),
+        create_case('MapModel._generate_index_list', grid_size, None, setup_generate_index_list),
+        create_case('netcdf_export', grid_size, None, setup_export_netcdf),
+    ]
+
+    for name, create_map_transformation in MAP_TRANSFORMATIONS.items():
+        def setup(create_map_transformation=create_map_transformation) -> Callable[[], Any]:
+            engine, model_id, _, _ = create_engine()
+            return lambda: engine.apply_map_transformation(create_map_transformation(model_id))
+
+        cases.append(create_case(name, grid_size, None, setup))
+
+    for name, create_map_transformation in TWO_MAPS_TRANSFORMATIONS.items():
+        def setup(create_map_transformation=create_map_transformation) -> Callable[[], Any]:
+            engine, model_id, _, second_model_id = create_engine(second_map=True)
+            return lambda: engine.apply_map_transformation(create_map_transformation(model_id, second_model_id))
+
+        cases.append(create_case(name, grid_size, None, setup))
+
+    for polygon_vertices in vertices_list:
+        polygons = create_polygons(polygon_vertices)
+        polygon_points = get_flat_point_list(polygons[0])
+
+        cases.append(create_case('generate_mask', grid_size, polygon_vertices,
+                                 lambda points=polygon_points: lambda: generate_mask(vertices, points)))
+        cases.append(create_case('get_max_min_inside_polygon', grid_size, polygon_vertices,
+                                 lambda points=polygon_points:
+                                 lambda: get_max_min_inside_polygon(vertices, points, vertices[:, :, 2])))
+
+        def setup_fill_nan_map(polygons=polygons) -> Callable[[], Any]:
+            engine, model_id, _, _ = create_engine(polygons)
+            return lambda: engine.apply_map_transformation(FillNanMapTransformation(model_id))
+
+        cases.append(create_case('FillNanMapTransformation', grid_size, polygon_vertices, setup_fill_nan_map))
+
+        for name, create_transformation in TRANSFORMATIONS.items():
+            def setup(polygons=polygons, create_transformation=create_transformation) -> Callable[[], Any]:
+                engine, model_id, polygon_ids, _ = create_engine(polygons)
+                return lambda: engine.apply_transformation(create_transformation(model_id, polygon_ids))
+
+            cases.append(create_case(name, grid_size, polygon_vertices, setup))
+
+        for name, create_interpolation in INTERPOLATIONS.items():
+            def setup(polygons=polygons, create_interpolation=create_interpolation) -> Callable[[], Any]:
+                engine, model_id, polygon_ids, _ = create_engine(polygons)
+                return lambda: engine.apply_interpolation(create_interpolation(model_id, polygon_ids))
+
+            cases.append(create_case(name, grid_size, polygon_vertices, setup))
+
+    return cases
+
+
+def get_shapefile_cases(vertices_list: List[int], directory: str) -> List[Dict[str, Any]]:
+    """
+    Get the benchmarks of the import and export of polygons in shapefile files.
+
+    Args:
+        vertices_list: List with the number of vertices of the polygons to use.
+        directory: Directory where to store the files generated.
+
+    Returns: List with the definition of the benchmarks.
+    """
+    cases = []
+    for polygon_vertices in vertices_list:
+        filename = os.path.join(directory, f'polygons_{polygon_vertices}')
+        polygons = create_polygons(polygon_vertices)
+
+        def export_polygons(polygons=polygons, filename=filename) -> None:
+            ShapefileExporter().export_list_of_polygons([get_flat_point_list(points) for points in polygons],
+                                                        [dict(POLYGON_PARAMETERS) for _ in polygons],
+                                                        [f'Polygon {ind}' for ind in range(len(polygons))],
+                                                        filename)
+
+        def setup_import(export_polygons=export_polygons, filename=filename) -> Callable[[], Any]:
+            export_polygons()
+            return lambda: ShapefileImporter().get_polygon_information(f'{filename}.shp')
+
+        cases.append(create_case('shapefile_export', None, polygon_vertices, lambda function=export_polygons: function))
+        cases.append(create_case('shapefile_import', None, polygon_vertices, setup_import))
+
+    return cases
+
+
+def get_report(comparison: List[Dict[str, Any]], threshold: float = DEFAULT_THRESHOLD) -> str:
+    """
+    Get a text report with the comparison of the results against the baseline.
+
+    Args:
+        comparison: Comparison generated by compare_results.
+        threshold: Threshold used in the comparison.
+
+    Returns: Text with a table with the comparison and a summary of the regressions found.
+    """
+    lines = [f'{"Benchmark":<60}{"Metric":<14}{"Baseline":>14}{"Current":>14}{"Change":>10}  Status']
+    for row in comparison:
+        change = '-' if row['CHANGE'] is None else f'{row["CHANGE"] * 100:+.1f}%'
+        lines.append(f'{row["KEY"]:<60}'
+                     f'{row["METRIC"]:<14}'
+                     f'{format_metric(row["METRIC"], row["BASELINE"]):>14}'
+                     f'{format_metric(row["METRIC"], row["CURRENT"]):>14}'
+                     f'{change:>10}'
+                     f'  {row["STATUS"]}')
+
+    regressions = [row for row in comparison if row['STATUS'] == 'REGRESSION']
+    lines.append('')
+    lines.append(f'{len(regressions)} regressions found (threshold: {threshold * 100:.0f}%).')
+    return '\n'.join(lines)
+
+
+def load_results(filename: str) -> Dict[str, Any]:
+    """
+    Load the results of the benchmarks stored in a JSON file.
+
+    Args:
+        filename: Name of the file.
+
+    Returns: Dictionary with the results.
+    """
+    with open(filename) as file:
+        return json.load(file)
+
+
+def measure_operation(setup: Callable[[], Callable[[], Any]], repeat: int = 3) -> Dict[str, float]:
+    """
+    Measure the time and the peak of memory of an operation.
+
+    The time is measured the number of times specified, preparing the data again before every measure. The peak of
+    memory is measured in an extra execution using tracemalloc, since tracing the memory slows down the operation.
+
+    Args:
+        setup: Function that prepares the data and returns the function to measure.
+        repeat: Number of times to measure the time of the operation.
+
+    Returns: Dictionary with the minimum, median and maximum time in seconds (TIME_MIN, TIME_MEDIAN, TIME_MAX) and the
+             peak of memory allocated in bytes (PEAK_MEMORY).
+    """
+    times = []
+    for _ in range(max(repeat, 1)):
+        operation = setup()
+        start_time = time.perf_counter()
+        operation()
+        times.append(time.perf_counter() - start_time)
+
+    operation = setup()
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'TIME_MIN': min(times),
+        'TIME_MEDIAN': statistics.median(times),
+        'TIME_MAX': max(times),
+        'PEAK_MEMORY': peak_memory
+    }
+
+
+def run_benchmarks(sizes: List[int] = None,
+                   vertices_list: List[int] = None,
+                   repeat: int = 3,
+                   nan_fraction: float = 0.05,
+                   operations: List[str] = None,
+                   directory: str = None) -> Dict[str, Any]:
+    """
+    Run the benchmarks over synthetic maps and polygons.
+
+    Args:
+        sizes: Number of values on every axis of the maps to use.
+        vertices_list: Number of vertices of the polygons to use.
+        repeat: Number of times to measure the time of every operation.
+        nan_fraction: Fraction of the maps to cover with NaN values.
+        operations: Name of the operations to measure. All the operations are measured if not specified.
+        directory: Directory where to store the files generated. A temporary directory is used if not specified.
+
+    Returns: Dictionary with the information of the execution (METADATA) and the results of every benchmark
+             (RESULTS), indexed by the key of the benchmark.
+    """
+    sizes = DEFAULT_SIZES if sizes is None else sizes
+    vertices_list = DEFAULT_VERTICES if vertices_list is None else vertices_list
+
+    results = {
+        'METADATA': {
+            'DATE': datetime.now().isoformat(timespec='seconds'),
+            'PLATFORM': platform.platform(),
+            'PYTHON': platform.python_version(),
+            'NUMPY': np.__version__,
+            'SIZES': sizes,
+            'VERTICES': vertices_list,
+            'REPEAT': repeat,
+            'NAN_FRACTION': nan_fraction
+        },
+        'RESULTS': {}
+    }
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        directory = temporary_directory if directory is None else directory
+
+        case_generators = [lambda: get_shapefile_cases(vertices_list, directory)]
+        for size in sizes:
+            case_generators.append(lambda size=size: get_grid_cases(size, vertices_list, directory, nan_fraction))
+
+        for get_cases in case_generators:
+            for case in get_cases():
+                if operations is not None and case['NAME'] not in operations:
+                    continue
+
+                log.info(f'Running benchmark {case["KEY"]}')
+                result = measure_operation(case['SETUP'], repeat)
+                result.update({key: case[key] for key in ['NAME', 'GRID_SIZE', 'POLYGON_VERTICES']})
+                results['RESULTS'][case['KEY']] = result
+
+    return results
+
+
+def save_results(results: Dict[str, Any], filename: str) -> None:
+    """
+    Save the results of the benchmarks in a JSON file.
+
+    Args:
+        results: Results of the benchmarks.
+        filename: Name of the file.
+
+    Returns: None
+    """
+    with open(filename, 'w') as file:
+        json.dump(results, file, indent=4)
+
+
+def get_command_line_arguments() -> argparse.Namespace:
+    """
+    Get the arguments of the benchmarks from the command line.
+
+    Returns: Namespace with the arguments.
+    """
+    parser = argparse.ArgumentParser(description='Benchmarks of the operations of Relief Creator.')
+    parser.add_argument('-sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Number of values on every axis of the synthetic maps (from 1000 to 20000).')
+    parser.add_argument('-vertices', type=int, nargs='+', default=DEFAULT_VERTICES,
+                        help='Number of vertices of the synthetic polygons (from 10 to 10000).')
+    parser.add_argument('-repeat', type=int, default=3,
+                        help='Number of times to measure the time of every operation.')
+    parser.add_argument('-nan_fraction', type=float, default=0.05,
+                        help='Fraction of the maps to cover with NaN values.')
+    parser.add_argument('-operations', type=str, nargs='+', default=None,
+                        help='Name of the operations to measure. All the operations are measured if not specified.')
+    parser.add_argument('-output', type=str, default='benchmark_results.json',
+                        help='JSON file where to store the results.')
+    parser.add_argument('-baseline', type=str, default=None,
+                        help='JSON file with the results to use as baseline.')
+    parser.add_argument('-threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Fraction of increase of the time or memory considered a regression.')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    arguments = get_command_line_arguments()
+
+    benchmark_results = run_benchmarks(arguments.sizes,
+                                       arguments.vertices,
+                                       arguments.repeat,
+                                       arguments.nan_fraction,
+                                       arguments.operations)
+    save_results(benchmark_results, arguments.output)
+    log.info(f'Results stored in {arguments.output}')
+
+    if arguments.baseline is not None:
+        benchmark_comparison = compare_results(benchmark_results, load_results(arguments.baseline), arguments.threshold)
+        print(get_report(benchmark_comparison, arguments.threshold))
+
+        if any(row['STATUS'] == 'REGRESSION' for row in benchmark_comparison):
+            sys.exit(1)
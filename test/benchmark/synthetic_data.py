@@ -0,0 +1,161 @@
+#  BEGIN GPL LICENSE BLOCK
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  END GPL LICENSE BLOCK
+
+"""
+File with the functions that generate the synthetic maps and polygons used by the benchmarks.
+"""
+import math
+from typing import List, Tuple
+
+import numpy as np
+from netCDF4 import Dataset
+
+
+def create_synthetic_grid(size: int,
+                          nan_fraction: float = 0.05,
+                          number_of_holes: int = 10,
+                          seed: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Create a square grid with a smooth relief and circular holes of NaN values.
+
+    The grid covers the region [-10, 10] x [-10, 10]. The holes are placed randomly and their radius is calculated so
+    they cover approximately the fraction of the grid specified (the holes can overlap).
+
+    Args:
+        size: Number of values on every axis of the grid.
+        nan_fraction: Fraction of the grid to cover with NaN values.
+        number_of_holes: Number of holes of NaN values.
+        seed: Seed to use to place the holes and generate the noise of the relief.
+
+    Returns: Tuple with the values of the x-axis, the y-axis and the heights. (shapes (size,), (size,), (size, size))
+    """
+    random = np.random.default_rng(seed)
+
+    x = np.linspace(-10, 10, size)
+    y = np.linspace(-10, 10, size)
+
+    # Relief generated by rows to avoid creating temporal arrays with the shape of the grid
+    # -------------------------------------------------------------------------------------
+    z = np.empty((size, size), dtype=np.float32)
+    x_wave = np.sin(x * 0.7) * 500
+    for row in range(size):
+        z[row, :] = x_wave + np.cos(y[row] * 0.5) * 800 + np.sin((x + y[row]) * 2.3) * 50
+    z += random.normal(0, 5, size).astype(np.float32).reshape((1, -1))
+
+    # Holes of NaN values
+    # -------------------
+    if nan_fraction > 0 and number_of_holes > 0:
+        radius = int(math.ceil(size * math.sqrt(nan_fraction / (number_of_holes * math.pi))))
+        for center_row, center_col in random.integers(0, size, (number_of_holes, 2)):
+            min_row, max_row = max(center_row - radius, 0), min(center_row + radius + 1, size)
+            min_col, max_col = max(center_col - radius, 0), min(center_col + radius + 1, size)
+
+            rows, cols = np.ogrid[min_row:max_row, min_col:max_col]
+            hole = (rows - center_row) ** 2 + (cols - center_col) ** 2 <= radius ** 2
+            z[min_row:max_row, min_col:max_col][hole] = np.nan
+
+    return x, y, z
+
+
+def create_star_polygon(number_of_vertices: int,
+                        center: Tuple[float, float] = (0, 0),
+                        radius: float = 5,
+                        seed: int = 0) -> List[List[float]]:
+    """
+    Create a simple polygon with the number of vertices specified.
+
+    The vertices are placed in increasing angles around the center with a random distance to it, so the polygon never
+    intersects itself.
+
+    Args:
+        number_of_vertices: Number of vertices of the polygon. (minimum 3)
+        center: Center of the polygon.
+        radius: Maximum distance from the center to the vertices.
+        seed: Seed to use to calculate the distance of the vertices to the center.
+
+    Returns: List with the points of the polygon. [[x,y],[x,y],...]
+    """
+    random = np.random.default_rng(seed)
+
+    angles = np.linspace(0, 2 * np.pi, number_of_vertices, endpoint=False)
+    distances = random.uniform(0.5, 1, number_of_vertices) * radius
+
+    x = center[0] + distances * np.cos(angles)
+    y = center[1] + distances * np.sin(angles)
+
+    return np.column_stack((x, y)).tolist()
+
+
+def get_flat_point_list(point_list: List[List[float]], height: float = 0) -> List[float]:
+    """
+    Get the points of a polygon in the format used by the scene and the geometrical operations.
+
+    Args:
+        point_list: List with the points of the polygon. [[x,y],[x,y],...]
+        height: Value to use as the third component of the points.
+
+    Returns: List with the points of the polygon. [x1, y1, z1, x2, y2, z2, ...]
+    """
+    flat_list = []
+    for x, y in point_list:
+        flat_list.extend([x, y, height])
+    return flat_list
+
+
+def get_grid_vertices(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+    """
+    Get the vertices of a grid in the format used by the geometrical operations.
+
+    Args:
+        x: Values of the x-axis of the grid. (shape (cols,))
+        y: Values of the y-axis of the grid. (shape (rows,))
+        z: Heights of the grid. (shape (rows, cols))
+
+    Returns: Array with the vertices of the grid. (shape (rows, cols, 3))
+    """
+    vertices = np.zeros((len(y), len(x), 3))
+    vertices[:, :, 0] = x.reshape((1, -1))
+    vertices[:, :, 1] = y.reshape((-1, 1))
+    vertices[:, :, 2] = z
+    return vertices
+
+
+def write_netcdf_file(filename: str, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> None:
+    """
+    Write a grid in a netcdf file that can be read by the program.
+
+    Args:
+        filename: Name of the file to create.
+        x: Values of the x-axis of the grid. (shape (cols,))
+        y: Values of the y-axis of the grid. (shape (rows,))
+        z: Heights of the grid. (shape (rows, cols))
+
+    Returns: None
+    """
+    root_grp = Dataset(filename, 'w', format='NETCDF4')
+    root_grp.createDimension('lon', len(x))
+    root_grp.createDimension('lat', len(y))
+
+    lon = root_grp.createVariable('lon', np.float64, ('lon',))
+    lat = root_grp.createVariable('lat', np.float64, ('lat',))
+    height = root_grp.createVariable('z', np.float32, ('lat', 'lon'))
+
+    lon[:] = x
+    lat[:] = y
+    height[:] = z
+
+    root_grp.close()
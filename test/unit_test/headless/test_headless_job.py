@@ -0,0 +1,207 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+Module in charge of the testing of the jobs applied over the maps without creating a window.
+"""
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.error.headless_job_error import HeadlessJobError
+from src.error.polygon_error import PolygonError
+from src.headless.headless_engine import HeadlessEngine
+from src.headless.headless_job import HeadlessJob, read_job_file, run_job
+from src.headless.headless_polygon import HeadlessPolygon
+from src.input.NetCDF import read_info
+from src.output.shapefile_exporter import ShapefileExporter
+
+MAP_FILE = os.path.abspath('resources/test_resources/netcdf/test_file_50_50.nc')
+
+
+def create_square_points(min_x: float, min_y: float, size: float) -> list:
+    """
+    Create the points of a square.
+
+    Args:
+        min_x: Minimum x-coordinate of the square.
+        min_y: Minimum y-coordinate of the square.
+        size: Length of the sides of the square.
+
+    Returns: List with the points. [x1, y1, z1, x2, y2, z2, ...]
+    """
+    return [min_x, min_y, 0, min_x + size, min_y, 0, min_x + size, min_y + size, 0, min_x, min_y + size, 0]
+
+
+class TestHeadlessPolygon(unittest.TestCase):
+
+    def test_planar_polygon(self):
+        polygon = HeadlessPolygon('Polygon 0', [(0, 0), (1, 0), (1, 1), (0, 1)], {'a': 1.0})
+        self.assertTrue(polygon.is_planar())
+        self.assertEqual([0, 0, 0.5, 1, 0, 0.5, 1, 1, 0.5, 0, 1, 0.5], polygon.get_point_list())
+        self.assertEqual([('a', 1.0)], polygon.get_parameter_list())
+
+    def test_not_planar_polygon(self):
+        polygon = HeadlessPolygon('Polygon 0', [(0, 0), (1, 0), (0, 1), (1, 1)])
+        self.assertFalse(polygon.is_planar())
+
+    def test_repeated_points(self):
+        with self.assertRaises(PolygonError) as e:
+            HeadlessPolygon('Polygon 0', [(0, 0), (1, 0), (1, 1), (1, 0)])
+        self.assertIn(e.exception.code, [0, 1])
+
+
+class TestHeadlessEngine(unittest.TestCase):
+
+    def test_load_model(self):
+        engine = HeadlessEngine()
+        model_id = engine.create_model_from_file(MAP_FILE)
+
+        x, y, z = read_info(MAP_FILE)
+        vertices = engine.scene.get_map2d_model_vertices_array(model_id)
+        np.testing.assert_array_equal(x, vertices[0, :, 0])
+        np.testing.assert_array_equal(y, vertices[:, 0, 1])
+        np.testing.assert_array_equal(z, vertices[:, :, 2])
+
+    def test_export_model(self):
+        engine = HeadlessEngine()
+        model_id = engine.create_model_from_file(MAP_FILE)
+        engine.scene.get_map2d_model_vertices_array(model_id)[:, :, 2] += 10
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = engine.export_model_as_netcdf(model_id, os.path.join(directory, 'exported'))
+            self.assertEqual(os.path.join(directory, 'exported.nc'), filename)
+
+            np.testing.assert_array_almost_equal(read_info(MAP_FILE)[2] + 10, read_info(filename)[2])
+
+
+class TestHeadlessJob(unittest.TestCase):
+
+    def setUp(self) -> None:
+        """
+        Create a directory with a shapefile file with two polygons with the heights stored in their parameters.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        ShapefileExporter().export_list_of_polygons([create_square_points(5.5, 5.5, 10),
+                                                     create_square_points(30.5, 30.5, 10)],
+                                                    [{'min_height': 100.0, 'max_height': 200.0},
+                                                     {'min_height': -50.0, 'max_height': -10.0}],
+                                                    ['Polygon 0', 'Polygon 1'],
+                                                    os.path.join(self.directory.name, 'polygons'))
+
+    def tearDown(self) -> None:
+        """
+        Delete the directory used by the tests.
+        """
+        self.directory.cleanup()
+
+    def __write_job(self, job_data: dict) -> str:
+        """
+        Write a job file in the directory of the test.
+
+        Args:
+            job_data: Data of the job.
+
+        Returns: Name of the job file.
+        """
+        filename = os.path.join(self.directory.name, 'job.json')
+        with open(filename, 'w') as job_file:
+            json.dump(job_data, job_file)
+        return filename
+
+    def test_run_job(self):
+        job_filename = self.__write_job({
+            'inputs': [MAP_FILE],
+            'output_directory': 'output',
+            'steps': [
+                {'operation': 'load_polygons', 'file': 'polygons.shp', 'group': 'squares'},
+                {'operation': 'linear_transformation', 'group': 'squares',
+                 'min_height_parameter': 'min_height', 'max_height_parameter': 'max_height'},
+                {'operation': 'export', 'suffix': '_modified'}
+            ]
+        })
+
+        results = run_job(job_filename, processes=1)
+        self.assertEqual(1, len(results))
+        self.assertIsNone(results[0]['error'])
+
+        output_file = os.path.join(self.directory.name, 'output', 'test_file_50_50_modified.nc')
+        self.assertEqual([output_file], results[0]['outputs'])
+
+        original_heights = read_info(MAP_FILE)[2]
+        heights = read_info(output_file)[2]
+        self.assertAlmostEqual(100, np.min(heights[6:16, 6:16]), 3)
+        self.assertAlmostEqual(200, np.max(heights[6:16, 6:16]), 3)
+        self.assertAlmostEqual(-50, np.min(heights[31:41, 31:41]), 3)
+        self.assertAlmostEqual(-10, np.max(heights[31:41, 31:41]), 3)
+        np.testing.assert_array_equal(original_heights[20:30, :], heights[20:30, :])
+
+    def test_run_job_many_processes(self):
+        with open(os.path.join(self.directory.name, 'copy.nc'), 'wb') as copy_file, open(MAP_FILE, 'rb') as map_file:
+            copy_file.write(map_file.read())
+
+        job_filename = self.__write_job({
+            'inputs': [MAP_FILE, '*.nc', 'non_existent_directory/*.nc'],
+            'steps': [
+                {'operation': 'load_polygons', 'file': 'polygons.shp'},
+                {'operation': 'fill_nan'},
+                {'operation': 'export', 'directory': 'output'}
+            ]
+        })
+        self.assertEqual(sorted([MAP_FILE, os.path.join(self.directory.name, 'copy.nc')]),
+                         read_job_file(job_filename).get_input_files())
+
+        results = run_job(job_filename, processes=2)
+        self.assertEqual([None, None], [result['error'] for result in results])
+        for result in results:
+            heights = read_info(result['outputs'][0])[2]
+            self.assertTrue(np.all(np.isnan(heights[6:16, 6:16])))
+            self.assertFalse(np.any(np.isnan(heights[20:30, :])))
+
+    def test_error_in_step(self):
+        job_filename = self.__write_job({
+            'inputs': [MAP_FILE],
+            'steps': [{'operation': 'fill_nan', 'group': 'non existent group'}]
+        })
+
+        results = run_job(job_filename, processes=1)
+        self.assertIsNotNone(results[0]['error'])
+        self.assertEqual([], results[0]['outputs'])
+
+    def test_bad_job_files(self):
+        with self.assertRaises(HeadlessJobError) as e:
+            HeadlessJob({'inputs': [MAP_FILE]})
+        self.assertEqual(2, e.exception.code)
+
+        with self.assertRaises(HeadlessJobError) as e:
+            HeadlessJob({'inputs': [MAP_FILE], 'steps': [{'operation': 'non existent operation'}]})
+        self.assertEqual(3, e.exception.code)
+
+        with self.assertRaises(HeadlessJobError) as e:
+            run_job(self.__write_job({'inputs': ['non_existent_file.nc'], 'steps': [{'operation': 'export'}]}))
+        self.assertEqual(4, e.exception.code)
+
+        with self.assertRaises(HeadlessJobError) as e:
+            read_job_file(os.path.join(self.directory.name, 'non_existent_job.json'))
+        self.assertEqual(1, e.exception.code)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -90,5 +90,34 @@ class TestDebugArgument(unittest.TestCase):
             sys.argv = saved_argv
 
 
+class TestJobArgument(unittest.TestCase):
+
+    def test_job_default(self):
+        saved_argv = sys.argv
+
+        try:
+            sys.argv = ['./main.py']
+
+            arguments = get_command_line_arguments()
+            self.assertIsNone(arguments.job)
+            self.assertIsNone(arguments.processes)
+
+        finally:
+            sys.argv = saved_argv
+
+    def test_job_value(self):
+        saved_argv = sys.argv
+
+        try:
+            sys.argv = ['./main.py', '-job', 'job.json', '-processes', '4']
+
+            arguments = get_command_line_arguments()
+            self.assertEqual('job.json', arguments.job)
+            self.assertEqual(4, arguments.processes)
+
+        finally:
+            sys.argv = saved_argv
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -117,6 +117,19 @@ class TestCamera(unittest.TestCase):
         equal_array = expected_matrix == view_matrix
         self.assertTrue(equal_array.all())
 
+    def test_camera_view_matrix_cached(self):
+        camera = Camera()
+        view_matrix = camera.get_view_matrix()
+        self.assertIs(view_matrix, camera.get_view_matrix(), 'Matrix must not be generated if the camera not changed.')
+
+        camera.modify_radius(10)
+        new_view_matrix = camera.get_view_matrix()
+        self.assertIsNot(view_matrix, new_view_matrix, 'Matrix must be generated again after changing the camera.')
+        self.assertFalse(np.array_equal(view_matrix, new_view_matrix))
+
+        camera.reset_values()
+        np.testing.assert_array_equal(view_matrix, camera.get_view_matrix())
+
 
 if __name__ == '__main__':
     unittest.main()
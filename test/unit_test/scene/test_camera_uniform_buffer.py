@@ -0,0 +1,56 @@
+#  BEGIN GPL LICENSE BLOCK
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  END GPL LICENSE BLOCK
+
+"""
+Module with the tests related to the uniform buffer used to share the matrices of the scene with the shaders.
+"""
+
+import unittest
+
+import numpy as np
+
+from src.engine.scene.camera_uniform_buffer import CameraUniformBuffer
+
+
+class TestCameraUniformBuffer(unittest.TestCase):
+
+    def test_outdated_values(self):
+        uniform_buffer = CameraUniformBuffer()
+        projection = np.arange(16, dtype=np.float32).reshape((4, 4))
+
+        uniform_buffer.set_projection_matrix_2D(projection)
+        uniform_buffer.set_viewport(0, 0, 800, 600)
+        outdated_data = uniform_buffer.get_outdated_data()
+
+        self.assertEqual({'projection_2d', 'viewport'}, set(outdated_data.keys()),
+                         'Only the values set must be outdated.')
+        self.assertEqual(192, outdated_data['viewport'][0])
+        np.testing.assert_array_equal([0, 0, 800, 600], np.frombuffer(outdated_data['viewport'][1], dtype=np.float32))
+
+    def test_matrices_column_major(self):
+        uniform_buffer = CameraUniformBuffer()
+        view = np.arange(16, dtype=np.float32).reshape((4, 4))
+        uniform_buffer.set_view_matrix(view)
+
+        offset, data = uniform_buffer.get_outdated_data()['view']
+        self.assertEqual(128, offset)
+        np.testing.assert_array_equal(view.T.reshape(-1), np.frombuffer(data, dtype=np.float32),
+                                      'Matrices must be stored in column-major order.')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -23,7 +23,10 @@ import unittest
 
 import numpy as np
 
-from src.engine.scene.geometrical_operations import get_max_min_inside_polygon, merge_matrices
+from skimage.filters import gaussian
+
+from src.engine.scene.geometrical_operations import filter_in_row_blocks, generate_mask, get_effective_areas, \
+    get_max_min_inside_polygon, get_region_indexes, get_row_blocks, interpolate_nan, merge_matrices
 
 
 class TestMinMaxPolygon(unittest.TestCase):
@@ -169,5 +172,84 @@ class TestMergeMatrices(unittest.TestCase):
                                       "Matrix generated is not equal to the expected.")
 
 
+class TestEffectiveAreas(unittest.TestCase):
+
+    def test_effective_areas(self):
+        points = np.array([[0, 0, 0.5],
+                           [1, 0, 0.5],
+                           [2, 0.1, 0.5],
+                           [3, 0, 0.5],
+                           [4, 5, 0.5]])
+
+        np.testing.assert_allclose([np.inf, 0.05, 0.15, 7.5, np.inf], get_effective_areas(points),
+                                   err_msg='Areas must be calculated using the neighbours at the moment of removal.')
+
+    def test_areas_non_decreasing(self):
+        points = np.array([[0, 0], [1, 1], [2, 0], [3, 1], [4, 0.5]])
+        areas = get_effective_areas(points)
+
+        np.testing.assert_allclose([np.inf, 1, 1, 0.75, np.inf], areas,
+                                   err_msg='Area of the point removed after a point with a bigger area must be raised.')
+        self.assertTrue(np.all(np.isinf(get_effective_areas(points[:2]))), 'Lines with 2 points can not be simplified.')
+
+
+class TestRegionIndexes(unittest.TestCase):
+
+    def test_region_indexes(self):
+        x, y = np.meshgrid(np.arange(10), np.arange(20))
+        points_array = np.dstack((x, y, np.zeros((20, 10))))
+
+        self.assertEqual((0, 20, 0, 10), get_region_indexes(points_array, None), 'None must select the whole matrix.')
+        self.assertEqual((2, 9, 1, 6), get_region_indexes(points_array, (2, 3, 4.5, 7.5)))
+        self.assertEqual((0, 20, 0, 10), get_region_indexes(points_array, (-5, -5, 50, 50)))
+
+    def test_region_indexes_outside(self):
+        x, y = np.meshgrid(np.arange(10), np.arange(20))
+        points_array = np.dstack((x, y, np.zeros((20, 10))))
+
+        for area in [(100, 100, 200, 200), (-20, -20, -10, -10), (2, 30, 4, 40), (-5, 2, -1, 4)]:
+            min_row, max_row, min_col, max_col = get_region_indexes(points_array, area)
+            self.assertEqual(min_row, max_row, f'Areas outside the matrix must not select rows. Area: {area}')
+            self.assertEqual(min_col, max_col, f'Areas outside the matrix must not select columns. Area: {area}')
+            self.assertEqual(0, points_array[min_row:max_row, min_col:max_col].size)
+
+        self.assertEqual((18, 20, 8, 10), get_region_indexes(points_array, (9, 19, 100, 100)),
+                         'Areas that touch the last points of the matrix must select them.')
+
+
+class TestRowBlocks(unittest.TestCase):
+
+    def test_row_blocks(self):
+        self.assertEqual([(0, 3), (3, 6), (6, 7)], get_row_blocks(7, 10, 30))
+        self.assertEqual([(0, 1), (1, 2)], get_row_blocks(2, 100, 30), 'Blocks must have at least one row.')
+        self.assertEqual([], get_row_blocks(0, 10, 30))
+
+    def test_generate_mask_progress(self):
+        x, y = np.meshgrid(np.arange(1000), np.arange(600))
+        points_array = np.dstack((x, y, np.zeros((600, 1000))))
+
+        progress = []
+        mask = generate_mask(points_array, [100, 100, 0, 900, 100, 0, 900, 500, 0, 100, 500, 0], progress.append)
+        self.assertEqual(399 * 799, np.count_nonzero(mask))
+        self.assertEqual([1 / 3, 2 / 3, 1], progress, 'Progress must be reported after every block of rows.')
+
+    def test_interpolate_nan_progress(self):
+        heights = np.random.RandomState(0).rand(30, 30)
+        heights[10:20, 10:20] = np.nan
+
+        progress = []
+        interpolated = interpolate_nan(heights, np.isnan(heights), 'linear', progress.append, points_per_block=40)
+        self.assertFalse(np.isnan(interpolated).any())
+        self.assertEqual([0.4, 0.8, 1], progress, 'Progress must be reported after every block of points.')
+
+    def test_filter_in_row_blocks(self):
+        heights = np.random.RandomState(0).rand(600, 1000)
+
+        progress = []
+        np.testing.assert_allclose(gaussian(heights), filter_in_row_blocks(heights, gaussian, 4, progress.append),
+                                   err_msg='Filtering by blocks must give the same result as filtering the whole array.')
+        self.assertEqual([1 / 3, 2 / 3, 1], progress)
+
+
 if __name__ == '__main__':
     unittest.main()
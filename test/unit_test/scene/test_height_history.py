@@ -0,0 +1,135 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+Module in charge of the testing of the history used to undo and redo the modifications of the heights of the maps.
+"""
+
+import unittest
+
+import numpy as np
+
+from src.engine.scene.height_history import HeightDelta, HeightHistory, compress_heights, decompress_heights
+
+
+def get_vertices(rows: int = 50, cols: int = 40) -> np.ndarray:
+    x, y = np.meshgrid(np.arange(cols, dtype=np.float32), np.arange(rows, dtype=np.float32))
+    return np.dstack((x, y, np.sin(x / 5) * np.cos(y / 7)))
+
+
+class TestCompressHeights(unittest.TestCase):
+
+    def test_compress_heights(self):
+        heights = get_vertices()[10:20, 5:30, 2]
+        heights[0, 0] = np.nan
+
+        data = compress_heights(heights)
+        np.testing.assert_array_equal(heights, decompress_heights(data, heights.shape, heights.dtype))
+        self.assertLess(len(data), heights.nbytes)
+
+
+class TestHeightHistory(unittest.TestCase):
+
+    def setUp(self) -> None:
+        """Setup parameters before each test"""
+        self.models = {'0': get_vertices(), '1': get_vertices(20, 20)}
+        self.original_heights = self.models['0'][:, :, 2].copy()
+
+    def modify(self, history: HeightHistory, model_id: str, region: tuple, value: float) -> None:
+        min_row, max_row, min_col, max_col = region
+        vertices = self.models[model_id]
+        history.add(HeightDelta(model_id, vertices.shape[:2], region,
+                                vertices[min_row:max_row, min_col:max_col, 2].copy()))
+        vertices[min_row:max_row, min_col:max_col, 2] = value
+
+    def test_undo_redo(self):
+        history = HeightHistory(1024 * 1024)
+        self.modify(history, '0', (5, 10, 5, 10), 1)
+        self.modify(history, '0', (8, 20, 0, 7), 2)
+        modified_heights = self.models['0'][:, :, 2].copy()
+
+        self.assertEqual('0', history.get_undo_model_id())
+        self.assertEqual(('0', (8, 20, 0, 7)), history.undo(self.models.get))
+        self.assertEqual(('0', (5, 10, 5, 10)), history.undo(self.models.get))
+        self.assertIsNone(history.get_undo_model_id())
+        self.assertIsNone(history.undo(self.models.get), 'There must be nothing left to undo.')
+        np.testing.assert_array_equal(self.original_heights, self.models['0'][:, :, 2])
+
+        self.assertEqual('0', history.get_redo_model_id())
+        self.assertEqual(('0', (5, 10, 5, 10)), history.redo(self.models.get))
+        self.assertEqual(('0', (8, 20, 0, 7)), history.redo(self.models.get))
+        self.assertIsNone(history.get_redo_model_id())
+        self.assertFalse(history.can_redo())
+        np.testing.assert_array_equal(modified_heights, self.models['0'][:, :, 2])
+
+    def test_new_modification_clears_redo(self):
+        history = HeightHistory(1024 * 1024)
+        self.modify(history, '0', (5, 10, 5, 10), 1)
+        history.undo(self.models.get)
+        self.assertTrue(history.can_redo())
+
+        self.modify(history, '0', (0, 3, 0, 3), 2)
+        self.assertFalse(history.can_redo(), 'Modifications undone can not be redone after a new modification.')
+
+    def test_memory_budget(self):
+        history = HeightHistory(0)
+        self.modify(history, '0', (0, 50, 0, 40), 1)
+        self.modify(history, '0', (10, 20, 10, 20), 2)
+
+        self.assertEqual(0, history.get_memory_used(), 'Deltas over the budget must be moved to files.')
+
+        history.undo(self.models.get)
+        history.undo(self.models.get)
+        np.testing.assert_array_equal(self.original_heights, self.models['0'][:, :, 2],
+                                      'Heights must be read from the files.')
+
+        history.clear()
+        self.assertFalse(history.can_redo())
+
+    def test_remove_model(self):
+        history = HeightHistory(0)
+        delta = HeightDelta('0', (50, 40), (0, 1, 0, 1), np.zeros((1, 1)))
+        history.add(delta)
+        self.assertTrue(delta.is_spilled())
+
+        history.remove_model('0')
+        self.assertFalse(history.can_undo())
+        history.clear()
+
+    def test_discard_removed_models(self):
+        history = HeightHistory(1024 * 1024)
+        self.modify(history, '0', (5, 10, 5, 10), 1)
+        self.modify(history, '1', (5, 10, 5, 10), 1)
+
+        self.models.pop('1')
+        self.models['0'] = get_vertices(10, 10)
+        self.assertIsNone(history.undo(self.models.get),
+                          'Modifications of models removed or with a different shape must be discarded.')
+
+    def test_max_entries(self):
+        history = HeightHistory(1024 * 1024, max_entries=2)
+        for value in range(4):
+            self.modify(history, '1', (0, 2, 0, 2), value)
+
+        self.assertEqual(('1', (0, 2, 0, 2)), history.undo(self.models.get))
+        self.assertEqual(('1', (0, 2, 0, 2)), history.undo(self.models.get))
+        self.assertFalse(history.can_undo())
+        np.testing.assert_array_equal(np.ones((2, 2)), self.models['1'][:2, :2, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
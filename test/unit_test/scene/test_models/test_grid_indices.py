@@ -0,0 +1,88 @@
+#  BEGIN GPL LICENSE BLOCK
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  END GPL LICENSE BLOCK
+
+"""
+Module in charge of the testing of the generation of indices of the grids.
+"""
+
+import unittest
+
+import numpy as np
+
+from src.engine.scene.model.grid_indices import PRIMITIVE_RESTART_INDEX, generate_grid_indices
+
+
+def get_triangles_from_strips(indices: np.ndarray) -> set:
+    """
+    Get the set of triangles (without considering the order of the vertices) defined by the strips.
+
+    Args:
+        indices: Indices of the strips.
+
+    Returns: Set with the triangles.
+    """
+    triangles = set()
+    strip = []
+    for index in list(indices) + [PRIMITIVE_RESTART_INDEX]:
+        if index == PRIMITIVE_RESTART_INDEX:
+            for position in range(len(strip) - 2):
+                triangles.add(frozenset(strip[position:position + 3]))
+            strip = []
+        else:
+            strip.append(int(index))
+    return triangles
+
+
+class TestGridIndices(unittest.TestCase):
+
+    def test_list_of_triangles(self):
+        indices = generate_grid_indices(np.array([0, 1]), np.array([0, 2]), 3)
+        self.assertEqual(np.uint32, indices.dtype, 'Indices must be of type uint32.')
+        np.testing.assert_array_equal([0, 2, 3, 2, 5, 3], indices)
+
+    def test_drop_nan_triangles(self):
+        nan_mask = np.array([[True, True, False],
+                             [True, False, False]])
+        indices = generate_grid_indices(np.array([0, 1]), np.array([0, 1, 2]), 3, nan_mask)
+
+        # only the first triangle of the first cell has all their vertices NaN
+        np.testing.assert_array_equal([1, 4, 3,
+                                       1, 2, 4, 2, 5, 4],
+                                      indices)
+
+    def test_triangle_strips(self):
+        rows = np.array([0, 1, 2])
+        cols = np.array([0, 1, 2, 3])
+        strips = generate_grid_indices(rows, cols, 4, triangle_strips=True)
+        triangles = generate_grid_indices(rows, cols, 4).reshape(-1, 3)
+
+        self.assertEqual(2 * (2 * 4 + 1), len(strips), 'Strips must use two indices per vertex and a restart index.')
+        self.assertEqual({frozenset(triangle) for triangle in triangles.tolist()}, get_triangles_from_strips(strips),
+                         'Strips do not generate the same triangles as the list of triangles.')
+
+    def test_triangle_strips_nan(self):
+        nan_mask = np.zeros((2, 6), dtype=bool)
+        nan_mask[:, 2:4] = True
+        strips = generate_grid_indices(np.array([0, 1]), np.arange(6), 6, nan_mask, triangle_strips=True)
+
+        # only the cell with the four vertices NaN is removed, splitting the strip in two
+        self.assertEqual(2, np.count_nonzero(strips == PRIMITIVE_RESTART_INDEX))
+        self.assertEqual(8, len(get_triangles_from_strips(strips)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#  BEGIN GPL LICENSE BLOCK
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  END GPL LICENSE BLOCK
+
+"""
+Module in charge of the testing of the height textures used to render the 2D maps as rasters.
+"""
+
+import unittest
+
+import numpy as np
+
+from src.engine.scene.model.height_texture import downsample_heights, generate_height_pyramid
+
+
+class TestDownsampleHeights(unittest.TestCase):
+
+    def test_downsample_mean(self):
+        heights = np.array([[1, 3, 5, 7],
+                            [1, 3, 5, 7]])
+        np.testing.assert_array_equal([[2, 6]], downsample_heights(heights),
+                                      'Values are not the mean of the blocks.')
+
+    def test_downsample_nan(self):
+        heights = np.array([[np.nan, 2, np.nan, np.nan],
+                            [np.nan, 4, np.nan, np.nan]])
+        np.testing.assert_array_equal([[3, np.nan]], downsample_heights(heights),
+                                      'NaN values must be ignored when calculating the mean.')
+
+    def test_downsample_odd_shape(self):
+        heights = np.array([[np.nan, 2, 4],
+                            [np.nan, np.nan, 6],
+                            [np.nan, np.nan, 8]])
+        np.testing.assert_array_equal([[5]], downsample_heights(heights),
+                                      'Last row and column must be added to the last block.')
+
+        heights = np.arange(181 * 361, dtype=np.float32).reshape((181, 361))
+        self.assertEqual((90, 180), downsample_heights(heights).shape, 'Size must be the half rounded down.')
+        self.assertEqual((1, 1), downsample_heights(np.ones((1, 1))).shape, 'Size must be at least 1.')
+
+
+class TestHeightPyramid(unittest.TestCase):
+
+    def test_pyramid_levels(self):
+        pyramid = generate_height_pyramid(np.zeros((10, 5)), 4096)
+        self.assertEqual([(10, 5), (5, 2), (2, 1), (1, 1)], [level.shape for level in pyramid],
+                         'Levels of the pyramid do not have the expected shape.')
+        self.assertEqual(np.float32, pyramid[0].dtype, 'Levels must be of type float32.')
+
+    def test_pyramid_odd_shape(self):
+        pyramid = generate_height_pyramid(np.zeros((181, 361)), 4096)
+        for level, level_heights in enumerate(pyramid):
+            self.assertEqual((max(1, 181 >> level), max(1, 361 >> level)), level_heights.shape,
+                             'Levels must have the size expected by OpenGL.')
+        self.assertEqual(9, len(pyramid))
+
+    def test_pyramid_max_texture_size(self):
+        pyramid = generate_height_pyramid(np.zeros((100, 20)), 32)
+        self.assertEqual((25, 5), pyramid[0].shape, 'First level must fit in the max texture size.')
+
+
+if __name__ == '__main__':
+    unittest.main()
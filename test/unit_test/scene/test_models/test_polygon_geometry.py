@@ -0,0 +1,73 @@
+#  BEGIN GPL LICENSE BLOCK
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  END GPL LICENSE BLOCK
+
+"""
+Module in charge of the testing of the class that stores the points of the polygons.
+"""
+
+import unittest
+
+import numpy as np
+
+from src.engine.scene.model.polygon_geometry import PolygonGeometry
+
+
+class TestPolygonGeometry(unittest.TestCase):
+
+    def test_capacity_doubled(self):
+        geometry = PolygonGeometry(initial_capacity=2)
+        geometry.append(0, 0, 0.5)
+        geometry.append(1, 0, 0.5)
+        self.assertEqual(2, geometry.get_capacity())
+
+        geometry.append(1, 1, 0.5)
+        self.assertEqual(4, geometry.get_capacity(), 'Capacity must be doubled when there is no space.')
+        self.assertEqual([0, 0, 0.5, 1, 0, 0.5, 1, 1, 0.5], geometry.get_point_list())
+
+        geometry.extend(np.zeros((6, 3)))
+        self.assertEqual(16, geometry.get_capacity())
+        self.assertEqual(9, geometry.get_number_of_points())
+
+    def test_initial_points(self):
+        points = np.array([[0, 0, 0.5], [1, 0, 0.5], [1, 1, 0.5]])
+        geometry = PolygonGeometry(points)
+
+        np.testing.assert_array_equal(points, geometry.get_points())
+        self.assertEqual(3, geometry.get_number_of_points())
+
+    def test_pop(self):
+        geometry = PolygonGeometry(np.array([[0, 0, 0.5], [1, 0, 0.5]]))
+        geometry.pop()
+        geometry.pop()
+        geometry.pop()
+
+        self.assertEqual([], geometry.get_point_list(), 'Pop must do nothing if there is no points.')
+        self.assertEqual(0, geometry.get_number_of_points())
+
+    def test_memory_usage(self):
+        geometry = PolygonGeometry(np.array([[0, 0, 0.5], [1, 0, 0.5]]), initial_capacity=4)
+        self.assertEqual({'CPU': 4 * 3 * 8, 'GPU': 0}, geometry.get_memory_usage(),
+                         'The buffer does not use memory before being created.')
+
+    def test_outdated_range(self):
+        geometry = PolygonGeometry(np.array([[0, 0, 0.5], [1, 0, 0.5]]), initial_capacity=4)
+        self.assertEqual((0, 2, True), geometry.get_outdated_range(),
+                         'All the points must be sent when the buffer does not exist.')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+#  BEGIN GPL LICENSE BLOCK
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  END GPL LICENSE BLOCK
+
+"""
+Module in charge of the testing of the packing of the polygons drawn by the PolygonLayer.
+"""
+
+import unittest
+
+import numpy as np
+
+from src.engine.scene.model.polygon_layer import get_polygon_depths, get_simplification_area, pack_polygon_geometry
+
+
+class TestPackPolygonGeometry(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.triangle = np.array([[0, 0, 0.5], [1, 0, 0.5], [1, 1, 0.5]])
+        self.line = np.array([[5, 5, 0.5], [6, 6, 0.5]])
+        self.point = np.array([[9, 9, 0.5]])
+
+    def test_vertices_and_vertex_data(self):
+        vertices, vertex_data, _, _ = pack_polygon_geometry([self.triangle, self.line, self.point])
+
+        np.testing.assert_array_equal(np.concatenate((self.triangle, self.line, self.point)), vertices)
+        np.testing.assert_array_equal([0, 0, 0, 1, 1, 2], vertex_data[:, 0], 'Vertices must store their polygon.')
+        np.testing.assert_array_equal([0, 1, 2, 0, 2, 0], vertex_data[:, 1],
+                                      'First, normal and last points must be identified.')
+
+    def test_indices_and_ranges(self):
+        _, _, indices, ranges = pack_polygon_geometry([self.triangle, self.line, self.point])
+
+        np.testing.assert_array_equal([0, 1, 1, 2, 3, 4,  # lines
+                                       2, 0,  # last line of the triangle
+                                       0, 1, 2, 3, 4, 5],  # points
+                                      indices)
+
+        np.testing.assert_array_equal([[0, 4], [6, 2], [8, 3]], ranges[0])
+        np.testing.assert_array_equal([[4, 2], [8, 0], [11, 2]], ranges[1])
+        np.testing.assert_array_equal([[6, 0], [8, 0], [13, 1]], ranges[2])
+
+    def test_empty_polygons(self):
+        vertices, vertex_data, indices, ranges = pack_polygon_geometry([np.zeros((0, 3)), self.line])
+
+        self.assertEqual((2, 3), vertices.shape)
+        np.testing.assert_array_equal([1, 1], vertex_data[:, 0])
+        np.testing.assert_array_equal([0, 1, 0, 1], indices)
+        np.testing.assert_array_equal([[0, 0], [2, 0], [2, 0]], ranges[0])
+
+        vertices, _, indices, ranges = pack_polygon_geometry([])
+        self.assertEqual(0, len(vertices))
+        self.assertEqual(0, len(indices))
+        self.assertEqual((0, 3, 2), ranges.shape)
+
+
+class TestPolygonDepths(unittest.TestCase):
+
+    def test_depth_order(self):
+        depths = get_polygon_depths(4)
+
+        self.assertTrue(np.all(np.diff(depths) > 0), 'Polygons with higher priority must be closer to the camera.')
+        self.assertTrue(np.all(depths > -1) and np.all(depths < 1), 'Depths must be inside the clip volume.')
+
+
+
+class TestSimplificationArea(unittest.TestCase):
+
+    def test_simplification_area(self):
+        self.assertEqual(0, get_simplification_area(0.01, 0), 'Tolerance 0 must draw all the points.')
+        self.assertEqual(0.25 ** 2, get_simplification_area(0.3, 1), 'Pixel size must be rounded to a power of 2.')
+        self.assertEqual(get_simplification_area(0.3, 1), get_simplification_area(0.26, 1))
+        self.assertEqual(1, get_simplification_area(0.5, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
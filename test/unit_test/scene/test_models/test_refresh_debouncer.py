@@ -0,0 +1,84 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+Module in charge of the testing of the debouncer used by the maps to load the tiles after the view stops changing.
+"""
+
+import unittest
+
+from src.engine.scene.model.refresh_debouncer import RefreshDebouncer
+
+
+class TestRefreshDebouncer(unittest.TestCase):
+
+    def test_refresh_after_delay(self):
+        debouncer = RefreshDebouncer(0.5)
+
+        self.assertFalse(debouncer.update('view_1', 0))
+        self.assertTrue(debouncer.is_pending())
+        self.assertFalse(debouncer.update('view_1', 0.4))
+        self.assertTrue(debouncer.update('view_1', 0.5))
+        self.assertEqual('view_1', debouncer.get_refreshed_state())
+        self.assertFalse(debouncer.is_pending())
+
+        # The same state is not refreshed twice
+        self.assertFalse(debouncer.update('view_1', 10))
+
+    def test_coalesce_intermediate_states(self):
+        debouncer = RefreshDebouncer(0.5)
+
+        # The view changes every 0.1 seconds, so nothing is refreshed
+        for frame, state in enumerate(['view_1', 'view_2', 'view_3', 'view_4']):
+            self.assertFalse(debouncer.update(state, frame * 0.1))
+
+        self.assertFalse(debouncer.update('view_4', 0.7))
+        self.assertTrue(debouncer.update('view_4', 0.8))
+        self.assertEqual('view_4', debouncer.get_refreshed_state())
+
+    def test_mark_refreshed(self):
+        debouncer = RefreshDebouncer(0.5)
+        debouncer.mark_refreshed('view_1')
+
+        self.assertFalse(debouncer.is_pending())
+        self.assertFalse(debouncer.update('view_1', 1))
+        self.assertFalse(debouncer.update('view_1', 2))
+
+        self.assertFalse(debouncer.update('view_2', 3))
+        self.assertTrue(debouncer.update('view_2', 3.5))
+
+    def test_reset(self):
+        debouncer = RefreshDebouncer(0)
+        self.assertTrue(debouncer.update('view_1', 0))
+
+        debouncer.reset()
+        self.assertIsNone(debouncer.get_refreshed_state())
+        self.assertTrue(debouncer.update('view_1', 1))
+
+    def test_return_to_refreshed_state(self):
+        debouncer = RefreshDebouncer(0.5)
+        self.assertFalse(debouncer.update('view_1', 0))
+        self.assertTrue(debouncer.update('view_1', 1))
+
+        # Moving the view and returning to the refreshed one before the delay does not refresh it again
+        self.assertFalse(debouncer.update('view_2', 1.1))
+        self.assertFalse(debouncer.update('view_1', 1.2))
+        self.assertFalse(debouncer.update('view_1', 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
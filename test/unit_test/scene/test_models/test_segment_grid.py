@@ -0,0 +1,89 @@
+#  BEGIN GPL LICENSE BLOCK
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  END GPL LICENSE BLOCK
+
+"""
+Module in charge of the testing of the grid used to check the intersections of the lines of the polygons.
+"""
+
+import unittest
+
+import numpy as np
+from shapely.geometry import LineString
+
+from src.engine.scene.model.segment_grid import SegmentGrid, segments_intersect
+
+
+class TestSegmentsIntersect(unittest.TestCase):
+
+    def test_intersections(self):
+        self.assertTrue(segments_intersect((0, 0), (2, 2), (0, 2), (2, 0)), 'Crossing segments must intersect.')
+        self.assertTrue(segments_intersect((0, 0), (2, 0), (1, 0), (1, 1)), 'Touching segments must intersect.')
+        self.assertTrue(segments_intersect((0, 0), (2, 0), (1, 0), (3, 0)), 'Overlapping segments must intersect.')
+        self.assertFalse(segments_intersect((0, 0), (1, 0), (2, 0), (3, 0)))
+        self.assertFalse(segments_intersect((0, 0), (1, 1), (0, 1), (0.4, 0.6)))
+
+
+class TestSegmentGrid(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.grid = SegmentGrid()
+        for x, y in [(0, 0), (4, 0), (4, 4), (2, 4)]:
+            self.grid.add_point(x, y, 0.5)
+
+    def test_repeated_points(self):
+        self.assertTrue(self.grid.contains_point(4, 4, 0.5))
+        self.assertFalse(self.grid.contains_point(4, 4, 0))
+
+        self.grid.remove_last_point()
+        self.assertFalse(self.grid.contains_point(2, 4, 0.5), 'Removed points must not be stored.')
+        self.assertEqual(3, self.grid.get_number_of_points())
+
+    def test_new_segment(self):
+        self.assertTrue(self.grid.intersects_new_segment(2, -1), 'Line crossing the first line must intersect.')
+        self.assertTrue(self.grid.intersects_new_segment(3, 4), 'Line going back over the last line must intersect.')
+        self.assertFalse(self.grid.intersects_new_segment(0, 4))
+
+    def test_closing_segment(self):
+        self.assertFalse(self.grid.intersects_closing_segment())
+        self.assertFalse(self.grid.intersects_closing_segment(0, 4))
+        self.assertTrue(self.grid.intersects_closing_segment(5, 2), 'Closing line must cross the second line.')
+
+    def test_same_result_as_shapely(self):
+        random_state = np.random.RandomState(0)
+        grid = SegmentGrid()
+        points = []
+
+        for _ in range(300):
+            x, y = random_state.randint(0, 20, 2) / 2
+            if grid.contains_point(x, y, 0.5):
+                continue
+
+            if len(points) > 2:
+                intersects = not LineString(points + [(x, y)]).is_simple
+                self.assertEqual(intersects, grid.intersects_new_segment(x, y))
+                if intersects:
+                    continue
+
+                self.assertEqual(not LineString(points + [(x, y), points[0]]).is_simple,
+                                 grid.intersects_closing_segment(x, y))
+
+            grid.add_point(x, y, 0.5)
+            points.append((x, y))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#  BEGIN GPL LICENSE BLOCK
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  END GPL LICENSE BLOCK
+
+"""
+Module with the tests related to the cache of shader programs.
+
+Since the shader programs need an OpenGL context to be compiled, the tests need to create a full program to run.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.engine.scene.model.shader_cache import ShaderCache
+from test.test_case import ProgramTestCase
+
+
+class TestShaderCache(ProgramTestCase):
+
+    def test_programs_shared_between_polygons(self):
+        self.engine.create_new_polygon()
+        programs_used = ShaderCache.get_number_of_programs()
+
+        for _ in range(50):
+            self.engine.create_new_polygon()
+
+        self.assertEqual(programs_used, ShaderCache.get_number_of_programs(),
+                         'New programs were compiled for polygons using the same shaders.')
+
+    def test_same_files_same_program(self):
+        program = ShaderCache.get_program('./src/engine/shaders/model_2d_vertex.glsl',
+                                          './src/engine/shaders/model_2d_fragment.glsl')
+        self.assertEqual(program,
+                         ShaderCache.get_program('./src/engine/shaders/model_2d_vertex.glsl',
+                                                 './src/engine/shaders/model_2d_fragment.glsl'),
+                         'The program must be compiled only once.')
+
+    def test_clear_on_exit(self):
+        ShaderCache.get_program('./src/engine/shaders/model_2d_vertex.glsl',
+                                './src/engine/shaders/model_2d_fragment.glsl')
+        self.engine.exit()
+        self.assertEqual(0, ShaderCache.get_number_of_programs(), 'Cache must be cleared when closing the engine.')
+
+    def test_reload_changed_files(self):
+        directory = tempfile.mkdtemp()
+        vertex_file = os.path.join(directory, 'vertex.glsl')
+        fragment_file = os.path.join(directory, 'fragment.glsl')
+        shutil.copy('./src/engine/shaders/model_2d_vertex.glsl', vertex_file)
+        shutil.copy('./src/engine/shaders/model_2d_fragment.glsl', fragment_file)
+
+        program = ShaderCache.get_program(vertex_file, fragment_file)
+        self.assertEqual(0, ShaderCache.reload(), 'Programs with files not modified must not be reloaded.')
+        self.assertEqual(program, ShaderCache.get_program(vertex_file, fragment_file))
+
+        with open(fragment_file, 'a') as file:
+            file.write('\n// Modified\n')
+        self.assertEqual(program, ShaderCache.get_program(vertex_file, fragment_file),
+                         'Files must only be checked again when reloading the cache.')
+
+        self.assertEqual(1, ShaderCache.reload(), 'The program with the modified file was not reloaded.')
+        self.assertNotEqual(program, ShaderCache.get_program(vertex_file, fragment_file))
+
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+#  BEGIN GPL LICENSE BLOCK
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  END GPL LICENSE BLOCK
+
+"""
+Module in charge of the testing of the chunks used to render the 3D maps.
+"""
+
+import unittest
+
+import numpy as np
+
+from src.engine.scene.model.grid_indices import generate_grid_indices
+from src.engine.scene.model.terrain_chunks import TerrainChunks
+from src.engine.scene.model.tranformations.transformations import lookAt, perspective
+
+
+class TestTerrainChunks(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.x = np.arange(33, dtype=float)
+        self.y = np.arange(33, dtype=float)
+        self.heights = np.random.RandomState(0).rand(33, 33)
+        self.projection = perspective(30, 1.5, 0.1, 3000)
+
+    def test_chunk_size_increased(self):
+        chunks = TerrainChunks(1001, 1001, 10, max_chunks=100)
+        self.assertEqual(160, chunks.get_chunk_size(), 'Chunk size must be doubled until the max chunks is reached.')
+        self.assertEqual(49, chunks.get_number_of_chunks())
+
+    def test_single_chunk_indices(self):
+        chunks = TerrainChunks(5, 5, 4)
+        indices, skirt_indices = chunks.build(np.arange(5), np.arange(5), np.zeros((5, 5)))
+
+        self.assertEqual(0, len(chunks.get_skirt_vertices()), 'A single chunk must not have skirts.')
+        self.assertEqual(0, len(skirt_indices))
+        np.testing.assert_array_equal(generate_grid_indices(np.arange(5), np.arange(5), 5),
+                                      indices[:6 * 16],
+                                      'Level 0 of the chunk must use all the vertices of the grid.')
+
+    def test_skirt_vertices(self):
+        chunks = TerrainChunks(33, 33, 8)
+        indices, skirt_indices = chunks.build(self.x, self.y, self.heights)
+        skirt_vertices = chunks.get_skirt_vertices()
+
+        self.assertEqual(2 * 3 * 33, len(skirt_vertices), 'Every interior border must have a copy of its vertices.')
+        self.assertEqual(8 * 33, skirt_vertices[0])
+        self.assertEqual(33 * 33 - 1, np.max(indices), 'Indices of the grid must only use the vertices of the grid.')
+        self.assertEqual(2 * len(skirt_vertices) - 1, np.max(skirt_indices),
+                         'Skirts must use the vertices of the borders and their lowered copies.')
+        self.assertGreater(chunks.get_skirt_depth(), 0)
+        self.assertLessEqual(chunks.get_skirt_depth(), np.max(self.heights) - np.min(self.heights),
+                             'Skirts can not be deeper than the max error of the chunks.')
+
+    def test_select_level_from_distance(self):
+        chunks = TerrainChunks(33, 33, 8)
+        chunks.build(self.x, self.y, self.heights)
+
+        view_near = lookAt(np.array([16., -40, 30]), np.array([16., 16, 0]), np.array([0, 0, 1.]))
+        chunks_near, levels_near = chunks.select_chunks(view_near, self.projection, 700, 1, 2)
+        _, counts = chunks.get_index_ranges(chunks_near, levels_near)
+        self.assertEqual(16, len(chunks_near), 'All the chunks must be visible.')
+        self.assertTrue(np.all(counts == 6 * 8 * 8), 'Chunks near the camera must use the finest level.')
+
+        view_far = lookAt(np.array([16., -1500, 1000]), np.array([16., 16, 0]), np.array([0, 0, 1.]))
+        chunks_far, levels_far = chunks.select_chunks(view_far, self.projection, 700, 1, 2)
+        _, counts_far = chunks.get_index_ranges(chunks_far, levels_far)
+        self.assertTrue(np.all(counts_far < counts), 'Chunks far from the camera must use coarser levels.')
+
+    def test_frustum_culling(self):
+        chunks = TerrainChunks(33, 33, 8)
+        chunks.build(self.x, self.y, self.heights)
+
+        view_away = lookAt(np.array([16., -40, 30]), np.array([16., -80, 0]), np.array([0, 0, 1.]))
+        offsets, counts = chunks.select_chunks(view_away, self.projection, 700, 1, 2)
+        self.assertEqual(0, len(offsets), 'Chunks behind the camera must not be selected.')
+
+        view_corner = lookAt(np.array([-10., -10, 5]), np.array([-20., -20, 0]), np.array([0, 0, 1.]))
+        offsets, _ = chunks.select_chunks(view_corner, self.projection, 700, 1, 2)
+        self.assertEqual(0, len(offsets))
+
+    def test_nan_chunks_not_selected(self):
+        heights = self.heights.copy()
+        heights[:9, :9] = np.nan
+        chunks = TerrainChunks(33, 33, 8)
+        chunks.build(self.x, self.y, heights)
+
+        view = lookAt(np.array([16., -40, 30]), np.array([16., 16, 0]), np.array([0, 0, 1.]))
+        offsets, _ = chunks.select_chunks(view, self.projection, 700, 1, 2)
+        self.assertEqual(15, len(offsets), 'Chunks with only NaN values must not be drawn.')
+
+    def test_update_bounds(self):
+        chunks = TerrainChunks(33, 33, 8)
+        indices, _ = chunks.build(self.x, self.y, self.heights)
+        skirt_depth = chunks.get_skirt_depth()
+
+        chunks.update_bounds(self.x, self.y, self.heights * 10)
+        self.assertAlmostEqual(skirt_depth * 10, chunks.get_skirt_depth(),
+                               msg='Errors of the chunks must be calculated again with the new heights.')
+
+        new_chunks = TerrainChunks(33, 33, 8)
+        new_indices, _ = new_chunks.build(self.x, self.y, self.heights * 10)
+        np.testing.assert_array_equal(indices, new_indices)
+
+        view = lookAt(np.array([16., -40, 300]), np.array([16., 16, 0]), np.array([0, 0, 1.]))
+        np.testing.assert_array_equal(new_chunks.select_chunks(view, self.projection, 700, 1, 2),
+                                      chunks.select_chunks(view, self.projection, 700, 1, 2),
+                                      'Updating the bounds must give the same chunks as building them again.')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+#  BEGIN GPL LICENSE BLOCK
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  END GPL LICENSE BLOCK
+
+"""
+Module in charge of the testing of the tiles used to render the 2D maps.
+"""
+
+import unittest
+
+import numpy as np
+
+from src.engine.scene.model.tile_quadtree import TileLRUCache, TileQuadtree
+
+
+class TestTileQuadtree(unittest.TestCase):
+
+    def test_max_level(self):
+        self.assertEqual(0, TileQuadtree(5, 5, 4).get_max_level(), 'Grid of one tile must have only one level.')
+        self.assertEqual(2, TileQuadtree(17, 9, 4).get_max_level(), 'Max level is not the one covering the grid.')
+        self.assertEqual([(2, 0, 0)], TileQuadtree(17, 9, 4).get_root_tiles(), 'Root tiles are not correct.')
+
+    def test_level_from_step(self):
+        quadtree = TileQuadtree(1000, 1000, 10)
+        self.assertEqual(0, quadtree.get_level_from_step(1))
+        self.assertEqual(1, quadtree.get_level_from_step(3))
+        self.assertEqual(3, quadtree.get_level_from_step(8))
+        self.assertEqual(quadtree.get_max_level(), quadtree.get_level_from_step(100000),
+                         'Level can not be greater than the max level.')
+
+    def test_parent(self):
+        quadtree = TileQuadtree(100, 100, 4)
+        self.assertEqual((1, 2, 3), quadtree.get_parent((0, 5, 6)))
+        root = quadtree.get_root_tiles()[0]
+        self.assertEqual(root, quadtree.get_parent(root), 'Root tile must not have a parent.')
+
+    def test_tiles_in_range(self):
+        quadtree = TileQuadtree(10, 10, 4)
+        self.assertEqual([(0, 0, 1), (0, 0, 2), (0, 1, 1), (0, 1, 2)],
+                         quadtree.get_tiles_in_range(0, 0, 5, 5, 100),
+                         'Tiles returned are not the ones covering the range.')
+        self.assertEqual([(1, 0, 0), (1, 0, 1)],
+                         quadtree.get_tiles_in_range(1, -5, 3, 0, 9),
+                         'Range outside of the grid must be clipped.')
+
+    def test_tile_indices(self):
+        # grid of 3x3 vertices, tile of 2x2 cells using all the vertices
+        quadtree = TileQuadtree(3, 3, 2)
+        indices = quadtree.generate_tile_indices((0, 0, 0))
+        self.assertEqual(np.uint32, indices.dtype, 'Indices must be of type uint32.')
+        np.testing.assert_array_equal([0, 1, 3, 1, 4, 3,
+                                       1, 2, 4, 2, 5, 4,
+                                       3, 4, 6, 4, 7, 6,
+                                       4, 5, 7, 5, 8, 7],
+                                      indices)
+
+    def test_tile_indices_coarse_level(self):
+        # grid of 4x4 vertices, level 1 uses one of every two vertices but always include the border of the grid
+        quadtree = TileQuadtree(4, 4, 2)
+        indices = quadtree.generate_tile_indices((1, 0, 0))
+        np.testing.assert_array_equal([0, 2, 8, 2, 10, 8,
+                                       2, 3, 10, 3, 11, 10,
+                                       8, 10, 12, 10, 14, 12,
+                                       10, 11, 14, 11, 15, 14],
+                                      indices)
+
+    def test_tiles_cover_grid(self):
+        quadtree = TileQuadtree(23, 37, 4)
+        for level in range(quadtree.get_max_level() + 1):
+            tiles = quadtree.get_tiles_in_range(level, 0, 22, 0, 36)
+            indices = np.concatenate([quadtree.generate_tile_indices(key) for key in tiles])
+            self.assertEqual({0, 36, 22 * 37, 23 * 37 - 1},
+                             {0, 36, 22 * 37, 23 * 37 - 1}.intersection(indices),
+                             f'Tiles of level {level} do not reach the corners of the grid.')
+
+
+class TestTileLRUCache(unittest.TestCase):
+
+    def test_evict_least_recently_used(self):
+        cache = TileLRUCache(20)
+        cache.add((0, 0, 0), 10)
+        cache.add((0, 0, 1), 10)
+        cache.add((0, 0, 2), 10)
+        cache.touch((0, 0, 0))
+
+        self.assertEqual(30, cache.get_memory_used())
+        self.assertEqual([(0, 0, 1)], cache.get_keys_to_evict(), 'Tile evicted is not the least recently used.')
+
+    def test_evict_pinned_and_protected(self):
+        cache = TileLRUCache(0)
+        cache.add((2, 0, 0), 10, pinned=True)
+        cache.add((0, 0, 0), 10)
+        cache.add((0, 0, 1), 10)
+
+        self.assertEqual([(0, 0, 1)], cache.get_keys_to_evict([(0, 0, 0)]),
+                         'Pinned and protected tiles can not be evicted.')
+
+        cache.remove((0, 0, 1))
+        self.assertNotIn((0, 0, 1), cache)
+        self.assertEqual(20, cache.get_memory_used())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+#  BEGIN GPL LICENSE BLOCK
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  END GPL LICENSE BLOCK
+
+"""
+Module in charge of the testing of the index used by the scene to search the polygons by their location.
+"""
+
+import unittest
+
+import numpy as np
+
+from src.engine.scene.polygon_spatial_index import PolygonSpatialIndex, get_distance_to_polygon
+
+
+class PolygonPoints:
+    """
+    Object with the methods of the polygons used by the index.
+    """
+
+    def __init__(self, points: list):
+        self.points = np.array(points, dtype=np.float64).reshape((-1, 3))
+
+    def get_point_array(self) -> np.ndarray:
+        return self.points
+
+    def set_points(self, points: list) -> None:
+        self.points = np.array(points, dtype=np.float64).reshape((-1, 3))
+
+
+def get_square(x: float, y: float, size: float) -> list:
+    return [[x, y, 0.5], [x + size, y, 0.5], [x + size, y + size, 0.5], [x, y + size, 0.5]]
+
+
+class TestDistanceToPolygon(unittest.TestCase):
+
+    def test_distance(self):
+        square = np.array(get_square(0, 0, 2))
+        self.assertEqual(0, get_distance_to_polygon(1, 1, square), 'Points inside the polygon must have distance 0.')
+        self.assertEqual(0, get_distance_to_polygon(2, 1, square), 'Points over the lines must have distance 0.')
+        self.assertEqual(3, get_distance_to_polygon(5, 1, square))
+        self.assertEqual(5, get_distance_to_polygon(5, 6, square))
+
+
+class TestPolygonSpatialIndex(unittest.TestCase):
+
+    def test_queries(self):
+        index = PolygonSpatialIndex(node_capacity=4)
+        index.add_polygon('Polygon 0', PolygonPoints(get_square(0, 0, 2)))
+        index.add_polygon('Polygon 1', PolygonPoints(get_square(1, 1, 2)))
+        index.add_polygon('Polygon 2', PolygonPoints(get_square(10, 10, 1)))
+        index.add_polygon('Polygon 3', PolygonPoints([]))
+
+        self.assertEqual(['Polygon 0', 'Polygon 1'], index.get_polygons_on_point(1.5, 1.5))
+        self.assertEqual(['Polygon 1'], index.get_polygons_on_point(2.5, 2.5))
+        self.assertEqual([], index.get_polygons_on_point(5, 5))
+        self.assertEqual(['Polygon 1', 'Polygon 2'], index.get_polygons_in_bbox(2.5, 2.5, 10, 10))
+        self.assertEqual('Polygon 2', index.get_nearest(9, 12))
+        self.assertIsNone(index.get_bounding_box('Polygon 3'), 'Polygons without points must not be in the tree.')
+
+    def test_modifications(self):
+        index = PolygonSpatialIndex()
+        polygon = PolygonPoints(get_square(0, 0, 1))
+        index.add_polygon('Polygon 0', polygon)
+        self.assertEqual(['Polygon 0'], index.get_polygons_on_point(0.5, 0.5))
+
+        polygon.set_points(get_square(5, 5, 1))
+        self.assertEqual((0, 0, 1, 1), index.get_bounding_box('Polygon 0'),
+                         'Bounding boxes must only be calculated again for the polygons marked as modified.')
+
+        index.mark_polygon_modified('Polygon 0')
+        index.mark_polygon_modified('Polygon 1')
+        self.assertEqual([], index.get_polygons_on_point(0.5, 0.5), 'Index must use the new points of the polygon.')
+        self.assertEqual((5, 5, 6, 6), index.get_bounding_box('Polygon 0'))
+
+        index.remove_polygon('Polygon 0')
+        self.assertEqual([], index.get_polygons_in_bbox(0, 0, 10, 10))
+        self.assertIsNone(index.get_nearest(0, 0))
+
+    def test_many_polygons(self):
+        rng = np.random.default_rng(0)
+        index = PolygonSpatialIndex(node_capacity=4)
+
+        polygons = {}
+        for polygon_number in range(300):
+            x, y = rng.uniform(0, 100, 2)
+            polygons[f'Polygon {polygon_number}'] = PolygonPoints(get_square(x, y, rng.uniform(0.5, 5)))
+            index.add_polygon(f'Polygon {polygon_number}', polygons[f'Polygon {polygon_number}'])
+
+        self.assertEqual(6, index.get_depth(), 'Tree must have the levels needed to store 300 polygons in nodes of 4.')
+
+        for x, y in rng.uniform(-10, 110, (50, 2)):
+            expected_on_point = [polygon_id for polygon_id, polygon in polygons.items()
+                                 if get_distance_to_polygon(x, y, polygon.points) == 0]
+            expected_in_bbox = [polygon_id for polygon_id, polygon in polygons.items()
+                                if polygon.points[0, 0] <= x + 10 and polygon.points[2, 0] >= x and
+                                polygon.points[0, 1] <= y + 10 and polygon.points[2, 1] >= y]
+            distances = [get_distance_to_polygon(x, y, polygon.points) for polygon in polygons.values()]
+
+            self.assertEqual(expected_on_point, index.get_polygons_on_point(x, y))
+            self.assertEqual(expected_in_bbox, index.get_polygons_in_bbox(x, y, x + 10, y + 10))
+            self.assertEqual(min(distances),
+                             get_distance_to_polygon(x, y, polygons[index.get_nearest(x, y)].points))
+
+
+if __name__ == '__main__':
+    unittest.main()
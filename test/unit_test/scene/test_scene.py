@@ -20,7 +20,11 @@ import unittest
 
 import numpy as np
 
+from src.engine.engine import Engine
+from src.engine.scene.map_transformation.map_transformation import MapTransformation
+from src.engine.scene.scene import Scene
 from src.error.scene_error import SceneError
+from src.error.transformation_job_error import TransformationJobError
 from src.input.NetCDF import read_info
 from test.test_case import ProgramTestCase
 
@@ -300,5 +304,113 @@ class TestLoadedModelsList(ProgramTestCase):
                          'The fourth models is not assigned to the ID 3.')
 
 
+class FailingMapTransformation(MapTransformation):
+    """
+    Map transformation that raises an error after modifying the heights of the map.
+    """
+
+    def __init__(self, model_id: str, fail: bool = True):
+        super().__init__(model_id)
+        self.fail = fail
+        self.model_vertices = None
+
+    def initialize(self, scene) -> None:
+        super().initialize(scene)
+        self.model_vertices = scene.get_map2d_model_vertices_array(self.model_id)
+
+    def apply(self):
+        self.model_vertices[:, :, 2] += 1
+        if self.fail:
+            raise ValueError('Error in the transformation.')
+        return self.model_vertices
+
+
+class UndoMapTransformation(FailingMapTransformation):
+    """
+    Map transformation that tries to undo and redo the modifications of the heights while it is being applied.
+    """
+
+    def __init__(self, model_id: str):
+        super().__init__(model_id, fail=False)
+        self.errors = []
+        self.scene = None
+
+    def apply(self):
+        for action in (self.scene.undo_height_modification, self.scene.redo_height_modification):
+            try:
+                action()
+            except TransformationJobError as e:
+                self.errors.append(e)
+        return super().apply()
+
+    def initialize(self, scene) -> None:
+        super().initialize(scene)
+        self.scene = scene
+
+
+class TestTransformationJobs(ProgramTestCase):
+
+    def test_failed_transformation(self):
+        self.engine.create_model_from_file(COLOR_FILE_LOCATION, PATH_TO_MODEL_1)
+        model_id = self.engine.get_active_model_id()
+        heights = self.engine.scene.get_map2d_model_vertices_array(model_id)[:, :, 2].copy()
+
+        results = []
+        transformation = FailingMapTransformation(model_id)
+        transformation.initialize(self.engine.scene)
+        self.engine.scene.apply_map_transformation(transformation,
+                                                   lambda applied, error: results.append((applied, error)))
+
+        self.assertEqual(1, len(results), 'The then function must be called when the transformation fails.')
+        self.assertFalse(results[0][0])
+        self.assertIsInstance(results[0][1], ValueError)
+        np.testing.assert_array_equal(heights, self.engine.scene.get_map2d_model_vertices_array(model_id)[:, :, 2])
+
+        transformation = FailingMapTransformation(model_id, fail=False)
+        transformation.initialize(self.engine.scene)
+        self.engine.scene.apply_map_transformation(transformation,
+                                                   lambda applied, error: results.append((applied, error)))
+        self.assertEqual((True, None), results[1], 'The failed job must not block the next transformations.')
+
+    def test_undo_while_running(self):
+        self.engine.create_model_from_file(COLOR_FILE_LOCATION, PATH_TO_MODEL_1)
+        model_id = self.engine.get_active_model_id()
+        heights = self.engine.scene.get_map2d_model_vertices_array(model_id)[:, :, 2].copy()
+
+        transformation = FailingMapTransformation(model_id, fail=False)
+        transformation.initialize(self.engine.scene)
+        self.engine.scene.apply_map_transformation(transformation, lambda applied, error: None)
+        self.assertTrue(self.engine.scene.undo_height_modification())
+        self.engine.scene.redo_height_modification()
+
+        transformation = UndoMapTransformation(model_id)
+        transformation.initialize(self.engine.scene)
+        self.engine.scene.apply_map_transformation(transformation, lambda applied, error: None)
+        self.assertEqual([1], [error.code for error in transformation.errors],
+                         'The heights of a model can not be restored while a job is modifying them.')
+
+        self.assertTrue(self.engine.scene.undo_height_modification())
+        self.assertTrue(self.engine.scene.undo_height_modification())
+        np.testing.assert_array_equal(heights, self.engine.scene.get_map2d_model_vertices_array(model_id)[:, :, 2])
+
+
+class SettingsEngine:
+    """
+    Object with the methods of the engine used by the scene when it is created, without creating a window.
+    """
+
+    get_height_history_settings = Engine.get_height_history_settings
+    get_scene_setting_data = Engine.get_scene_setting_data
+
+
+class TestSceneCreation(unittest.TestCase):
+
+    def test_create_scene(self):
+        scene = Scene(SettingsEngine())
+        self.assertEqual([], scene.get_model_list())
+        self.assertFalse(scene.undo_height_modification(), 'A new scene must not have modifications to undo.')
+        self.assertFalse(scene.redo_height_modification(), 'A new scene must not have modifications to redo.')
+
+
 if __name__ == '__main__':
     unittest.main()
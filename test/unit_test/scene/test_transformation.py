@@ -19,11 +19,15 @@
 File with the tests related to the modifications of the height to the points inside the polygons.
 """
 import os
+import unittest
 import warnings
 
 import numpy as np
 
+from src.engine.scene.transformation.batch_transformation import group_disjoint_regions, regions_overlap
+from src.engine.scene.transformation.fill_nan_batch_transformation import FillNanBatchTransformation
 from src.engine.scene.transformation.fill_nan_transformation import FillNanTransformation
+from src.engine.scene.transformation.linear_batch_transformation import LinearBatchTransformation
 from src.engine.scene.transformation.linear_transformation import LinearTransformation
 from src.engine.scene.transformation.transformation import Transformation
 from src.error.transformation_error import TransformationError
@@ -344,3 +348,134 @@ class TestFillNanTransformation(ProgramTestCase):
             transformation.apply()
 
         self.assertEqual(3, e.exception.code, 'Error code is not 3.')
+
+
+class TestDisjointRegions(unittest.TestCase):
+
+    def test_regions_overlap(self):
+        self.assertTrue(regions_overlap((0, 10, 0, 10), (5, 15, 5, 15)))
+        self.assertTrue(regions_overlap((0, 10, 0, 10), (2, 3, 2, 3)))
+        self.assertFalse(regions_overlap((0, 10, 0, 10), (10, 20, 0, 10)), 'Regions only touch their limits.')
+        self.assertFalse(regions_overlap((0, 10, 0, 10), (0, 10, 20, 30)))
+
+    def test_group_disjoint_regions(self):
+        regions = [(0, 10, 0, 10),
+                   (5, 15, 5, 15),
+                   (20, 30, 20, 30),
+                   (8, 22, 8, 22),
+                   (40, 50, 40, 50)]
+
+        batches = group_disjoint_regions(regions)
+        self.assertEqual([[0, 2, 4], [1], [3]], batches)
+
+        for batch in batches:
+            for first in batch:
+                for second in batch:
+                    if first != second:
+                        self.assertFalse(regions_overlap(regions[first], regions[second]))
+
+    def test_group_no_regions(self):
+        self.assertEqual([], group_disjoint_regions([]))
+
+
+class TestBatchTransformation(ProgramTestCase):
+
+    def setUp(self) -> None:
+        """
+        Code executed before every test on the testcase.
+        """
+        super().setUp()
+        warnings.simplefilter('ignore', DeprecationWarning)
+
+    def __create_square_polygon(self, min_x: float, min_y: float, size: float) -> str:
+        """
+        Create a square polygon on the scene.
+
+        Args:
+            min_x: Minimum x-coordinate of the square.
+            min_y: Minimum y-coordinate of the square.
+            size: Length of the sides of the square.
+
+        Returns: ID of the polygon.
+        """
+        polygon_id = self.engine.create_new_polygon()
+        self.engine.set_active_polygon(polygon_id)
+        self.engine.add_new_vertex_to_active_polygon_using_real_coords(min_x, min_y)
+        self.engine.add_new_vertex_to_active_polygon_using_real_coords(min_x + size, min_y)
+        self.engine.add_new_vertex_to_active_polygon_using_real_coords(min_x + size, min_y + size)
+        self.engine.add_new_vertex_to_active_polygon_using_real_coords(min_x, min_y + size)
+        return polygon_id
+
+    def test_linear_batch_transformation(self):
+        self.engine.create_model_from_file('resources/test_resources/cpt/cpt_1.cpt',
+                                           'resources/test_resources/netcdf/test_file_50_50.nc')
+        model_id = self.engine.get_active_model_id()
+
+        polygon_list = [self.__create_square_polygon(5, 5, 10),
+                        self.__create_square_polygon(10, 10, 10),
+                        self.__create_square_polygon(30, 30, 10)]
+        for index, polygon_id in enumerate(polygon_list):
+            self.engine.scene.set_polygon_param(polygon_id, 'min_height', 100.0 * index)
+            self.engine.scene.set_polygon_param(polygon_id, 'max_height', 100.0 * index + 50)
+
+        # apply the transformations one by one to get the expected heights
+        vertices = self.engine.scene.get_map2d_model_vertices_array(model_id)
+        original_heights = vertices[:, :, 2].copy()
+        for index, polygon_id in enumerate(polygon_list):
+            transformation = LinearTransformation(model_id, polygon_id, 100.0 * index, 100.0 * index + 50)
+            transformation.initialize(self.engine.scene)
+            transformation.apply()
+        expected_heights = vertices[:, :, 2].copy()
+        vertices[:, :, 2] = original_heights
+
+        transformation = LinearBatchTransformation(model_id, polygon_list, 'min_height', 'max_height', max_workers=2)
+        transformation.initialize(self.engine.scene)
+        self.assertEqual([[polygon_list[0], polygon_list[2]], [polygon_list[1]]], transformation.get_batches())
+        self.assertEqual((5, 5, 40, 40), transformation.get_modified_area())
+
+        self.engine.apply_transformation(transformation)
+        np.testing.assert_array_almost_equal(expected_heights,
+                                             self.engine.scene.get_map2d_model_vertices_array(model_id)[:, :, 2])
+
+    def test_fill_nan_batch_transformation(self):
+        self.engine.create_model_from_file('resources/test_resources/cpt/cpt_1.cpt',
+                                           'resources/test_resources/netcdf/test_file_50_50.nc')
+        model_id = self.engine.get_active_model_id()
+        polygon_list = [self.__create_square_polygon(5, 5, 10), self.__create_square_polygon(30, 30, 10)]
+
+        transformation = FillNanBatchTransformation(model_id, polygon_list)
+        transformation.initialize(self.engine.scene)
+        self.assertEqual([polygon_list], transformation.get_batches())
+        transformation.apply()
+
+        heights = self.engine.scene.get_map2d_model_vertices_array(model_id)[:, :, 2]
+        self.assertTrue(np.isnan(heights).any())
+
+    def test_missing_parameters(self):
+        self.engine.create_model_from_file('resources/test_resources/cpt/cpt_1.cpt',
+                                           'resources/test_resources/netcdf/test_file_50_50.nc')
+        polygon_id = self.__create_square_polygon(5, 5, 10)
+        self.engine.scene.set_polygon_param(polygon_id, 'min_height', 10.0)
+
+        transformation = LinearBatchTransformation(self.engine.get_active_model_id(),
+                                                   [polygon_id],
+                                                   'min_height',
+                                                   'max_height')
+        with self.assertRaises(TransformationError) as e:
+            transformation.initialize(self.engine.scene)
+
+        self.assertEqual(15, e.exception.code, 'Error code is not 15.')
+
+    def test_no_polygons(self):
+        self.engine.create_model_from_file('resources/test_resources/cpt/cpt_1.cpt',
+                                           'resources/test_resources/netcdf/test_file_50_50.nc')
+
+        transformation = FillNanBatchTransformation(self.engine.get_active_model_id(), [])
+        with self.assertRaises(TransformationError) as e:
+            transformation.initialize(self.engine.scene)
+
+        self.assertEqual(14, e.exception.code, 'Error code is not 14.')
+
+
+if __name__ == '__main__':
+    unittest.main()
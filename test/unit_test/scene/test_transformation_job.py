@@ -0,0 +1,162 @@
+# BEGIN GPL LICENSE BLOCK
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# END GPL LICENSE BLOCK
+
+"""
+Module in charge of the testing of the jobs used to apply the transformations in other threads.
+"""
+
+import unittest
+from threading import Event, Thread
+
+import numpy as np
+
+from src.engine.scene.map_transformation.map_transformation import MapTransformation
+from src.engine.scene.transformation_job import TransformationJob
+
+
+class AddHeightMapTransformation(MapTransformation):
+    """
+    Map transformation that adds 1 to the heights of the map row by row, reporting the progress after every row.
+    """
+
+    def __init__(self, model_vertices: np.ndarray, row_to_wait: int = None, row_to_fail: int = None):
+        super().__init__('0')
+        self.model_vertices = model_vertices
+        self.row_to_wait = row_to_wait
+        self.row_to_fail = row_to_fail
+        self.row_reached = Event()
+        self.continue_rows = Event()
+
+    def apply(self) -> np.ndarray:
+        for row in range(self.model_vertices.shape[0]):
+            self.model_vertices[row, :, 2] += 1
+
+            if row == self.row_to_fail:
+                raise ValueError('Error in the transformation.')
+
+            if row == self.row_to_wait:
+                self.row_reached.set()
+                self.continue_rows.wait(5)
+
+            self.report_progress((row + 1) / self.model_vertices.shape[0])
+
+        return self.model_vertices
+
+
+class StepsMapTransformation(MapTransformation):
+    """
+    Map transformation that adds 1 to the heights of the map in two steps, cancelling the job after the first step.
+    """
+
+    def __init__(self, model_vertices: np.ndarray):
+        super().__init__('0')
+        self.model_vertices = model_vertices
+        self.rows_modified = 0
+
+    def apply(self) -> np.ndarray:
+        for step in range(2):
+            progress = self.get_progress_callback(step, 2)
+            for row in range(self.model_vertices.shape[0]):
+                self.model_vertices[row, :, 2] += 0.5
+                self.rows_modified += 1
+                progress((row + 1) / self.model_vertices.shape[0])
+
+            self.job.cancel()
+
+        return self.model_vertices
+
+
+def get_vertices() -> np.ndarray:
+    x, y = np.meshgrid(np.arange(4, dtype=np.float64), np.arange(5, dtype=np.float64))
+    return np.dstack((x, y, np.zeros((5, 4))))
+
+
+class TestTransformationJob(unittest.TestCase):
+
+    def test_run(self):
+        vertices = get_vertices()
+        job = TransformationJob(AddHeightMapTransformation(vertices), vertices)
+
+        self.assertTrue(job.run(), 'Job must report that the transformation was applied.')
+        self.assertTrue(job.is_finished())
+        self.assertEqual(1, job.get_progress())
+        np.testing.assert_array_equal(np.ones((5, 4)), vertices[:, :, 2])
+        self.assertIsNone(job.get_transformation().job, 'Transformation must not keep the job after running.')
+
+        delta = job.get_height_delta()
+        self.assertEqual((0, 5, 0, 4), delta.get_region(), 'Map transformations can modify the whole map.')
+        np.testing.assert_array_equal(np.zeros((5, 4)), delta.get_heights(), 'Delta must store the previous heights.')
+
+    def test_cancel_before_run(self):
+        vertices = get_vertices()
+        job = TransformationJob(AddHeightMapTransformation(vertices), vertices)
+
+        job.cancel()
+        self.assertFalse(job.run())
+        self.assertFalse(job.is_finished())
+        np.testing.assert_array_equal(np.zeros((5, 4)), vertices[:, :, 2])
+
+    def test_cancel_while_running(self):
+        vertices = get_vertices()
+        transformation = AddHeightMapTransformation(vertices, row_to_wait=2)
+        job = TransformationJob(transformation, vertices)
+
+        result = []
+        thread = Thread(target=lambda: result.append(job.run()))
+        thread.start()
+
+        # Cancel the job when the transformation already modified some rows
+        transformation.row_reached.wait(5)
+        self.assertEqual(0.4, job.get_progress(), 'Progress must be the last one reported.')
+        job.cancel()
+        transformation.continue_rows.set()
+        thread.join(5)
+
+        self.assertEqual([False], result, 'Job must report that the transformation was cancelled.')
+        self.assertFalse(job.is_finished())
+        self.assertIsNone(job.get_height_delta())
+        self.assertIsNone(job.get_error(), 'Cancelling the job is not an error.')
+        np.testing.assert_array_equal(np.zeros((5, 4)), vertices[:, :, 2],
+                                      'Heights modified before the cancellation must be restored.')
+
+    def test_error_while_running(self):
+        vertices = get_vertices()
+        job = TransformationJob(AddHeightMapTransformation(vertices, row_to_fail=3), vertices)
+
+        with self.assertRaises(ValueError):
+            job.run()
+
+        self.assertFalse(job.is_finished())
+        self.assertIsInstance(job.get_error(), ValueError, 'Job must store the error raised.')
+        self.assertIsNone(job.get_height_delta())
+        self.assertIsNone(job.get_transformation().job)
+        np.testing.assert_array_equal(np.zeros((5, 4)), vertices[:, :, 2],
+                                      'Heights modified before the error must be restored.')
+
+    def test_cancel_between_steps(self):
+        vertices = get_vertices()
+        transformation = StepsMapTransformation(vertices)
+        job = TransformationJob(transformation, vertices)
+
+        self.assertFalse(job.run())
+        self.assertEqual(6, transformation.rows_modified, 'Cancellation must be checked inside the steps.')
+        self.assertAlmostEqual(0.6, job.get_progress(), msg='Every step must count as half of the progress.')
+        np.testing.assert_array_equal(np.zeros((5, 4)), vertices[:, :, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
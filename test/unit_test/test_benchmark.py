@@ -0,0 +1,130 @@
+#  BEGIN GPL LICENSE BLOCK
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  END GPL LICENSE BLOCK
+
+"""
+Module in charge of the testing of the benchmarks and the synthetic data that they use.
+"""
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.headless.headless_polygon import HeadlessPolygon
+from src.input.NetCDF import read_info
+from test.benchmark.benchmark import compare_results, get_report, measure_operation, run_benchmarks
+from test.benchmark.synthetic_data import create_star_polygon, create_synthetic_grid, get_flat_point_list, \
+    write_netcdf_file
+
+
+class TestSyntheticData(unittest.TestCase):
+
+    def test_grid(self):
+        x, y, z = create_synthetic_grid(300, nan_fraction=0.1)
+        self.assertEqual((300,), x.shape)
+        self.assertEqual((300,), y.shape)
+        self.assertEqual((300, 300), z.shape)
+
+        nan_fraction = np.isnan(z).mean()
+        self.assertGreater(nan_fraction, 0.02)
+        self.assertLess(nan_fraction, 0.15)
+
+        np.testing.assert_array_equal(z, create_synthetic_grid(300, nan_fraction=0.1)[2])
+
+    def test_grid_without_nan(self):
+        _, _, z = create_synthetic_grid(100, nan_fraction=0)
+        self.assertFalse(np.isnan(z).any())
+
+    def test_star_polygon(self):
+        for number_of_vertices in [10, 100, 1000]:
+            points = create_star_polygon(number_of_vertices, (1, 2), 3)
+            self.assertEqual(number_of_vertices, len(points))
+
+            polygon = HeadlessPolygon('Polygon 0', points)
+            self.assertTrue(polygon.is_planar())
+            self.assertEqual(3 * number_of_vertices, len(get_flat_point_list(points)))
+
+    def test_netcdf_file(self):
+        x, y, z = create_synthetic_grid(50)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'map.nc')
+            write_netcdf_file(filename, x, y, z)
+            x_file, y_file, z_file = read_info(filename)
+
+        np.testing.assert_array_equal(x, x_file)
+        np.testing.assert_array_equal(y, y_file)
+        np.testing.assert_array_equal(z, z_file)
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_measure_operation(self):
+        calls = []
+
+        # noinspection PyMissingOrEmptyDocstring
+        def setup():
+            calls.append('setup')
+            return lambda: np.zeros(100000)
+
+        result = measure_operation(setup, repeat=2)
+        self.assertEqual(3, len(calls))
+        self.assertLessEqual(result['TIME_MIN'], result['TIME_MEDIAN'])
+        self.assertLessEqual(result['TIME_MEDIAN'], result['TIME_MAX'])
+        self.assertGreaterEqual(result['PEAK_MEMORY'], 800000)
+
+    def test_run_benchmarks(self):
+        results = run_benchmarks([50], [10], repeat=1,
+                                 operations=['read_info', 'generate_mask', 'LinearTransformation', 'shapefile_import'])
+
+        self.assertEqual(['shapefile_import/-/10',
+                          'read_info/50/-',
+                          'generate_mask/50/10',
+                          'LinearTransformation/50/10'], list(results['RESULTS'].keys()))
+        self.assertEqual([50], results['METADATA']['SIZES'])
+
+        result = results['RESULTS']['generate_mask/50/10']
+        self.assertEqual('generate_mask', result['NAME'])
+        self.assertEqual(50, result['GRID_SIZE'])
+        self.assertEqual(10, result['POLYGON_VERTICES'])
+
+    def test_compare_results(self):
+        baseline = {'RESULTS': {
+            'a/-/-': {'TIME_MEDIAN': 1.0, 'PEAK_MEMORY': 1000},
+            'b/-/-': {'TIME_MEDIAN': 1.0, 'PEAK_MEMORY': 1000},
+        }}
+        results = {'RESULTS': {
+            'a/-/-': {'TIME_MEDIAN': 1.5, 'PEAK_MEMORY': 1100},
+            'b/-/-': {'TIME_MEDIAN': 0.5, 'PEAK_MEMORY': 1000},
+            'c/-/-': {'TIME_MEDIAN': 1.0, 'PEAK_MEMORY': 1000},
+        }}
+
+        comparison = compare_results(results, baseline, threshold=0.2)
+        status = {(row['KEY'], row['METRIC']): row['STATUS'] for row in comparison}
+        self.assertEqual({('a/-/-', 'TIME_MEDIAN'): 'REGRESSION',
+                          ('a/-/-', 'PEAK_MEMORY'): 'OK',
+                          ('b/-/-', 'TIME_MEDIAN'): 'IMPROVEMENT',
+                          ('b/-/-', 'PEAK_MEMORY'): 'OK',
+                          ('c/-/-', 'TIME_MEDIAN'): 'NEW',
+                          ('c/-/-', 'PEAK_MEMORY'): 'NEW'}, status)
+
+        report = get_report(comparison, 0.2)
+        self.assertIn('+50.0%', report)
+        self.assertIn('1 regressions found (threshold: 20%).', report)
+
+
+if __name__ == '__main__':
+    unittest.main()
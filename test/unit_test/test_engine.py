@@ -84,6 +84,24 @@ class TestModelInformation(ProgramTestCase):
                          'Model information generated is not equal to the expected.')
 
 
+class TestMemoryUsage(ProgramTestCase):
+
+    def test_memory_usage_of_models(self):
+        empty_memory_data = self.engine.get_memory_usage_data()
+        self.assertEqual(['Polygons'], [model['NAME'] for model in empty_memory_data['MODELS']])
+
+        self.engine.create_model_from_file('resources/test_resources/cpt/colors_0_100_200.cpt',
+                                           'resources/test_resources/netcdf/test_file_50_50.nc')
+        memory_data = self.engine.get_memory_usage_data()
+
+        map_memory = memory_data['MODELS'][0]
+        self.assertEqual('2D', map_memory['TYPE'])
+        self.assertGreaterEqual(map_memory['CPU'], 50 * 50 * 3 * 4, 'Vertices of the map are not included.')
+        self.assertGreaterEqual(map_memory['GPU'], 50 * 50 * 3 * 4, 'Buffer of the vertices is not included.')
+        self.assertEqual(sum(model['CPU'] for model in memory_data['MODELS']), memory_data['CPU'])
+        self.assertEqual(sum(model['GPU'] for model in memory_data['MODELS']), memory_data['GPU'])
+
+
 class TestSetActiveModel(ProgramTestCase):
 
     def test_set_active_model(self):
@@ -0,0 +1,101 @@
+#  BEGIN GPL LICENSE BLOCK
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  END GPL LICENSE BLOCK
+import json
+import os
+import tempfile
+import unittest
+
+from src.engine.frame_profiler import FrameProfiler
+
+
+class TestFrameProfiler(unittest.TestCase):
+
+    def tearDown(self) -> None:
+        FrameProfiler.set_enabled(False)
+        FrameProfiler.clear()
+
+    def test_disabled(self):
+        FrameProfiler.set_enabled(False)
+
+        FrameProfiler.begin_frame()
+        with FrameProfiler.scope('task'):
+            pass
+        FrameProfiler.end_frame()
+
+        self.assertEqual(0, FrameProfiler.get_number_of_frames())
+        self.assertEqual({}, FrameProfiler.get_statistics())
+
+    def test_statistics(self):
+        FrameProfiler.set_enabled(True, 10)
+
+        for frame in range(5):
+            FrameProfiler.begin_frame()
+            FrameProfiler.add_event('task', 0, 0.001 * (frame + 1))
+            FrameProfiler.add_event('task', 0, 0.001)
+            with FrameProfiler.scope('draw_model', 'model_1'):
+                pass
+            FrameProfiler.end_frame()
+
+        statistics = FrameProfiler.get_statistics()
+        self.assertEqual(5, FrameProfiler.get_number_of_frames())
+        self.assertEqual({'task', 'draw_model model_1', 'frame'}, set(statistics.keys()))
+
+        # The events with the same name in the same frame are added
+        self.assertAlmostEqual(6, statistics['task']['LAST'])
+        self.assertAlmostEqual(4, statistics['task']['P50'])
+        self.assertTrue(statistics['task']['P50'] <= statistics['task']['P95'] <= statistics['task']['P99'])
+
+    def test_history_size(self):
+        FrameProfiler.set_enabled(True, 3)
+
+        for frame in range(10):
+            FrameProfiler.begin_frame()
+            FrameProfiler.add_event('task', 0, frame)
+            FrameProfiler.end_frame()
+
+        self.assertEqual(3, FrameProfiler.get_number_of_frames())
+        self.assertAlmostEqual(8000, FrameProfiler.get_statistics()['task']['P50'])
+
+    def test_export_chrome_trace(self):
+        FrameProfiler.set_enabled(True, 10)
+
+        for frame in range(2):
+            FrameProfiler.begin_frame()
+            with FrameProfiler.scope('input'):
+                pass
+            with FrameProfiler.scope('scene_draw'):
+                pass
+            FrameProfiler.end_frame()
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'trace.json')
+            self.assertEqual(6, FrameProfiler.export_chrome_trace(filename))
+
+            with open(filename) as file:
+                trace = json.load(file)
+
+        self.assertEqual(6, len(trace['traceEvents']))
+        self.assertEqual(['input', 'scene_draw', 'frame'], [event['name'] for event in trace['traceEvents'][:3]])
+        for event in trace['traceEvents']:
+            self.assertEqual('X', event['ph'])
+            self.assertGreaterEqual(event['dur'], 0)
+            self.assertIn('ts', event)
+            self.assertIn('tid', event)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+#  BEGIN GPL LICENSE BLOCK
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  END GPL LICENSE BLOCK
+import time
+import unittest
+
+from src.engine.main_thread_scheduler import MainThreadScheduler, complete_work
+from src.engine.thread_manager import ThreadManager
+
+
+class TestMainThreadScheduler(unittest.TestCase):
+
+    def test_execute_work(self):
+        scheduler = MainThreadScheduler(0.008)
+        executed = []
+
+        scheduler.set_work(lambda: executed.append(1))
+        scheduler.set_work(lambda: executed.append(2))
+        self.assertEqual(2, scheduler.get_number_of_pending_work())
+        self.assertEqual([], executed)
+
+        scheduler.update()
+        self.assertEqual([1, 2], executed)
+        self.assertEqual(0, scheduler.get_number_of_pending_work())
+        self.assertEqual(2, scheduler.get_last_frame_slices())
+
+    def test_work_in_slices(self):
+        scheduler = MainThreadScheduler(0)
+        executed = []
+
+        # noinspection PyMissingOrEmptyDocstring
+        def work_in_slices():
+            for chunk in range(3):
+                executed.append(chunk)
+                yield
+
+        scheduler.set_work(work_in_slices)
+        scheduler.set_work(lambda: executed.append('next work'))
+
+        # Without budget, only one slice is executed every frame
+        scheduler.update()
+        self.assertEqual([0], executed)
+        scheduler.update()
+        scheduler.update()
+        self.assertEqual([0, 1, 2], executed)
+        self.assertEqual(2, scheduler.get_number_of_pending_work())
+
+        scheduler.update()
+        self.assertEqual([0, 1, 2], executed)
+        scheduler.update()
+        self.assertEqual([0, 1, 2, 'next work'], executed)
+        self.assertEqual(0, scheduler.get_number_of_pending_work())
+
+    def test_time_budget(self):
+        scheduler = MainThreadScheduler(0.05)
+        for _ in range(10):
+            scheduler.set_work(lambda: time.sleep(0.02))
+
+        scheduler.update()
+        self.assertEqual(3, scheduler.get_last_frame_slices())
+        self.assertEqual(7, scheduler.get_number_of_pending_work())
+        self.assertGreaterEqual(scheduler.get_last_frame_time(), 0.05)
+        self.assertEqual(0.05, scheduler.get_time_budget())
+
+    def test_exception_in_slice(self):
+        scheduler = MainThreadScheduler(1)
+
+        # noinspection PyMissingOrEmptyDocstring
+        def failing_work():
+            yield
+            raise ValueError('Error in the slice.')
+
+        scheduler.set_work(failing_work)
+        with self.assertRaises(ValueError):
+            scheduler.update()
+        self.assertEqual(0, scheduler.get_number_of_pending_work())
+
+    def test_complete_work(self):
+        executed = []
+
+        # noinspection PyMissingOrEmptyDocstring
+        def work_in_slices():
+            for chunk in range(3):
+                executed.append(chunk)
+                yield
+
+        complete_work(work_in_slices())
+        complete_work(None)
+        self.assertEqual([0, 1, 2], executed)
+
+
+class TestThreadManagerWithScheduler(unittest.TestCase):
+
+    def test_then_executed_by_scheduler(self):
+        scheduler = MainThreadScheduler(0)
+        tm = ThreadManager(max_workers=1, scheduler=scheduler)
+        executed = []
+
+        # noinspection PyMissingOrEmptyDocstring
+        def then_in_slices(value):
+            executed.append(value)
+            yield
+            executed.append(value + 1)
+
+        tm.set_thread_task(lambda: 10, then_in_slices)
+        for _ in range(300):
+            tm.update_threads()
+            if scheduler.get_number_of_pending_work() > 0:
+                break
+            time.sleep(0.1)
+
+        self.assertEqual([], executed)
+        scheduler.update()
+        self.assertEqual([10], executed)
+        scheduler.update()
+        self.assertEqual([10, 11], executed)
+
+        tm.shutdown()
+
+    def test_then_without_scheduler(self):
+        tm = ThreadManager(max_workers=1)
+        executed = []
+
+        # noinspection PyMissingOrEmptyDocstring
+        def then_in_slices():
+            executed.append(1)
+            yield
+            executed.append(2)
+
+        tm.set_thread_task(lambda: None, then_in_slices)
+        for _ in range(300):
+            tm.update_threads()
+            if len(executed) > 0:
+                break
+            time.sleep(0.1)
+
+        self.assertEqual([1, 2], executed)
+        tm.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -21,11 +21,15 @@ File wth logic that test the process manager of the application.
 Due to python implementations, all functions passed to the parallel process must be defined public. They can not
 be private, protected, or local to a function or class.
 """
+import pickle
 import queue
 import time
 import unittest
 
+import numpy as np
+
 from src.engine.process_manager import ProcessManager
+from src.engine.shared_array import SharedArray
 
 # Variables and functions used in testing.
 TEST_MUTABLE_OBJECT = [None, None, None]
@@ -53,6 +57,17 @@ def change_global_mutable_object(value, ind):
     TEST_MUTABLE_OBJECT[ind] = value
 
 
+def multiply_shared_array(shared_array, value):
+    """Multiply the values of the shared array and return it."""
+    shared_array.get_array()[...] *= value
+    return shared_array
+
+
+def raise_exception():
+    """Raise an exception in the parallel process."""
+    raise ValueError('Exception in the parallel process.')
+
+
 class TestProcessTask(unittest.TestCase):
 
     def test_code_in_another_process(self):
@@ -173,5 +188,96 @@ class TestProcessTask(unittest.TestCase):
         self.assertEqual([45], list(q.queue))
 
 
+class TestSharedMemory(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.pm = ProcessManager(max_workers=2)
+
+    def tearDown(self) -> None:
+        self.pm.shutdown()
+
+    def wait_process(self, result: list) -> None:
+        for _ in range(300):
+            self.pm.update_process()
+            if len(result) > 0:
+                return
+            time.sleep(0.1)
+
+    def test_pickle_shared_array(self):
+        heights = np.arange(12, dtype=np.float32).reshape((3, 4))
+        shared_array = self.pm.create_shared_array(heights)
+
+        copied_array = pickle.loads(pickle.dumps(shared_array))
+        self.assertEqual(shared_array.get_name(), copied_array.get_name())
+        self.assertFalse(copied_array.is_owner())
+        np.testing.assert_array_equal(heights, copied_array.get_array())
+
+        # Both arrays use the same memory
+        copied_array.get_array()[0, 0] = 100
+        self.assertEqual(100, shared_array.get_array()[0, 0])
+        copied_array.release()
+
+        self.assertEqual(heights.nbytes, self.pm.get_shared_memory_nbytes())
+        self.pm.release_shared_array(shared_array)
+        self.assertEqual(0, self.pm.get_shared_memory_nbytes())
+
+    def test_then_receive_shared_memory(self):
+        heights = np.arange(12, dtype=np.float32).reshape((3, 4))
+        shared_array = self.pm.create_shared_array(heights)
+        result = []
+
+        self.pm.create_parallel_process(multiply_shared_array, [shared_array, 2], lambda array: result.append(array))
+        self.wait_process(result)
+
+        self.assertEqual(1, len(result))
+        self.assertIsInstance(result[0], np.ndarray)
+        self.assertTrue(np.shares_memory(result[0], shared_array.get_array()))
+        np.testing.assert_array_equal(heights * 2, result[0])
+
+    def test_process_pool_reused(self):
+        result = []
+        for value in range(5):
+            self.pm.create_parallel_process(return_value_plus_50, [value], lambda ret: result.append(ret))
+
+        for _ in range(300):
+            self.pm.update_process()
+            if len(result) == 5:
+                break
+            time.sleep(0.1)
+
+        self.assertEqual([50, 51, 52, 53, 54], sorted(result))
+
+    def test_exception_in_process(self):
+        result = []
+        self.pm.create_parallel_process(raise_exception, then_function=lambda: result.append('then'))
+        self.pm.create_parallel_process(return_value_plus_50, [0], lambda ret: result.append(ret))
+
+        for _ in range(300):
+            self.pm.update_process()
+            if len(result) > 0:
+                break
+            time.sleep(0.1)
+        time.sleep(0.2)
+        self.pm.update_process()
+
+        self.assertEqual([50], result)
+
+
+class TestSharedArray(unittest.TestCase):
+
+    def test_from_array(self):
+        heights = np.random.rand(5, 6)
+        shared_array = SharedArray.from_array(heights)
+
+        self.assertTrue(shared_array.is_owner())
+        self.assertEqual(heights.dtype, shared_array.get_array().dtype)
+        self.assertEqual(heights.nbytes, shared_array.get_nbytes())
+        np.testing.assert_array_equal(heights, shared_array.get_array())
+
+        shared_array.release()
+        self.assertFalse(shared_array.is_owner())
+        self.assertIsNone(shared_array.get_array())
+
+
 if __name__ == '__main__':
     unittest.main()
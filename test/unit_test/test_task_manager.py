@@ -72,6 +72,17 @@ class TestSetTask(unittest.TestCase):
         self.assertEqual(100, mutable_object[0])
         self.assertIsNone(mutable_object[1])
 
+    def test_number_of_pending_tasks(self):
+        tm = TaskManager()
+        tm.set_task(lambda: None, 1)
+        tm.set_task(lambda: None, 2)
+        self.assertEqual(2, tm.get_number_of_pending_tasks())
+
+        tm.update_tasks()
+        self.assertEqual(1, tm.get_number_of_pending_tasks())
+        tm.update_tasks()
+        self.assertEqual(0, tm.get_number_of_pending_tasks())
+
     def test_error_number_frames(self):
         tm = TaskManager()
         with self.assertRaises(AssertionError):
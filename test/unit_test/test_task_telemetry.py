@@ -0,0 +1,155 @@
+#  BEGIN GPL LICENSE BLOCK
+#
+#      This program is free software: you can redistribute it and/or modify
+#      it under the terms of the GNU General Public License as published by
+#      the Free Software Foundation, either version 3 of the License, or
+#      (at your option) any later version.
+#
+#      This program is distributed in the hope that it will be useful,
+#      but WITHOUT ANY WARRANTY; without even the implied warranty of
+#      MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#      GNU General Public License for more details.
+#
+#      You should have received a copy of the GNU General Public License
+#      along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  END GPL LICENSE BLOCK
+import json
+import os
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from src.engine.task_manager import TaskManager
+from src.engine.task_telemetry import TaskTelemetry, get_result_size, measure_task
+from src.engine.thread_manager import ThreadManager
+
+
+class TestTaskTelemetry(unittest.TestCase):
+
+    def setUp(self) -> None:
+        TaskTelemetry.clear()
+        TaskTelemetry.set_enabled(True)
+
+    def tearDown(self) -> None:
+        TaskTelemetry.set_enabled(False)
+        TaskTelemetry.clear()
+
+    def test_disabled(self):
+        TaskTelemetry.set_enabled(False)
+        self.assertIsNone(TaskTelemetry.create_record('thread', print))
+
+        task_manager = TaskManager()
+        task_manager.set_task(lambda: None, 1)
+        task_manager.update_tasks()
+        self.assertEqual([], TaskTelemetry.get_records())
+
+    def test_thread_task(self):
+        thread_manager = ThreadManager(2)
+
+        # noinspection PyMissingOrEmptyDocstring
+        def create_array():
+            time.sleep(0.01)
+            return np.zeros(1000, dtype=np.float64)
+
+        thread_manager.set_thread_task(create_array, lambda array: None)
+
+        for _ in range(200):
+            thread_manager.update_threads()
+            if len(TaskTelemetry.get_records()) > 0:
+                break
+            time.sleep(0.01)
+        thread_manager.shutdown()
+
+        record = TaskTelemetry.get_records()[0]
+        self.assertEqual('thread', record['KIND'])
+        self.assertEqual('finished', record['STATUS'])
+        self.assertIn('create_array', record['NAME'])
+        self.assertEqual(8000, record['RESULT_SIZE'])
+        self.assertLessEqual(record['SUBMIT_TIME'], record['START_TIME'])
+        self.assertGreaterEqual(record['END_TIME'] - record['START_TIME'], 0.01)
+
+    def test_then_in_slices(self):
+        record = TaskTelemetry.create_record('thread', print, 'upload')
+
+        # noinspection PyMissingOrEmptyDocstring
+        def then_in_slices():
+            for _ in range(3):
+                time.sleep(0.005)
+                yield
+
+        generator = TaskTelemetry.run_then(record, then_in_slices, [])
+        self.assertEqual([], TaskTelemetry.get_records())
+
+        for _ in generator:
+            pass
+        self.assertEqual([record], TaskTelemetry.get_records())
+        self.assertGreaterEqual(record['THEN_DURATION'], 0.015)
+
+    def test_task_manager(self):
+        task_manager = TaskManager()
+        task_manager.set_task(lambda: None, 1, 'loading', 'read_file')
+        task_manager.update_tasks()
+
+        records = TaskTelemetry.get_records()
+        self.assertEqual(1, len(records))
+        self.assertEqual('read_file', records[0]['NAME'])
+        self.assertEqual('loading', records[0]['KIND'])
+
+    def test_error(self):
+        record = TaskTelemetry.create_record('task', print)
+
+        # noinspection PyMissingOrEmptyDocstring
+        def raise_error():
+            raise ValueError()
+
+        with self.assertRaises(ValueError):
+            TaskTelemetry.run_task(record, raise_error, [])
+        self.assertEqual('error', record['STATUS'])
+        self.assertIsNotNone(record['END_TIME'])
+
+    def test_measure_task(self):
+        record = TaskTelemetry.create_record('process', sum)
+        result = TaskTelemetry.set_process_measures(record, measure_task(sum, [1, 2, 3]))
+
+        self.assertEqual(6, result)
+        self.assertLessEqual(record['START_TIME'], record['END_TIME'])
+
+    def test_result_size(self):
+        self.assertEqual(0, get_result_size(None))
+        self.assertEqual(800, get_result_size([np.zeros(50), np.zeros(50)]))
+        self.assertEqual(400, get_result_size({'heights': np.zeros(100, dtype=np.float32)}))
+
+    def test_export_jsonl(self):
+        for name in ['first', 'second']:
+            TaskTelemetry.finish_record(TaskTelemetry.create_record('task', print, name))
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'telemetry.jsonl')
+            self.assertEqual(2, TaskTelemetry.export_jsonl(filename))
+
+            with open(filename) as file:
+                records = [json.loads(line) for line in file]
+
+        self.assertEqual(['first', 'second'], [record['NAME'] for record in records])
+
+    def test_output_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'telemetry.jsonl')
+            TaskTelemetry.set_output_file(filename)
+            try:
+                TaskTelemetry.finish_record(TaskTelemetry.create_record('task', print, 'first'))
+                TaskTelemetry.finish_record(TaskTelemetry.create_record('task', print, 'second'), 'cancelled')
+            finally:
+                TaskTelemetry.set_output_file(None)
+
+            with open(filename) as file:
+                records = [json.loads(line) for line in file]
+
+        self.assertEqual(['finished', 'cancelled'], [record['STATUS'] for record in records])
+
+
+if __name__ == '__main__':
+    unittest.main()
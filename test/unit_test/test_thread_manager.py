@@ -34,8 +34,11 @@
 
 import time
 import unittest
+from threading import Event
 
+from src.engine.cancellation_token import CancellationToken
 from src.engine.thread_manager import ThreadManager
+from src.engine.thread_task_priority import ThreadTaskPriority
 
 
 class TestThreadTask(unittest.TestCase):
@@ -145,5 +148,119 @@ class TestThreadTask(unittest.TestCase):
                 break
 
 
+class TestThreadPool(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # Use only one worker, blocked until the event is set, so the tasks wait in the queue
+        self.tm = ThreadManager(max_workers=1)
+        self.release_worker = Event()
+        self.tm.set_thread_task(lambda: self.release_worker.wait(30), lambda released: None)
+
+    def tearDown(self) -> None:
+        self.release_worker.set()
+        self.tm.shutdown()
+
+    def wait_tasks(self, number_of_tasks: int, executed_then: list) -> None:
+        for _ in range(300):
+            self.tm.update_threads()
+            if len(executed_then) >= number_of_tasks and self.tm.get_number_of_pending_tasks() == 0:
+                time.sleep(0.05)
+                self.tm.update_threads()
+                return
+            time.sleep(0.1)
+
+    def test_priority_order(self):
+        executed = []
+        self.tm.set_thread_task(lambda: executed.append('background'), lambda: None,
+                                priority=ThreadTaskPriority.background)
+        self.tm.set_thread_task(lambda: executed.append('reload'), lambda: None,
+                                priority=ThreadTaskPriority.reload)
+        self.tm.set_thread_task(lambda: executed.append('interactive_1'), lambda: None,
+                                priority=ThreadTaskPriority.interactive)
+        self.tm.set_thread_task(lambda: executed.append('interactive_2'), lambda: None,
+                                priority=ThreadTaskPriority.interactive)
+
+        self.release_worker.set()
+        self.wait_tasks(4, executed)
+
+        self.assertEqual(['interactive_1', 'interactive_2', 'reload', 'background'], executed)
+
+    def test_superseded_tasks(self):
+        executed, executed_then = [], []
+        for value in range(3):
+            self.tm.set_thread_task(lambda value=value: executed.append(value) or value,
+                                    lambda value: executed_then.append(value),
+                                    priority=ThreadTaskPriority.reload,
+                                    key='model_reload')
+        self.tm.set_thread_task(lambda: 'other', lambda value: executed_then.append(value),
+                                key='other_key')
+
+        self.release_worker.set()
+        self.wait_tasks(2, executed_then)
+
+        self.assertEqual([2], executed)
+        self.assertEqual(['other', 2], executed_then)
+
+    def test_cancelled_task(self):
+        executed, executed_then = [], []
+        token = self.tm.set_thread_task(lambda: executed.append('cancelled'),
+                                        lambda: executed_then.append('cancelled'))
+        self.tm.set_thread_task(lambda: executed.append('not cancelled'),
+                                lambda: executed_then.append('not cancelled'))
+        self.assertIsInstance(token, CancellationToken)
+        token.cancel()
+
+        self.release_worker.set()
+        self.wait_tasks(1, executed_then)
+
+        self.assertEqual(['not cancelled'], executed)
+        self.assertEqual(['not cancelled'], executed_then)
+
+    def test_task_cancelled_while_running(self):
+        executed_then = []
+        started = Event()
+        token = CancellationToken()
+
+        # noinspection PyMissingOrEmptyDocstring
+        def parallel_task():
+            started.set()
+            while not token.is_cancelled():
+                time.sleep(0.01)
+            return 'cancelled'
+
+        self.release_worker.set()
+        self.tm.set_thread_task(parallel_task, lambda value: executed_then.append(value), token=token)
+        self.assertTrue(started.wait(30))
+        token.cancel()
+
+        self.tm.set_thread_task(lambda: 'new task', lambda value: executed_then.append(value))
+        self.wait_tasks(1, executed_then)
+
+        self.assertEqual(['new task'], executed_then)
+
+    def test_notify_finished_tasks(self):
+        notified = Event()
+        tm = ThreadManager(max_workers=1, on_task_finished=notified.set)
+
+        tm.set_thread_task(lambda: None, lambda: None)
+        self.assertTrue(notified.wait(30))
+
+        # Wait for the task to be in the list of finished tasks
+        updated_tasks = 0
+        for _ in range(300):
+            updated_tasks = tm.update_threads()
+            if updated_tasks > 0:
+                break
+            time.sleep(0.1)
+
+        self.assertEqual(1, updated_tasks)
+        self.assertEqual(0, tm.update_threads())
+        tm.shutdown()
+
+    def test_max_workers(self):
+        self.assertEqual(1, self.tm.get_max_workers())
+        self.assertEqual(1, ThreadManager(max_workers=0).get_max_workers())
+
+
 if __name__ == '__main__':
     unittest.main()